@@ -8,10 +8,11 @@ import streamlit_testing_functions as functions
 import injury_report as ir
 import datetime
 from datetime import date
-import time
 import nba_api.stats.endpoints
 import prediction_features as pf
 import team_onoff as toff
+import data_cache as dc
+import request_scheduler as rs
 
 import altair as alt
 import pandas as pd
@@ -28,6 +29,7 @@ with st.sidebar:
     st.markdown("### Cache Management")
     if st.button("🗑️ Clear All Cache", width='stretch'):
         st.cache_data.clear()
+        dc.clear_all()
         st.success("✅ Cache cleared successfully!")
         st.rerun()
     st.markdown("---")  # Separator
@@ -38,14 +40,10 @@ def get_matchups_for_date(selected_date):
     """Fetch NBA matchups for a given date from the API"""
     season = '2025-26'
     
-    # Fetch from API
-    try:
-        league_schedule = nba_api.stats.endpoints.ScheduleLeagueV2(
-            league_id='00',
-            season=season
-        ).get_data_frames()[0]
-    except Exception as e:
-        return [], f"Error fetching schedule: {str(e)}"
+    # Fetch from API (falls back to the latest snapshot)
+    league_schedule = pf.get_league_schedule(season)
+    if len(league_schedule) == 0:
+        return [], "Error fetching schedule: no data returned"
     
     try:
         
@@ -149,6 +147,10 @@ if matchups_for_date:
     if 'matchup_override' in st.session_state:
         functions.set_matchup_override(st.session_state['matchup_override'])
         functions.update_selected_matchup(st.session_state['matchup_override'])
+        # Fetch everything the matchup stats need in parallel before the tabs read them
+        functions.load_matchup_stats()
+        # Index every game of the date in one pass so switching games is a lookup
+        functions.precompute_matchup_cards(matchups_for_date)
 else:
     st.info(f"ℹ️ No games scheduled for {selected_date.strftime('%B %d, %Y')}.")
     selected_matchup = None
@@ -750,28 +752,22 @@ if selected_matchup:
             season = pf.CURRENT_SEASON
         
         # Fetch from API
-        synergy_data = None
-        for attempt in range(max_retries):
-            try:
-                synergy_data = nba_api.stats.endpoints.SynergyPlayTypes(
-                    league_id='00',
-                    per_mode_simple='Totals',
-                    season=season,
-                    season_type_all_star='Regular Season',
-                    player_or_team_abbreviation='T',
-                    type_grouping_nullable=type_grouping,
-                    play_type_nullable=playtype,
-                    timeout=timeout
-                ).get_data_frames()[0]
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"Error fetching synergy data for team {team_id}, playtype {playtype}, type {type_grouping}: {str(e)}")
-                    return pd.DataFrame(), False
+        try:
+            synergy_data = rs.call_nba_api(
+                nba_api.stats.endpoints.SynergyPlayTypes,
+                max_retries=max_retries,
+                league_id='00',
+                per_mode_simple='Totals',
+                season=season,
+                season_type_all_star='Regular Season',
+                player_or_team_abbreviation='T',
+                type_grouping_nullable=type_grouping,
+                play_type_nullable=playtype,
+                timeout=timeout
+            )[0]
+        except Exception as e:
+            print(f"Error fetching synergy data for team {team_id}, playtype {playtype}, type {type_grouping}: {str(e)}")
+            return pd.DataFrame(), False
         
         # Filter for the specific team
         if synergy_data is not None and len(synergy_data) > 0 and 'TEAM_ID' in synergy_data.columns:
@@ -799,46 +795,31 @@ if selected_matchup:
                             'PRBallHandler', 'PRRollman', 'OffRebound', 'Spotup', 'Transition']
         synergy_sides = ['offensive', 'defensive']
         
-        # Fetch from API
-        result = {}
-        total_requests = len(synergy_playtypes) * len(synergy_sides)
-        current_request = 0
+        # Fetch from API: all 22 requests scheduled at once under the stats.nba.com rate limit
+        futures = {
+            (playtype, side): rs.submit_nba_api(
+                nba_api.stats.endpoints.SynergyPlayTypes,
+                league_id='00',
+                per_mode_simple='Totals',
+                season=season,
+                season_type_all_star='Regular Season',
+                player_or_team_abbreviation='T',
+                type_grouping_nullable=side,
+                play_type_nullable=playtype,
+                timeout=60
+            )
+            for playtype in synergy_playtypes
+            for side in synergy_sides
+        }
         
-        for playtype in synergy_playtypes:
-            result[playtype] = {}
-            for side in synergy_sides:
-                current_request += 1
-                
-                # API call
-                synergy_data = None
-                for attempt in range(3):
-                    try:
-                        synergy_data = nba_api.stats.endpoints.SynergyPlayTypes(
-                            league_id='00',
-                            per_mode_simple='Totals',
-                            season=season,
-                            season_type_all_star='Regular Season',
-                            player_or_team_abbreviation='T',
-                            type_grouping_nullable=side,
-                            play_type_nullable=playtype,
-                            timeout=60
-                        ).get_data_frames()[0]
-                        break
-                    except Exception as e:
-                        if attempt < 2:
-                            wait_time = (attempt + 1) * 2
-                            time.sleep(wait_time)
-                            continue
-                        else:
-                            print(f"Error fetching synergy data for playtype {playtype}, type {side}: {str(e)}")
-                            synergy_data = pd.DataFrame()
-                            break
-                
-                result[playtype][side] = synergy_data if synergy_data is not None else pd.DataFrame()
-                
-                # Add delay between API calls to avoid rate limiting
-                if current_request < total_requests:
-                    time.sleep(1.5)
+        result = {}
+        for (playtype, side), future in futures.items():
+            try:
+                synergy_data = future.result()[0]
+            except Exception as e:
+                print(f"Error fetching synergy data for playtype {playtype}, type {side}: {str(e)}")
+                synergy_data = pd.DataFrame()
+            result.setdefault(playtype, {})[side] = synergy_data if synergy_data is not None else pd.DataFrame()
         
         return result
     
@@ -15,8 +15,8 @@ import backtest as bt
 import injury_report as ir
 import player_similarity as ps
 import player_synergy as psyn
+import data_cache as dc
 import pandas as pd
-import nba_api.stats.endpoints
 from datetime import datetime, date, timedelta
 import math
 import requests
@@ -29,6 +29,7 @@ with st.sidebar:
     st.markdown("### Cache Management")
     if st.button("🗑️ Clear All Cache", width='stretch'):
         st.cache_data.clear()
+        dc.clear_all()
         st.success("✅ Cache cleared successfully!")
         st.rerun()
     st.markdown("---")  # Separator
@@ -184,28 +185,7 @@ def get_bulk_team_defensive_synergy(season=None):
     """Fetch all teams' defensive synergy data for frequency rank calculations"""
     if season is None:
         season = psyn.CURRENT_SEASON
-    
-    synergy_playtypes = ['Cut', 'Handoff', 'Isolation', 'Misc', 'OffScreen', 'Postup', 
-                        'PRBallHandler', 'PRRollman', 'OffRebound', 'Spotup', 'Transition']
-    
-    result = {}
-    for playtype in synergy_playtypes:
-        try:
-            synergy_data = nba_api.stats.endpoints.SynergyPlayTypes(
-                league_id='00',
-                per_mode_simple='Totals',
-                season=season,
-                season_type_all_star='Regular Season',
-                player_or_team_abbreviation='T',
-                type_grouping_nullable='defensive',
-                play_type_nullable=playtype,
-                timeout=60
-            ).get_data_frames()[0]
-            result[playtype] = synergy_data if synergy_data is not None else pd.DataFrame()
-        except Exception as e:
-            result[playtype] = pd.DataFrame()
-    
-    return result
+    return psyn.get_all_teams_defensive_synergy_bulk(season)
 
 # Cache player shooting data
 @st.cache_data(ttl=3600)  # Cache for 1 hour
@@ -226,10 +206,7 @@ def get_matchups_for_date(selected_date):
         from datetime import datetime
         
         # Get schedule data
-        league_schedule = nba_api.stats.endpoints.ScheduleLeagueV2(
-            league_id='00',
-            season='2025-26'
-        ).get_data_frames()[0]
+        league_schedule = pf_features.get_league_schedule('2025-26')
         
         league_schedule['dateGame'] = pd.to_datetime(league_schedule['gameDate'])
         league_schedule['matchup'] = league_schedule['awayTeam_teamTricode'] + ' @ ' + league_schedule['homeTeam_teamTricode']
@@ -5,6 +5,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'new-stre
 
 import streamlit as st
 import streamlit_testing_functions as functions
+import passing_network as pn
 import nba_api.stats.endpoints as endpoints
 import pandas as pd
 from datetime import date
@@ -80,20 +81,25 @@ def get_team_roster(team_id):
         st.error(f"Error fetching roster: {str(e)}")
         return []
 
-# Cache function to get passing data
-@st.cache_data(ttl=1800)
-def get_player_passing_data(player_id, team_id, season='2025-26', season_type='Regular Season', per_mode_simple='PerGame'):
+# Passing edges for a team from the passing network store
+def get_team_passing_edges(team_id, season='2025-26', per_mode_simple='PerGame'):
+    """Get a team's passing edges (receiver column named like PlayerDashPtPass)
+    
+    Teams missing from the stored network are fetched on demand and kept in memory
+    only; they are saved with the next background or nightly refresh.
+    """
+    players_df = functions.get_players_dataframe()
+    # Refresh the stored networks in the background if they are missing or stale
+    pn.ensure_passing_network(players_df, season)
+    edges = pn.get_team_passing_edges(team_id, season, per_mode_simple, players_df=players_df)
+    return edges.rename(columns={'RECEIVER_ID': 'PASS_TEAMMATE_PLAYER_ID'})
+
+# Get passing data for a specific player
+def get_player_passing_data(player_id, team_id, season='2025-26', per_mode_simple='PerGame'):
     """Get passing data for a specific player"""
     try:
-        passing_data = endpoints.PlayerDashPtPass(
-            season=season,
-            season_type_all_star=season_type,
-            per_mode_simple=per_mode_simple,
-            player_id=str(player_id),
-            team_id=str(team_id)
-        ).get_data_frames()[0]
-        
-        return passing_data
+        edges = get_team_passing_edges(team_id, season, per_mode_simple)
+        return edges[edges['PASSER_ID'] == player_id].copy()
     except Exception as e:
         st.error(f"Error fetching passing data: {str(e)}")
         return pd.DataFrame()
@@ -114,34 +120,20 @@ def format_passer_name(passer_id, roster):
             return player['name']  # Already in FIRST LAST format from get_team_roster
     return None
 
-# Cache function to get all passing data for a team (for receiver view)
-@st.cache_data(ttl=1800)
-def get_all_team_passing_data(team_id, roster, season='2025-26', season_type='Regular Season', per_mode_simple='PerGame'):
+# Get all passing data for a team (for receiver view)
+def get_all_team_passing_data(team_id, roster, season='2025-26', per_mode_simple='PerGame'):
     """Get passing data for all players on a team"""
-    all_passing_data = []
-    
-    for player in roster:
-        try:
-            passing_data = endpoints.PlayerDashPtPass(
-                season=season,
-                season_type_all_star=season_type,
-                per_mode_simple=per_mode_simple,
-                player_id=str(player['id']),
-                team_id=str(team_id)
-            ).get_data_frames()[0]
-            
-            # Add passer ID to each row
-            passing_data['PASSER_ID'] = player['id']
-            passing_data['PASSER_NAME'] = player['name']
-            all_passing_data.append(passing_data)
-        except Exception as e:
-            # Skip players with no passing data
-            continue
-    
-    if not all_passing_data:
+    try:
+        edges = get_team_passing_edges(team_id, season, per_mode_simple)
+    except Exception as e:
+        st.error(f"Error fetching passing data: {str(e)}")
         return pd.DataFrame()
     
-    return pd.concat(all_passing_data, ignore_index=True)
+    # Add passer names from the roster
+    passer_names = {player['id']: player['name'] for player in roster}
+    edges = edges[edges['PASSER_ID'].isin(passer_names)].copy()
+    edges['PASSER_NAME'] = edges['PASSER_ID'].map(passer_names)
+    return edges
 
 # Team Selection
 st.markdown("### Select Team")
@@ -20,12 +20,13 @@ from typing import Dict, List, Optional, Tuple
 from fetch_draftkings_draftables import fetch_direct, fetch_via_zenrows, extract_player_data
 from optimize_lineups_by_wave import get_matchups_with_times, group_games_by_wave, optimize_lineups_by_wave, combine_predictions_for_waves, optimize_combined_waves
 from generate_predictions_batch import generate_predictions_for_date, get_matchups_for_date
-from optimize_draftkings_nba_lineup import load_draftables, format_lineup_output, calculate_boom_bust_probabilities, merge_draftables_with_predictions, add_position_flags
+from optimize_draftkings_nba_lineup import load_draftables, format_lineup_output, calculate_boom_bust_probabilities, merge_draftables_with_predictions, add_position_flags, normalize_player_name
 
 # Import prediction functions
 import player_functions as pf
 import prediction_model as pm
 import injury_report as ir
+import slate_simulator as ss
 
 st.set_page_config(
     page_title="DraftKings Optimizer",
@@ -195,6 +196,32 @@ existing_predictions = {}
 def get_cached_matchups(selected_date):
     return get_matchups_with_times(selected_date)
 
+def build_simulation_slate(merged_df, predictions_df, matchups):
+    """Slate rows for simulate_slate(): player/team ids and predicted stat means per merged player."""
+    team_ids = {}
+    opponent_ids = {}
+    for matchup in matchups:
+        team_ids[matchup['away_team']] = matchup['away_team_id']
+        team_ids[matchup['home_team']] = matchup['home_team_id']
+        opponent_ids[matchup['away_team']] = matchup['home_team_id']
+        opponent_ids[matchup['home_team']] = matchup['away_team_id']
+    
+    predictions = predictions_df.drop_duplicates(subset=['Player_normalized']).set_index('Player_normalized')
+    names = merged_df['Player'].apply(normalize_player_name)
+    
+    slate_df = merged_df[['Player', 'Team', 'salary']].copy()
+    slate_df['player_id'] = pd.to_numeric(names.map(predictions['Player_ID']), errors='coerce')
+    slate_df['team_id'] = slate_df['Team'].map(team_ids)
+    slate_df['opponent_team_id'] = slate_df['Team'].map(opponent_ids)
+    for stat in ss.SIM_STATS:
+        if stat in predictions.columns:
+            slate_df[stat] = names.map(predictions[stat])
+    return slate_df.dropna(subset=['player_id', 'team_id']).reset_index(drop=True)
+
+@st.cache_data(ttl=1800, show_spinner="Simulating slate...")
+def get_slate_simulation_summary(slate_df):
+    return ss.summarize_players(ss.simulate_slate(slate_df, seed=0))
+
 if st.session_state.draftables_df is None:
     st.warning("⚠️ Please fetch draftables first before selecting games")
 else:
@@ -441,12 +468,10 @@ else:
                 
                 # Ensure normalized columns exist (required by merge_draftables_with_predictions)
                 if 'displayName_normalized' not in draftables_df.columns:
-                    from optimize_draftkings_nba_lineup import normalize_player_name
                     draftables_df['displayName_normalized'] = draftables_df['displayName'].apply(normalize_player_name)
                 
                 # Ensure predictions have normalized column
                 if 'Player_normalized' not in combined_predictions_df.columns:
-                    from optimize_draftkings_nba_lineup import normalize_player_name
                     combined_predictions_df['Player_normalized'] = combined_predictions_df['Player'].apply(normalize_player_name)
                 
                 merged_df = merge_draftables_with_predictions(draftables_df, combined_predictions_df)
@@ -456,8 +481,17 @@ else:
                     merged_df = merged_df[merged_df['Team'].isin(team_abbreviations)].copy()
                 
                 if len(merged_df) > 0:
+                    # Simulated FPTS distributions drive ceiling/floor and boom/bust where players match
+                    simulation_summary = None
+                    try:
+                        slate_df = build_simulation_slate(merged_df, combined_predictions_df, matchups)
+                        if len(slate_df) > 0:
+                            simulation_summary = get_slate_simulation_summary(slate_df)
+                    except Exception as e:
+                        st.warning(f"⚠️ Slate simulation unavailable, using score-based boom/bust: {e}")
+                    
                     # Calculate boom/bust scores
-                    merged_df = calculate_boom_bust_probabilities(merged_df)
+                    merged_df = calculate_boom_bust_probabilities(merged_df, simulation_summary=simulation_summary)
                     
                     # Create two columns for boom and bust tables
                     col1, col2 = st.columns(2)
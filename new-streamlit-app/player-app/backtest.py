@@ -5,7 +5,7 @@ Test prediction model against historical game results.
 
 import pandas as pd
 import numpy as np
-import streamlit as st
+import data_cache as dc
 from typing import Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
@@ -14,6 +14,7 @@ import nba_api.stats.endpoints as endpoints
 # Import prediction modules
 import prediction_model as pm
 import prediction_features as pf
+import slate_features as sf
 
 
 # Constants
@@ -48,7 +49,7 @@ def categorize_player(ppg: float, mpg: float) -> str:
         return "Role Player"
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_player_season_averages(player_id: str, season: str = CURRENT_SEASON) -> Dict:
     """
     Get player's season averages (PPG, MPG) for categorization.
@@ -143,7 +144,7 @@ def get_opponent_team_id(opponent_abbr: str) -> Optional[int]:
     return team_abbr_to_id.get(opponent_abbr)
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_player_game_logs_for_backtest(player_id: str, season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Get player's game logs for backtesting.
@@ -307,6 +308,70 @@ def run_player_backtest(
     return all_results
 
 
+class BacktestAccumulator:
+    """
+    Running per-stat error totals so summaries can be read at any point
+    while results are still streaming in.
+    """
+    
+    def __init__(self):
+        self.totals = {}
+    
+    def update(self, results: List[BacktestResult]) -> None:
+        """Fold a batch of results into the running totals."""
+        for r in results:
+            t = self.totals.get(r.stat)
+            if t is None:
+                t = self.totals[r.stat] = {
+                    'n': 0, 'sum_abs': 0.0, 'sum_sq': 0.0, 'sum_err': 0.0,
+                    'n_valid': 0, 'within_10': 0, 'within_20': 0, 'within_3': 0
+                }
+            t['n'] += 1
+            t['sum_abs'] += r.abs_error
+            t['sum_sq'] += r.error ** 2
+            t['sum_err'] += r.error
+            if r.abs_error <= 3:
+                t['within_3'] += 1
+            if r.actual > 0:
+                pct_error = r.abs_error / r.actual * 100
+                t['n_valid'] += 1
+                t['within_10'] += pct_error <= 10
+                t['within_20'] += pct_error <= 20
+    
+    @property
+    def n_results(self) -> int:
+        return sum(t['n'] for t in self.totals.values())
+    
+    def summaries(self) -> Dict[str, BacktestSummary]:
+        """Current summary by stat (same metrics as calculate_backtest_summary)."""
+        summaries = {}
+        for stat, t in self.totals.items():
+            n = t['n']
+            if n == 0:
+                continue
+            
+            # Percentage within thresholds (only where actual > 0)
+            if t['n_valid'] > 0:
+                within_10 = t['within_10'] / t['n_valid'] * 100
+                within_20 = t['within_20'] / t['n_valid'] * 100
+            else:
+                within_10 = 0
+                within_20 = 0
+            
+            summaries[stat] = BacktestSummary(
+                stat=stat,
+                n_predictions=n,
+                mae=round(t['sum_abs'] / n, 2),
+                rmse=round(np.sqrt(t['sum_sq'] / n), 2),
+                bias=round(t['sum_err'] / n, 2),
+                within_10_pct=round(within_10, 1),
+                within_20_pct=round(within_20, 1),
+                within_3_pts=round(t['within_3'] / n * 100, 1)
+            )
+        
+        return summaries
+
+
 def calculate_backtest_summary(results: List[BacktestResult]) -> Dict[str, BacktestSummary]:
     """
     Calculate aggregate metrics from backtest results.
@@ -314,50 +379,9 @@ def calculate_backtest_summary(results: List[BacktestResult]) -> Dict[str, Backt
     if not results:
         return {}
     
-    df = pd.DataFrame([asdict(r) for r in results])
-    summaries = {}
-    
-    for stat in df['stat'].unique():
-        stat_df = df[df['stat'] == stat]
-        
-        if len(stat_df) == 0:
-            continue
-        
-        predictions = stat_df['predicted'].values
-        actuals = stat_df['actual'].values
-        errors = stat_df['error'].values
-        abs_errors = stat_df['abs_error'].values
-        
-        # Calculate metrics
-        mae = np.mean(abs_errors)
-        rmse = np.sqrt(np.mean(errors ** 2))
-        bias = np.mean(errors)
-        
-        # Percentage within thresholds
-        valid_actuals = actuals > 0
-        if valid_actuals.any():
-            pct_errors = abs_errors[valid_actuals] / actuals[valid_actuals] * 100
-            within_10 = np.mean(pct_errors <= 10) * 100
-            within_20 = np.mean(pct_errors <= 20) * 100
-        else:
-            within_10 = 0
-            within_20 = 0
-        
-        # Within absolute threshold
-        within_3 = np.mean(abs_errors <= 3) * 100
-        
-        summaries[stat] = BacktestSummary(
-            stat=stat,
-            n_predictions=len(stat_df),
-            mae=round(mae, 2),
-            rmse=round(rmse, 2),
-            bias=round(bias, 2),
-            within_10_pct=round(within_10, 1),
-            within_20_pct=round(within_20, 1),
-            within_3_pts=round(within_3, 1)
-        )
-    
-    return summaries
+    accumulator = BacktestAccumulator()
+    accumulator.update(results)
+    return accumulator.summaries()
 
 
 def calculate_confidence_accuracy(results: List[BacktestResult]) -> Dict[str, Dict]:
@@ -523,7 +547,12 @@ def run_multi_player_backtest(
     players: List[Dict],  # [{'id': '...', 'name': '...', 'team_id': ...}, ...]
     n_games: int = 10,
     skip_recent: int = 0,
-    progress_callback=None
+    progress_callback=None,
+    use_bulk: bool = False,
+    n_workers: int = 1,
+    bulk_game_logs: pd.DataFrame = None,
+    bulk_team_game_logs: pd.DataFrame = None,
+    partial_callback=None
 ) -> Tuple[List[BacktestResult], Dict[str, BacktestSummary]]:
     """
     Run backtest across multiple players.
@@ -533,30 +562,518 @@ def run_multi_player_backtest(
         n_games: Number of games per player to test
         skip_recent: Games to skip (for true out-of-sample testing)
         progress_callback: Optional callback for progress updates
+        use_bulk: Run the point-in-time bulk path (see iter_multi_player_backtest)
+                  instead of one run_player_backtest() per player
+        n_workers: Worker processes for the bulk path (> 1 runs players in parallel)
+        bulk_game_logs: Optional pre-fetched player game logs for the bulk path
+        bulk_team_game_logs: Optional pre-fetched team game logs for the bulk path
+        partial_callback: Optional callback(summaries, n_players_done) called as
+                          each player finishes, with the running summary by stat
     
     Returns:
         Tuple of (all results, summary by stat)
     """
     all_results = []
+    accumulator = BacktestAccumulator()
+    
+    if not use_bulk and (n_workers > 1 or bulk_game_logs is not None):
+        print("Warning: n_workers and bulk frames only apply with use_bulk=True; running per-player backtests")
     
-    for i, player in enumerate(players):
+    if use_bulk:
+        player_results = iter_multi_player_backtest(
+            players,
+            n_games=n_games,
+            skip_recent=skip_recent,
+            n_workers=n_workers,
+            bulk_game_logs=bulk_game_logs,
+            bulk_team_game_logs=bulk_team_game_logs
+        )
+    else:
+        player_results = (
+            (player, run_player_backtest(
+                player_id=player['id'],
+                player_name=player['name'],
+                player_team_id=player['team_id'],
+                n_games=n_games,
+                skip_recent=skip_recent
+            ))
+            for player in players
+        )
+    
+    for i, (player, results) in enumerate(player_results):
         if progress_callback:
             progress_callback(i + 1, len(players), player['name'])
         
-        results = run_player_backtest(
-            player_id=player['id'],
-            player_name=player['name'],
-            player_team_id=player['team_id'],
-            n_games=n_games,
-            skip_recent=skip_recent
-        )
         all_results.extend(results)
+        accumulator.update(results)
+        
+        if partial_callback:
+            partial_callback(accumulator.summaries(), i + 1)
+    
+    return all_results, accumulator.summaries()
+
+
+def build_team_context_as_of(
+    bulk_team_game_logs: pd.DataFrame,
+    dates: List
+) -> pd.DataFrame:
+    """
+    Build point-in-time opponent context (pace, DRtg, opp FT rate, ranks) for
+    every team as of each date, using only games played before that date.
+    
+    Pace and ratings are estimated from box-score possessions in the team game
+    logs, so no API calls are needed and there is no look-ahead.
+    
+    Args:
+        bulk_team_game_logs: DataFrame from get_bulk_team_game_logs()
+        dates: Dates to build context for
+    
+    Returns:
+        DataFrame keyed by (TEAM_ID, AS_OF_DATE) with PACE, DEF_RATING,
+        DEF_RATING_L5, OFF_RATING, OPP_FT_RATE, OPP_FT_RATE_RANK and league averages
+    """
+    required = ['TEAM_ID', 'GAME_ID', 'GAME_DATE', 'PTS', 'FGA', 'FTA', 'OREB', 'TOV']
+    if bulk_team_game_logs is None or len(bulk_team_game_logs) == 0 or \
+            not all(col in bulk_team_game_logs.columns for col in required):
+        return pd.DataFrame()
+    
+    logs = bulk_team_game_logs[required].copy()
+    logs['TEAM_ID'] = logs['TEAM_ID'].astype(int)
+    logs['GAME_DATE'] = pd.to_datetime(logs['GAME_DATE']).dt.normalize()
+    
+    # Pair each team-game with the opponent's row from the same game
+    opp = logs.rename(columns={c: f'OPP_{c}' for c in required if c not in ['GAME_ID', 'GAME_DATE']})
+    games = logs.merge(opp, on=['GAME_ID', 'GAME_DATE'])
+    games = games[games['TEAM_ID'] != games['OPP_TEAM_ID']]
+    
+    team_poss = games['FGA'] + 0.44 * games['FTA'] - games['OREB'] + games['TOV']
+    opp_poss = games['OPP_FGA'] + 0.44 * games['OPP_FTA'] - games['OPP_OREB'] + games['OPP_TOV']
+    games['POSS'] = 0.5 * (team_poss + opp_poss)
+    games = games.sort_values(['TEAM_ID', 'GAME_DATE'])
+    
+    # Cumulative (inclusive) season-to-date and last-5 sums per team
+    grouped = games.groupby('TEAM_ID')
+    games['GP'] = grouped.cumcount() + 1
+    for col in ['POSS', 'PTS', 'OPP_PTS', 'OPP_FTA', 'OPP_FGA']:
+        games[f'CUM_{col}'] = grouped[col].cumsum()
+    games['L5_POSS'] = grouped['POSS'].transform(lambda x: x.rolling(5, min_periods=1).sum())
+    games['L5_OPP_PTS'] = grouped['OPP_PTS'].transform(lambda x: x.rolling(5, min_periods=1).sum())
+    
+    games['PACE'] = games['CUM_POSS'] / games['GP']
+    games['DEF_RATING'] = games['CUM_OPP_PTS'] / games['CUM_POSS'] * 100
+    games['OFF_RATING'] = games['CUM_PTS'] / games['CUM_POSS'] * 100
+    games['DEF_RATING_L5'] = games['L5_OPP_PTS'] / games['L5_POSS'] * 100
+    games['OPP_FT_RATE'] = games['CUM_OPP_FTA'] / games['CUM_OPP_FGA'] * 100
+    
+    # Grid of (team, date) resolved to each team's last game strictly before the date
+    as_of_dates = pd.Series(pd.to_datetime(pd.Series(list(dates))).dt.normalize().unique(), name='AS_OF_DATE')
+    grid = pd.DataFrame({'TEAM_ID': games['TEAM_ID'].unique()}).merge(as_of_dates.to_frame(), how='cross')
+    grid = grid.sort_values('AS_OF_DATE')
+    
+    context_cols = ['PACE', 'DEF_RATING', 'DEF_RATING_L5', 'OFF_RATING', 'OPP_FT_RATE']
+    context = pd.merge_asof(
+        grid,
+        games[['TEAM_ID', 'GAME_DATE'] + context_cols].sort_values('GAME_DATE'),
+        left_on='AS_OF_DATE', right_on='GAME_DATE',
+        by='TEAM_ID', direction='backward', allow_exact_matches=False
+    ).drop(columns=['GAME_DATE'])
+    
+    # Lower rank = fewer free throws allowed (matches team_defensive_stats FT_RATE_RANK)
+    by_date = context.groupby('AS_OF_DATE')
+    context['OPP_FT_RATE_RANK'] = by_date['OPP_FT_RATE'].rank(ascending=True, method='first')
+    for col in ['PACE', 'DEF_RATING', 'OFF_RATING', 'OPP_FT_RATE']:
+        context[f'LEAGUE_{col}'] = by_date[col].transform('mean')
+    
+    return context.reset_index(drop=True)
+
+
+def _team_context_to_features(context_row: Optional[Dict], opponent_team_id: int, opponent_abbr: str) -> Dict:
+    """Convert a build_team_context_as_of() row to the opponent feature keys used by the predictor."""
+    def _value(key, default):
+        if context_row is None or pd.isna(context_row.get(key)):
+            return default
+        return round(float(context_row[key]), 1)
+    
+    rank = _value('OPP_FT_RATE_RANK', 15)
+    return {
+        'opponent': {
+            'team_id': opponent_team_id,
+            'abbr': opponent_abbr,
+            'pace': _value('PACE', 100.0),
+            'def_rating': _value('DEF_RATING', 110.0),
+            'def_rating_L5': _value('DEF_RATING_L5', 110.0),
+            'ft_rate_allowed': _value('OPP_FT_RATE', 25.0),
+            'ft_rate_allowed_rank': int(rank),
+        },
+        'league_avg_ft_rate': _value('LEAGUE_OPP_FT_RATE', 25.0),
+        'league_avg': {
+            'pace': _value('LEAGUE_PACE', 100.0),
+            'def_rating': _value('LEAGUE_DEF_RATING', 110.0),
+            'off_rating': _value('LEAGUE_OFF_RATING', 110.0),
+        }
+    }
+
+
+def build_season_backtest_slate(
+    bulk_game_logs: pd.DataFrame,
+    player_ids: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Turn every player-game in the bulk logs into a slate row for replay.
+    
+    Returns:
+        DataFrame with slate columns plus player_name and GAME_ID
+    """
+    logs = bulk_game_logs
+    if player_ids is not None:
+        logs = logs[logs['PLAYER_ID'].astype(int).isin([int(p) for p in player_ids])]
+    
+    logs = logs.copy()
+    logs['GAME_DATE'] = pd.to_datetime(logs['GAME_DATE']).dt.normalize()
+    if start_date is not None:
+        logs = logs[logs['GAME_DATE'] >= pd.to_datetime(start_date)]
+    if end_date is not None:
+        logs = logs[logs['GAME_DATE'] <= pd.to_datetime(end_date)]
+    
+    matchup = logs['MATCHUP'].astype(str)
+    is_home = matchup.str.contains(' vs. ', regex=False)
+    opponent_abbr = [get_team_abbr_from_matchup(m, h) for m, h in zip(matchup, is_home)]
+    
+    slate = pd.DataFrame({
+        'player_id': logs['PLAYER_ID'].astype(int).values,
+        'player_name': logs['PLAYER_NAME'].values if 'PLAYER_NAME' in logs.columns else '',
+        'team_id': logs['TEAM_ID'].astype(int).values,
+        'opponent_abbr': opponent_abbr,
+        'game_date': logs['GAME_DATE'].values,
+        'is_home': is_home.values,
+        'GAME_ID': logs['GAME_ID'].values,
+    })
+    slate['opponent_team_id'] = slate['opponent_abbr'].map(get_opponent_team_id)
+    slate = slate.dropna(subset=['opponent_team_id'])
+    slate['opponent_team_id'] = slate['opponent_team_id'].astype(int)
+    
+    return slate.sort_values(['game_date', 'player_id']).reset_index(drop=True)
+
+
+def run_season_backtest(
+    season: str = CURRENT_SEASON,
+    bulk_game_logs: pd.DataFrame = None,
+    bulk_team_game_logs: pd.DataFrame = None,
+    bulk_player_index: pd.DataFrame = None,
+    player_ids: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    min_prior_games: int = 5,
+    stats: List[str] = STATS_TO_BACKTEST,
+    progress_callback=None,
+    slate: pd.DataFrame = None,
+    player_feature_table: pd.DataFrame = None
+) -> Tuple[List[BacktestResult], Dict[str, BacktestSummary]]:
+    """
+    Point-in-time backtest over every player-game in a season.
+    
+    Bulk logs are loaded once and every feature is computed "as of" the game
+    date from games strictly before it, so there is no look-ahead and no
+    per-game API call. Opponent pace/DRtg/FT rate come from team box scores
+    as of the same date. Matchup, synergy, drives and similar-players
+    adjustments are season aggregates with no as-of history, so they are left
+    neutral here.
+    
+    Args:
+        season: Season to backtest (used only when bulk frames are not provided)
+        bulk_game_logs: Optional pre-fetched player game logs (fetched once if None)
+        bulk_team_game_logs: Optional pre-fetched team game logs (fetched once if None)
+        bulk_player_index: Optional PlayerIndex DataFrame (for position-based regression)
+        player_ids: Optional list of player IDs to restrict the replay to
+        start_date: Optional first game date to include (YYYY-MM-DD)
+        end_date: Optional last game date to include (YYYY-MM-DD)
+        min_prior_games: Skip player-games with fewer prior games than this
+        stats: Stats to compare
+        progress_callback: Optional callback(current, total, label) for progress updates
+        slate: Optional pre-built build_season_backtest_slate() rows to replay instead
+               of filtering by player_ids/start_date/end_date
+        player_feature_table: Optional sf.get_player_feature_table() result; as-of lookups
+                              replace recomputing each row's rolling features
+    
+    Returns:
+        Tuple of (all results, summary by stat)
+    """
+    if bulk_game_logs is None:
+        bulk_game_logs = pf.get_bulk_player_game_logs(season)
+    if bulk_team_game_logs is None:
+        bulk_team_game_logs = pf.get_bulk_team_game_logs(season)
+    
+    if bulk_game_logs is None or len(bulk_game_logs) == 0:
+        return [], {}
+    
+    if slate is None:
+        slate = build_season_backtest_slate(bulk_game_logs, player_ids, start_date, end_date)
+    if len(slate) == 0:
+        return [], {}
+    
+    # Every feature for every player-game in one pass (strictly prior games only)
+    matrix = sf.build_slate_feature_matrix(
+        bulk_game_logs, slate,
+        bulk_team_game_logs=bulk_team_game_logs,
+        player_feature_table=player_feature_table
+    )
+    matrix['player_name'] = slate['player_name'].values
+    matrix = matrix[matrix['GP'] >= min_prior_games]
+    
+    # Actual results for each replayed row
+    actuals = bulk_game_logs[['PLAYER_ID', 'GAME_ID'] + [s for s in stats if s in bulk_game_logs.columns]].copy()
+    actuals['PLAYER_ID'] = actuals['PLAYER_ID'].astype(int)
+    actuals = actuals[actuals['GAME_ID'].isin(slate['GAME_ID'].unique())]
+    actuals = actuals.drop_duplicates(['PLAYER_ID', 'GAME_ID'])
+    actual_lookup = {
+        (record.pop('PLAYER_ID'), record.pop('GAME_ID')): record
+        for record in actuals.to_dict('records')
+    }
+    matrix['GAME_ID'] = slate.loc[matrix.index, 'GAME_ID'].values
+    
+    # Point-in-time opponent context keyed by (team, date)
+    context = build_team_context_as_of(bulk_team_game_logs, slate['game_date'].unique())
+    context_lookup = {}
+    if len(context) > 0:
+        for record in context.to_dict('records'):
+            context_lookup[(record['TEAM_ID'], record['AS_OF_DATE'])] = record
+    
+    positions = {}
+    if bulk_player_index is not None and len(bulk_player_index) > 0:
+        positions = dict(zip(bulk_player_index['PERSON_ID'].astype(int), bulk_player_index['POSITION']))
+    
+    predictor = pm.PlayerStatPredictor()
+    all_results = []
+    total = len(matrix)
+    
+    for idx, row in enumerate(matrix.to_dict('records')):
+        if progress_callback and (idx % 500 == 0 or idx + 1 == total):
+            progress_callback(idx + 1, total, row['game_date'].strftime('%Y-%m-%d'))
+        
+        actual_row = actual_lookup.get((int(row['player_id']), row['GAME_ID']))
+        if actual_row is None:
+            continue
+        
+        player_features = sf.matrix_row_to_features(row)
+        player_features.update(_team_context_to_features(
+            context_lookup.get((int(row['opponent_team_id']), row['game_date'])),
+            int(row['opponent_team_id']),
+            row['opponent_abbr']
+        ))
+        player_features['player_position'] = positions.get(int(row['player_id']), 'F')
+        
+        try:
+            predictions = predictor.predict_all_stats(player_features)
+        except Exception as e:
+            print(f"Error generating prediction for {row['player_name']} on {row['game_date']}: {e}")
+            continue
+        
+        # Player type from season-to-date averages (no look-ahead)
+        ppg = player_features['rolling_avgs'].get('Season', {}).get('PTS', 0.0)
+        mpg = player_features['rolling_avgs'].get('Season', {}).get('MIN', 0.0)
+        player_type = categorize_player(ppg, mpg)
+        game_date = row['game_date'].strftime('%Y-%m-%d')
+        
+        for stat in stats:
+            if stat not in predictions or stat not in actual_row:
+                continue
+            
+            pred = predictions[stat]
+            actual = actual_row[stat]
+            if pd.isna(actual):
+                actual = 0
+            
+            error = pred.value - actual
+            abs_error = abs(error)
+            pct_error = (abs_error / actual * 100) if actual > 0 else 0
+            regression_tier = pred.factors.get('regression_tier', 'Unknown') if pred.factors else 'Unknown'
+            
+            all_results.append(BacktestResult(
+                player_id=str(int(row['player_id'])),
+                player_name=row['player_name'],
+                game_date=game_date,
+                opponent_abbr=row['opponent_abbr'],
+                stat=stat,
+                predicted=round(pred.value, 1),
+                actual=actual,
+                error=round(error, 1),
+                abs_error=round(abs_error, 1),
+                pct_error=round(pct_error, 1),
+                confidence=pred.confidence,
+                is_home=bool(row['is_home']),
+                player_type=player_type,
+                player_ppg=ppg,
+                player_mpg=mpg,
+                regression_tier=regression_tier
+            ))
     
     summaries = calculate_backtest_summary(all_results)
     
     return all_results, summaries
 
 
+def run_players_backtest_from_bulk(
+    players: List[Dict],
+    bulk_game_logs: pd.DataFrame,
+    bulk_team_game_logs: pd.DataFrame = None,
+    n_games: int = 10,
+    skip_recent: int = 0
+) -> Dict[str, List[BacktestResult]]:
+    """
+    Point-in-time backtest of each player's last N games using bulk frames only
+    (no API calls). Each game is predicted from games strictly before it, and
+    all players are replayed through one feature-matrix pass.
+    
+    Returns:
+        Dict of player_id -> list of BacktestResult
+    """
+    player_names = {str(p['id']): p['name'] for p in players}
+    results_by_player = {player_id: [] for player_id in player_names}
+    
+    logs = bulk_game_logs[bulk_game_logs['PLAYER_ID'].astype(int).isin([int(p) for p in player_names])]
+    if len(logs) == 0:
+        return results_by_player
+    
+    # Each player's most recent games after skipping skip_recent
+    logs = logs.sort_values(['PLAYER_ID', 'GAME_DATE'], ascending=[True, False])
+    rank = logs.groupby('PLAYER_ID').cumcount()
+    games_to_test = logs[(rank >= skip_recent) & (rank < skip_recent + n_games)]
+    
+    results, _ = run_season_backtest(
+        bulk_game_logs=bulk_game_logs,
+        bulk_team_game_logs=bulk_team_game_logs,
+        min_prior_games=1,
+        slate=build_season_backtest_slate(games_to_test)
+    )
+    
+    for r in results:
+        r.player_name = player_names.get(r.player_id, r.player_name)
+        results_by_player.setdefault(r.player_id, []).append(r)
+    
+    return results_by_player
+
+
+def run_player_backtest_from_bulk(
+    player_id: str,
+    player_name: str,
+    bulk_game_logs: pd.DataFrame,
+    bulk_team_game_logs: pd.DataFrame = None,
+    n_games: int = 10,
+    skip_recent: int = 0
+) -> List[BacktestResult]:
+    """
+    Point-in-time backtest for a single player's last N games using bulk frames
+    only (no API calls). Each game is predicted from games strictly before it.
+    """
+    results_by_player = run_players_backtest_from_bulk(
+        [{'id': str(player_id), 'name': player_name}],
+        bulk_game_logs,
+        bulk_team_game_logs=bulk_team_game_logs,
+        n_games=n_games,
+        skip_recent=skip_recent
+    )
+    return results_by_player.get(str(player_id), [])
+
+
+# Bulk frames shared with backtest worker processes. Set once per worker by
+# _init_backtest_worker (or inherited directly from the parent under fork)
+_worker_bulk_game_logs = None
+_worker_bulk_team_game_logs = None
+
+
+def _init_backtest_worker(bulk_game_logs: pd.DataFrame = None, bulk_team_game_logs: pd.DataFrame = None):
+    """Process pool initializer: keep the shared bulk frames in module globals."""
+    global _worker_bulk_game_logs, _worker_bulk_team_game_logs
+    
+    if bulk_game_logs is not None:
+        _worker_bulk_game_logs = bulk_game_logs
+    if bulk_team_game_logs is not None:
+        _worker_bulk_team_game_logs = bulk_team_game_logs
+
+
+def _backtest_chunk_worker(players: List[Dict], n_games: int, skip_recent: int) -> List[Tuple[Dict, List[BacktestResult]]]:
+    """Process pool task: backtest a chunk of players against the worker's shared bulk frames."""
+    results_by_player = run_players_backtest_from_bulk(
+        players,
+        _worker_bulk_game_logs,
+        bulk_team_game_logs=_worker_bulk_team_game_logs,
+        n_games=n_games,
+        skip_recent=skip_recent
+    )
+    return [(player, results_by_player.get(str(player['id']), [])) for player in players]
+
+
+def iter_multi_player_backtest(
+    players: List[Dict],
+    n_games: int = 10,
+    skip_recent: int = 0,
+    n_workers: int = 1,
+    bulk_game_logs: pd.DataFrame = None,
+    bulk_team_game_logs: pd.DataFrame = None
+):
+    """
+    Backtest players against bulk frames, yielding (player, results) as each
+    player finishes.
+    
+    With n_workers > 1 players run in a process pool. The bulk frames reach the
+    workers once: inherited copy-on-write under fork, or passed once per worker
+    through the pool initializer under spawn - never per task. An error in a
+    chunk is raised here rather than reported as players with no results.
+    
+    Args:
+        players: List of player dicts with 'id', 'name', 'team_id'
+        n_games: Number of games per player to test
+        skip_recent: Games to skip (for true out-of-sample testing)
+        n_workers: Number of worker processes (1 = run in this process)
+        bulk_game_logs: Optional pre-fetched player game logs (fetched once if None)
+        bulk_team_game_logs: Optional pre-fetched team game logs (fetched once if None)
+    
+    Yields:
+        Tuple of (player dict, list of BacktestResult) in completion order
+    """
+    if bulk_game_logs is None:
+        bulk_game_logs = pf.get_bulk_player_game_logs()
+    if bulk_team_game_logs is None:
+        bulk_team_game_logs = pf.get_bulk_team_game_logs()
+    
+    _init_backtest_worker(bulk_game_logs, bulk_team_game_logs)
+    
+    # Small chunks keep results streaming while amortizing per-call overhead
+    n_chunks = max(1, min(len(players), max(n_workers, 1) * 4))
+    chunks = [players[i::n_chunks] for i in range(n_chunks)]
+    
+    if n_workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from _backtest_chunk_worker(chunk, n_games, skip_recent)
+        return
+    
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Workers inherit the globals set above; nothing is pickled
+        mp_context = multiprocessing.get_context('fork')
+        initargs = ()
+    else:
+        mp_context = multiprocessing.get_context('spawn')
+        initargs = (bulk_game_logs, bulk_team_game_logs)
+    
+    with ProcessPoolExecutor(
+        max_workers=min(n_workers, len(players)),
+        mp_context=mp_context,
+        initializer=_init_backtest_worker,
+        initargs=initargs
+    ) as executor:
+        futures = [
+            executor.submit(_backtest_chunk_worker, chunk, n_games, skip_recent)
+            for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
 def format_summary_for_display(summaries: Dict[str, BacktestSummary]) -> pd.DataFrame:
     """
     Format backtest summaries as a DataFrame for display.
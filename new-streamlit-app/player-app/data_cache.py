@@ -0,0 +1,370 @@
+"""
+Data Cache Module
+Framework-independent caching decorator for data-loading functions.
+
+Tiers (checked in order):
+    1. In-process LRU with TTL (or st.cache_data when a Streamlit runtime is active)
+    2. On-disk pickle files keyed by function + season + arguments, shared between
+       the Streamlit app and CLI scripts on the same machine
+    3. Optional Supabase cached_api_data table (opt-in per function with shared=True
+       and globally with NBA_CACHE_SUPABASE=1)
+
+Callers get a copy of the cached value from the in-process tier (as with
+st.cache_data), so mutating a result never changes the cache. Empty results
+(None, empty DataFrames/containers, which data loaders return on API errors)
+are kept in memory only and never written to the disk or Supabase tiers.
+
+Environment variables:
+    NBA_CACHE_BACKEND: 'auto' (default), 'streamlit' or 'memory'
+    NBA_CACHE_DIR: Directory for the disk tier (default: <project root>/.cache/nba_data)
+    NBA_CACHE_DISK: Set to 0 to disable the disk tier
+    NBA_CACHE_SUPABASE: Set to 1 to enable the Supabase tier for shared=True functions
+"""
+
+import os
+import copy
+import time
+import pickle
+import hashlib
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+
+try:
+    import streamlit as st
+    STREAMLIT_AVAILABLE = True
+except ImportError:
+    st = None
+    STREAMLIT_AVAILABLE = False
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+CACHE_DIR = Path(os.getenv("NBA_CACHE_DIR", str(PROJECT_ROOT / '.cache' / 'nba_data')))
+CACHE_BACKEND = os.getenv("NBA_CACHE_BACKEND", "auto").strip().lower()
+DISK_CACHE_ENABLED = os.getenv("NBA_CACHE_DISK", "1").strip() not in ('0', 'false', 'no')
+SUPABASE_CACHE_ENABLED = os.getenv("NBA_CACHE_SUPABASE", "0").strip() in ('1', 'true', 'yes')
+
+DEFAULT_MAX_ENTRIES = 256
+
+_MISSING = object()
+
+# Every decorated function, so clear_all() can reset them together
+_registry: List[Callable] = []
+
+
+class LRUTTLCache:
+    """Thread-safe in-process LRU cache whose entries expire after a TTL."""
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at is not None and time.time() > expires_at:
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _streamlit_active() -> bool:
+    """Check whether we are running inside a Streamlit script run."""
+    if not STREAMLIT_AVAILABLE:
+        return False
+    try:
+        from streamlit import runtime
+        return runtime.exists()
+    except Exception:
+        return False
+
+
+def _use_streamlit_backend() -> bool:
+    if CACHE_BACKEND == 'memory':
+        return False
+    if CACHE_BACKEND == 'streamlit':
+        return STREAMLIT_AVAILABLE
+    return _streamlit_active()
+
+
+def _hash_value(value: Any, hasher) -> None:
+    """Feed a stable representation of an argument value into hasher."""
+    if isinstance(value, pd.DataFrame):
+        hasher.update(b'df')
+        hasher.update(repr(list(value.columns)).encode())
+        hasher.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, pd.Series):
+        hasher.update(b'series')
+        hasher.update(str(value.name).encode())
+        hasher.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, dict):
+        hasher.update(b'dict')
+        for k in sorted(value, key=repr):
+            hasher.update(repr(k).encode())
+            _hash_value(value[k], hasher)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(type(value).__name__.encode())
+        for item in value:
+            _hash_value(item, hasher)
+    else:
+        hasher.update(repr(value).encode())
+
+
+def content_hash(*values: Any) -> str:
+    """
+    Stable hex digest of arbitrary values (DataFrames, dicts, lists, scalars),
+    using the same representation as cache keys.
+    """
+    hasher = hashlib.sha256()
+    for value in values:
+        _hash_value(value, hasher)
+    return hasher.hexdigest()
+
+
+def make_cache_key(func: Callable, signature: inspect.Signature, args: tuple, kwargs: dict) -> Tuple[str, Optional[str]]:
+    """
+    Build a cache key for a call.
+    
+    Arguments whose names start with an underscore are excluded from the key,
+    matching st.cache_data's convention for unhashable parameters.
+    
+    Returns:
+        Tuple of (hex digest, season argument if the function takes one)
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    
+    hasher = hashlib.sha256()
+    hasher.update(f"{func.__module__}.{func.__qualname__}".encode())
+    for name, value in bound.arguments.items():
+        if name.startswith('_'):
+            continue
+        hasher.update(name.encode())
+        _hash_value(value, hasher)
+    
+    season = bound.arguments.get('season')
+    return hasher.hexdigest(), (str(season) if season is not None else None)
+
+
+def _is_empty(value: Any) -> bool:
+    """True for results that should not be persisted (None or an empty frame/container)."""
+    if value is None:
+        return True
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    if isinstance(value, (dict, list, tuple, set)):
+        return len(value) == 0
+    return False
+
+
+def _disk_path(func: Callable, key: str, season: Optional[str]) -> Path:
+    return CACHE_DIR / f"{func.__module__}.{func.__qualname__}" / (season or 'all') / f"{key}.pkl"
+
+
+def _read_disk(path: Path, ttl: Optional[float]) -> Any:
+    try:
+        if not path.exists():
+            return _MISSING
+        if ttl and time.time() - path.stat().st_mtime > ttl:
+            return _MISSING
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"[DATA CACHE] Error reading {path.name}: {e}")
+        return _MISSING
+
+
+def _write_disk(path: Path, value: Any) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file then rename so concurrent readers never see a partial file
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"[DATA CACHE] Error writing {path.name}: {e}")
+
+
+def _read_supabase(func: Callable, key: str, season: Optional[str], ttl: Optional[float]) -> Any:
+    try:
+        import supabase_cache
+        value = supabase_cache.get_cached_bulk_data(
+            func.__name__, season or 'all', ttl_hours=(ttl or 3600) / 3600, key=key[:16]
+        )
+        return _MISSING if value is None else value
+    except Exception as e:
+        print(f"[DATA CACHE] Supabase tier unavailable for {func.__name__}: {e}")
+        return _MISSING
+
+
+def _write_supabase(func: Callable, key: str, season: Optional[str], ttl: Optional[float], value: Any) -> None:
+    # supabase_cache only serializes DataFrames and dicts of DataFrames
+    if not isinstance(value, (pd.DataFrame, dict)):
+        return
+    try:
+        import supabase_cache
+        supabase_cache.set_cached_bulk_data(
+            func.__name__, season or 'all', value, ttl_hours=(ttl or 3600) / 3600, key=key[:16]
+        )
+    except Exception as e:
+        print(f"[DATA CACHE] Supabase tier unavailable for {func.__name__}: {e}")
+
+
+def cached(
+    ttl: Optional[float] = 3600,
+    show_spinner: Any = False,
+    disk: bool = True,
+    shared: bool = False,
+    max_entries: int = DEFAULT_MAX_ENTRIES
+) -> Callable:
+    """
+    Cache a data-loading function across the in-process, disk and Supabase tiers.
+    
+    Drop-in replacement for @st.cache_data(ttl=..., show_spinner=...). Works the
+    same inside and outside Streamlit; inside a Streamlit run st.cache_data is
+    used as the in-process tier so show_spinner keeps working.
+    
+    Args:
+        ttl: Time-to-live in seconds for every tier (None = never expires)
+        show_spinner: Passed through to st.cache_data
+        disk: Persist results to the disk tier
+        shared: Also persist results to the Supabase tier (when NBA_CACHE_SUPABASE=1)
+        max_entries: Maximum entries kept in the in-process LRU
+    
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        memory = LRUTTLCache(max_entries)
+        
+        def load(*args, **kwargs):
+            """Disk -> Supabase -> compute, filling the faster tiers on the way back."""
+            key, season = make_cache_key(func, signature, args, kwargs)
+            use_disk = disk and DISK_CACHE_ENABLED
+            use_supabase = shared and SUPABASE_CACHE_ENABLED
+            
+            path = _disk_path(func, key, season) if use_disk else None
+            if use_disk:
+                value = _read_disk(path, ttl)
+                if value is not _MISSING:
+                    return value
+            
+            if use_supabase:
+                value = _read_supabase(func, key, season, ttl)
+                if value is not _MISSING:
+                    if use_disk:
+                        _write_disk(path, value)
+                    return value
+            
+            value = func(*args, **kwargs)
+            
+            # Empty results are usually failed fetches; don't let them outlive the process
+            if _is_empty(value):
+                return value
+            if use_disk:
+                _write_disk(path, value)
+            if use_supabase:
+                _write_supabase(func, key, season, ttl, value)
+            return value
+        
+        functools.update_wrapper(load, func)
+        
+        # Built on first use inside Streamlit so CLI imports don't trigger st.cache_data warnings
+        streamlit_load = []
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _use_streamlit_backend():
+                if not streamlit_load:
+                    streamlit_load.append(st.cache_data(ttl=ttl, show_spinner=show_spinner)(load))
+                return streamlit_load[0](*args, **kwargs)
+            
+            key, _ = make_cache_key(func, signature, args, kwargs)
+            value = memory.get(key)
+            if value is _MISSING:
+                value = load(*args, **kwargs)
+                memory.set(key, value, ttl)
+            return copy.deepcopy(value)
+        
+        def clear(disk_tier: bool = True) -> None:
+            """Clear this function's in-process cache (and its disk tier by default)."""
+            memory.clear()
+            if streamlit_load:
+                try:
+                    streamlit_load[0].clear()
+                except Exception:
+                    pass
+            if disk_tier:
+                _clear_disk(CACHE_DIR / f"{func.__module__}.{func.__qualname__}")
+        
+        wrapper.clear = clear
+        _registry.append(wrapper)
+        return wrapper
+    
+    return decorator
+
+
+def _clear_disk(directory: Path) -> int:
+    removed = 0
+    if not directory.exists():
+        return removed
+    for path in directory.rglob('*.pkl'):
+        try:
+            path.unlink()
+            removed += 1
+        except Exception as e:
+            print(f"[DATA CACHE] Error removing {path}: {e}")
+    return removed
+
+
+def clear_all(disk_tier: bool = True) -> None:
+    """
+    Clear every function decorated with @cached.
+    
+    Args:
+        disk_tier: Also delete the on-disk cache files
+    """
+    for wrapper in _registry:
+        wrapper.clear(disk_tier=False)
+    if disk_tier:
+        _clear_disk(CACHE_DIR)
+
+
+def get_cache_info() -> Dict[str, Any]:
+    """Summary of cache configuration and disk usage (for debugging)."""
+    disk_files = list(CACHE_DIR.rglob('*.pkl')) if CACHE_DIR.exists() else []
+    return {
+        'backend': 'streamlit' if _use_streamlit_backend() else 'memory',
+        'cache_dir': str(CACHE_DIR),
+        'disk_enabled': DISK_CACHE_ENABLED,
+        'supabase_enabled': SUPABASE_CACHE_ENABLED,
+        'n_functions': len(_registry),
+        'n_disk_entries': len(disk_files),
+        'disk_bytes': sum(p.stat().st_size for p in disk_files),
+    }
@@ -5,7 +5,8 @@ Used for FTM, PTS, and AST prediction adjustments.
 """
 
 import pandas as pd
-import streamlit as st
+import data_cache as dc
+import snapshot_store as snap
 import nba_api.stats.endpoints as endpoints
 from typing import Dict, Optional, Tuple
 
@@ -13,7 +14,8 @@ from typing import Dict, Optional, Tuple
 CURRENT_SEASON = "2025-26"
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@dc.cached(ttl=3600, show_spinner=False, shared=True)  # Cache for 1 hour
+@snap.snapshotted('player_drives')
 def get_all_player_drives_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch drives tracking data for all players.
@@ -42,7 +44,8 @@ def get_all_player_drives_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@dc.cached(ttl=3600, show_spinner=False, shared=True)  # Cache for 1 hour
+@snap.snapshotted('team_drives')
 def get_all_team_drives_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch team-level drives tracking data (offensive).
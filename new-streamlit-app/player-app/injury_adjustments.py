@@ -3,10 +3,14 @@ Injury Adjustments Module
 Functions to calculate prediction adjustments when players are out.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 import pandas as pd
 
 
+# Combined season minutes of OUT opponents that makes the matchup easier
+KEY_OPPONENT_MINUTES_OUT = 30
+
+
 def calculate_minutes_redistribution(
     teammates_out: List[str],
     player_minutes: float,
@@ -217,7 +221,8 @@ def calculate_injury_adjustments(
     teammates_out: List[str],
     opponents_out: List[str],
     player_minutes_map: Dict[int, float],
-    players_df: pd.DataFrame
+    players_df: pd.DataFrame,
+    positions: Optional[Dict[int, str]] = None
 ) -> Dict[str, any]:
     """
     Calculate all injury-related adjustments for a player's prediction.
@@ -230,6 +235,8 @@ def calculate_injury_adjustments(
         opponents_out: List of opponent player IDs who are out
         player_minutes_map: Dict of player_id -> average minutes
         players_df: DataFrame with player info
+        positions: Optional dict of player_id -> position from get_position_map();
+                   avoids scanning players_df when adjusting a whole roster
     
     Returns:
         Dict with adjustment multipliers and explanations
@@ -249,24 +256,30 @@ def calculate_injury_adjustments(
     
     player_mins = player_minutes_map.get(int(player_id), 25)
     
-    # Get player position from players_df
-    player_position = None
-    try:
-        player_row = players_df[players_df['PERSON_ID'] == int(player_id)]
-        if len(player_row) > 0:
-            player_position = player_row['POSITION'].iloc[0]
-    except:
-        pass
-    
-    # Build positions map for injured teammates
-    teammates_positions_map = {}
-    for out_player_id in teammates_out:
+    if positions is not None:
+        player_position = positions.get(int(player_id))
+        teammates_positions_map = {
+            int(p): positions[int(p)] for p in teammates_out if int(p) in positions
+        }
+    else:
+        # Get player position from players_df
+        player_position = None
         try:
-            out_player_row = players_df[players_df['PERSON_ID'] == int(out_player_id)]
-            if len(out_player_row) > 0:
-                teammates_positions_map[int(out_player_id)] = out_player_row['POSITION'].iloc[0]
+            player_row = players_df[players_df['PERSON_ID'] == int(player_id)]
+            if len(player_row) > 0:
+                player_position = player_row['POSITION'].iloc[0]
         except:
             pass
+        
+        # Build positions map for injured teammates
+        teammates_positions_map = {}
+        for out_player_id in teammates_out:
+            try:
+                out_player_row = players_df[players_df['PERSON_ID'] == int(out_player_id)]
+                if len(out_player_row) > 0:
+                    teammates_positions_map[int(out_player_id)] = out_player_row['POSITION'].iloc[0]
+            except:
+                pass
     
     # === TEAMMATE INJURIES ===
     if teammates_out:
@@ -337,11 +350,7 @@ def calculate_injury_adjustments(
     # === OPPONENT INJURIES ===
     if opponents_out:
         # When key opponents are out, matchup might be easier
-        opp_minutes_out = sum(
-            player_minutes_map.get(int(p), 0) for p in opponents_out
-        )
-        
-        if opp_minutes_out >= 30:  # Significant player(s) out
+        if key_opponents_out(opponents_out, player_minutes_map):  # Significant player(s) out
             # Slight boost to scoring (easier defense)
             adjustments['PTS'] *= 1.03
             adjustments['FG3M'] *= 1.02
@@ -354,6 +363,21 @@ def calculate_injury_adjustments(
     return adjustments
 
 
+def key_opponents_out(opponents_out: Iterable[str], player_minutes_map: Dict[int, float]) -> bool:
+    """Whether the OUT opponents add up to enough minutes to make the matchup easier."""
+    opp_minutes_out = sum(
+        player_minutes_map.get(int(p), 0) for p in opponents_out
+    )
+    return opp_minutes_out >= KEY_OPPONENT_MINUTES_OUT
+
+
+def get_position_map(players_df: pd.DataFrame) -> Dict[int, str]:
+    """Dict of player_id -> position, for calculate_injury_adjustments(positions=...)."""
+    if players_df is None or len(players_df) == 0 or 'POSITION' not in players_df.columns:
+        return {}
+    return dict(zip(players_df['PERSON_ID'].astype(int), players_df['POSITION']))
+
+
 def get_player_names(player_ids: List[str], players_df: pd.DataFrame) -> List[str]:
     """Get player names from IDs."""
     names = []
@@ -0,0 +1,315 @@
+"""
+Injury Poller Module
+Incremental polling of the official NBA injury report.
+
+The poller remembers the publication slot and content hash of the last report
+it found. Each poll probes only the slots published since then (concurrently,
+through the shared request scheduler). A report whose PDF bytes are unchanged is
+not parsed again. A changed report is diffed against the previous one, producing
+an InjuryDelta: the players whose status changed, and therefore the teams and
+games whose predictions need to be recomputed.
+
+Environment variables:
+    INJURY_POLLER_DIR: Directory for persisted poller state (default: <project root>/.cache/injury_reports)
+"""
+
+import os
+import pickle
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+import pandas as pd
+
+import injury_report as ir
+import player_resolver as pr
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+STATE_DIR = Path(os.getenv("INJURY_POLLER_DIR", str(PROJECT_ROOT / '.cache' / 'injury_reports')))
+DEFAULT_POLL_INTERVAL = 300  # seconds
+
+CHANGE_COLUMNS = ['team', 'team_abbr', 'player_name', 'player_id', 'game_date',
+                  'matchup', 'old_status', 'new_status', 'reason']
+
+
+@dataclass
+class InjuryReportState:
+    """Last report seen by a poller."""
+    report_date: date
+    slot: Optional[datetime] = None
+    url: Optional[str] = None
+    pdf_hash: Optional[str] = None
+    injury_df: pd.DataFrame = field(default_factory=pd.DataFrame)
+    checked_at: Optional[datetime] = None
+    # Newest slot probed so far; older empty slots are not probed again
+    probed_through: Optional[datetime] = None
+
+
+@dataclass
+class InjuryDelta:
+    """Status changes between two consecutive injury reports."""
+    report_date: date
+    slot: datetime
+    url: str
+    changes: pd.DataFrame
+    injury_df: pd.DataFrame
+    initial: bool = False
+    
+    def is_empty(self) -> bool:
+        return len(self.changes) == 0
+    
+    def flipped_to(self, status: str) -> pd.DataFrame:
+        """Changes whose new status is `status` (e.g. 'Out', 'Questionable')."""
+        if self.is_empty():
+            return self.changes
+        return self.changes[self.changes['new_status'].fillna('').str.lower() == status.lower()]
+    
+    @property
+    def affected_teams(self) -> Set[str]:
+        """Abbreviations of teams with at least one status change."""
+        if self.is_empty():
+            return set()
+        return {abbr for abbr in self.changes['team_abbr'].dropna() if abbr}
+    
+    def affected_matchups(self, matchups: List[Dict]) -> List[Dict]:
+        """
+        Games involving a team with a status change.
+        
+        Args:
+            matchups: Matchup dicts with away_team/home_team abbreviations
+        
+        Returns:
+            Subset of matchups, in input order
+        """
+        teams = self.affected_teams
+        return [m for m in matchups if m['away_team'] in teams or m['home_team'] in teams]
+    
+    def describe(self) -> List[str]:
+        """One line per change (e.g. "BOS Jayson Tatum: Questionable -> Out")."""
+        return [
+            f"{row.team_abbr or row.team} {row.player_name}: {row.old_status or 'not listed'} -> {row.new_status or 'not listed'}"
+            for row in self.changes.itertuples(index=False)
+        ]
+
+
+def _status_table(injury_df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """One row per (team, player name key) with the player's latest listed status."""
+    columns = ['team', 'team_abbr', 'player_name', 'game_date', 'matchup', 'status', 'reason', 'key']
+    if injury_df is None or len(injury_df) == 0 or 'player_name' not in injury_df.columns:
+        return pd.DataFrame(columns=columns)
+    
+    table = injury_df.copy()
+    for col in ['team', 'game_date', 'matchup', 'status', 'reason']:
+        if col not in table.columns:
+            table[col] = None
+    table['team_abbr'] = table['team'].map(lambda team: ir.get_team_abbreviation(team) if team else None)
+    table['key'] = table['player_name'].map(pr.name_key)
+    table = table[table['key'] != '']
+    return table.drop_duplicates(['team_abbr', 'key'], keep='last')[columns]
+
+
+def diff_injury_reports(
+    old_df: Optional[pd.DataFrame],
+    new_df: Optional[pd.DataFrame],
+    players_df: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Players whose status differs between two parsed injury reports.
+    
+    A player missing from one report has status None there (e.g. removed from the
+    report after being cleared).
+    
+    Args:
+        old_df: Previous report from parse_injury_report_pdf (may be empty)
+        new_df: Current report
+        players_df: Optional PlayerIndex DataFrame to resolve player IDs
+    
+    Returns:
+        DataFrame with CHANGE_COLUMNS, one row per changed player
+    """
+    old = _status_table(old_df)
+    new = _status_table(new_df)
+    merged = old.merge(new, on=['team_abbr', 'key'], how='outer', suffixes=('_old', '_new'))
+    if len(merged) == 0:
+        return pd.DataFrame(columns=CHANGE_COLUMNS)
+    
+    changed = merged[merged['status_old'].fillna('') != merged['status_new'].fillna('')].copy()
+    if len(changed) == 0:
+        return pd.DataFrame(columns=CHANGE_COLUMNS)
+    
+    # Prefer the current report's details, falling back to the previous one.
+    # Missing values become None (object dtype; .where on float/str columns keeps NaN)
+    for col in ['team', 'player_name', 'game_date', 'matchup', 'reason']:
+        value = changed[f'{col}_new'].where(changed[f'{col}_new'].notna(), changed[f'{col}_old'])
+        changed[col] = value.astype(object).where(value.notna(), None)
+    changed['team_abbr'] = changed['team_abbr'].astype(object).where(changed['team_abbr'].notna(), None)
+    changed['old_status'] = changed['status_old'].astype(object).where(changed['status_old'].notna(), None)
+    changed['new_status'] = changed['status_new'].astype(object).where(changed['status_new'].notna(), None)
+    
+    if players_df is not None and len(players_df) > 0:
+        resolver = pr.resolver_for_frame(players_df)
+        changed['player_id'] = [
+            resolver.resolve(name, team=team)
+            for name, team in zip(changed['player_name'], changed['team'])
+        ]
+    else:
+        changed['player_id'] = None
+    
+    return changed[CHANGE_COLUMNS].reset_index(drop=True)
+
+
+class InjuryReportPoller:
+    """
+    Polls the injury report for one date, probing only slots newer than the last
+    report found and parsing a report only when its bytes changed.
+    
+    Use poll() for a single check or start()/stop() to poll in a background thread;
+    on_delta is called with every non-empty InjuryDelta.
+    """
+    
+    def __init__(
+        self,
+        report_date: date = None,
+        players_df: Optional[pd.DataFrame] = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        on_delta: Optional[Callable[[InjuryDelta], None]] = None,
+        persist: bool = True
+    ):
+        """
+        Args:
+            report_date: Date of the report (defaults to today)
+            players_df: Optional PlayerIndex DataFrame for player IDs in deltas
+            interval: Seconds between polls in the background thread
+            on_delta: Callback receiving each non-empty InjuryDelta
+            persist: Keep the last report on disk so a restarted poller resumes from it
+        """
+        self.report_date = report_date or date.today()
+        self.players_df = players_df
+        self.interval = interval
+        self.on_delta = on_delta
+        self.persist = persist
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.state = self._load_state() if persist else InjuryReportState(self.report_date)
+    
+    @property
+    def state_path(self) -> Path:
+        return STATE_DIR / f"{self.report_date.strftime('%Y-%m-%d')}.pkl"
+    
+    def _load_state(self) -> InjuryReportState:
+        try:
+            if self.state_path.exists():
+                with open(self.state_path, 'rb') as f:
+                    state = pickle.load(f)
+                if isinstance(state, InjuryReportState) and state.report_date == self.report_date:
+                    return state
+        except Exception as e:
+            print(f"[INJURY POLLER] Error reading state: {e}")
+        return InjuryReportState(self.report_date)
+    
+    def _save_state(self) -> None:
+        if not self.persist:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(self.state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            print(f"[INJURY POLLER] Error writing state: {e}")
+    
+    @property
+    def injury_df(self) -> pd.DataFrame:
+        """Latest parsed report (empty until one is found)."""
+        return self.state.injury_df
+    
+    def poll(self) -> Optional[InjuryDelta]:
+        """
+        Check for a report newer than the last one found.
+        
+        Returns:
+            InjuryDelta if a new report with different content was found
+            (possibly with no status changes), otherwise None
+        """
+        with self._lock:
+            state = self.state
+            # Slots newer than the last report, except those already found empty
+            # before the newest probed slot (which is re-probed once for late uploads)
+            after = state.slot
+            if state.probed_through is not None:
+                previous = state.probed_through - timedelta(minutes=ir.REPORT_SLOT_MINUTES)
+                after = previous if after is None else max(after, previous)
+            slots = ir.report_slots(self.report_date, after=after)
+            state.checked_at = datetime.now()
+            if slots:
+                state.probed_through = max(slots[0], state.probed_through or slots[0])
+            
+            slot, url, content = ir.find_latest_report(slots, self.report_date) if slots else (None, None, None)
+            if content is None:
+                self._save_state()
+                return None
+            
+            pdf_hash = ir.report_hash(content)
+            if pdf_hash == state.pdf_hash:
+                # Republished without changes: remember the slot, skip parsing
+                state.slot, state.url = slot, url
+                self._save_state()
+                return None
+            
+            injury_df = ir.parse_injury_report_cached(content)
+            if len(injury_df) == 0:
+                # Remember the unparseable PDF so it is not fetched and parsed again
+                print(f"[INJURY POLLER] Report at {ir.format_slot(slot)} ET could not be parsed; keeping previous report")
+                state.slot, state.url, state.pdf_hash = slot, url, pdf_hash
+                self._save_state()
+                return None
+            
+            delta = InjuryDelta(
+                report_date=self.report_date,
+                slot=slot,
+                url=url,
+                changes=diff_injury_reports(state.injury_df, injury_df, self.players_df),
+                injury_df=injury_df,
+                initial=len(state.injury_df) == 0
+            )
+            self.state = InjuryReportState(
+                report_date=self.report_date,
+                slot=slot,
+                url=url,
+                pdf_hash=pdf_hash,
+                injury_df=injury_df,
+                checked_at=state.checked_at,
+                probed_through=state.probed_through
+            )
+            self._save_state()
+        
+        if self.on_delta is not None and not delta.is_empty():
+            self.on_delta(delta)
+        return delta
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"[INJURY POLLER] Poll failed: {e}")
+            self._stop.wait(self.interval)
+    
+    def start(self) -> None:
+        """Poll now and then every `interval` seconds in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='injury-poller', daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread (waits for an in-progress poll)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
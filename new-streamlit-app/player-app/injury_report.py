@@ -5,13 +5,17 @@ Fetches and parses official NBA injury reports from PDF.
 
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import pandas as pd
 from datetime import datetime, date, timedelta
 from io import BytesIO
 from typing import Optional, Dict, List, Tuple
 import re
+import hashlib
+import threading
 import unicodedata
+from collections import OrderedDict
+import player_resolver as pr
+import request_scheduler as rs
 
 try:
     import pdfplumber
@@ -31,6 +35,24 @@ except ImportError:
 # Base URL for NBA injury reports
 INJURY_REPORT_BASE_URL = "https://ak-static.cms.nba.com/referee/injury/"
 
+# Reports are published on 15-minute slots; slots are probed concurrently in
+# batches (newest first) through the shared request scheduler
+REPORT_SLOT_MINUTES = 15
+PROBE_BATCH_SIZE = 8
+PROBE_MAX_RETRIES = 2
+
+# Use proper User-Agent header (some CDNs block generic clients)
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/pdf',
+    'Accept-Language': 'en-US,en;q=0.9'
+}
+
+# Parsed reports keyed by PDF content hash, so an unchanged report is never re-parsed
+MAX_PARSED_REPORTS = 16
+_parsed_reports: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_parsed_lock = threading.Lock()
+
 
 def build_injury_report_url(report_date: date = None, hour: int = 1, minute: int = 0, period: str = "PM") -> str:
     """
@@ -55,91 +77,201 @@ def build_injury_report_url(report_date: date = None, hour: int = 1, minute: int
     return f"{INJURY_REPORT_BASE_URL}Injury-Report_{date_str}_{hour_str}_{minute_str}{period}.pdf"
 
 
-def try_fetch_injury_report(report_date: date = None) -> Tuple[Optional[bytes], str]:
+def now_et() -> datetime:
+    """Current time in US/Eastern (timezone-aware when pytz is available)."""
+    try:
+        import pytz
+        return datetime.now(pytz.timezone('US/Eastern'))
+    except ImportError:
+        # Fallback if pytz not available - assume local is close to ET
+        return datetime.now()
+
+
+def _localize_et(value: datetime) -> datetime:
+    """Attach the US/Eastern timezone to a naive datetime (when pytz is available)."""
+    if value.tzinfo is not None:
+        return value
+    try:
+        import pytz
+        return pytz.timezone('US/Eastern').localize(value)
+    except ImportError:
+        return value
+
+
+def report_slots(
+    report_date: date = None,
+    start: datetime = None,
+    after: datetime = None,
+    earliest: datetime = None,
+    max_slots: int = 96
+) -> List[datetime]:
     """
-    Try to fetch injury report PDF, trying the most likely time first based on current time.
-    
-    Logic: Tries every 15 minutes (00, 15, 30, 45) going backwards from current time.
-           Starts with the most recent 15-minute increment, then works backwards.
+    Report publication slots to probe, most recent first.
     
     Args:
         report_date: Date of report (defaults to today)
+        start: Latest slot (defaults to the current ET time rounded down to 15 minutes)
+        after: Only return slots strictly newer than this one (e.g. the last report found)
+        earliest: Oldest slot to return (defaults to 6 AM ET of report_date)
+        max_slots: Maximum number of slots (default 96 = 24 hours)
     
     Returns:
-        Tuple of (PDF bytes or None, URL that worked or error message)
+        List of timezone-aware ET datetimes
     """
     if report_date is None:
         report_date = date.today()
+    if start is None:
+        start = now_et()
+    start = _localize_et(start)
+    start = start.replace(minute=(start.minute // REPORT_SLOT_MINUTES) * REPORT_SLOT_MINUTES, second=0, microsecond=0)
+    
+    if earliest is None:
+        earliest = datetime.combine(report_date, datetime.min.time()).replace(hour=6)
+    earliest = _localize_et(earliest)
+    if after is not None:
+        earliest = max(earliest, _localize_et(after) + timedelta(minutes=REPORT_SLOT_MINUTES))
+    
+    slots = []
+    for i in range(max_slots):
+        slot = start - timedelta(minutes=i * REPORT_SLOT_MINUTES)
+        if slot < earliest:
+            break
+        slots.append(slot)
+    return slots
+
+
+def build_slot_url(slot: datetime, report_date: date = None) -> str:
+    """Injury report URL for a publication slot (report_date defaults to the slot's date)."""
+    hour = slot.hour % 12 or 12
+    period = "AM" if slot.hour < 12 else "PM"
+    return build_injury_report_url(report_date or slot.date(), hour, slot.minute, period)
+
+
+def format_slot(slot: datetime) -> str:
+    """Slot label as used in status messages (e.g. "05:30PM")."""
+    return f"{slot.hour % 12 or 12:02d}:{slot.minute:02d}{'AM' if slot.hour < 12 else 'PM'}"
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update(REQUEST_HEADERS)
+            _session.mount("https://", HTTPAdapter(pool_maxsize=PROBE_BATCH_SIZE))
+        return _session
+
+
+def get_report_pdf(url: str) -> Optional[bytes]:
+    """
+    GET one report PDF.
     
-    # Get current time in ET (Eastern Time)
-    try:
-        import pytz
-        et_tz = pytz.timezone('US/Eastern')
-        now_et = datetime.now(et_tz)
-    except ImportError:
-        # Fallback if pytz not available - assume local is close to ET
-        now_et = datetime.now()
-    
-    current_hour = now_et.hour
-    current_minute = now_et.minute
-    
-    # Round down to nearest 15-minute increment
-    rounded_minute = (current_minute // 15) * 15
-    
-    # Convert 24h to 12h format with AM/PM
-    def hour_to_12h(h):
-        if h == 0:
-            return (12, "AM")
-        elif h < 12:
-            return (h, "AM")
-        elif h == 12:
-            return (12, "PM")
-        else:
-            return (h - 12, "PM")
+    Returns:
+        PDF bytes, or None if the report does not exist (403/404). Other HTTP
+        errors raise so the request scheduler can retry them.
+    """
+    # Separate timeouts: 5s to connect, 30s to read
+    response = _get_session().get(url, timeout=(5, 30), allow_redirects=True)
+    if response.status_code in (403, 404):
+        # 403 Forbidden / 404 Not Found - report not published for this slot
+        return None
+    response.raise_for_status()
+    return response.content
+
+
+def find_latest_report(
+    slots: List[datetime],
+    report_date: date = None,
+    accept=None,
+    batch_size: int = PROBE_BATCH_SIZE
+) -> Tuple[Optional[datetime], Optional[str], Optional[bytes]]:
+    """
+    Probe report slots concurrently and return the most recent published report.
     
-    # Build list of times to try (most recent first, going backwards in 15-min increments)
-    times_to_try = []
+    Slots are requested in batches of batch_size (newest first) through the
+    shared request scheduler; older batches are only requested when no slot in
+    the newer batch has a report.
     
-    # Start from current rounded time and go backwards
-    start_datetime = now_et.replace(minute=rounded_minute, second=0, microsecond=0)
+    Args:
+        slots: Slots from report_slots(), most recent first
+        report_date: Date used in the URL (defaults to each slot's date)
+        accept: Optional predicate on the PDF bytes; rejected reports are skipped
+        batch_size: Slots requested concurrently per batch
     
-    # Create a datetime for 6 AM of the report date (in ET timezone)
-    try:
-        import pytz
-        et_tz_check = pytz.timezone('US/Eastern')
-        report_datetime_6am = et_tz_check.localize(datetime.combine(report_date, datetime.min.time()).replace(hour=6))
-    except:
-        report_datetime_6am = datetime.combine(report_date, datetime.min.time()).replace(hour=6)
-    
-    # Go back up to 24 hours, checking every 15 minutes
-    for i in range(96):  # 24 hours * 4 (15-min intervals) = 96
-        check_time = start_datetime - timedelta(minutes=i * 15)
-        
-        # Stop if we've gone back before 6 AM of the report date
-        if check_time < report_datetime_6am:
-            break
-        
-        hour_12, period = hour_to_12h(check_time.hour)
-        minute = check_time.minute
+    Returns:
+        Tuple of (slot, url, PDF bytes), or (None, None, None) if nothing was found
+    """
+    for batch_start in range(0, len(slots), batch_size):
+        batch = slots[batch_start:batch_start + batch_size]
+        urls = [build_slot_url(slot, report_date) for slot in batch]
+        futures = [
+            rs.submit(get_report_pdf, url, host=rs.NBA_CDN_HOST, max_retries=PROBE_MAX_RETRIES)
+            for url in urls
+        ]
         
-        times_to_try.append((hour_12, minute, period))
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_times = []
-    for t in times_to_try:
-        if t not in seen:
-            seen.add(t)
-            unique_times.append(t)
-    
-    for hour, minute, period in unique_times:
-        url = build_injury_report_url(report_date, hour, minute, period)
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                return response.content, url
-        except requests.RequestException:
-            continue
+        for slot, url, future in zip(batch, urls, futures):
+            try:
+                content = future.result()
+            except Exception:
+                continue
+            if content and (accept is None or accept(content)):
+                # Newer slots in the batch have been checked already
+                for pending in futures:
+                    pending.cancel()
+                return slot, url, content
+    
+    return None, None, None
+
+
+def report_hash(pdf_bytes: bytes) -> str:
+    """Content hash of a report PDF."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def parse_injury_report_cached(pdf_bytes: bytes) -> pd.DataFrame:
+    """
+    parse_injury_report_pdf() memoized by PDF content hash.
+    
+    Returns:
+        DataFrame with injury data (a copy; safe to modify)
+    """
+    key = report_hash(pdf_bytes)
+    with _parsed_lock:
+        if key in _parsed_reports:
+            _parsed_reports.move_to_end(key)
+            return _parsed_reports[key].copy()
+    
+    injury_df = parse_injury_report_pdf(pdf_bytes)
+    with _parsed_lock:
+        _parsed_reports[key] = injury_df
+        while len(_parsed_reports) > MAX_PARSED_REPORTS:
+            _parsed_reports.popitem(last=False)
+    return injury_df.copy()
+
+
+def try_fetch_injury_report(report_date: date = None) -> Tuple[Optional[bytes], str]:
+    """
+    Try to fetch injury report PDF, trying the most likely time first based on current time.
+    
+    Logic: Probes every 15-minute slot (00, 15, 30, 45) from the current time back to
+           6 AM ET of the report date, newest first, in concurrent batches.
+    
+    Args:
+        report_date: Date of report (defaults to today)
+    
+    Returns:
+        Tuple of (PDF bytes or None, URL that worked or error message)
+    """
+    if report_date is None:
+        report_date = date.today()
+    
+    slot, url, content = find_latest_report(report_slots(report_date), report_date)
+    if content is not None:
+        return content, url
     
     return None, f"No injury report found for {report_date.strftime('%Y-%m-%d')}"
 
@@ -426,6 +558,9 @@ def match_player_to_id(
     """
     Match a player name from injury report to a player ID.
     
+    Uses the indexed resolver built once per players_df (exact ASCII name,
+    then last name + team with a compatible first name).
+    
     Args:
         player_name: Name from injury report (may be "Last, First" format)
         players_df: DataFrame with PERSON_ID, PLAYER_FIRST_NAME, PLAYER_LAST_NAME
@@ -437,120 +572,7 @@ def match_player_to_id(
     if players_df is None or len(players_df) == 0:
         return None
     
-    normalized_name = normalize_player_name(player_name)
-    
-    # Try to filter by team first if provided
-    search_df = players_df.copy()
-    if team_name:
-        # Try matching team name
-        team_match = search_df[
-            search_df['TEAM_NAME'].str.lower().str.contains(team_name.lower().split()[-1], na=False) |
-            search_df['TEAM_CITY'].str.lower().str.contains(team_name.lower().split()[0], na=False)
-        ]
-        if len(team_match) > 0:
-            search_df = team_match
-    
-    # Create full name column for matching with ASCII normalization
-    search_df = search_df.copy()
-    search_df['full_name_lower'] = (
-        search_df['PLAYER_FIRST_NAME'].fillna('').str.lower() + ' ' +
-        search_df['PLAYER_LAST_NAME'].fillna('').str.lower()
-    ).str.strip()
-    # Apply ASCII normalization to database names for comparison
-    search_df['full_name_lower'] = search_df['full_name_lower'].apply(normalize_to_ascii)
-    
-    # Try exact match first
-    exact_match = search_df[search_df['full_name_lower'] == normalized_name]
-    if len(exact_match) > 0:
-        return str(exact_match['PERSON_ID'].iloc[0])
-    
-    # Try last name match
-    # Handle suffixes like Jr., Sr., II, III when extracting last name
-    suffixes_lower = ['jr.', 'jr', 'sr.', 'sr', 'ii', 'iii', 'iv', 'v']
-    
-    last_name_with_suffix = None  # Keep track of full last name with suffix
-    
-    if ',' in player_name:
-        last_name_raw = player_name.split(',')[0].strip().lower()
-        last_name = last_name_raw
-        
-        # Check if suffix is attached and extract both versions
-        for suffix in suffixes_lower:
-            if last_name.endswith(suffix):
-                # Add space before suffix for "with suffix" version
-                last_name_with_suffix = last_name[:-len(suffix)].strip() + ' ' + suffix
-                last_name = last_name[:-len(suffix)].strip()
-                break
-        # Also handle space before suffix
-        for suffix in suffixes_lower:
-            if f' {suffix}' in last_name:
-                last_name_with_suffix = last_name  # Already has space
-                last_name = last_name.replace(f' {suffix}', '').strip()
-                break
-    else:
-        # For "First Last Jr." format, get the actual last name (not the suffix)
-        name_parts = player_name.split()
-        if len(name_parts) >= 2:
-            # Check if last part is a suffix
-            last_part_clean = name_parts[-1].lower().rstrip('.')
-            if last_part_clean in [s.rstrip('.') for s in suffixes_lower]:
-                last_name = name_parts[-2].lower() if len(name_parts) >= 2 else name_parts[-1].lower()
-                # Build "last name + suffix" version (e.g., "pippen jr.")
-                last_name_with_suffix = f"{last_name} {name_parts[-1].lower()}"
-            else:
-                last_name = name_parts[-1].lower()
-        else:
-            last_name = player_name.lower()
-    
-    # Normalize last names to ASCII for comparison
-    # Normalize the search last names (from injury report)
-    last_name_normalized = normalize_to_ascii(last_name)
-    last_name_with_suffix_normalized = normalize_to_ascii(last_name_with_suffix) if last_name_with_suffix else None
-    
-    # Create normalized last name column for database names
-    search_df['last_name_normalized'] = search_df['PLAYER_LAST_NAME'].fillna('').str.lower().apply(normalize_to_ascii)
-    
-    # Try matching with suffix first (since that's how NBA stores it, e.g., "Pippen Jr.")
-    if last_name_with_suffix_normalized:
-        last_name_match = search_df[search_df['last_name_normalized'] == last_name_with_suffix_normalized]
-        if len(last_name_match) == 0:
-            # Also try with period variations
-            last_name_with_suffix_no_period = last_name_with_suffix_normalized.replace('.', '')
-            last_name_match = search_df[
-                search_df['last_name_normalized'].str.replace('.', '', regex=False) == last_name_with_suffix_no_period
-            ]
-    else:
-        last_name_match = pd.DataFrame()
-    
-    # If no match with suffix, try without suffix
-    if len(last_name_match) == 0:
-        last_name_match = search_df[search_df['last_name_normalized'] == last_name_normalized]
-    
-    if len(last_name_match) == 1:
-        return str(last_name_match['PERSON_ID'].iloc[0])
-    elif len(last_name_match) > 1:
-        # Multiple matches - try to narrow with first name
-        if ',' in player_name:
-            first_name = player_name.split(',')[1].strip().lower()
-        else:
-            first_name = player_name.split()[0].lower() if ' ' in player_name else ''
-        
-        if first_name:
-            # Normalize first name to ASCII for comparison
-            first_name_normalized = normalize_to_ascii(first_name)
-            # Create normalized first name column for database names
-            last_name_match['first_name_normalized'] = last_name_match['PLAYER_FIRST_NAME'].fillna('').str.lower().apply(normalize_to_ascii)
-            
-            first_match = last_name_match[
-                last_name_match['first_name_normalized'].str.startswith(first_name_normalized[:3])
-            ]
-            if len(first_match) > 0:
-                return str(first_match['PERSON_ID'].iloc[0])
-        
-        # Return first match if still multiple
-        return str(last_name_match['PERSON_ID'].iloc[0])
-    
-    return None
+    return pr.resolver_for_frame(players_df).resolve(player_name, team=team_name)
 
 
 def get_injuries_for_matchup(
@@ -730,112 +752,22 @@ def fetch_injuries_for_date(report_date: date = None, players_df: pd.DataFrame =
     # Always use today's date for URL construction (injury report PDF includes tomorrow's games too)
     url_date = date.today()
     
-    # Get current time in ET (Eastern Time)
-    try:
-        import pytz
-        et_tz = pytz.timezone('US/Eastern')
-        now_et = datetime.now(et_tz)
-    except ImportError:
-        now_et = datetime.now()
-    
-    current_hour = now_et.hour
-    current_minute = now_et.minute
-    
-    # Round down to nearest 15-minute increment
-    rounded_minute = (current_minute // 15) * 15
-    
-    # Convert 24h to 12h format with AM/PM
-    def hour_to_12h(h):
-        if h == 0:
-            return (12, "AM")
-        elif h < 12:
-            return (h, "AM")
-        elif h == 12:
-            return (12, "PM")
-        else:
-            return (h - 12, "PM")
+    # Try only the last hour (4 slots: current, 15min, 30min, 45min back), probed concurrently
+    midnight = datetime.combine(url_date, datetime.min.time())
+    slots = report_slots(url_date, earliest=midnight, max_slots=4)
+    tried_urls = [format_slot(slot) for slot in slots]
     
-    # Build list of times to try (most recent first, going backwards)
-    # Try only the last hour (4 attempts: current, 15min, 30min, 45min back)
-    times_to_try = []
+    # Newest report that parses to at least one injury
+    parsed = {}
     
-    # Always use current time rounded down (URL always uses today's date)
-    start_datetime = now_et.replace(minute=rounded_minute, second=0, microsecond=0)
+    def has_injuries(content: bytes) -> bool:
+        parsed['df'] = parse_injury_report_cached(content)
+        return len(parsed['df']) > 0
     
-    # Go back only 1 hour (4 attempts), checking every 15 minutes
-    for i in range(4):  # 1 hour * 4 (15-min intervals) = 4 attempts
-        check_time = start_datetime - timedelta(minutes=i * 15)
-        
-        # Stop if we've gone back before today (don't check previous days)
-        if check_time.date() < url_date:
-            break
-        
-        hour_12, period = hour_to_12h(check_time.hour)
-        minute = check_time.minute
-        
-        times_to_try.append((hour_12, minute, period, check_time))
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_times = []
-    for t in times_to_try:
-        time_key = (t[0], t[1], t[2])
-        if time_key not in seen:
-            seen.add(time_key)
-            unique_times.append(t)
-    
-    tried_urls = []
-    for idx, (hour_12, minute, period, check_time) in enumerate(unique_times):
-        # Always use today's date for URL (injury report PDF includes tomorrow's games too)
-        url = build_injury_report_url(url_date, hour_12, minute, period)
-        time_str = f"{hour_12:02d}:{minute:02d}{period}"
-        tried_urls.append(time_str)
-        
-        try:
-            # Create session with retry strategy and proper headers
-            session = requests.Session()
-            retry_strategy = Retry(
-                total=2,
-                backoff_factor=0.5,
-                status_forcelist=[429, 500, 502, 503, 504],
-                allowed_methods=["GET"]
-            )
-            adapter = HTTPAdapter(max_retries=retry_strategy)
-            session.mount("https://", adapter)
-            
-            # Use proper User-Agent header (some CDNs block generic clients)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'application/pdf',
-                'Accept-Language': 'en-US,en;q=0.9'
-            }
-            
-            # GET request with proper timeout settings: (connect_timeout, read_timeout)
-            # Separate timeouts: 5s to connect, 30s to read
-            response = session.get(url, headers=headers, timeout=(5, 30), allow_redirects=True)
-            
-            # Handle different status codes
-            if response.status_code == 403:
-                # 403 Forbidden - might mean URL doesn't exist yet or server is blocking
-                continue  # Skip to next time
-            elif response.status_code == 404:
-                # 404 Not Found - URL doesn't exist
-                continue  # Skip to next time
-            
-            if response.status_code == 200:
-                # Try to parse the PDF
-                injury_df = parse_injury_report_pdf(response.content)
-                
-                if len(injury_df) > 0:
-                    return injury_df, f"✅ Loaded {len(injury_df)} injuries from **{time_str} ET** report ([source]({url}))"
-        
-        except requests.Timeout as e:
-            # Add small delay before next attempt to avoid overwhelming server
-            import time
-            time.sleep(0.5)
-            continue
-        except requests.RequestException as e:
-            continue
+    slot, url, content = find_latest_report(slots, url_date, accept=has_injuries)
+    if content is not None:
+        injury_df = parsed['df']
+        return injury_df, f"✅ Loaded {len(injury_df)} injuries from **{format_slot(slot)} ET** report ([source]({url}))"
     
     # If none of the times worked, return empty
     return pd.DataFrame(), f"❌ No injury report found for {report_date.strftime('%m/%d/%Y')}. Tried: {', '.join(tried_urls[:5])}..."
@@ -0,0 +1,206 @@
+"""
+Injury Repredict Module
+Incremental re-prediction of one team after injury status changes.
+
+Base predictions (features and model output) do not depend on who else is
+available; the injury adjustments and minutes normalization applied on top of
+them do. repredict_team() takes a game's cached base predictions and recomputes
+minutes redistribution, usage boosts, normalized minutes and FPTS for a single
+team's roster, so a status change ("X is out", "Y is back") re-runs only the
+team it affects, returning rows in the predicted statlines format read by the
+lineup optimizer.
+"""
+
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+
+import injury_adjustments as inj
+import minutes_normalization as mnorm
+
+
+BASE_STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'FG3M', 'FTM']
+DEFAULT_SEASON_MINUTES = 25.0
+
+STATLINE_COLUMNS = ['Player', 'Team', 'MIN'] + BASE_STATS + [
+    'PRA', 'FPTS', 'FPTS_Ceiling', 'FPTS_Floor', 'FPTS_Median',
+    'FPTS_Variance', 'FPTS_StdDev', 'Player_ID'
+]
+
+
+def _prediction_value(predictions: Dict, stat: str) -> float:
+    pred_obj = predictions.get(stat)
+    if pred_obj is None:
+        return 0.0
+    return float(pred_obj.value if hasattr(pred_obj, 'value') else pred_obj)
+
+
+def build_statline(
+    player_id: str,
+    player_data: Dict,
+    is_away: bool,
+    season_minutes: float,
+    injury_adj: Optional[Dict] = None
+) -> Dict:
+    """
+    Statline dict for minutes normalization from a base prediction.
+    
+    Stats start at their base values; injury multipliers are stored and applied
+    by minutes_normalization after the minutes are scaled.
+    
+    Args:
+        player_id: Player ID
+        player_data: Base prediction entry (predictions, player_name, team_abbr)
+        is_away: Whether the player's team is the away team
+        season_minutes: Player's season average minutes
+        injury_adj: Optional dict from inj.calculate_injury_adjustments()
+    
+    Returns:
+        Statline dict
+    """
+    predictions = player_data.get('predictions', {})
+    base_stats = {stat: _prediction_value(predictions, stat) for stat in BASE_STATS}
+    
+    minutes = season_minutes
+    injury_multipliers = None
+    if injury_adj:
+        injury_multipliers = {stat: injury_adj.get(stat, 1.0) for stat in BASE_STATS}
+        injury_multipliers['minutes_boost'] = injury_adj.get('minutes_boost', 0.0)
+        minutes += injury_multipliers['minutes_boost']
+    
+    pts, reb, ast = base_stats['PTS'], base_stats['REB'], base_stats['AST']
+    return {
+        'Player': player_data.get('player_name', f"Player {player_id}"),
+        'Team': player_data.get('team_abbr', ''),
+        'player_id': str(player_id),
+        'MIN': minutes,
+        '_original_season_minutes': season_minutes,
+        '_injury_adjusted_minutes': minutes,
+        '_base_stats': dict(base_stats),
+        '_injury_multipliers': injury_multipliers,
+        **base_stats,
+        'PRA': pts + reb + ast,
+        'RA': reb + ast,
+        'FPTS': pts + reb * 1.2 + ast * 1.5 + base_stats['STL'] * 3.0 + base_stats['BLK'] * 3.0 - base_stats['TOV'],
+        'is_away': is_away
+    }
+
+
+def statlines_to_frame(statlines: List[Dict], base_predictions: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Predicted statlines DataFrame (the optimizer's input format) for the players
+    with minutes. FPTS distribution columns are the base prediction's, scaled by
+    the change in FPTS.
+    
+    Args:
+        statlines: Normalized statline dicts
+        base_predictions: Dict of player_id -> base prediction entry
+    
+    Returns:
+        DataFrame with STATLINE_COLUMNS
+    """
+    rows = []
+    for statline in statlines:
+        if statline.get('MIN', 0) < 0.01:
+            continue
+        player_data = base_predictions.get(statline['player_id'], {})
+        fpts = statline['FPTS']
+        base_fpts = _prediction_value(player_data.get('predictions', {}), 'FPTS')
+        ratio = fpts / base_fpts if base_fpts > 0 else 1.0
+        ceiling_floor = player_data.get('ceiling_floor') or {}
+        
+        rows.append({
+            'Player': statline['Player'],
+            'Team': statline['Team'],
+            'MIN': round(statline['MIN'], 1),
+            **{stat: round(statline[stat], 1) for stat in BASE_STATS},
+            'PRA': round(statline['PRA'], 1),
+            'FPTS': round(fpts, 1),
+            'FPTS_Ceiling': round(ceiling_floor.get('ceiling', base_fpts * 1.3) * ratio, 1),
+            'FPTS_Floor': round(ceiling_floor.get('floor', base_fpts * 0.7) * ratio, 1),
+            'FPTS_Median': round(ceiling_floor.get('median', base_fpts) * ratio, 1),
+            'FPTS_Variance': round(ceiling_floor.get('variance', 0.0) * ratio ** 2, 2),
+            'FPTS_StdDev': round(ceiling_floor.get('std_dev', 0.0) * ratio, 2),
+            'Player_ID': statline['player_id']
+        })
+    return pd.DataFrame(rows, columns=STATLINE_COLUMNS)
+
+
+def repredict_team(
+    base_predictions: Dict[str, Dict],
+    team_abbr: str,
+    out_player_ids: Iterable[str],
+    opponent_out_ids: Iterable[str],
+    player_minutes_map: Dict[int, float],
+    players_df: Optional[pd.DataFrame] = None,
+    positions: Optional[Dict[int, str]] = None,
+    bulk_game_logs: Optional[pd.DataFrame] = None,
+    game_date: Optional[str] = None,
+    target_minutes: float = 240.0
+) -> pd.DataFrame:
+    """
+    Injury-adjusted, minutes-normalized statlines for one team.
+    
+    Only this team's players are touched: its OUT players get 0 minutes, the rest
+    get minutes redistribution and usage boosts from inj.calculate_injury_adjustments(),
+    then the team is normalized to target_minutes and FPTS recomputed.
+    
+    Args:
+        base_predictions: Dict of player_id -> base prediction entry for the game
+                          (pm.predict_slate_rows output, OUT players included)
+        team_abbr: Team to recompute
+        out_player_ids: This team's OUT/DOUBTFUL player IDs
+        opponent_out_ids: The opponent's OUT/DOUBTFUL player IDs
+        player_minutes_map: Dict of player_id -> season average minutes
+        players_df: DataFrame with player info (names in adjustment factors)
+        positions: Optional dict of player_id -> position (default: from players_df)
+        bulk_game_logs: Game logs for the recent activity check (optional)
+        game_date: Game date (YYYY-MM-DD) for the recent activity check (optional)
+        target_minutes: Team minutes (default 240)
+    
+    Returns:
+        DataFrame with STATLINE_COLUMNS, one row per player with minutes
+    """
+    out_ids = {str(p) for p in out_player_ids}
+    opponents_out = sorted(str(p) for p in opponent_out_ids)
+    if positions is None:
+        positions = inj.get_position_map(players_df)
+    
+    statlines = []
+    for player_id, player_data in base_predictions.items():
+        player_id = str(player_id)
+        if player_data.get('team_abbr') != team_abbr:
+            continue
+        
+        injury_adj = None
+        teammates_out = sorted(out_ids - {player_id})
+        if player_id not in out_ids and (teammates_out or opponents_out):
+            injury_adj = inj.calculate_injury_adjustments(
+                player_id=player_id,
+                player_team_id=0,
+                opponent_team_id=0,
+                teammates_out=teammates_out,
+                opponents_out=opponents_out,
+                player_minutes_map=player_minutes_map,
+                players_df=players_df,
+                positions=positions
+            )
+            if not injury_adj.get('factors'):
+                injury_adj = None
+        
+        statlines.append(build_statline(
+            player_id,
+            player_data,
+            is_away=not player_data.get('is_home', False),
+            season_minutes=player_minutes_map.get(int(player_id), DEFAULT_SEASON_MINUTES),
+            injury_adj=injury_adj
+        ))
+    
+    mnorm.normalize_single_team(
+        statlines,
+        target_minutes=target_minutes,
+        out_player_ids=out_ids,
+        bulk_game_logs=bulk_game_logs,
+        game_date=game_date
+    )
+    return statlines_to_frame(statlines, base_predictions)
+
@@ -6,7 +6,8 @@ opponent defensive stats for matchup-based predictions.
 
 import pandas as pd
 import numpy as np
-import streamlit as st
+import data_cache as dc
+import snapshot_store as snap
 import nba_api.stats.endpoints as endpoints
 from typing import Dict, Optional, Tuple
 
@@ -15,7 +16,8 @@ CURRENT_SEASON = "2025-26"
 SEASON_TYPE = "Regular Season"
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@dc.cached(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@snap.snapshotted('player_misc_stats')
 def get_player_misc_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Get player misc stats including PTS_PAINT, PTS_FB, PTS_2ND_CHANCE.
@@ -45,7 +47,7 @@ def get_player_misc_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@dc.cached(ttl=3600, show_spinner=False)  # Cache for 1 hour
 def get_team_misc_stats(season: str = CURRENT_SEASON) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Get team misc stats (offense and defense) including PITP, FB, 2nd Chance.
@@ -216,7 +218,7 @@ def get_opponent_defensive_vulnerabilities(
     }
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@dc.cached(ttl=3600, show_spinner=False)  # Cache for 1 hour
 def get_league_misc_averages(season: str = CURRENT_SEASON) -> Dict:
     """
     Get league average misc stats for normalization.
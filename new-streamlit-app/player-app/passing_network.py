@@ -0,0 +1,412 @@
+"""
+Passing Network Module
+League-wide passing networks from PlayerDashPtPass, stored as an edge list.
+
+PlayerDashPtPass returns one passer's passes to each teammate, so a team view
+needs one request per roster player. refresh_passing_networks() fetches every
+rostered player's dashboard through the request scheduler (stats.nba.com rate
+limits and retries) and stores one compact edge list per season and per mode in
+the snapshot store ('passing_network' dataset). Readers get a team's edges or a
+passer x receiver adjacency matrix from memory; the per-team views are built
+once per stored version.
+
+Refresh the store with scripts/build_passing_networks.py (e.g. nightly), or in
+the app with start_background_refresh(). Teams fetched on demand by
+get_team_passing_edges() (missing from the stored network) are only held in
+memory: they are not written to the snapshot store and are dropped when a new
+stored version is loaded.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+import snapshot_store as snap
+import request_scheduler as rs
+import nba_api.stats.endpoints as endpoints
+
+# Current season configuration
+CURRENT_SEASON = "2025-26"
+SEASON_TYPE = 'Regular Season'
+PER_MODES = ('PerGame', 'Totals')
+
+# Snapshot store dataset holding the edge lists
+DATASET = 'passing_network'
+
+# Stored edges older than this are refetched by ensure_passing_network()
+MAX_AGE_HOURS = 24
+
+# Share of failed player requests above which a refresh is not stored
+MAX_FAILED_SHARE = 0.1
+
+# Minutes before a failed refresh (or an on-demand team fetch with no edges) is retried
+RETRY_COOLDOWN_MINUTES = 30
+
+# Edge list columns (PlayerDashPtPass PassesMade, renamed to passer/receiver)
+EDGE_COLUMNS = [
+    'TEAM_ID', 'PASSER_ID', 'RECEIVER_ID', 'PASS_TYPE', 'G', 'FREQUENCY', 'PASS', 'AST',
+    'FGM', 'FGA', 'FG_PCT', 'FG2M', 'FG2A', 'FG2_PCT', 'FG3M', 'FG3A', 'FG3_PCT'
+]
+
+# Stats with a pre-built adjacency matrix per team
+ADJACENCY_VALUES = ('PASS', 'AST', 'FGM', 'FGA')
+
+
+@dataclass
+class PassingNetwork:
+    """
+    Edge list of one season and per mode, with per-team views built once.
+    
+    teams and adjacency are copy-on-write: add_team() builds new dicts and swaps
+    them in, so readers never see a dict while it is being modified and need no
+    lock.
+    """
+    season: str
+    per_mode: str
+    edges: pd.DataFrame
+    version: Optional[str] = None
+    teams: Dict[int, pd.DataFrame] = field(default_factory=dict)
+    adjacency: Dict[Tuple[int, str], pd.DataFrame] = field(default_factory=dict)
+    
+    @classmethod
+    def from_edges(cls, edges: pd.DataFrame, season: str, per_mode: str,
+                   version: Optional[str] = None) -> 'PassingNetwork':
+        """Split an edge list by team and build every team's adjacency matrices."""
+        network = cls(season=season, per_mode=per_mode, edges=edges, version=version)
+        if len(edges) > 0:
+            for team_id, team_edges in edges.groupby('TEAM_ID', sort=False):
+                network.add_team(int(team_id), team_edges.reset_index(drop=True))
+        return network
+    
+    def add_team(self, team_id: int, team_edges: pd.DataFrame) -> None:
+        """Store (or replace) one team's edges and adjacency matrices (callers serialize writes)."""
+        teams = dict(self.teams)
+        adjacency = dict(self.adjacency)
+        teams[team_id] = team_edges
+        for value in ADJACENCY_VALUES:
+            adjacency[(team_id, value)] = build_adjacency(team_edges, value)
+        self.teams, self.adjacency = teams, adjacency
+    
+    def team(self, team_id: int) -> pd.DataFrame:
+        """A team's edges (empty DataFrame if the team is not in the network)."""
+        return self.teams.get(int(team_id), pd.DataFrame(columns=EDGE_COLUMNS))
+
+
+_networks: Dict[Tuple[str, str], PassingNetwork] = {}
+_networks_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+# Last failed attempt: (season, per_mode) -> time of a refresh that stored nothing,
+# (season, per_mode, team_id) -> time of an on-demand fetch that returned no edges
+_failed_attempts: Dict[tuple, datetime] = {}
+
+
+def build_adjacency(edges: pd.DataFrame, value: str = 'PASS') -> pd.DataFrame:
+    """
+    Passer x receiver matrix of one stat, summed over pass types.
+    
+    Args:
+        edges: Edge list (one team)
+        value: Stat column (e.g. 'PASS', 'AST')
+    
+    Returns:
+        Square DataFrame indexed by passer ID with receiver ID columns, 0 where
+        no passes were recorded
+    """
+    if len(edges) == 0 or value not in edges.columns:
+        return pd.DataFrame()
+    matrix = edges.groupby(['PASSER_ID', 'RECEIVER_ID'])[value].sum().unstack(fill_value=0)
+    players = sorted(set(matrix.index) | set(matrix.columns))
+    return matrix.reindex(index=players, columns=players, fill_value=0)
+
+
+def get_rosters(players_df: pd.DataFrame) -> Dict[int, List[int]]:
+    """
+    Current rosters from the PlayerIndex DataFrame.
+    
+    Returns:
+        Dict of team ID -> player IDs (players without a team are left out)
+    """
+    if players_df is None or len(players_df) == 0 or 'TEAM_ID' not in players_df.columns:
+        return {}
+    rostered = players_df[pd.to_numeric(players_df['TEAM_ID'], errors='coerce').fillna(0) > 0]
+    rosters = {}
+    for team_id, team_players in rostered.groupby('TEAM_ID', sort=False):
+        rosters[int(team_id)] = [int(p) for p in team_players['PERSON_ID'].tolist()]
+    return rosters
+
+
+def _passer_edges(passes_made: pd.DataFrame, team_id: int, passer_id: int) -> pd.DataFrame:
+    """Edge list rows of one PlayerDashPtPass PassesMade frame."""
+    edges = passes_made.rename(columns={'PASS_TEAMMATE_PLAYER_ID': 'RECEIVER_ID'})
+    edges['TEAM_ID'] = team_id
+    edges['PASSER_ID'] = passer_id
+    return edges[[c for c in EDGE_COLUMNS if c in edges.columns]]
+
+
+def fetch_passing_edges(
+    rosters: Dict[int, Iterable[int]],
+    season: str = CURRENT_SEASON,
+    per_mode: str = 'PerGame',
+    season_type: str = SEASON_TYPE,
+    max_retries: int = 3
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Fetch the passing dashboards of every rostered player.
+    
+    All requests are submitted at once; the request scheduler runs them within
+    the stats.nba.com concurrency and rate limits.
+    
+    Args:
+        rosters: Team ID -> player IDs (see get_rosters)
+        season: Season string
+        per_mode: 'PerGame' or 'Totals'
+        season_type: Season type (e.g. 'Regular Season', 'Playoffs')
+        max_retries: Attempts per player request
+    
+    Returns:
+        Tuple of (edge list DataFrame, number of failed requests)
+    """
+    futures = {}
+    for team_id, player_ids in rosters.items():
+        for player_id in player_ids:
+            futures[(int(team_id), int(player_id))] = rs.submit_nba_api(
+                endpoints.PlayerDashPtPass,
+                max_retries=max_retries,
+                season=season,
+                season_type_all_star=season_type,
+                per_mode_simple=per_mode,
+                player_id=str(player_id),
+                team_id=str(team_id)
+            )
+    
+    frames = []
+    failed = 0
+    for (team_id, player_id), future in futures.items():
+        try:
+            passes_made = future.result()[0]
+        except Exception as e:
+            print(f"Error fetching passing data for player {player_id} (team {team_id}): {str(e)}")
+            failed += 1
+            continue
+        if len(passes_made) > 0:
+            frames.append(_passer_edges(passes_made, team_id, player_id))
+    
+    if not frames:
+        return pd.DataFrame(columns=EDGE_COLUMNS), failed
+    return pd.concat(frames, ignore_index=True), failed
+
+
+def _latest_version(season: str, per_mode: str, max_age_hours: Optional[float] = None) -> Optional[str]:
+    """Version of the stored edge list (None if missing or older than max_age_hours)."""
+    for entry in snap.load_manifest().values():
+        if (entry['dataset'] != DATASET or entry['season'] != season
+                or entry['params'].get('per_mode') != per_mode or not entry['versions']):
+            continue
+        latest = entry['versions'][-1]
+        if max_age_hours is not None:
+            created_at = datetime.fromisoformat(latest['created_at'])
+            if (datetime.now(timezone.utc) - created_at).total_seconds() > max_age_hours * 3600:
+                return None
+        return latest['version']
+    return None
+
+
+def _record_attempt(key: tuple, succeeded: bool) -> None:
+    """Remember a failed refresh or team fetch (a success clears it)."""
+    with _networks_lock:
+        if succeeded:
+            _failed_attempts.pop(key, None)
+        else:
+            _failed_attempts[key] = datetime.now(timezone.utc)
+
+
+def _cooling_down(key: tuple) -> bool:
+    """Whether the last attempt for key failed less than RETRY_COOLDOWN_MINUTES ago."""
+    with _networks_lock:
+        failed_at = _failed_attempts.get(key)
+    if failed_at is None:
+        return False
+    return (datetime.now(timezone.utc) - failed_at).total_seconds() < RETRY_COOLDOWN_MINUTES * 60
+
+
+def get_passing_network(season: str = CURRENT_SEASON, per_mode: str = 'PerGame') -> PassingNetwork:
+    """
+    The stored passing network of a season and per mode.
+    
+    The edge list is read from the snapshot store once per stored version; later
+    calls return the in-memory network.
+    
+    Returns:
+        PassingNetwork (with no edges if nothing is stored yet)
+    """
+    version = _latest_version(season, per_mode)
+    with _networks_lock:
+        network = _networks.get((season, per_mode))
+        if network is not None and (version is None or network.version == version):
+            return network
+    
+    edges = snap.load_snapshot(DATASET, season=season, per_mode=per_mode) if version else None
+    if edges is None:
+        edges = pd.DataFrame(columns=EDGE_COLUMNS)
+    network = PassingNetwork.from_edges(edges, season, per_mode, version)
+    with _networks_lock:
+        _networks[(season, per_mode)] = network
+    return network
+
+
+def get_team_passing_edges(
+    team_id: int,
+    season: str = CURRENT_SEASON,
+    per_mode: str = 'PerGame',
+    players_df: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    A team's passing edges.
+    
+    Args:
+        team_id: Team ID
+        season: Season string
+        per_mode: 'PerGame' or 'Totals'
+        players_df: PlayerIndex DataFrame; if given and the store has no edges for
+            the team, the team's roster is fetched on demand. On-demand edges are
+            kept in memory only (never saved to the snapshot store) until the next
+            stored version replaces the network. A fetch that returns no edges is
+            not retried for RETRY_COOLDOWN_MINUTES
+    
+    Returns:
+        Edge list DataFrame (empty if unavailable)
+    """
+    team_id = int(team_id)
+    network = get_passing_network(season, per_mode)
+    attempt_key = (season, per_mode, team_id)
+    if team_id in network.teams or players_df is None or _cooling_down(attempt_key):
+        return network.team(team_id)
+    
+    roster = get_rosters(players_df).get(team_id, [])
+    edges, _ = fetch_passing_edges({team_id: roster}, season, per_mode)
+    _record_attempt(attempt_key, len(edges) > 0)
+    if len(edges) > 0:
+        with _networks_lock:
+            network.add_team(team_id, edges)
+    return edges
+
+
+def get_team_adjacency(
+    team_id: int,
+    value: str = 'PASS',
+    season: str = CURRENT_SEASON,
+    per_mode: str = 'PerGame',
+    players_df: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    A team's passer x receiver matrix of one stat (see build_adjacency).
+    
+    Matrices of ADJACENCY_VALUES are pre-built when the network is loaded; other
+    stats are built from the team's edges.
+    
+    Returns:
+        Square DataFrame indexed by passer ID (empty if unavailable)
+    """
+    team_id = int(team_id)
+    edges = get_team_passing_edges(team_id, season, per_mode, players_df)
+    network = get_passing_network(season, per_mode)
+    matrix = network.adjacency.get((team_id, value))
+    if matrix is not None:
+        return matrix
+    return build_adjacency(edges, value)
+
+
+def refresh_passing_networks(
+    players_df: pd.DataFrame,
+    season: str = CURRENT_SEASON,
+    per_modes: Iterable[str] = PER_MODES
+) -> Dict[str, int]:
+    """
+    Fetch every team's passing network and store it.
+    
+    Teams are fetched one at a time (each team's players concurrently), so the
+    scheduler queue never holds more than one team's requests and on-demand
+    requests from the app are not stuck behind the whole league. A refresh with
+    more than MAX_FAILED_SHARE failed requests is not stored, so a rate-limited
+    run does not replace a complete network with a partial one; the failed
+    attempt is recorded and ensure_passing_network() waits RETRY_COOLDOWN_MINUTES
+    before trying that per mode again.
+    
+    Args:
+        players_df: PlayerIndex DataFrame (current rosters)
+        season: Season string
+        per_modes: Per modes to refresh
+    
+    Returns:
+        Dict of per mode -> number of edges stored
+    """
+    rosters = get_rosters(players_df)
+    n_requests = sum(len(player_ids) for player_ids in rosters.values())
+    stored = {}
+    for per_mode in per_modes:
+        frames = []
+        failed = 0
+        for team_id, player_ids in rosters.items():
+            team_edges, team_failed = fetch_passing_edges({team_id: player_ids}, season, per_mode)
+            failed += team_failed
+            if len(team_edges) > 0:
+                frames.append(team_edges)
+        edges = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=EDGE_COLUMNS)
+        if len(edges) == 0 or failed > n_requests * MAX_FAILED_SHARE:
+            print(f"[PASSING] Not storing {season} {per_mode}: {failed}/{n_requests} requests failed")
+            _record_attempt((season, per_mode), False)
+            continue
+        _record_attempt((season, per_mode), True)
+        version = snap.save_snapshot(DATASET, edges, season=season, per_mode=per_mode)
+        network = PassingNetwork.from_edges(edges, season, per_mode, version)
+        with _networks_lock:
+            _networks[(season, per_mode)] = network
+        stored[per_mode] = len(edges)
+    return stored
+
+
+def start_background_refresh(
+    players_df: pd.DataFrame,
+    season: str = CURRENT_SEASON,
+    per_modes: Iterable[str] = PER_MODES
+) -> bool:
+    """
+    Run refresh_passing_networks() in a daemon thread.
+    
+    Returns:
+        True if a refresh was started, False if one is already running
+    """
+    global _refresh_thread
+    with _networks_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return False
+        _refresh_thread = threading.Thread(
+            target=refresh_passing_networks, args=(players_df, season, tuple(per_modes)),
+            name='passing-network-refresh', daemon=True
+        )
+        _refresh_thread.start()
+    return True
+
+
+def ensure_passing_network(
+    players_df: pd.DataFrame,
+    season: str = CURRENT_SEASON,
+    max_age_hours: float = MAX_AGE_HOURS
+) -> bool:
+    """
+    Start a background refresh of the per modes missing or stale in the store.
+    
+    Per modes whose last refresh failed less than RETRY_COOLDOWN_MINUTES ago are
+    skipped, so a rate-limited refresh is not restarted on every render.
+    
+    Returns:
+        True if a refresh was started
+    """
+    per_modes = [
+        per_mode for per_mode in PER_MODES
+        if not _latest_version(season, per_mode, max_age_hours) and not _cooling_down((season, per_mode))
+    ]
+    if not per_modes:
+        return False
+    return start_background_refresh(players_df, season, per_modes)
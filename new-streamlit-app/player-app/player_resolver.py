@@ -0,0 +1,306 @@
+"""
+Player Resolver Module
+Indexed player-name resolution shared by every name matcher.
+
+A PlayerResolver is built once from a list of player records (the season's
+PlayerIndex, a predictions file, the names in a props feed, ...) and holds:
+    - normalized ASCII name keys ("Last, First", suffixes, accents, punctuation)
+    - a last-name index and a (last name, team) index
+    - a character-trigram index for the optional fuzzy fallback
+Lookups are dictionary hits plus, for fuzzy matches, a similarity check
+against the few candidates sharing the most trigrams. Results are memoized,
+so resolving a full slate of DraftKings, injury-report and odds names costs
+milliseconds instead of comparing every name against every other name.
+"""
+
+import re
+import unicodedata
+import threading
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+
+try:
+    from unidecode import unidecode
+    UNIDECODE_AVAILABLE = True
+except ImportError:
+    UNIDECODE_AVAILABLE = False
+
+
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+# Fuzzy fallback: candidates checked per lookup (those sharing the most trigrams)
+FUZZY_CANDIDATES = 10
+
+
+def to_ascii(text: str) -> str:
+    """Transliterate to lowercase ASCII ("Jokić" -> "jokic")."""
+    if not text:
+        return ""
+    if UNIDECODE_AVAILABLE:
+        return unidecode(text).lower()
+    normalized = unicodedata.normalize('NFD', text)
+    stripped = ''.join(char for char in normalized if unicodedata.category(char) != 'Mn')
+    return stripped.encode('ascii', 'ignore').decode('ascii').lower()
+
+
+def _name_tokens(name: Any) -> List[str]:
+    """ASCII, lowercase tokens of a name in "First Last" order, without punctuation."""
+    if name is None or (isinstance(name, float) and pd.isna(name)):
+        return []
+    name = str(name).strip()
+    if not name:
+        return []
+    
+    # Attached suffixes ("PorterJr." -> "Porter Jr.")
+    name = re.sub(r'([a-z])(Jr\.?|Sr\.?|III|II|IV)(?=,|$)', r'\1 \2', name)
+    
+    # "Last, First" -> "First Last"
+    if name.count(',') == 1:
+        last, first = [part.strip() for part in name.split(',')]
+        name = f"{first} {last}"
+    
+    name = to_ascii(name)
+    name = re.sub(r"[.'`]", '', name)
+    return re.sub(r'[^a-z0-9]+', ' ', name).split()
+
+
+def normalize_name(name: Any) -> str:
+    """Normalized full name including suffixes ("Gary Trent Jr." -> "gary trent jr")."""
+    return ' '.join(_name_tokens(name))
+
+
+def name_key(name: Any) -> str:
+    """Matching key: normalized name without suffixes ("Trent Jr., Gary" -> "gary trent")."""
+    tokens = _name_tokens(name)
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        tokens = tokens[:-1]
+    return ' '.join(tokens)
+
+
+def _split_key(key: str) -> Tuple[str, str]:
+    """(first name, last name) of a matching key; multi-word surnames keep only the last word."""
+    parts = key.split()
+    if not parts:
+        return '', ''
+    if len(parts) == 1:
+        return '', parts[0]
+    return parts[0], parts[-1]
+
+
+def team_token(team: Any) -> str:
+    """Comparable team token: abbreviation or nickname ("Boston Celtics" -> "celtics", "BOS" -> "bos")."""
+    if team is None or (isinstance(team, float) and pd.isna(team)):
+        return ''
+    words = to_ascii(str(team)).split()
+    return words[-1] if words else ''
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerResolver:
+    """
+    Resolves player names to ids through precomputed indexes.
+    
+    Build with from_player_index() (PlayerIndex / players DataFrame) or
+    from_names() (any list of names, e.g. prediction rows or prop names).
+    """
+    
+    def __init__(self, records: Iterable[Tuple[Any, str, Iterable[str]]]):
+        """
+        Args:
+            records: (player_id, name, team tokens) tuples; ids may be any hashable
+        """
+        self.ids: List[Any] = []
+        self.keys: List[str] = []
+        self.firsts: List[str] = []
+        self.teams: List[set] = []
+        self._by_key: Dict[str, List[int]] = defaultdict(list)
+        self._by_last: Dict[str, List[int]] = defaultdict(list)
+        self._by_last_team: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        self._by_trigram: Dict[str, List[int]] = defaultdict(list)
+        self._memo: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+        
+        for player_id, name, teams in records:
+            key = name_key(name)
+            if not key:
+                continue
+            idx = len(self.ids)
+            first, last = _split_key(key)
+            team_set = {t for t in teams if t}
+            
+            self.ids.append(player_id)
+            self.keys.append(key)
+            self.firsts.append(first)
+            self.teams.append(team_set)
+            
+            self._by_key[key].append(idx)
+            self._by_last[last].append(idx)
+            for team in team_set:
+                self._by_last_team[(last, team)].append(idx)
+            for gram in _trigrams(key):
+                self._by_trigram[gram].append(idx)
+    
+    @classmethod
+    def from_player_index(cls, players_df: pd.DataFrame) -> 'PlayerResolver':
+        """
+        Build from a PlayerIndex-style DataFrame.
+        
+        Args:
+            players_df: DataFrame with PERSON_ID, PLAYER_FIRST_NAME, PLAYER_LAST_NAME
+                        and optionally TEAM_ABBREVIATION, TEAM_NAME
+        
+        Returns:
+            PlayerResolver keyed by PERSON_ID (as str)
+        """
+        if players_df is None or len(players_df) == 0:
+            return cls([])
+        
+        names = (
+            players_df['PLAYER_FIRST_NAME'].fillna('').astype(str) + ' ' +
+            players_df['PLAYER_LAST_NAME'].fillna('').astype(str)
+        ).str.strip()
+        team_cols = [c for c in ['TEAM_ABBREVIATION', 'TEAM_NAME'] if c in players_df.columns]
+        teams = zip(*[players_df[c].map(team_token) for c in team_cols]) if team_cols else ([] for _ in names)
+        return cls(zip(players_df['PERSON_ID'].astype(str), names, teams))
+    
+    @classmethod
+    def from_names(cls, names: Iterable[str], ids: Optional[Iterable[Any]] = None,
+                   teams: Optional[Iterable[Any]] = None) -> 'PlayerResolver':
+        """
+        Build from plain names.
+        
+        Args:
+            names: Player names
+            ids: Id per name (default: the names themselves)
+            teams: Optional team (abbreviation or name) per name
+        
+        Returns:
+            PlayerResolver
+        """
+        names = list(names)
+        ids = names if ids is None else list(ids)
+        teams = [[team_token(t)] for t in teams] if teams is not None else [[] for _ in names]
+        return cls(zip(ids, names, teams))
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def _pick(self, candidates: List[int], team: str, first: str) -> Optional[int]:
+        """Narrow candidates by team, then by first-name prefix, and take the first remaining."""
+        if team:
+            on_team = [i for i in candidates if team in self.teams[i]]
+            if on_team:
+                candidates = on_team
+        if len(candidates) > 1 and first:
+            prefix = [i for i in candidates if self.firsts[i][:3] == first[:3]]
+            if prefix:
+                candidates = prefix
+        return candidates[0] if candidates else None
+    
+    def _resolve(self, key: str, team: str, fuzzy_threshold: Optional[float]) -> Optional[int]:
+        first, last = _split_key(key)
+        
+        # 1. Exact normalized name
+        exact = self._by_key.get(key)
+        if exact:
+            return self._pick(exact, team, first)
+        
+        # 2. Same last name with a compatible first name ("nic claxton" -> "nicolas
+        #    claxton"), or the only player with that last name on the team
+        on_team = self._by_last_team.get((last, team), []) if team else []
+        if len(on_team) == 1:
+            return on_team[0]
+        same_last = on_team or self._by_last.get(last, [])
+        if same_last:
+            if not first:
+                if len(same_last) == 1:
+                    return same_last[0]
+            else:
+                compatible = [i for i in same_last
+                              if self.firsts[i] and (self.firsts[i].startswith(first) or first.startswith(self.firsts[i]))]
+                if compatible:
+                    return self._pick(compatible, team, first)
+        
+        # 3. Fuzzy: similarity against the names sharing the most trigrams
+        if fuzzy_threshold is None:
+            return None
+        counts: Dict[int, int] = defaultdict(int)
+        for gram in _trigrams(key):
+            for i in self._by_trigram.get(gram, ()):
+                counts[i] += 1
+        best_idx, best_score = None, 0.0
+        for i in sorted(counts, key=counts.get, reverse=True)[:FUZZY_CANDIDATES]:
+            score = SequenceMatcher(None, key, self.keys[i]).ratio()
+            if score > best_score:
+                best_idx, best_score = i, score
+        return best_idx if best_score >= fuzzy_threshold else None
+    
+    def resolve(self, name: Any, team: Any = None, fuzzy_threshold: Optional[float] = None) -> Optional[Any]:
+        """
+        Resolve a name to a player id.
+        
+        Args:
+            name: Player name in any common format ("First Last", "Last, First",
+                  accents, attached or detached suffixes)
+            team: Optional team abbreviation or name used to break ties
+            fuzzy_threshold: Minimum similarity (0-1) for the fuzzy fallback;
+                             None disables fuzzy matching
+        
+        Returns:
+            Player id, or None if no match
+        """
+        memo_key = (name, team, fuzzy_threshold)
+        with self._lock:
+            if memo_key in self._memo:
+                return self._memo[memo_key]
+        
+        key = name_key(name)
+        idx = self._resolve(key, team_token(team), fuzzy_threshold) if key else None
+        result = self.ids[idx] if idx is not None else None
+        
+        with self._lock:
+            self._memo[memo_key] = result
+        return result
+    
+    def resolve_many(self, names: Iterable[Any], teams: Optional[Iterable[Any]] = None,
+                     fuzzy_threshold: Optional[float] = None) -> List[Optional[Any]]:
+        """Resolve a list of names (see resolve()); returns ids in input order."""
+        names = list(names)
+        teams = list(teams) if teams is not None else [None] * len(names)
+        return [self.resolve(name, team, fuzzy_threshold) for name, team in zip(names, teams)]
+
+
+# Resolvers for DataFrames passed around by callers (e.g. players_df), keyed by
+# object identity; the frame is kept alongside so its id cannot be reused
+_frame_resolvers: Dict[int, Tuple[pd.DataFrame, PlayerResolver]] = {}
+_frame_lock = threading.Lock()
+MAX_FRAME_RESOLVERS = 8
+
+
+def resolver_for_frame(players_df: pd.DataFrame) -> PlayerResolver:
+    """
+    PlayerResolver for a PlayerIndex-style DataFrame, built once per DataFrame object.
+    
+    Args:
+        players_df: DataFrame with PERSON_ID, PLAYER_FIRST_NAME, PLAYER_LAST_NAME
+    
+    Returns:
+        PlayerResolver
+    """
+    with _frame_lock:
+        entry = _frame_resolvers.get(id(players_df))
+        if entry is not None and entry[0] is players_df:
+            return entry[1]
+    
+    resolver = PlayerResolver.from_player_index(players_df)
+    with _frame_lock:
+        if len(_frame_resolvers) >= MAX_FRAME_RESOLVERS:
+            _frame_resolvers.pop(next(iter(_frame_resolvers)))
+        _frame_resolvers[id(players_df)] = (players_df, resolver)
+    return resolver
+
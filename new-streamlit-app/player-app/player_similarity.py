@@ -8,11 +8,10 @@ Used for:
 
 import pandas as pd
 import numpy as np
-import streamlit as st
+import data_cache as dc
 from typing import Dict, List, Tuple, Optional
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics.pairwise import cosine_similarity
 import nba_api.stats.endpoints as endpoints
 
 # Current season configuration
@@ -28,7 +27,7 @@ MIN_MINUTES = 10.0
 # DATA FETCHING FUNCTIONS
 # =============================================================================
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_all_player_base_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch base per-game stats for all players.
@@ -49,7 +48,7 @@ def get_all_player_base_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_all_player_misc_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch misc stats (paint scoring, fast break, 2nd chance) for all players.
@@ -67,7 +66,7 @@ def get_all_player_misc_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_all_player_drives_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch drives tracking data for all players.
@@ -85,7 +84,7 @@ def get_all_player_drives_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_all_player_advanced_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch advanced stats (usage rate, etc.) for all players.
@@ -103,7 +102,7 @@ def get_all_player_advanced_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_player_shooting_zones(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch zone shooting data from pbpstats.
@@ -127,7 +126,7 @@ def get_player_shooting_zones(season: str = CURRENT_SEASON) -> pd.DataFrame:
 # SIMILARITY FEATURE BUILDING
 # =============================================================================
 
-@st.cache_data(ttl=3600, show_spinner="Building player profiles...")
+@dc.cached(ttl=3600, show_spinner="Building player profiles...")
 def build_similarity_features(season: str = CURRENT_SEASON) -> Tuple[pd.DataFrame, List[str]]:
     """
     Build comprehensive feature matrix for player similarity.
@@ -312,66 +311,311 @@ def build_similarity_features(season: str = CURRENT_SEASON) -> Tuple[pd.DataFram
 
 
 # =============================================================================
-# SIMILARITY CALCULATION
+# SIMILARITY INDEX
 # =============================================================================
 
-def calculate_similarity_matrix(
-    features_df: pd.DataFrame,
-    feature_columns: List[str],
-    position_filter: bool = False,
-    minutes_tier_filter: bool = True
-) -> pd.DataFrame:
+# Neighbors kept per player (get_similarity_breakdown asks for up to 100)
+SIMILARITY_TOP_K = 100
+
+# Rows scored per block when building neighbor lists (bounds memory to BLOCK x N)
+SIMILARITY_BLOCK_SIZE = 512
+
+# Share of changed players above which update() refits the standardization
+# and rebuilds every neighbor list instead of patching them
+SIMILARITY_REBUILD_FRACTION = 0.5
+
+# In-process index, refreshed incrementally by get_similarity_index()
+_similarity_index = None
+_similarity_index_season = None
+
+
+def _feature_row_hashes(features_df: pd.DataFrame, feature_columns: List[str]) -> np.ndarray:
+    """One uint64 hash per player row of the similarity features."""
+    return pd.util.hash_pandas_object(features_df[feature_columns], index=False).to_numpy()
+
+
+class SimilarityIndex:
     """
-    Calculate pairwise similarity between all players.
+    Top-k cosine-similarity neighbors for every player.
     
-    Args:
-        features_df: DataFrame with player features
-        feature_columns: List of columns to use for similarity
-        position_filter: If True, only compare within same position group
-        minutes_tier_filter: If True, weight by minutes similarity
+    Features are standardized (z-scores) and L2-normalized into a float32 array,
+    so cosine similarity is a dot product. Only the k best neighbors of each
+    player are kept, as (row, score) arrays, instead of the full N x N matrix.
+    """
     
-    Returns:
-        DataFrame with similarity scores (player pairs)
+    def __init__(self, features_df: pd.DataFrame, feature_columns: List[str], k: int = SIMILARITY_TOP_K):
+        """
+        Build the index from scratch.
+        
+        Args:
+            features_df: DataFrame with PLAYER_ID and the feature columns
+            feature_columns: Columns to use for similarity
+            k: Neighbors kept per player
+        """
+        self.k = k
+        self.feature_columns = list(feature_columns)
+        self.scaler = StandardScaler().fit(features_df[self.feature_columns].values)
+        self._set_rows(features_df)
+        self.neighbor_rows, self.neighbor_scores = self._top_k(np.arange(len(self.player_ids)))
+    
+    def __len__(self) -> int:
+        return len(self.player_ids)
+    
+    def _vectors(self, features_df: pd.DataFrame) -> np.ndarray:
+        """Standardized, unit-length float32 feature vectors (zero rows stay zero)."""
+        vectors = self.scaler.transform(features_df[self.feature_columns].values).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+    
+    def _set_rows(self, features_df: pd.DataFrame) -> None:
+        self.player_ids = features_df['PLAYER_ID'].to_numpy(dtype=np.int64)
+        self.row_of = {int(pid): row for row, pid in enumerate(self.player_ids)}
+        self.vectors = self._vectors(features_df)
+        self.row_hashes = _feature_row_hashes(features_df, self.feature_columns)
+    
+    def _top_k(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best k neighbors (excluding self) for the given rows, best first.
+        
+        Returns:
+            Tuple of (neighbor_rows int32 [len(rows), k], neighbor_scores float32 [len(rows), k]);
+            lists shorter than k (tiny pools) are padded with row -1 / score -inf
+        """
+        n = len(self.player_ids)
+        k = min(self.k, max(n - 1, 0))
+        out_rows = np.full((len(rows), self.k), -1, dtype=np.int32)
+        out_scores = np.full((len(rows), self.k), -np.inf, dtype=np.float32)
+        if k == 0:
+            return out_rows, out_scores
+        
+        for start in range(0, len(rows), SIMILARITY_BLOCK_SIZE):
+            block = rows[start:start + SIMILARITY_BLOCK_SIZE]
+            scores = self.vectors[block] @ self.vectors.T
+            scores[np.arange(len(block)), block] = -np.inf
+            
+            # Partial sort: unordered top k, then order just those k
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+            out_rows[start:start + len(block), :k] = np.take_along_axis(top, order, axis=1)
+            out_scores[start:start + len(block), :k] = np.take_along_axis(top_scores, order, axis=1)
+        return out_rows, out_scores
+    
+    def update(self, features_df: pd.DataFrame, feature_columns: List[str]) -> 'SimilarityIndex':
+        """
+        Bring the index up to date with new features, recomputing only what changed.
+        
+        Changed and new players get fresh neighbor lists. Every other player's list
+        is patched with its new scores against the changed players, and recomputed
+        only when the patch can no longer guarantee an exact top k. The fitted
+        standardization is kept; a full rebuild happens when the feature columns
+        change or more than SIMILARITY_REBUILD_FRACTION of players changed.
+        
+        Args:
+            features_df: Current DataFrame from build_similarity_features()
+            feature_columns: Current feature columns
+        
+        Returns:
+            The updated index (self, or a new index after a full rebuild)
+        """
+        if list(feature_columns) != self.feature_columns:
+            return SimilarityIndex(features_df, feature_columns, self.k)
+        
+        new_hashes = _feature_row_hashes(features_df, self.feature_columns)
+        new_ids = features_df['PLAYER_ID'].to_numpy(dtype=np.int64)
+        old_hash = dict(zip(self.player_ids.tolist(), self.row_hashes.tolist()))
+        changed = np.array([old_hash.get(int(pid)) != h for pid, h in zip(new_ids, new_hashes)], dtype=bool)
+        removed = len(set(old_hash) - set(new_ids.tolist()))
+        if not changed.any() and removed == 0:
+            return self
+        if changed.sum() + removed > SIMILARITY_REBUILD_FRACTION * max(len(new_ids), 1):
+            return SimilarityIndex(features_df, feature_columns, self.k)
+        
+        # Carry unchanged players' lists over to the new row numbering
+        old_rows = np.array([self.row_of.get(int(pid), -1) for pid in new_ids], dtype=np.int64)
+        old_to_new = np.full(len(self.player_ids), -1, dtype=np.int64)
+        kept = old_rows >= 0
+        old_to_new[old_rows[kept & ~changed]] = np.flatnonzero(kept & ~changed)
+        prev_rows = self.neighbor_rows
+        prev_scores = self.neighbor_scores
+        
+        self._set_rows(features_df)
+        changed_rows = np.flatnonzero(changed)
+        neighbor_rows = np.full((len(new_ids), self.k), -1, dtype=np.int32)
+        neighbor_scores = np.full((len(new_ids), self.k), -np.inf, dtype=np.float32)
+        if len(changed_rows):
+            neighbor_rows[changed_rows], neighbor_scores[changed_rows] = self._top_k(changed_rows)
+        
+        k = min(self.k, len(new_ids) - 1)
+        recompute = []
+        vs_changed = self.vectors @ self.vectors[changed_rows].T if len(changed_rows) else None
+        for row in (np.flatnonzero(~changed) if k > 0 else []):
+            old_list = prev_rows[old_rows[row]]
+            old_list_scores = prev_scores[old_rows[row]]
+            # Unchanged neighbors keep their scores; changed/removed ones are rescored below
+            mapped = np.where(old_list >= 0, old_to_new[np.maximum(old_list, 0)], -1)
+            keep = mapped >= 0
+            cand_rows = mapped[keep]
+            cand_scores = old_list_scores[keep]
+            if len(changed_rows):
+                cand_rows = np.concatenate([cand_rows, changed_rows])
+                cand_scores = np.concatenate([cand_scores, vs_changed[row]])
+            
+            # Exact only if the k-th candidate still beats the old k-th score:
+            # any player outside the old list scored no higher than that
+            threshold = old_list_scores[-1]
+            if len(cand_rows) < k:
+                recompute.append(row)
+                continue
+            top = np.argsort(-cand_scores, kind='stable')[:k]
+            if np.isfinite(threshold) and cand_scores[top[-1]] < threshold:
+                recompute.append(row)
+                continue
+            neighbor_rows[row, :k] = cand_rows[top]
+            neighbor_scores[row, :k] = cand_scores[top]
+        
+        if recompute:
+            recompute = np.array(recompute, dtype=np.int64)
+            neighbor_rows[recompute], neighbor_scores[recompute] = self._top_k(recompute)
+        
+        self.neighbor_rows = neighbor_rows
+        self.neighbor_scores = neighbor_scores
+        return self
+    
+    def neighbors(self, player_id: int, n: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Most similar players to one player, best first.
+        
+        Returns:
+            Tuple of (player_ids, similarities in 0-1); empty if the player is not indexed
+        """
+        row = self.row_of.get(int(player_id))
+        if row is None:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        rows = self.neighbor_rows[row, :n]
+        valid = rows >= 0
+        return self.player_ids[rows[valid]], self.neighbor_scores[row, :n][valid]
+    
+    def query_many(self, player_ids: List[int], n: int = None) -> pd.DataFrame:
+        """
+        Neighbor lists for a batch of players (e.g. a whole slate) in one gather.
+        
+        Args:
+            player_ids: Player IDs to look up (players not indexed are skipped)
+            n: Neighbors per player (defaults to k)
+        
+        Returns:
+            Long DataFrame with PLAYER_ID, SIMILAR_PLAYER_ID, SIMILARITY (0-1), RANK (1 = most similar)
+        """
+        n = self.k if n is None else min(n, self.k)
+        rows = np.array([self.row_of[int(pid)] for pid in player_ids if int(pid) in self.row_of], dtype=np.int64)
+        if len(rows) == 0 or n == 0:
+            return pd.DataFrame(columns=['PLAYER_ID', 'SIMILAR_PLAYER_ID', 'SIMILARITY', 'RANK'])
+        
+        neighbor_rows = self.neighbor_rows[rows, :n]
+        valid = neighbor_rows >= 0
+        return pd.DataFrame({
+            'PLAYER_ID': np.repeat(self.player_ids[rows], n)[valid.ravel()],
+            'SIMILAR_PLAYER_ID': self.player_ids[neighbor_rows[valid]],
+            'SIMILARITY': self.neighbor_scores[rows, :n][valid],
+            'RANK': np.tile(np.arange(1, n + 1), len(rows))[valid.ravel()],
+        })
+
+
+def get_similarity_index(season: str = CURRENT_SEASON) -> Tuple[pd.DataFrame, Optional[SimilarityIndex]]:
     """
-    if features_df.empty or not feature_columns:
-        return pd.DataFrame()
+    Current features and similarity index for a season.
     
-    # Extract feature matrix
-    X = features_df[feature_columns].values
+    The index is kept in process and updated incrementally when the (cached)
+    features are rebuilt, so only players whose stats changed are rescored.
     
-    # Standardize features (z-score normalization)
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+    Returns:
+        Tuple of (features_df, index); index is None if no features are available
+    """
+    global _similarity_index, _similarity_index_season
     
-    # Calculate cosine similarity
-    similarity_matrix = cosine_similarity(X_scaled)
+    features_df, feature_columns = build_similarity_features(season)
+    if features_df.empty or not feature_columns:
+        return features_df, None
     
-    # Convert to DataFrame
-    player_ids = features_df['PLAYER_ID'].values
-    similarity_df = pd.DataFrame(
-        similarity_matrix,
-        index=player_ids,
-        columns=player_ids
-    )
+    if _similarity_index is not None and _similarity_index_season == season:
+        _similarity_index = _similarity_index.update(features_df, feature_columns)
+    else:
+        _similarity_index = SimilarityIndex(features_df, feature_columns)
+    _similarity_index_season = season
+    return features_df, _similarity_index
+
+
+def _similar_player_record(other_row: pd.Series, other_id: int, similarity: float) -> Dict:
+    """Display/prediction dict for one similar player (see get_similar_players)."""
+    # Get team name (use full name if available, otherwise use abbreviation)
+    team_abbr = other_row['TEAM_ABBREVIATION']
+    team_name = other_row.get('TEAM_NAME', team_abbr) if 'TEAM_NAME' in other_row else team_abbr
     
-    return similarity_df
+    return {
+        'player_id': int(other_id),
+        'player_name': other_row['PLAYER_NAME'],
+        'team_abbr': team_abbr,
+        'team_name': team_name,
+        'similarity': round(float(similarity) * 100, 1),  # Convert to percentage
+        'ppg': round(other_row.get('PTS', 0), 1),
+        'rpg': round(other_row.get('REB', 0), 1),
+        'apg': round(other_row.get('AST', 0), 1),
+        'mpg': round(other_row.get('MIN', 0), 1),
+        # Handle NaN values for shooting percentages
+        'fg_pct': round(other_row['FG_PCT'] * 100, 1) if pd.notna(other_row.get('FG_PCT')) else 0.0,
+        'fg3_pct': round(other_row['FG3_PCT'] * 100, 1) if pd.notna(other_row.get('FG3_PCT')) else 0.0,
+        'ft_pct': round(other_row['FT_PCT'] * 100, 1) if pd.notna(other_row.get('FT_PCT')) else 0.0,
+    }
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def get_cached_similarity_matrix(season: str = CURRENT_SEASON) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def get_similar_players_many(
+    player_ids: List[int],
+    n: int = 5,
+    season: str = CURRENT_SEASON,
+    min_similarity: float = 0.0,
+    exclude_same_team: bool = False
+) -> Dict[int, List[Dict]]:
     """
-    Cache the similarity matrix calculation.
-    Returns both the features_df and similarity_df to avoid recalculating.
+    Get the N most similar players for a batch of players with one index query.
+    
+    Args:
+        player_ids: NBA API player IDs (e.g. everyone on a slate)
+        n: Number of similar players to return per player
+        season: NBA season
+        min_similarity: Minimum similarity threshold (percentage, 0-100)
+        exclude_same_team: If True, exclude teammates
+    
+    Returns:
+        Dict of player_id -> list of dicts as returned by get_similar_players
+        (players that are not indexed map to an empty list)
     """
-    features_df, feature_columns = build_similarity_features(season)
-    if features_df.empty:
-        return pd.DataFrame(), pd.DataFrame()
+    results = {int(pid): [] for pid in player_ids}
+    features_df, index = get_similarity_index(season)
+    if index is None:
+        return results
+    
+    # Teammates can occupy part of the stored list, so read the whole list when excluding them
+    neighbors = index.query_many(list(results), n=None if exclude_same_team else n)
+    neighbors = neighbors[neighbors['SIMILARITY'] >= min_similarity / 100.0]
+    if len(neighbors) == 0:
+        return results
+    
+    player_info = features_df.drop_duplicates('PLAYER_ID').set_index('PLAYER_ID', drop=False)
+    if exclude_same_team:
+        teams = player_info['TEAM_ABBREVIATION']
+        neighbors = neighbors[
+            neighbors['PLAYER_ID'].map(teams).to_numpy() != neighbors['SIMILAR_PLAYER_ID'].map(teams).to_numpy()
+        ]
+    neighbors = neighbors.groupby('PLAYER_ID', sort=False).head(n)
     
-    similarity_df = calculate_similarity_matrix(features_df, feature_columns)
-    return features_df, similarity_df
+    for pid, other_id, similarity in neighbors[['PLAYER_ID', 'SIMILAR_PLAYER_ID', 'SIMILARITY']].itertuples(index=False):
+        results[int(pid)].append(_similar_player_record(player_info.loc[other_id], other_id, similarity))
+    return results
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_similar_players(
     player_id: int,
     n: int = 5,
@@ -392,67 +636,10 @@ def get_similar_players(
     Returns:
         List of dicts with player info and similarity scores
     """
-    # Use cached similarity matrix (much faster for batch operations)
-    features_df, similarity_df = get_cached_similarity_matrix(season)
-    
-    if features_df.empty or similarity_df.empty or player_id not in features_df['PLAYER_ID'].values:
-        return []
-    
-    if player_id not in similarity_df.index:
-        return []
-    
-    # Get player's row
-    player_similarities = similarity_df.loc[player_id]
-    
-    # Get player's team for exclusion
-    player_row = features_df[features_df['PLAYER_ID'] == player_id].iloc[0]
-    player_team = player_row['TEAM_ABBREVIATION']
-    
-    # Build results
-    # Convert min_similarity from percentage (0-100) to decimal (0-1)
-    min_similarity_decimal = min_similarity / 100.0
-    
-    results = []
-    for other_id, similarity in player_similarities.items():
-        if other_id == player_id:
-            continue  # Skip self
-        
-        if similarity < min_similarity_decimal:
-            continue
-        
-        other_row = features_df[features_df['PLAYER_ID'] == other_id]
-        if len(other_row) == 0:
-            continue
-        
-        other_row = other_row.iloc[0]
-        
-        # Optionally exclude teammates
-        if exclude_same_team and other_row['TEAM_ABBREVIATION'] == player_team:
-            continue
-        
-        # Get team name (use full name if available, otherwise use abbreviation)
-        team_abbr = other_row['TEAM_ABBREVIATION']
-        team_name = other_row.get('TEAM_NAME', team_abbr) if 'TEAM_NAME' in other_row else team_abbr
-        
-        results.append({
-            'player_id': int(other_id),
-            'player_name': other_row['PLAYER_NAME'],
-            'team_abbr': team_abbr,
-            'team_name': team_name,
-            'similarity': round(similarity * 100, 1),  # Convert to percentage
-            'ppg': round(other_row.get('PTS', 0), 1),
-            'rpg': round(other_row.get('REB', 0), 1),
-            'apg': round(other_row.get('AST', 0), 1),
-            'mpg': round(other_row.get('MIN', 0), 1),
-            # Handle NaN values for shooting percentages
-            'fg_pct': round(other_row['FG_PCT'] * 100, 1) if pd.notna(other_row.get('FG_PCT')) else 0.0,
-            'fg3_pct': round(other_row['FG3_PCT'] * 100, 1) if pd.notna(other_row.get('FG3_PCT')) else 0.0,
-            'ft_pct': round(other_row['FT_PCT'] * 100, 1) if pd.notna(other_row.get('FT_PCT')) else 0.0,
-        })
-    
-    # Sort by similarity and return top N
-    results.sort(key=lambda x: x['similarity'], reverse=True)
-    return results[:n]
+    return get_similar_players_many(
+        [player_id], n=n, season=season,
+        min_similarity=min_similarity, exclude_same_team=exclude_same_team
+    )[int(player_id)]
 
 
 def get_similarity_breakdown(
@@ -536,14 +723,68 @@ def get_similarity_breakdown(
 # PREDICTION INTEGRATION - Similar Players vs Defense
 # =============================================================================
 
+# Neighbor selection for the prediction adjustment
+SIMILAR_VS_OPPONENT_MIN_SIMILARITY = 50.0  # At least 50% similar
+SIMILAR_VS_OPPONENT_N = 10
+
+# (player, opponent) performance cube
+OPPONENT_CUBE_INDEX = ['PLAYER_ID', 'OPPONENT_ABBR']
+OPPONENT_CUBE_STATS = ['PTS', 'REB', 'AST']
+
+# Last cube built by get_opponent_performance_cube() and the logs it came from
+_opponent_cube = None
+_opponent_cube_source = None
+
+
+def build_opponent_performance_cube(game_logs_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-game averages of every player against every opponent, in one groupby.
+    
+    Args:
+        game_logs_df: Game logs with PLAYER_ID, MATCHUP ("MIN vs. LAL" / "MIN @ LAL") and stats
+    
+    Returns:
+        DataFrame indexed by (PLAYER_ID, OPPONENT_ABBR) with the mean of each
+        OPPONENT_CUBE_STATS column and GAMES (number of games)
+    """
+    stats = [col for col in OPPONENT_CUBE_STATS if game_logs_df is not None and col in game_logs_df.columns]
+    if game_logs_df is None or len(game_logs_df) == 0 or 'MATCHUP' not in game_logs_df.columns:
+        empty_index = pd.MultiIndex.from_arrays([[], []], names=OPPONENT_CUBE_INDEX)
+        return pd.DataFrame(columns=stats + ['GAMES'], index=empty_index)
+    
+    logs = game_logs_df[['PLAYER_ID'] + stats].astype(float)
+    logs['PLAYER_ID'] = logs['PLAYER_ID'].astype(int)
+    logs['OPPONENT_ABBR'] = game_logs_df['MATCHUP'].str.extract(r'(?:vs\.|@)\s*(\S+)\s*$', expand=False).str.upper()
+    
+    grouped = logs.dropna(subset=['OPPONENT_ABBR']).groupby(OPPONENT_CUBE_INDEX)
+    cube = grouped[stats].mean()
+    cube['GAMES'] = grouped.size()
+    return cube
+
+
+def get_opponent_performance_cube(game_logs_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Opponent performance cube for a game logs DataFrame, reusing the last cube
+    when called again with the same DataFrame (e.g. every player of a batch).
+    """
+    global _opponent_cube, _opponent_cube_source
+    
+    if _opponent_cube is None or game_logs_df is not _opponent_cube_source:
+        _opponent_cube = build_opponent_performance_cube(game_logs_df)
+        _opponent_cube_source = game_logs_df
+    return _opponent_cube
+
+
 def get_similar_players_vs_opponent(
     player_id: int,
     opponent_team_id: int,
     game_logs_df: pd.DataFrame,
     opponent_abbr: str = None,
     season: str = CURRENT_SEASON,
-    n_similar: int = 10,
-    min_games_vs_opponent: int = 1
+    n_similar: int = SIMILAR_VS_OPPONENT_N,
+    min_games_vs_opponent: int = 1,
+    similar_players: Optional[List[Dict]] = None,
+    opponent_cube: Optional[pd.DataFrame] = None
 ) -> Dict:
     """
     Get how similar players performed against a specific opponent.
@@ -556,18 +797,22 @@ def get_similar_players_vs_opponent(
         season: NBA season
         n_similar: Number of similar players to consider
         min_games_vs_opponent: Minimum games vs opponent to include
+        similar_players: Optional precomputed neighbors (from get_similar_players_many)
+        opponent_cube: Optional build_opponent_performance_cube() result (defaults to
+                       the cube of game_logs_df, built once per DataFrame)
     
     Returns:
         Dict with weighted performance data and adjustment factors
     """
     # Get similar players
-    similar_players = get_similar_players(
-        player_id, 
-        n=n_similar, 
-        season=season,
-        min_similarity=50.0,  # At least 50% similar
-        exclude_same_team=True  # Don't include teammates
-    )
+    if similar_players is None:
+        similar_players = get_similar_players(
+            player_id, 
+            n=n_similar, 
+            season=season,
+            min_similarity=SIMILAR_VS_OPPONENT_MIN_SIMILARITY,
+            exclude_same_team=True  # Don't include teammates
+        )
     
     if not similar_players:
         return {
@@ -604,91 +849,62 @@ def get_similar_players_vs_opponent(
             'similar_player_data': []
         }
     
-    results = []
-    total_weight = 0
-    weighted_pts_diff = 0
-    weighted_reb_diff = 0
-    weighted_ast_diff = 0
+    # Gather each similar player's (player, opponent) cell from the cube
+    if opponent_cube is None:
+        opponent_cube = get_opponent_performance_cube(game_logs_df)
+    sims = pd.DataFrame(similar_players)
+    # Exclude similar players who play for the opponent team
+    sims = sims[sims['team_abbr'].fillna('').str.upper() != opponent_abbr.upper()]
+    cells = opponent_cube.reindex(pd.MultiIndex.from_arrays(
+        [sims['player_id'].astype(int), np.repeat(opponent_abbr.upper(), len(sims))],
+        names=OPPONENT_CUBE_INDEX
+    ))
+    games = cells['GAMES'].fillna(0).astype(int).to_numpy()
+    keep = games >= min_games_vs_opponent
+    sims, cells, games = sims[keep], cells[keep], games[keep]
+    
+    # Season averages; performance vs opponent falls back to them without games
+    season_min = sims['mpg'].to_numpy(dtype=float) if 'mpg' in sims.columns else np.zeros(len(sims))
+    diffs = {}
+    games_vs_opp = {}
+    for stat, season_col in [('PTS', 'ppg'), ('REB', 'rpg'), ('AST', 'apg')]:
+        row_season = sims[season_col].to_numpy(dtype=float)
+        vs_opp = cells[stat].to_numpy(dtype=float) if stat in cells.columns else np.full(len(sims), np.nan)
+        vs_opp = np.where(np.isnan(vs_opp), row_season, vs_opp)
+        games_vs_opp[stat] = vs_opp
+        # Differential vs opponent compared to season avg
+        diffs[stat] = np.divide(vs_opp - row_season, row_season, out=np.zeros(len(sims)), where=row_season > 0)
+    
+    # Downweight low-minute players (< 20 MPG season avg); they often have high
+    # per-minute rates but low total production, which skews adjustments
+    minutes_weight = np.select(
+        [season_min < 10, season_min < 15, season_min < 20],
+        [0.2, 0.5, 0.75],
+        default=1.0
+    )
     
-    for sim_player in similar_players:
-        sim_id = sim_player['player_id']
-        similarity = sim_player['similarity'] / 100  # Convert back to 0-1
-        sim_team_abbr = sim_player.get('team_abbr', '')
-        
-        # Exclude similar players who play for the opponent team
-        if sim_team_abbr.upper() == opponent_abbr.upper():
-            continue
-        
-        # Get this player's games vs opponent
-        # MATCHUP format: "MIN vs. LAL" or "MIN @ LAL"
-        sim_player_all_games = game_logs_df[game_logs_df['PLAYER_ID'] == sim_id]
-        
-        # Filter for games vs specific opponent
-        sim_player_games = sim_player_all_games[
-            sim_player_all_games['MATCHUP'].str.contains(opponent_abbr, na=False, case=False)
-        ]
-        
-        if len(sim_player_games) < min_games_vs_opponent:
-            continue
-        
-        # Get season averages
-        season_pts = sim_player['ppg']
-        season_reb = sim_player['rpg']
-        season_ast = sim_player['apg']
-        season_min = sim_player.get('mpg', 0)  # Get minutes per game
-        
-        # Get performance vs opponent
-        games_pts = sim_player_games['PTS'].astype(float).mean() if len(sim_player_games) > 0 and 'PTS' in sim_player_games.columns else season_pts
-        games_reb = sim_player_games['REB'].astype(float).mean() if len(sim_player_games) > 0 and 'REB' in sim_player_games.columns else season_reb
-        games_ast = sim_player_games['AST'].astype(float).mean() if len(sim_player_games) > 0 and 'AST' in sim_player_games.columns else season_ast
-        games_min = sim_player_games['MIN'].astype(float).mean() if len(sim_player_games) > 0 and 'MIN' in sim_player_games.columns else season_min
-        
-        # Skip or heavily downweight low-minute players (< 10 MPG season avg)
-        # They often have high per-minute rates but low total production, which skews adjustments
-        minutes_weight = 1.0
-        if season_min < 10:
-            # Heavily downweight players averaging < 10 MPG
-            minutes_weight = 0.2
-        elif season_min < 15:
-            # Moderate downweight for 10-15 MPG players
-            minutes_weight = 0.5
-        elif season_min < 20:
-            # Slight downweight for 15-20 MPG players
-            minutes_weight = 0.75
-        
-        # Calculate differentials (vs opponent compared to season avg)
-        if season_pts > 0:
-            pts_diff = (games_pts - season_pts) / season_pts
-        else:
-            pts_diff = 0
-        
-        if season_reb > 0:
-            reb_diff = (games_reb - season_reb) / season_reb
-        else:
-            reb_diff = 0
-        
-        if season_ast > 0:
-            ast_diff = (games_ast - season_ast) / season_ast
-        else:
-            ast_diff = 0
-        
-        # Weight by similarity, sample size, AND minutes played
-        # Low-minute players get much less weight
-        weight = similarity * len(sim_player_games) * minutes_weight
-        total_weight += weight
-        weighted_pts_diff += pts_diff * weight
-        weighted_reb_diff += reb_diff * weight
-        weighted_ast_diff += ast_diff * weight
-        
-        results.append({
-            'player_name': sim_player['player_name'],
-            'similarity': sim_player['similarity'],
-            'games_vs_opp': len(sim_player_games),
-            'pts_vs_opp': round(games_pts, 1),
+    # Weight by similarity, sample size, AND minutes played
+    weights = sims['similarity'].to_numpy(dtype=float) / 100 * games * minutes_weight
+    total_weight = float(weights.sum())
+    weighted_pts_diff = float((diffs['PTS'] * weights).sum())
+    weighted_reb_diff = float((diffs['REB'] * weights).sum())
+    weighted_ast_diff = float((diffs['AST'] * weights).sum())
+    
+    results = [
+        {
+            'player_name': name,
+            'similarity': similarity,
+            'games_vs_opp': int(n_games),
+            'pts_vs_opp': round(float(pts_vs_opp), 1),
             'season_pts': season_pts,
-            'pts_diff': round(pts_diff * 100, 1),
-            'season_min': season_min,  # Store for confidence calculation
-        })
+            'pts_diff': round(float(pts_diff) * 100, 1),
+            'season_min': mpg,  # Store for confidence calculation
+        }
+        for name, similarity, n_games, pts_vs_opp, season_pts, pts_diff, mpg in zip(
+            sims['player_name'], sims['similarity'], games, games_vs_opp['PTS'],
+            sims['ppg'], diffs['PTS'], season_min
+        )
+    ]
     
     # Calculate final adjustments
     if total_weight > 0:
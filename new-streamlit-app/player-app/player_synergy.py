@@ -6,11 +6,11 @@ and opponent defensive playtype performance for prediction models.
 
 import pandas as pd
 import numpy as np
-import streamlit as st
+import data_cache as dc
+import snapshot_store as snap
+import request_scheduler as rs
 import nba_api.stats.endpoints as endpoints
-import time
 from typing import Dict, Optional, List
-from requests.exceptions import ReadTimeout, RequestException
 
 # Current season configuration
 CURRENT_SEASON = "2025-26"
@@ -21,7 +21,7 @@ SYNERGY_PLAYTYPES = ['Cut', 'Handoff', 'Isolation', 'Misc', 'OffScreen', 'Postup
                      'PRBallHandler', 'PRRollman', 'OffRebound', 'Spotup', 'Transition']
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_player_synergy_data(player_id: str, playtype: str, season: str = CURRENT_SEASON, 
                            max_retries: int = 3, timeout: int = 60) -> pd.DataFrame:
     """
@@ -37,47 +37,32 @@ def get_player_synergy_data(player_id: str, playtype: str, season: str = CURRENT
     Returns:
         DataFrame with synergy data for the player, or empty DataFrame on error
     """
-    for attempt in range(max_retries):
-        try:
-            synergy_data = endpoints.SynergyPlayTypes(
-                league_id=LEAGUE_ID,
-                per_mode_simple='Totals',
-                season=season,
-                season_type_all_star='Regular Season',
-                player_or_team_abbreviation='P',  # 'P' for player
-                type_grouping_nullable='offensive',
-                play_type_nullable=playtype,
-                timeout=timeout
-            ).get_data_frames()[0]
-            
-            # Filter for the specific player
-            if len(synergy_data) > 0 and 'PLAYER_ID' in synergy_data.columns:
-                player_data = synergy_data[synergy_data['PLAYER_ID'] == int(player_id)]
-                return player_data
-            else:
-                return pd.DataFrame()
-                
-        except (ReadTimeout, RequestException) as e:
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 2
-                time.sleep(wait_time)
-                continue
-            else:
-                print(f"Error fetching player synergy data for player {player_id}, playtype {playtype}: {str(e)}")
-                return pd.DataFrame()
-        except Exception as e:
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 2
-                time.sleep(wait_time)
-                continue
-            else:
-                print(f"Unexpected error fetching player synergy data for player {player_id}, playtype {playtype}: {str(e)}")
-                return pd.DataFrame()
-    
+    try:
+        # Same league-wide request for every player, so concurrent callers share it
+        synergy_data = rs.call_nba_api(
+            endpoints.SynergyPlayTypes,
+            max_retries=max_retries,
+            league_id=LEAGUE_ID,
+            per_mode_simple='Totals',
+            season=season,
+            season_type_all_star='Regular Season',
+            player_or_team_abbreviation='P',  # 'P' for player
+            type_grouping_nullable='offensive',
+            play_type_nullable=playtype,
+            timeout=timeout
+        )[0]
+    except Exception as e:
+        print(f"Error fetching player synergy data for player {player_id}, playtype {playtype}: {str(e)}")
+        return pd.DataFrame()
+    
+    # Filter for the specific player
+    if len(synergy_data) > 0 and 'PLAYER_ID' in synergy_data.columns:
+        return synergy_data[synergy_data['PLAYER_ID'] == int(player_id)]
     return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False, shared=True)
+@snap.snapshotted('player_synergy', group_param='playtype')
 def get_all_players_offensive_synergy_bulk(season: str = CURRENT_SEASON) -> Dict[str, pd.DataFrame]:
     """
     Fetch ALL players' offensive synergy data for ALL playtypes in bulk.
@@ -90,51 +75,29 @@ def get_all_players_offensive_synergy_bulk(season: str = CURRENT_SEASON) -> Dict
     Returns:
         Dictionary: {playtype: df_with_all_players}
     """
-    result = {}
-    total_requests = len(SYNERGY_PLAYTYPES)
-    current_request = 0
+    # One request per playtype, all scheduled at once under the stats.nba.com rate limit
+    futures = {
+        playtype: rs.submit_nba_api(
+            endpoints.SynergyPlayTypes,
+            league_id=LEAGUE_ID,
+            per_mode_simple='Totals',
+            season=season,
+            season_type_all_star='Regular Season',
+            player_or_team_abbreviation='P',  # 'P' for player
+            type_grouping_nullable='offensive',
+            play_type_nullable=playtype,
+            timeout=60
+        )
+        for playtype in SYNERGY_PLAYTYPES
+    }
     
-    for playtype in SYNERGY_PLAYTYPES:
-        current_request += 1
-        
-        for attempt in range(3):
-            try:
-                synergy_data = endpoints.SynergyPlayTypes(
-                    league_id=LEAGUE_ID,
-                    per_mode_simple='Totals',
-                    season=season,
-                    season_type_all_star='Regular Season',
-                    player_or_team_abbreviation='P',  # 'P' for player
-                    type_grouping_nullable='offensive',
-                    play_type_nullable=playtype,
-                    timeout=60
-                ).get_data_frames()[0]
-                
-                result[playtype] = synergy_data
-                break
-                
-            except (ReadTimeout, RequestException) as e:
-                if attempt < 2:
-                    wait_time = (attempt + 1) * 2
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"Error fetching bulk offensive synergy for playtype {playtype}: {str(e)}")
-                    result[playtype] = pd.DataFrame()
-                    break
-            except Exception as e:
-                if attempt < 2:
-                    wait_time = (attempt + 1) * 2
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"Unexpected error fetching bulk offensive synergy for playtype {playtype}: {str(e)}")
-                    result[playtype] = pd.DataFrame()
-                    break
-        
-        # Add delay between requests to avoid rate limiting (except for last request)
-        if current_request < total_requests:
-            time.sleep(1.5)
+    result = {}
+    for playtype, future in futures.items():
+        try:
+            result[playtype] = future.result()[0]
+        except Exception as e:
+            print(f"Error fetching bulk offensive synergy for playtype {playtype}: {str(e)}")
+            result[playtype] = pd.DataFrame()
     
     return result
 
@@ -166,7 +129,7 @@ def get_player_offensive_synergy_from_bulk(
     return result
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_all_player_offensive_synergy(player_id: str, season: str = CURRENT_SEASON) -> Dict[str, pd.DataFrame]:
     """
     Fetch all offensive synergy data for a player (all 11 playtypes).
@@ -179,88 +142,98 @@ def get_all_player_offensive_synergy(player_id: str, season: str = CURRENT_SEASO
         Dictionary: {playtype: df}
     """
     result = {}
-    total_requests = len(SYNERGY_PLAYTYPES)
-    current_request = 0
     
+    # Requests are rate limited by the scheduler, no fixed delay needed
     for playtype in SYNERGY_PLAYTYPES:
-        current_request += 1
-        df = get_player_synergy_data(player_id, playtype, season)
-        result[playtype] = df
-        
-        # Add delay between requests to avoid rate limiting (except for last request)
-        if current_request < total_requests:
-            time.sleep(1.5)
+        result[playtype] = get_player_synergy_data(player_id, playtype, season)
     
     return result
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def get_opponent_defensive_synergy(team_id: int, season: str = CURRENT_SEASON) -> Dict[str, pd.DataFrame]:
+@dc.cached(ttl=3600, show_spinner=False, shared=True)
+@snap.snapshotted('team_defensive_synergy', group_param='playtype')
+def get_all_teams_defensive_synergy_bulk(season: str = CURRENT_SEASON) -> Dict[str, pd.DataFrame]:
     """
-    Fetch all defensive synergy data for an opponent team (all 11 playtypes).
+    Fetch ALL teams' defensive synergy data for ALL playtypes in bulk.
+    Makes only 11 API calls per season (one per playtype), shared by every
+    opponent lookup instead of 11 league-wide calls per opponent.
     
     Args:
-        team_id: Team ID (integer)
         season: Season string (defaults to CURRENT_SEASON)
     
     Returns:
-        Dictionary: {playtype: df}
+        Dictionary: {playtype: df_with_all_teams}
     """
+    # One request per playtype, all scheduled at once under the stats.nba.com rate limit
+    futures = {
+        playtype: rs.submit_nba_api(
+            endpoints.SynergyPlayTypes,
+            league_id=LEAGUE_ID,
+            per_mode_simple='Totals',
+            season=season,
+            season_type_all_star='Regular Season',
+            player_or_team_abbreviation='T',  # 'T' for team
+            type_grouping_nullable='defensive',
+            play_type_nullable=playtype,
+            timeout=60
+        )
+        for playtype in SYNERGY_PLAYTYPES
+    }
+    
     result = {}
-    total_requests = len(SYNERGY_PLAYTYPES)
-    current_request = 0
+    for playtype, future in futures.items():
+        try:
+            result[playtype] = future.result()[0]
+        except Exception as e:
+            print(f"Error fetching bulk defensive synergy for playtype {playtype}: {str(e)}")
+            result[playtype] = pd.DataFrame()
     
-    for playtype in SYNERGY_PLAYTYPES:
-        current_request += 1
-        
-        # Fetch team defensive synergy data
-        for attempt in range(3):
-            try:
-                synergy_data = endpoints.SynergyPlayTypes(
-                    league_id=LEAGUE_ID,
-                    per_mode_simple='Totals',
-                    season=season,
-                    season_type_all_star='Regular Season',
-                    player_or_team_abbreviation='T',  # 'T' for team
-                    type_grouping_nullable='defensive',
-                    play_type_nullable=playtype,
-                    timeout=60
-                ).get_data_frames()[0]
-                
-                # Filter for the specific team
-                if len(synergy_data) > 0 and 'TEAM_ID' in synergy_data.columns:
-                    team_data = synergy_data[synergy_data['TEAM_ID'] == team_id]
-                    result[playtype] = team_data
-                else:
-                    result[playtype] = pd.DataFrame()
-                break
-                
-            except (ReadTimeout, RequestException) as e:
-                if attempt < 2:
-                    wait_time = (attempt + 1) * 2
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"Error fetching opponent defensive synergy for team {team_id}, playtype {playtype}: {str(e)}")
-                    result[playtype] = pd.DataFrame()
-                    break
-            except Exception as e:
-                if attempt < 2:
-                    wait_time = (attempt + 1) * 2
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"Unexpected error fetching opponent defensive synergy for team {team_id}, playtype {playtype}: {str(e)}")
-                    result[playtype] = pd.DataFrame()
-                    break
-        
-        # Add delay between requests to avoid rate limiting (except for last request)
-        if current_request < total_requests:
-            time.sleep(1.5)
+    return result
+
+
+def get_team_defensive_synergy_from_bulk(
+    team_id: int,
+    bulk_synergy: Dict[str, pd.DataFrame]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Extract a single team's defensive synergy data from bulk results.
+    
+    Args:
+        team_id: Team ID (integer)
+        bulk_synergy: Dictionary from get_all_teams_defensive_synergy_bulk()
+    
+    Returns:
+        Dictionary: {playtype: df} for the specific team
+    """
+    result = {}
+    team_id_int = int(team_id)
+    
+    for playtype, df in bulk_synergy.items():
+        if df is not None and len(df) > 0 and 'TEAM_ID' in df.columns:
+            team_data = df[df['TEAM_ID'] == team_id_int].copy()
+            result[playtype] = team_data
+        else:
+            result[playtype] = pd.DataFrame()
     
     return result
 
 
+def get_opponent_defensive_synergy(team_id: int, season: str = CURRENT_SEASON) -> Dict[str, pd.DataFrame]:
+    """
+    Get all defensive synergy data for an opponent team (all 11 playtypes).
+    Reads from the league-wide bulk loader, so each playtype is fetched once
+    per season no matter how many opponents are looked up.
+    
+    Args:
+        team_id: Team ID (integer)
+        season: Season string (defaults to CURRENT_SEASON)
+    
+    Returns:
+        Dictionary: {playtype: df}
+    """
+    return get_team_defensive_synergy_from_bulk(team_id, get_all_teams_defensive_synergy_bulk(season))
+
+
 def extract_playtype_metrics(df: pd.DataFrame, playtype: str) -> Dict:
     """
     Extract key metrics from a synergy dataframe.
@@ -6,7 +6,7 @@ This helps adjust predictions based on how teams defend different positions.
 
 import pandas as pd
 import numpy as np
-import streamlit as st
+import data_cache as dc
 from typing import Dict, Optional, Tuple
 import nba_api.stats.endpoints as endpoints
 
@@ -64,7 +64,7 @@ def get_position_group(position: str) -> str:
         return 'F'
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@dc.cached(ttl=3600, show_spinner=False)  # Cache for 1 hour
 def get_league_players_with_positions() -> pd.DataFrame:
     """
     Get all players with their positions and team IDs.
@@ -82,7 +82,7 @@ def get_league_players_with_positions() -> pd.DataFrame:
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
 def get_player_position(player_id: int) -> str:
     """
     Get a player's position from PlayerIndex.
@@ -97,7 +97,7 @@ def get_player_position(player_id: int) -> str:
         return 'F'
 
 
-@st.cache_data(ttl=7200, show_spinner=False)  # Cache for 2 hours
+@dc.cached(ttl=7200, show_spinner=False)  # Cache for 2 hours
 def calculate_team_defense_by_position() -> Dict[str, Dict[str, Dict]]:
     """
     Calculate how each team defends each position.
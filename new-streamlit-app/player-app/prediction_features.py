@@ -6,25 +6,25 @@ Kept separate from main codebase for modularity.
 
 import pandas as pd
 import numpy as np
-import streamlit as st
+import data_cache as dc
+import snapshot_store as snap
 import nba_api.stats.endpoints as endpoints
 from typing import Optional, Dict, List, Tuple
 from datetime import datetime, date
 import prediction_utils as utils
 import matchup_stats as ms
 import positional_defense as pos_def
-import team_defensive_stats as tds
 import drives_stats as ds
 import player_similarity as ps
 import player_synergy as psyn
-# Supabase imports removed - using Streamlit cache instead
+# Caching via data_cache (memory + disk, optional Supabase tier for bulk loaders)
 
 # Current season configuration
 CURRENT_SEASON = "2025-26"
 LEAGUE_ID = "00"
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False, shared=True)
 def get_cached_bulk_offensive_synergy(season: str = CURRENT_SEASON) -> Dict[str, pd.DataFrame]:
     """
     Get cached bulk offensive synergy data for all players.
@@ -35,7 +35,8 @@ def get_cached_bulk_offensive_synergy(season: str = CURRENT_SEASON) -> Dict[str,
     return data
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False, shared=True)
+@snap.snapshotted('player_game_logs')
 def get_bulk_player_game_logs(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch ALL player game logs for the season in ONE API call.
@@ -87,7 +88,8 @@ def get_player_logs_from_bulk(player_id: str, bulk_game_logs: pd.DataFrame) -> p
     return player_logs
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False, shared=True)
+@snap.snapshotted('player_index')
 def get_bulk_player_index() -> pd.DataFrame:
     """
     Get all players from PlayerIndex endpoint (cached).
@@ -108,6 +110,51 @@ def get_bulk_player_index() -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@dc.cached(ttl=3600, show_spinner=False, shared=True)
+@snap.snapshotted('schedule')
+def get_league_schedule(season: str = CURRENT_SEASON) -> pd.DataFrame:
+    """
+    Get the full league schedule from the ScheduleLeagueV2 endpoint (cached).
+    
+    Args:
+        season: Season string (e.g., '2025-26')
+    
+    Returns:
+        DataFrame with one row per game, or empty DataFrame on error
+    """
+    try:
+        return endpoints.ScheduleLeagueV2(
+            league_id=LEAGUE_ID,
+            season=season
+        ).get_data_frames()[0]
+    except Exception as e:
+        print(f"Error fetching league schedule: {e}")
+        return pd.DataFrame()
+
+
+@dc.cached(ttl=3600, show_spinner=False, shared=True)
+@snap.snapshotted('standings')
+def get_league_standings(season: str = CURRENT_SEASON) -> pd.DataFrame:
+    """
+    Get regular season standings from the LeagueStandings endpoint (cached).
+    
+    Args:
+        season: Season string (e.g., '2025-26')
+    
+    Returns:
+        DataFrame with one row per team, or empty DataFrame on error
+    """
+    try:
+        return endpoints.LeagueStandings(
+            league_id=LEAGUE_ID,
+            season=season,
+            season_type='Regular Season'
+        ).get_data_frames()[0]
+    except Exception as e:
+        print(f"Error fetching league standings: {e}")
+        return pd.DataFrame()
+
+
 def get_player_position_from_index(player_id: str, bulk_player_index: pd.DataFrame = None) -> str:
     """
     Get player's position from PlayerIndex endpoint.
@@ -174,7 +221,8 @@ def get_player_game_logs(player_id: str, season: str = CURRENT_SEASON) -> pd.Dat
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False, shared=True)
+@snap.snapshotted('team_game_logs')
 def get_bulk_team_game_logs(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch ALL team game logs for the season in ONE API call.
@@ -361,29 +409,126 @@ def get_player_vs_opponent_history(
     return result
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
-def get_team_pace(team_id: int, season: str = CURRENT_SEASON) -> float:
+# Windows in the bulk team context table (0 = full season)
+TEAM_CONTEXT_WINDOWS = [0, 5, 10]
+TEAM_CONTEXT_COLUMNS = ['PACE', 'DEF_RATING', 'OFF_RATING', 'NET_RATING']
+
+
+@dc.cached(ttl=1800, show_spinner=False)  # Cache for 30 minutes
+def get_league_team_stats(
+    season: str = CURRENT_SEASON,
+    measure_type: str = 'Advanced',
+    last_n_games: int = 0
+) -> pd.DataFrame:
     """
-    Get team's pace (possessions per game).
+    Fetch LeagueDashTeamStats for all 30 teams in a single request.
+    
+    Args:
+        season: Season string
+        measure_type: 'Advanced', 'Four Factors', ...
+        last_n_games: Restrict to each team's last N games (0 = full season)
+    
+    Returns:
+        DataFrame with one row per team (empty on error)
     """
     try:
-        team_stats = endpoints.TeamDashboardByGeneralSplits(
-            team_id=team_id,
+        return endpoints.LeagueDashTeamStats(
+            league_id_nullable=LEAGUE_ID,
+            measure_type_detailed_defense=measure_type,
+            pace_adjust='N',
+            per_mode_detailed='PerGame',
             season=season,
-            measure_type_detailed_defense='Advanced',
-            per_mode_detailed='PerGame'
+            season_type_all_star='Regular Season',
+            last_n_games=last_n_games
         ).get_data_frames()[0]
-        
-        if 'PACE' in team_stats.columns and len(team_stats) > 0:
-            return round(team_stats['PACE'].iloc[0], 1)
     except Exception as e:
-        print(f"Error fetching pace for team {team_id}: {e}")
+        window = f"L{last_n_games}" if last_n_games else "season"
+        print(f"Error fetching {measure_type} team stats ({window}): {e}")
+        return pd.DataFrame()
+
+
+@dc.cached(ttl=1800, show_spinner=False, shared=True)  # Cache for 30 minutes
+@snap.snapshotted('team_context')
+def get_team_context_table(season: str = CURRENT_SEASON) -> pd.DataFrame:
+    """
+    Build the team context table used for opponent features.
+    
+    One Advanced LeagueDashTeamStats request per window (season, L5, L10) plus one
+    Four Factors request for opponent FT rate, instead of separate requests per team.
+    Windowed columns carry an _L5/_L10 suffix.
     
-    return 100.0  # League average default
+    Returns:
+        DataFrame with one row per TEAM_ID: PACE, DEF_RATING, OFF_RATING, NET_RATING
+        and their ranks per window, plus OPP_FT_RATE (FTA/FGA allowed, as a
+        percentage) and OPP_FT_RATE_RANK (1 = fewest free throws allowed)
+    """
+    table = None
+    for n_games in TEAM_CONTEXT_WINDOWS:
+        stats = get_league_team_stats(season, 'Advanced', n_games)
+        if len(stats) == 0 or 'TEAM_ID' not in stats.columns:
+            continue
+        
+        suffix = f"_L{n_games}" if n_games else ''
+        renames = {}
+        for col in TEAM_CONTEXT_COLUMNS:
+            renames[col] = f"{col}{suffix}"
+            renames[f"{col}_RANK"] = f"{col}{suffix}_RANK"
+        id_columns = ['TEAM_ID'] if n_games or 'TEAM_NAME' not in stats.columns else ['TEAM_ID', 'TEAM_NAME']
+        window = stats[id_columns + [c for c in renames if c in stats.columns]].rename(columns=renames)
+        
+        table = window if table is None else table.merge(window, on='TEAM_ID', how='outer')
+    
+    if table is None:
+        return pd.DataFrame()
+    
+    four_factors = get_league_team_stats(season, 'Four Factors', 0)
+    if len(four_factors) > 0 and 'OPP_FTA_RATE' in four_factors.columns:
+        ft_rate = four_factors[['TEAM_ID', 'OPP_FTA_RATE']].copy()
+        ft_rate['OPP_FT_RATE'] = (ft_rate['OPP_FTA_RATE'] * 100).round(1)
+        # Lower = better defense (fewer free throws allowed)
+        ft_rate['OPP_FT_RATE_RANK'] = ft_rate['OPP_FTA_RATE'].rank(ascending=True, method='first').astype(int)
+        table = table.merge(ft_rate[['TEAM_ID', 'OPP_FT_RATE', 'OPP_FT_RATE_RANK']], on='TEAM_ID', how='left')
+    
+    table['TEAM_ID'] = table['TEAM_ID'].astype(int)
+    return table.reset_index(drop=True)
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
-def get_opponent_ft_rate(opponent_team_id: int) -> Dict[str, float]:
+def get_team_context(
+    team_id: int,
+    season: str = CURRENT_SEASON,
+    team_context: Optional[pd.DataFrame] = None
+) -> Dict:
+    """
+    Look up one team's row in the team context table.
+    
+    Args:
+        team_id: NBA team ID
+        season: Season string (used when team_context is not given)
+        team_context: Optional preloaded get_team_context_table() result
+    
+    Returns:
+        Dict of the team's context columns (empty dict if the team is missing)
+    """
+    if team_context is None:
+        team_context = get_team_context_table(season)
+    if team_context is None or len(team_context) == 0:
+        return {}
+    
+    rows = team_context[team_context['TEAM_ID'] == int(team_id)]
+    if len(rows) == 0:
+        return {}
+    return {k: v for k, v in rows.iloc[0].to_dict().items() if not pd.isna(v)}
+
+
+def get_team_pace(team_id: int, season: str = CURRENT_SEASON) -> float:
+    """
+    Get team's pace (possessions per game).
+    """
+    pace = get_team_context(team_id, season).get('PACE')
+    return round(float(pace), 1) if pace is not None else 100.0  # League average default
+
+
+def get_opponent_ft_rate(opponent_team_id: int, season: str = CURRENT_SEASON) -> Dict[str, float]:
     """
     Get opponent's Free Throw Rate allowed (FTA/FGA).
     Higher FT Rate = opponents get to the line more often against this team.
@@ -391,53 +536,34 @@ def get_opponent_ft_rate(opponent_team_id: int) -> Dict[str, float]:
     Returns:
         Dict with opp_ft_rate, opp_ft_rate_rank, league_avg_ft_rate
     """
-    try:
-        # Load the team defensive stats
-        _, opp_team_stats = tds.load_shooting_data()
-        
-        if opp_team_stats is None:
-            return {'opp_ft_rate': 25.0, 'opp_ft_rate_rank': 15, 'league_avg_ft_rate': 25.0}
-        
-        opp_def_stats = tds.get_team_defensive_stats(opponent_team_id, opp_team_stats)
-        
-        if opp_def_stats is None:
-            return {'opp_ft_rate': 25.0, 'opp_ft_rate_rank': 15, 'league_avg_ft_rate': 25.0}
-        
-        # Calculate league average FT Rate
-        league_avg_ft_rate = opp_team_stats['FT_RATE'].mean() * 100  # Convert to percentage
-        
-        return {
-            'opp_ft_rate': opp_def_stats.get('opp_ft_rate', 25.0),
-            'opp_ft_rate_rank': opp_def_stats.get('opp_ft_rate_rank', 15),
-            'league_avg_ft_rate': round(league_avg_ft_rate, 1)
-        }
-    except Exception as e:
-        print(f"Error getting opponent FT Rate: {e}")
-        return {'opp_ft_rate': 25.0, 'opp_ft_rate_rank': 15, 'league_avg_ft_rate': 25.0}
+    return _opponent_ft_rate_from_context(opponent_team_id, get_team_context_table(season))
+
+
+def _opponent_ft_rate_from_context(opponent_team_id: int, team_context: pd.DataFrame) -> Dict[str, float]:
+    """Opponent FT rate dict (see get_opponent_ft_rate) from a team context table."""
+    defaults = {'opp_ft_rate': 25.0, 'opp_ft_rate_rank': 15, 'league_avg_ft_rate': 25.0}
+    if team_context is None or 'OPP_FT_RATE' not in team_context.columns:
+        return defaults
+    
+    team = get_team_context(opponent_team_id, team_context=team_context)
+    if 'OPP_FT_RATE' not in team:
+        return defaults
+    
+    return {
+        'opp_ft_rate': float(team['OPP_FT_RATE']),
+        'opp_ft_rate_rank': int(team['OPP_FT_RATE_RANK']),
+        'league_avg_ft_rate': round(float(team_context['OPP_FT_RATE'].mean()), 1)
+    }
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
 def get_team_defensive_rating(team_id: int, season: str = CURRENT_SEASON) -> float:
     """
     Get team's defensive rating (points allowed per 100 possessions).
     """
-    try:
-        team_stats = endpoints.TeamDashboardByGeneralSplits(
-            team_id=team_id,
-            season=season,
-            measure_type_detailed_defense='Advanced',
-            per_mode_detailed='PerGame'
-        ).get_data_frames()[0]
-        
-        if 'DEF_RATING' in team_stats.columns and len(team_stats) > 0:
-            return round(team_stats['DEF_RATING'].iloc[0], 1)
-    except Exception as e:
-        print(f"Error fetching def rating for team {team_id}: {e}")
-    
-    return 110.0  # League average default
+    def_rating = get_team_context(team_id, season).get('DEF_RATING')
+    return round(float(def_rating), 1) if def_rating is not None else 110.0  # League average default
 
 
-@st.cache_data(ttl=1800, show_spinner=False)  # Cache for 30 minutes
 def get_team_defensive_rating_last_n(
     team_id: int,
     n_games: int = 5,
@@ -445,54 +571,37 @@ def get_team_defensive_rating_last_n(
 ) -> float:
     """
     Get team's defensive rating over last N games.
-    Uses LeagueDashTeamStats with last_n_games parameter (same approach as Teams page).
+    Uses LeagueDashTeamStats with last_n_games parameter (same approach as Teams page);
+    windows in TEAM_CONTEXT_WINDOWS come from the team context table.
     """
-    try:
-        # Use LeagueDashTeamStats with last_n_games parameter (same as Teams page)
-        league_stats = endpoints.LeagueDashTeamStats(
-            league_id_nullable='00',
-            measure_type_detailed_defense='Advanced',
-            pace_adjust='N',
-            per_mode_detailed='PerGame',
-            season=season,
-            season_type_all_star='Regular Season',
-            last_n_games=n_games
-        ).get_data_frames()[0]
-        
-        # Filter by team_id
-        team_stats = league_stats[league_stats['TEAM_ID'] == team_id]
-        
-        if 'DEF_RATING' in team_stats.columns and len(team_stats) > 0:
-            return round(team_stats['DEF_RATING'].iloc[0], 1)
-    except Exception as e:
-        print(f"Error fetching L{n_games} def rating for team {team_id}: {e}")
+    if n_games in TEAM_CONTEXT_WINDOWS:
+        def_rating = get_team_context(team_id, season).get(f"DEF_RATING_L{n_games}" if n_games else 'DEF_RATING')
+    else:
+        league_stats = get_league_team_stats(season, 'Advanced', n_games)
+        team_stats = league_stats[league_stats['TEAM_ID'] == team_id] if len(league_stats) > 0 else league_stats
+        def_rating = team_stats['DEF_RATING'].iloc[0] if 'DEF_RATING' in team_stats.columns and len(team_stats) > 0 else None
     
-    return 110.0  # Default
+    return round(float(def_rating), 1) if def_rating is not None else 110.0  # Default
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
-def get_league_averages(season: str = CURRENT_SEASON) -> Dict[str, float]:
+def get_league_averages(season: str = CURRENT_SEASON, team_context: Optional[pd.DataFrame] = None) -> Dict[str, float]:
     """
     Get league average stats for normalization.
     """
-    try:
-        league_stats = endpoints.LeagueDashTeamStats(
-            season=season,
-            measure_type_detailed_defense='Advanced',
-            per_mode_detailed='PerGame'
-        ).get_data_frames()[0]
-        
-        return {
-            'pace': round(league_stats['PACE'].mean(), 1),
-            'def_rating': round(league_stats['DEF_RATING'].mean(), 1),
-            'off_rating': round(league_stats['OFF_RATING'].mean(), 1),
-        }
-    except Exception as e:
-        print(f"Error fetching league averages: {e}")
+    if team_context is None:
+        team_context = get_team_context_table(season)
+    if team_context is None or not all(c in team_context.columns for c in ['PACE', 'DEF_RATING', 'OFF_RATING']):
         return {'pace': 100.0, 'def_rating': 110.0, 'off_rating': 110.0}
+    
+    return {
+        'pace': round(team_context['PACE'].mean(), 1),
+        'def_rating': round(team_context['DEF_RATING'].mean(), 1),
+        'off_rating': round(team_context['OFF_RATING'].mean(), 1),
+    }
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False, shared=True)
+@snap.snapshotted('player_advanced_stats')
 def get_bulk_player_advanced_stats(season: str = CURRENT_SEASON) -> pd.DataFrame:
     """
     Fetch ALL players' advanced stats (including usage rate) in ONE API call.
@@ -536,7 +645,7 @@ def get_usage_rate_from_bulk(player_id: str, bulk_advanced_stats: pd.DataFrame)
     return 20.0  # League average default
 
 
-@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@dc.cached(ttl=3600, show_spinner=False)  # Cache for 1 hour
 def get_player_usage_rate(player_id: str, season: str = CURRENT_SEASON) -> float:
     """
     Get player's usage rate. Falls back to individual fetch if bulk not available.
@@ -607,130 +716,72 @@ def calculate_days_rest(team_id: int, game_date: str) -> int:
         return 2  # Default
 
 
-def get_all_prediction_features(
-    player_id: str,
-    player_team_id: int,
+def get_opponent_features(
     opponent_team_id: int,
     opponent_abbr: str,
-    game_date: str,
-    is_home: bool,
-    bulk_game_logs: pd.DataFrame = None,
-    bulk_advanced_stats: pd.DataFrame = None,
-    bulk_misc_stats: pd.DataFrame = None,
-    bulk_drives_stats: pd.DataFrame = None,
-    bulk_offensive_synergy: Dict[str, pd.DataFrame] = None,
-    use_similar_players: bool = False
+    team_context: Optional[pd.DataFrame] = None
 ) -> Dict:
     """
-    Gather all features needed for prediction.
+    Gather opponent team stats and league averages used for normalization.
+    These depend only on the opponent, so slate-level callers can compute
+    them once per team and share the result across every player facing it.
     
     Args:
-        player_id: NBA API player ID
-        player_team_id: Player's team ID (for rest calculation)
-        opponent_team_id: Opponent's team ID
-        opponent_abbr: Opponent's team abbreviation (e.g., 'LAL')
-        game_date: Date of the game (YYYY-MM-DD)
-        is_home: Whether player's team is playing at home
-        bulk_game_logs: Optional pre-fetched bulk game logs (for batch processing)
-        bulk_advanced_stats: Optional pre-fetched bulk advanced stats (for batch processing)
-        bulk_misc_stats: Optional pre-fetched bulk misc stats (for batch processing)
-        bulk_drives_stats: Optional pre-fetched bulk drives stats (for batch processing)
-        use_similar_players: Whether to fetch similar players data (skip for batch to improve performance)
+        opponent_team_id: Opponent NBA team ID
+        opponent_abbr: Opponent abbreviation
+        team_context: Optional preloaded get_team_context_table() result
     
     Returns:
-        Dict with all prediction features
+        Dict with 'opponent', 'league_avg_ft_rate' and 'league_avg' keys
     """
-    import time
-    features_start = time.time()
-    features = {}
-    
-    # Get player game logs - use bulk if provided, otherwise fetch individually
-    logs_start = time.time()
-    if bulk_game_logs is not None and len(bulk_game_logs) > 0:
-        game_logs = get_player_logs_from_bulk(player_id, bulk_game_logs)
-    else:
-        game_logs = get_player_game_logs(player_id)
-    logs_time = time.time() - logs_start
+    if team_context is None:
+        team_context = get_team_context_table()
     
-    # Store game_logs in features for reuse in prediction model
-    features['game_logs'] = game_logs
-    
-    # Player rolling averages
-    rolling_start = time.time()
-    features['rolling_avgs'] = get_player_rolling_averages(game_logs)
-    rolling_time = time.time() - rolling_start
-    
-    # Season PPG for tier determination (stable metric)
-    features['season_ppg'] = features['rolling_avgs'].get('Season', {}).get('PTS', 0.0)
-    
-    # Home/Away splits
-    features['home_away_splits'] = get_player_home_away_splits(game_logs)
-    features['is_home'] = is_home
-    
-    # Historical vs opponent
-    features['vs_opponent'] = get_player_vs_opponent_history(game_logs, opponent_abbr)
-    
-    # Rest days (using team schedule for accuracy)
-    features['days_rest'] = calculate_days_rest(player_team_id, game_date)
-    features['is_back_to_back'] = utils.is_back_to_back(features['days_rest'])
+    features = {}
     
-    # Opponent stats
-    opp_ft_rate_stats = get_opponent_ft_rate(opponent_team_id)
+    # Opponent stats (one row of the bulk team context table)
+    team = get_team_context(opponent_team_id, team_context=team_context)
+    opp_ft_rate_stats = _opponent_ft_rate_from_context(opponent_team_id, team_context)
     features['opponent'] = {
         'team_id': opponent_team_id,
         'abbr': opponent_abbr,
-        'pace': get_team_pace(opponent_team_id),
-        'def_rating': get_team_defensive_rating(opponent_team_id),
-        'def_rating_L5': get_team_defensive_rating_last_n(opponent_team_id, 5),
+        'pace': round(float(team.get('PACE', 100.0)), 1),
+        'def_rating': round(float(team.get('DEF_RATING', 110.0)), 1),
+        'def_rating_L5': round(float(team.get('DEF_RATING_L5', 110.0)), 1),
         'ft_rate_allowed': opp_ft_rate_stats.get('opp_ft_rate', 25.0),
         'ft_rate_allowed_rank': opp_ft_rate_stats.get('opp_ft_rate_rank', 15),
     }
     features['league_avg_ft_rate'] = opp_ft_rate_stats.get('league_avg_ft_rate', 25.0)
     
     # League averages for normalization
-    features['league_avg'] = get_league_averages()
-    
-    # Player usage - use bulk if provided, otherwise fetch individually
-    if bulk_advanced_stats is not None and len(bulk_advanced_stats) > 0:
-        features['usage_rate'] = get_usage_rate_from_bulk(player_id, bulk_advanced_stats)
-    else:
-        features['usage_rate'] = get_player_usage_rate(player_id)
-    
-    # Minutes trend
-    features['minutes_trend'] = get_player_minutes_trend(game_logs)
-    
-    # Stat trends
-    if len(game_logs) >= 5:
-        features['stat_trends'] = {
-            'PTS': utils.calculate_trend(game_logs['PTS'].tolist()),
-            'REB': utils.calculate_trend(game_logs['REB'].tolist()),
-            'AST': utils.calculate_trend(game_logs['AST'].tolist()),
-            'FTM': utils.calculate_trend(game_logs['FTM'].tolist()) if 'FTM' in game_logs.columns else 0.0,
-            'FG3M': utils.calculate_trend(game_logs['FG3M'].tolist()) if 'FG3M' in game_logs.columns else 0.0,
-        }
-    else:
-        features['stat_trends'] = {'PTS': 0.0, 'REB': 0.0, 'AST': 0.0, 'FTM': 0.0, 'FG3M': 0.0}
+    features['league_avg'] = get_league_averages(team_context=team_context)
     
-    # Consistency scores
-    if len(game_logs) >= 5:
-        features['consistency'] = {
-            'PTS': utils.calculate_consistency(game_logs['PTS'].tolist()),
-            'REB': utils.calculate_consistency(game_logs['REB'].tolist()),
-            'AST': utils.calculate_consistency(game_logs['AST'].tolist()),
-            'FTM': utils.calculate_consistency(game_logs['FTM'].tolist()) if 'FTM' in game_logs.columns else 0.0,
-            'FG3M': utils.calculate_consistency(game_logs['FG3M'].tolist()) if 'FG3M' in game_logs.columns else 0.0,
-        }
-    else:
-        features['consistency'] = {'PTS': 0.0, 'REB': 0.0, 'AST': 0.0, 'FTM': 0.0, 'FG3M': 0.0}
+    return features
+
+
+def add_context_features(
+    features: Dict,
+    player_id: str,
+    opponent_team_id: int,
+    opponent_abbr: str,
+    bulk_game_logs: pd.DataFrame = None,
+    bulk_drives_stats: pd.DataFrame = None,
+    bulk_offensive_synergy: Dict[str, pd.DataFrame] = None,
+    use_similar_players: bool = False,
+    similar_players: Optional[List[Dict]] = None,
+    opponent_cube: Optional[pd.DataFrame] = None
+) -> Dict:
+    """
+    Add matchup, synergy, positional defense, drives and similar-players features.
+    Expects features to already contain the 'opponent' and 'league_avg_ft_rate'
+    keys from get_opponent_features().
     
-    # Player's season FT Rate (for FTM prediction adjustment)
-    if len(game_logs) > 0 and all(col in game_logs.columns for col in ['FTA', 'FGA']):
-        total_fta = game_logs['FTA'].sum()
-        total_fga = game_logs['FGA'].sum()
-        features['player_ft_rate'] = round(total_fta / total_fga * 100, 1) if total_fga > 0 else 0.0
-    else:
-        features['player_ft_rate'] = 25.0  # Default ~25% FT rate
+    Batch callers can pass similar_players (from ps.get_similar_players_many) and
+    opponent_cube (from ps.get_opponent_performance_cube) to skip those lookups.
     
+    Returns:
+        The same features dict, updated in place
+    """
     # Matchup-specific stats (PTS_PAINT, PTS_FB, PTS_2ND_CHANCE)
     # This includes player scoring breakdown and opponent defensive vulnerabilities
     try:
@@ -845,10 +896,7 @@ def get_all_prediction_features(
             'ast_description': 'Data unavailable',
         }
     
-    # Similar players vs opponent adjustment
-    # Skip for batch predictions to improve performance (can be enabled per-player in UI)
-    # Only fetch if explicitly requested (not in batch mode)
-    
+    # Similar players vs opponent adjustment (only if requested)
     if use_similar_players and bulk_game_logs is not None and len(bulk_game_logs) > 0:
         try:
             similar_players_data = ps.get_similar_players_vs_opponent(
@@ -857,8 +905,10 @@ def get_all_prediction_features(
                 game_logs_df=bulk_game_logs,
                 opponent_abbr=opponent_abbr,
                 season=CURRENT_SEASON,
-                n_similar=10,
-                min_games_vs_opponent=1
+                n_similar=ps.SIMILAR_VS_OPPONENT_N,
+                min_games_vs_opponent=1,
+                similar_players=similar_players,
+                opponent_cube=opponent_cube
             )
             features['similar_players'] = similar_players_data
         except Exception as e:
@@ -872,7 +922,6 @@ def get_all_prediction_features(
                 'similar_player_data': []
             }
     else:
-        # Skip similar players (default for batch predictions)
         features['similar_players'] = {
             'pts_adjustment_factor': 1.0,
             'reb_adjustment_factor': 1.0,
@@ -882,6 +931,133 @@ def get_all_prediction_features(
             'similar_player_data': []
         }
     
+    return features
+
+
+def get_all_prediction_features(
+    player_id: str,
+    player_team_id: int,
+    opponent_team_id: int,
+    opponent_abbr: str,
+    game_date: str,
+    is_home: bool,
+    bulk_game_logs: pd.DataFrame = None,
+    bulk_advanced_stats: pd.DataFrame = None,
+    bulk_misc_stats: pd.DataFrame = None,
+    bulk_drives_stats: pd.DataFrame = None,
+    bulk_offensive_synergy: Dict[str, pd.DataFrame] = None,
+    use_similar_players: bool = True
+) -> Dict:
+    """
+    Gather all features needed for prediction.
+    
+    Args:
+        player_id: NBA API player ID
+        player_team_id: Player's team ID (for rest calculation)
+        opponent_team_id: Opponent's team ID
+        opponent_abbr: Opponent's team abbreviation (e.g., 'LAL')
+        game_date: Date of the game (YYYY-MM-DD)
+        is_home: Whether player's team is playing at home
+        bulk_game_logs: Optional pre-fetched bulk game logs (for batch processing)
+        bulk_advanced_stats: Optional pre-fetched bulk advanced stats (for batch processing)
+        bulk_misc_stats: Optional pre-fetched bulk misc stats (for batch processing)
+        bulk_drives_stats: Optional pre-fetched bulk drives stats (for batch processing)
+        use_similar_players: Whether to apply the similar-players-vs-opponent adjustment
+                             (needs bulk_game_logs; their opponent cube is built once per batch)
+    
+    Returns:
+        Dict with all prediction features
+    """
+    import time
+    features_start = time.time()
+    features = {}
+    
+    # Get player game logs - use bulk if provided, otherwise fetch individually
+    logs_start = time.time()
+    if bulk_game_logs is not None and len(bulk_game_logs) > 0:
+        game_logs = get_player_logs_from_bulk(player_id, bulk_game_logs)
+    else:
+        game_logs = get_player_game_logs(player_id)
+    logs_time = time.time() - logs_start
+    
+    # Store game_logs in features for reuse in prediction model
+    features['game_logs'] = game_logs
+    
+    # Player rolling averages
+    rolling_start = time.time()
+    features['rolling_avgs'] = get_player_rolling_averages(game_logs)
+    rolling_time = time.time() - rolling_start
+    
+    # Season PPG for tier determination (stable metric)
+    features['season_ppg'] = features['rolling_avgs'].get('Season', {}).get('PTS', 0.0)
+    
+    # Home/Away splits
+    features['home_away_splits'] = get_player_home_away_splits(game_logs)
+    features['is_home'] = is_home
+    
+    # Historical vs opponent
+    features['vs_opponent'] = get_player_vs_opponent_history(game_logs, opponent_abbr)
+    
+    # Rest days (using team schedule for accuracy)
+    features['days_rest'] = calculate_days_rest(player_team_id, game_date)
+    features['is_back_to_back'] = utils.is_back_to_back(features['days_rest'])
+    
+    # Opponent stats and league averages for normalization
+    features.update(get_opponent_features(opponent_team_id, opponent_abbr))
+    
+    # Player usage - use bulk if provided, otherwise fetch individually
+    if bulk_advanced_stats is not None and len(bulk_advanced_stats) > 0:
+        features['usage_rate'] = get_usage_rate_from_bulk(player_id, bulk_advanced_stats)
+    else:
+        features['usage_rate'] = get_player_usage_rate(player_id)
+    
+    # Minutes trend
+    features['minutes_trend'] = get_player_minutes_trend(game_logs)
+    
+    # Stat trends
+    if len(game_logs) >= 5:
+        features['stat_trends'] = {
+            'PTS': utils.calculate_trend(game_logs['PTS'].tolist()),
+            'REB': utils.calculate_trend(game_logs['REB'].tolist()),
+            'AST': utils.calculate_trend(game_logs['AST'].tolist()),
+            'FTM': utils.calculate_trend(game_logs['FTM'].tolist()) if 'FTM' in game_logs.columns else 0.0,
+            'FG3M': utils.calculate_trend(game_logs['FG3M'].tolist()) if 'FG3M' in game_logs.columns else 0.0,
+        }
+    else:
+        features['stat_trends'] = {'PTS': 0.0, 'REB': 0.0, 'AST': 0.0, 'FTM': 0.0, 'FG3M': 0.0}
+    
+    # Consistency scores
+    if len(game_logs) >= 5:
+        features['consistency'] = {
+            'PTS': utils.calculate_consistency(game_logs['PTS'].tolist()),
+            'REB': utils.calculate_consistency(game_logs['REB'].tolist()),
+            'AST': utils.calculate_consistency(game_logs['AST'].tolist()),
+            'FTM': utils.calculate_consistency(game_logs['FTM'].tolist()) if 'FTM' in game_logs.columns else 0.0,
+            'FG3M': utils.calculate_consistency(game_logs['FG3M'].tolist()) if 'FG3M' in game_logs.columns else 0.0,
+        }
+    else:
+        features['consistency'] = {'PTS': 0.0, 'REB': 0.0, 'AST': 0.0, 'FTM': 0.0, 'FG3M': 0.0}
+    
+    # Player's season FT Rate (for FTM prediction adjustment)
+    if len(game_logs) > 0 and all(col in game_logs.columns for col in ['FTA', 'FGA']):
+        total_fta = game_logs['FTA'].sum()
+        total_fga = game_logs['FGA'].sum()
+        features['player_ft_rate'] = round(total_fta / total_fga * 100, 1) if total_fga > 0 else 0.0
+    else:
+        features['player_ft_rate'] = 25.0  # Default ~25% FT rate
+    
+    # Matchup, synergy, positional defense, drives and similar players
+    add_context_features(
+        features,
+        player_id=player_id,
+        opponent_team_id=opponent_team_id,
+        opponent_abbr=opponent_abbr,
+        bulk_game_logs=bulk_game_logs,
+        bulk_drives_stats=bulk_drives_stats,
+        bulk_offensive_synergy=bulk_offensive_synergy,
+        use_similar_players=use_similar_players
+    )
+    
     features_total_time = time.time() - features_start
     
     return features
@@ -10,6 +10,8 @@ from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
 import prediction_utils as utils
 import prediction_features as features
+import slate_features as sf
+import player_resolver as pr
 import matchup_stats as ms
 
 
@@ -74,9 +76,12 @@ class PlayerStatPredictor:
         
         # 2. Calculate weighted average (exponential decay)
         # This gives more weight to recent games
-        # Use game_logs from features dict (already cached) instead of re-fetching
-        game_logs = player_features.get('game_logs', pd.DataFrame())
-        if len(game_logs) > 0 and stat in game_logs.columns:
+        # Use precomputed slate values or game_logs from features dict (already cached) instead of re-fetching
+        weighted_avgs = player_features.get('weighted_avgs', {})
+        game_logs = player_features.get('game_logs')
+        if stat in weighted_avgs:
+            weighted_avg = weighted_avgs[stat]
+        elif game_logs is not None and len(game_logs) > 0 and stat in game_logs.columns:
             recent_values = game_logs[stat].head(10).tolist()
             weighted_avg = utils.weighted_average(recent_values, decay=0.85)
         else:
@@ -790,7 +795,9 @@ class PlayerStatPredictor:
         Returns:
             Dict with 'ceiling', 'floor', 'median', 'variance', 'std_dev'
         """
-        game_logs = player_features.get('game_logs', pd.DataFrame())
+        game_logs = player_features.get('game_logs')
+        if game_logs is None:
+            game_logs = pd.DataFrame()
         
         # Default values (use median prediction if no history)
         median_fpts = predictions.get('FPTS', Prediction('FPTS', 0.0, 'low', {}, {})).value
@@ -799,7 +806,22 @@ class PlayerStatPredictor:
         variance = 0.0
         std_dev = 0.0
         
-        if len(game_logs) > 0:
+        # Slate features carry a precomputed FPTS distribution instead of game_logs
+        fpts_dist = player_features.get('fpts_distribution')
+        if fpts_dist is not None:
+            n_games = fpts_dist.get('n_games', 0)
+            if n_games >= 3:
+                if n_games >= 5:  # Need at least 5 games for meaningful percentiles
+                    floor_fpts = float(fpts_dist['p25'])
+                    ceiling_fpts = float(fpts_dist['p75'])
+                else:
+                    # With 3-4 games, use min/max/median
+                    floor_fpts = float(fpts_dist['min'])
+                    ceiling_fpts = float(fpts_dist['max'])
+                variance = float(fpts_dist['variance'])
+                std_dev = float(np.sqrt(variance))
+                median_fpts = predictions.get('FPTS', Prediction('FPTS', float(fpts_dist['p50']), 'low', {}, {})).value
+        elif len(game_logs) > 0:
             # Calculate FPTS for each game using Underdog formula
             # PTS*1 + REB*1.2 + AST*1.5 + STL*3 + BLK*3 - TOV*1
             required_cols = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV']
@@ -861,7 +883,7 @@ def generate_prediction(
     bulk_advanced_stats: pd.DataFrame = None,
     bulk_drives_stats: pd.DataFrame = None,
     bulk_offensive_synergy: Dict[str, pd.DataFrame] = None,
-    use_similar_players: bool = False,
+    use_similar_players: bool = True,
     projected_minutes: Optional[float] = None,
     return_ceiling_floor: bool = False
 ) -> Dict[str, Prediction]:
@@ -879,6 +901,7 @@ def generate_prediction(
         bulk_advanced_stats: Optional pre-fetched bulk advanced stats (for batch processing)
         bulk_drives_stats: Optional pre-fetched bulk drives stats (for batch processing)
         bulk_offensive_synergy: Optional pre-fetched bulk offensive synergy data (for batch processing)
+        use_similar_players: Apply the similar-players-vs-opponent adjustment (needs bulk_game_logs)
         return_ceiling_floor: If True, returns dict with 'predictions' and 'ceiling_floor' keys
     
     Returns:
@@ -904,8 +927,28 @@ def generate_prediction(
     if projected_minutes is not None:
         player_features['projected_minutes'] = projected_minutes
     
-    # Generate predictions
-    predictor = PlayerStatPredictor()
+    result = predict_from_features(player_features)
+    
+    if return_ceiling_floor:
+        return result
+    
+    return result['predictions']
+
+
+def predict_from_features(player_features: Dict, predictor: PlayerStatPredictor = None) -> Dict:
+    """
+    Run the predictor on an already-built feature dict.
+    
+    Args:
+        player_features: Dict from get_all_prediction_features() or get_slate_prediction_features()
+        predictor: Optional predictor instance to reuse across players
+    
+    Returns:
+        Dict with 'predictions' (stat -> Prediction) and 'ceiling_floor'
+    """
+    if predictor is None:
+        predictor = PlayerStatPredictor()
+    
     predictions = predictor.predict_all_stats(player_features)
     
     # Calculate ceiling/floor for FPTS
@@ -921,13 +964,10 @@ def generate_prediction(
         fpts_pred.factors['variance'] = str(ceiling_floor['variance'])
         fpts_pred.factors['std_dev'] = str(ceiling_floor['std_dev'])
     
-    if return_ceiling_floor:
-        return {
-            'predictions': predictions,
-            'ceiling_floor': ceiling_floor
-        }
-    
-    return predictions
+    return {
+        'predictions': predictions,
+        'ceiling_floor': ceiling_floor
+    }
 
 
 def format_predictions_for_display(predictions: Dict[str, Prediction]) -> pd.DataFrame:
@@ -1031,12 +1071,54 @@ def generate_predictions_for_game(
     
     bulk_fetch_total = time.time() - bulk_fetch_start
     
-    # Track per-player timing
-    player_times = []
+    bulk_team_game_logs = features.get_bulk_team_game_logs()
     
-    for idx, player_id in enumerate(player_ids):
-        player_start_time = time.time()
-        player_name = player_names.get(player_id, f"Player {player_id}")
+    # Build slate rows for every player in this matchup
+    slate_rows = build_game_slate_rows(
+        player_ids, player_team_ids, away_team_id, home_team_id,
+        away_team_abbr, home_team_abbr, game_date
+    )
+    
+    if not slate_rows:
+        return all_predictions
+    
+    # Compute game-log features for all players in one columnar pass
+    player_feature_table = sf.get_player_feature_table(bulk_game_logs=bulk_game_logs)
+    slate_features = sf.get_slate_prediction_features(
+        slate_rows,
+        bulk_game_logs=bulk_game_logs,
+        bulk_team_game_logs=bulk_team_game_logs,
+        bulk_advanced_stats=bulk_advanced_stats,
+        bulk_drives_stats=bulk_drives_stats,
+        bulk_offensive_synergy=bulk_offensive_synergy,
+        player_feature_table=player_feature_table
+    )
+    
+    all_predictions = predict_slate_rows(
+        slate_rows, slate_features, player_names, away_team_abbr, home_team_abbr,
+        total=total, progress_callback=progress_callback
+    )
+    
+    total_time = time.time() - total_start_time
+    
+    return all_predictions
+
+
+def build_game_slate_rows(
+    player_ids: List[str],
+    player_team_ids: Dict[str, int],
+    away_team_id: int,
+    home_team_id: int,
+    away_team_abbr: str,
+    home_team_abbr: str,
+    game_date: str
+) -> List[Dict]:
+    """
+    Slate rows (see slate_features.build_slate_frame) for the players in one game.
+    Players whose team is not in the matchup are skipped.
+    """
+    slate_rows = []
+    for player_id in player_ids:
         player_team_id = player_team_ids.get(player_id)
         
         if not player_team_id:
@@ -1054,53 +1136,73 @@ def generate_predictions_for_game(
         else:
             continue  # Player not in this matchup
         
+        slate_rows.append({
+            'player_id': player_id,
+            'team_id': int(player_team_id),
+            'opponent_team_id': int(opponent_team_id),
+            'opponent_abbr': opponent_abbr,
+            'game_date': game_date,
+            'is_home': is_home
+        })
+    
+    return slate_rows
+
+
+def predict_slate_rows(
+    slate_rows: List[Dict],
+    slate_features: List[Dict],
+    player_names: Dict[str, str],
+    away_team_abbr: str,
+    home_team_abbr: str,
+    total: int = None,
+    progress_callback=None
+) -> Dict[str, Dict]:
+    """
+    Run the predictor over precomputed slate features.
+    
+    Args:
+        slate_rows: Rows from build_game_slate_rows()
+        slate_features: Feature dicts from slate_features.get_slate_prediction_features()
+        player_names: Dict of player_id -> player_name
+        away_team_abbr: Away team abbreviation
+        home_team_abbr: Home team abbreviation
+        total: Player count reported to progress_callback (default: len(slate_rows))
+        progress_callback: Optional callback(current, total, player_name)
+    
+    Returns:
+        Dict of player_id -> {'predictions', 'player_name', 'opponent_abbr',
+        'is_home', 'team_abbr', 'ceiling_floor'}
+    """
+    all_predictions = {}
+    total = len(slate_rows) if total is None else total
+    predictor = PlayerStatPredictor()
+    
+    for idx, (row, player_features) in enumerate(zip(slate_rows, slate_features)):
+        player_id = row['player_id']
+        player_name = player_names.get(player_id, f"Player {player_id}")
+        is_home = row['is_home']
+        
         # Update progress
         if progress_callback:
             progress_callback(idx + 1, total, player_name)
         
         try:
-            # Generate predictions for this player using bulk data
-            # Skip similar players for batch predictions (too slow)
-            pred_start = time.time()
-            result = generate_prediction(
-                player_id=player_id,
-                player_team_id=int(player_team_id),
-                opponent_team_id=int(opponent_team_id),
-                opponent_abbr=opponent_abbr,
-                game_date=game_date,
-                is_home=is_home,
-                bulk_game_logs=bulk_game_logs,
-                bulk_advanced_stats=bulk_advanced_stats,
-                bulk_drives_stats=bulk_drives_stats,
-                bulk_offensive_synergy=bulk_offensive_synergy,
-                use_similar_players=False,  # Skip for batch to improve performance
-                return_ceiling_floor=True
-            )
-            predictions = result['predictions']
-            ceiling_floor = result['ceiling_floor']
-            
-            pred_time = time.time() - pred_start
-            player_total_time = time.time() - player_start_time
-            
-            player_times.append(player_total_time)
+            player_features['player_id'] = player_id
+            result = predict_from_features(player_features, predictor=predictor)
             
             all_predictions[player_id] = {
-                'predictions': predictions,
+                'predictions': result['predictions'],
                 'player_name': player_name,
-                'opponent_abbr': opponent_abbr,
+                'opponent_abbr': row['opponent_abbr'],
                 'is_home': is_home,
                 'team_abbr': home_team_abbr if is_home else away_team_abbr,
-                'ceiling_floor': ceiling_floor
+                'ceiling_floor': result['ceiling_floor']
             }
         except Exception as e:
             # Log error but continue with other players
-            player_total_time = time.time() - player_start_time
             print(f"Error generating predictions for {player_name}: {e}")
             continue
     
-    total_time = time.time() - total_start_time
-    avg_player_time = sum(player_times) / len(player_times) if player_times else 0
-    
     return all_predictions
 
 
@@ -1160,6 +1262,9 @@ def find_best_value_plays(
     
     plays = []
     
+    # Index prop names once; each player is then a dictionary lookup
+    prop_resolver = pr.PlayerResolver.from_names(all_props.keys())
+    
     for player_id, player_data in all_predictions.items():
         predictions = player_data.get('predictions', {})
         player_name = player_data.get('player_name', '')
@@ -1168,15 +1273,8 @@ def find_best_value_plays(
         is_home = player_data.get('is_home', True)
         
         # Find matching props for this player
-        player_name_lower = player_name.lower().strip()
-        player_props = None
-        
-        # Try to find props with fuzzy matching
-        for prop_name, props in all_props.items():
-            # Check if names match
-            if _names_match(prop_name, player_name_lower):
-                player_props = props
-                break
+        prop_name = prop_resolver.resolve(player_name)
+        player_props = all_props[prop_name] if prop_name is not None else None
         
         if not player_props:
             continue
@@ -1286,30 +1384,3 @@ def find_best_value_plays(
             print(f"⚠️ Systematic bias detected: Average edge = {avg_edge:.2f} ({over_count} Over, {under_count} Under)")
     
     return plays
-
-
-def _names_match(name1: str, name2: str) -> bool:
-    """Check if two player names match (fuzzy matching)."""
-    if not name1 or not name2:
-        return False
-    
-    name1 = name1.lower().strip()
-    name2 = name2.lower().strip()
-    
-    # Exact match
-    if name1 == name2:
-        return True
-    
-    # One contains the other
-    if name1 in name2 or name2 in name1:
-        return True
-    
-    # Check if major parts match
-    parts1 = set(name1.replace(',', '').split())
-    parts2 = set(name2.replace(',', '').split())
-    
-    if len(parts1 & parts2) >= 2:
-        return True
-    
-    return False
-
@@ -6,7 +6,7 @@ Data can be used to train ML models.
 
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterable, Iterator, List
 from dataclasses import dataclass, asdict
 from datetime import datetime, date
 import json
@@ -30,6 +30,20 @@ def get_supabase_client():
 PREDICTIONS_FILE = "predictions_log.csv"
 ACCURACY_SUMMARY_FILE = "accuracy_summary.json"
 
+# PostgREST caps responses at 1000 rows, so queries are read page by page
+QUERY_PAGE_SIZE = 1000
+
+# Box score columns logged as stats; PRA, RA and FPTS are derived from them
+BOX_SCORE_STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'FG3M', 'FTM']
+# Rows per apply_prediction_actuals call when reconciling actual results
+ACTUALS_BATCH_SIZE = 5000
+
+ML_FEATURE_COLUMNS = [
+    'season_avg', 'l5_avg', 'l10_avg', 'vs_opponent_avg',
+    'opp_def_rating', 'opp_pace', 'usage_rate',
+    'is_home', 'days_rest'
+]
+
 
 @dataclass
 class PredictionRecord:
@@ -103,6 +117,9 @@ def update_actual_result(
 ):
     """
     Update a prediction record with the actual result.
+    
+    For a whole night of games use reconcile_actual_results(), which grades every
+    open prediction for the date in one pass.
     """
     # Try Supabase first
     if is_supabase_configured():
@@ -141,42 +158,350 @@ def update_actual_result(
     return False
 
 
-def get_predictions_dataframe() -> pd.DataFrame:
+def actuals_from_game_logs(game_logs: pd.DataFrame, game_date: Optional[str] = None) -> pd.DataFrame:
     """
-    Load all predictions as a DataFrame from Supabase (or CSV as fallback).
+    Actual stat values from player game logs, one row per (player, game date, stat).
+    
+    Args:
+        game_logs: Player game logs (PLAYER_ID, GAME_DATE and box score columns),
+                   e.g. from get_bulk_player_game_logs()
+        game_date: Only this date ('YYYY-MM-DD')
+    
+    Returns:
+        DataFrame with player_id (str), game_date (str), stat, actual
+    """
+    columns = ['player_id', 'game_date', 'stat', 'actual']
+    if game_logs is None or len(game_logs) == 0:
+        return pd.DataFrame(columns=columns)
+    
+    logs = game_logs.copy()
+    logs['game_date'] = pd.to_datetime(logs['GAME_DATE']).dt.strftime('%Y-%m-%d')
+    if game_date is not None:
+        logs = logs[logs['game_date'] == _date_str(game_date)]
+    if len(logs) == 0:
+        return pd.DataFrame(columns=columns)
+    
+    logs['player_id'] = logs['PLAYER_ID'].astype(int).astype(str)
+    box = logs[[c for c in BOX_SCORE_STATS if c in logs.columns]].apply(pd.to_numeric, errors='coerce').fillna(0.0)
+    box = box.reindex(columns=BOX_SCORE_STATS, fill_value=0.0)
+    box['PRA'] = box['PTS'] + box['REB'] + box['AST']
+    box['RA'] = box['REB'] + box['AST']
+    box['FPTS'] = (
+        box['PTS'] + box['REB'] * 1.2 + box['AST'] * 1.5 +
+        box['STL'] * 3.0 + box['BLK'] * 3.0 - box['TOV']
+    )
+    box[['player_id', 'game_date']] = logs[['player_id', 'game_date']]
+    
+    actuals = box.melt(id_vars=['player_id', 'game_date'], var_name='stat', value_name='actual')
+    actuals['actual'] = actuals['actual'].round(2)
+    return actuals.drop_duplicates(['player_id', 'game_date', 'stat'], keep='first')[columns]
+
+
+def _apply_actuals_supabase(supabase, updates: pd.DataFrame) -> int:
+    """Write actuals by prediction id with batched apply_prediction_actuals calls."""
+    updated = 0
+    records = [{'id': int(row.id), 'actual': float(row.actual)} for row in updates.itertuples(index=False)]
+    for offset in range(0, len(records), ACTUALS_BATCH_SIZE):
+        batch = records[offset:offset + ACTUALS_BATCH_SIZE]
+        try:
+            result = supabase.rpc('apply_prediction_actuals', {'p_updates': batch}).execute()
+            updated += int(result.data or 0)
+        except Exception as e:
+            # Function not deployed yet: fall back to one update per prediction
+            logger.warning(f"apply_prediction_actuals unavailable ({e}); updating {len(batch)} rows individually.")
+            for record in batch:
+                supabase.table('predictions').update({'actual': record['actual']}).eq('id', record['id']).execute()
+                updated += 1
+    return updated
+
+
+def reconcile_actual_results(game_date: str, game_logs: pd.DataFrame) -> Dict:
+    """
+    Fill in actual results for every open (ungraded) prediction of a date in one pass.
+    
+    Open predictions are joined against the night's game logs on (player_id, stat)
+    and written back in batches (Supabase) or with a single rewrite of the CSV log.
+    Predictions without a matching game log (DNP, postponed game) stay open and are
+    reported as orphaned.
+    
+    Args:
+        game_date: Game date ('YYYY-MM-DD')
+        game_logs: Player game logs covering game_date
+    
+    Returns:
+        Dict with game_date, open, matched, orphaned and updated counts, plus the
+        orphaned player IDs
     """
+    game_date = _date_str(game_date)
+    actuals = actuals_from_game_logs(game_logs, game_date)[['player_id', 'stat', 'actual']]
+    report = {'game_date': game_date, 'open': 0, 'matched': 0, 'orphaned': 0, 'updated': 0, 'orphaned_players': []}
+    
+    def join(open_df: pd.DataFrame) -> pd.DataFrame:
+        joined = open_df.assign(player_id=open_df['player_id'].astype(str)).merge(
+            actuals, on=['player_id', 'stat'], how='left', suffixes=('_old', '')
+        )
+        orphaned = joined[joined['actual'].isna()]
+        report['open'] = len(open_df)
+        report['matched'] = len(joined) - len(orphaned)
+        report['orphaned'] = len(orphaned)
+        report['orphaned_players'] = sorted(orphaned['player_id'].unique().tolist())
+        return joined[joined['actual'].notna()]
+    
     # Try Supabase first
     if is_supabase_configured():
         try:
             supabase = get_supabase_client()
             if supabase:
-                result = supabase.table('predictions').select('*').order('timestamp', desc=True).execute()
-                
-                if result.data:
-                    df = pd.DataFrame(result.data)
-                    # Convert timestamp to datetime if present
-                    if 'timestamp' in df.columns:
-                        df['timestamp'] = pd.to_datetime(df['timestamp'])
-                    logger.debug(f"Loaded {len(df)} predictions from Supabase")
-                    return df
+                open_df = query_predictions(
+                    start_date=game_date, end_date=game_date, has_actual=False,
+                    columns=['id', 'player_id', 'stat']
+                )
+                if len(open_df) == 0:
+                    return report
+                matched = join(open_df)
+                report['updated'] = _apply_actuals_supabase(supabase, matched[['id', 'actual']])
+                logger.debug(f"Reconciled {report['updated']} predictions in Supabase for {game_date}")
+                return report
         except Exception as e:
-            logger.warning(f"Failed to load predictions from Supabase: {e}. Falling back to CSV.")
+            logger.warning(f"Failed to reconcile predictions in Supabase: {e}. Falling back to CSV.")
+    
+    # Fallback to CSV: one read, one vectorized update, one write
+    if not os.path.exists(PREDICTIONS_FILE):
+        return report
+    
+    df = pd.read_csv(PREDICTIONS_FILE)
+    open_mask = (df['game_date'].astype(str).str[:10] == game_date) & df['actual'].isna()
+    if not open_mask.any():
+        return report
+    
+    open_df = df.loc[open_mask, ['player_id', 'stat']].reset_index()
+    matched = join(open_df)
+    if len(matched) > 0:
+        df.loc[matched['index'].values, 'actual'] = matched['actual'].values
+        df.to_csv(PREDICTIONS_FILE, index=False)
+    report['updated'] = len(matched)
+    return report
+
+
+def _date_str(value) -> Optional[str]:
+    return str(value)[:10] if value is not None else None
+
+
+def iter_prediction_pages(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    player_id: Optional[str] = None,
+    stats: Optional[Iterable[str]] = None,
+    has_actual: Optional[bool] = None,
+    columns: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    page_size: int = QUERY_PAGE_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield predictions matching the filters, newest first, one page at a time.
+    
+    With Supabase the filters and column projection run in Postgres and pages are
+    fetched by keyset (id < last id seen), so each page costs the same however
+    deep into the table it is. The CSV fallback applies the same filters locally.
+    
+    Args:
+        start_date: Earliest game_date to include ('YYYY-MM-DD')
+        end_date: Latest game_date to include ('YYYY-MM-DD')
+        player_id: Only this player's predictions
+        stats: Only these stats (e.g. ['PTS', 'REB'])
+        has_actual: True for graded predictions only, False for ungraded only
+        columns: Columns to return (default: all)
+        limit: Maximum total rows
+        page_size: Rows per page (at most QUERY_PAGE_SIZE with Supabase)
+    
+    Yields:
+        DataFrame per page
+    """
+    stats = list(stats) if stats is not None else None
+    
+    if is_supabase_configured():
+        yielded = False
+        try:
+            supabase = get_supabase_client()
+            if supabase:
+                page_size = min(page_size, QUERY_PAGE_SIZE)
+                # id is the pagination key, so it is always selected
+                projection = '*' if columns is None else ','.join(dict.fromkeys(['id'] + list(columns)))
+                last_id = None
+                remaining = limit
+                while remaining is None or remaining > 0:
+                    query = supabase.table('predictions').select(projection)
+                    if start_date is not None:
+                        query = query.gte('game_date', _date_str(start_date))
+                    if end_date is not None:
+                        query = query.lte('game_date', _date_str(end_date))
+                    if player_id is not None:
+                        query = query.eq('player_id', str(player_id))
+                    if stats is not None:
+                        query = query.in_('stat', stats)
+                    if has_actual is True:
+                        query = query.not_.is_('actual', 'null')
+                    elif has_actual is False:
+                        query = query.is_('actual', 'null')
+                    if last_id is not None:
+                        query = query.lt('id', last_id)
+                    
+                    batch = page_size if remaining is None else min(page_size, remaining)
+                    result = query.order('id', desc=True).limit(batch).execute()
+                    rows = result.data or []
+                    if not rows:
+                        break
+                    
+                    last_id = rows[-1]['id']
+                    page = pd.DataFrame(rows)
+                    if columns is not None and 'id' not in columns:
+                        page = page.drop(columns=['id'])
+                    if 'timestamp' in page.columns:
+                        page['timestamp'] = pd.to_datetime(page['timestamp'])
+                    yield page
+                    yielded = True
+                    
+                    if remaining is not None:
+                        remaining -= len(rows)
+                    if len(rows) < batch:
+                        break
+                return
+        except Exception as e:
+            # Pages already yielded came from Supabase; switching to the CSV now
+            # would repeat or skip rows
+            if yielded:
+                raise
+            logger.warning(f"Failed to query predictions from Supabase: {e}. Falling back to CSV.")
     
     # Fallback to CSV
-    if os.path.exists(PREDICTIONS_FILE):
-        return pd.read_csv(PREDICTIONS_FILE)
-    return pd.DataFrame()
+    if not os.path.exists(PREDICTIONS_FILE):
+        return
+    
+    filter_columns = {'game_date', 'player_id', 'stat', 'actual', 'timestamp'}
+    usecols = None if columns is None else (lambda c: c in filter_columns or c in columns)
+    df = pd.read_csv(PREDICTIONS_FILE, usecols=usecols)
+    if len(df) == 0:
+        return
+    
+    mask = pd.Series(True, index=df.index)
+    if start_date is not None:
+        mask &= df['game_date'].astype(str) >= _date_str(start_date)
+    if end_date is not None:
+        mask &= df['game_date'].astype(str) <= _date_str(end_date)
+    if player_id is not None:
+        mask &= df['player_id'].astype(str) == str(player_id)
+    if stats is not None:
+        mask &= df['stat'].isin(stats)
+    if has_actual is not None:
+        mask &= df['actual'].notna() == has_actual
+    df = df[mask]
+    
+    # Rows are appended in logging order, so newest first is the reversed file
+    df = df.iloc[::-1]
+    if limit is not None:
+        df = df.head(limit)
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    for offset in range(0, len(df), page_size):
+        yield df.iloc[offset:offset + page_size].reset_index(drop=True)
+
+
+def query_predictions(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    player_id: Optional[str] = None,
+    stats: Optional[Iterable[str]] = None,
+    has_actual: Optional[bool] = None,
+    columns: Optional[List[str]] = None,
+    limit: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Load predictions matching the filters, newest first (see iter_prediction_pages).
+    
+    Returns:
+        DataFrame (empty if nothing matches)
+    """
+    pages = list(iter_prediction_pages(
+        start_date=start_date,
+        end_date=end_date,
+        player_id=player_id,
+        stats=stats,
+        has_actual=has_actual,
+        columns=columns,
+        limit=limit
+    ))
+    if not pages:
+        return pd.DataFrame(columns=columns) if columns is not None else pd.DataFrame()
+    return pd.concat(pages, ignore_index=True)
 
 
-def calculate_accuracy_metrics(df: pd.DataFrame = None) -> Dict:
+def get_predictions_dataframe() -> pd.DataFrame:
+    """
+    Load all predictions as a DataFrame from Supabase (or CSV as fallback).
+    
+    Prefer query_predictions() with filters; this reads the whole table.
+    """
+    df = query_predictions()
+    logger.debug(f"Loaded {len(df)} predictions")
+    return df
+
+
+def _rpc_rows(function_name: str, start_date: Optional[str], end_date: Optional[str]) -> Optional[List[Dict]]:
+    """Rows returned by a Supabase accuracy function, or None if unavailable."""
+    if not is_supabase_configured():
+        return None
+    try:
+        supabase = get_supabase_client()
+        if supabase:
+            result = supabase.rpc(function_name, {
+                'p_start_date': _date_str(start_date),
+                'p_end_date': _date_str(end_date)
+            }).execute()
+            return result.data or []
+    except Exception as e:
+        logger.warning(f"Failed to call {function_name} in Supabase: {e}. Computing locally.")
+    return None
+
+
+def _round_metric(value, digits: int) -> Optional[float]:
+    return round(float(value), digits) if value is not None else None
+
+
+def calculate_accuracy_metrics(df: pd.DataFrame = None, start_date: Optional[str] = None,
+                               end_date: Optional[str] = None) -> Dict:
     """
     Calculate accuracy metrics for predictions.
     
+    Without df the metrics are aggregated in Postgres (get_prediction_accuracy_by_stat)
+    when Supabase is configured, otherwise computed from the graded predictions.
+    
+    Args:
+        df: Optional predictions DataFrame to compute the metrics from
+        start_date: Earliest game_date to include (when df is not given)
+        end_date: Latest game_date to include (when df is not given)
+    
     Returns:
         Dict with accuracy metrics by stat
     """
     if df is None:
-        df = get_predictions_dataframe()
+        rows = _rpc_rows('get_prediction_accuracy_by_stat', start_date, end_date)
+        if rows is not None:
+            return {
+                row['stat']: {
+                    'count': int(row['count']),
+                    'mae': _round_metric(row['mae'], 2),
+                    'rmse': _round_metric(row['rmse'], 2),
+                    'bias': _round_metric(row['bias'], 2),
+                    'vs_line_accuracy': _round_metric(row['vs_line_accuracy'], 1) if row['vs_line_accuracy'] else None,
+                    'within_10_pct': _round_metric(row['within_10_pct'], 1),
+                    'within_20_pct': _round_metric(row['within_20_pct'], 1),
+                }
+                for row in rows
+            }
+        df = query_predictions(
+            start_date=start_date, end_date=end_date, has_actual=True,
+            columns=['stat', 'prediction', 'actual', 'vegas_line']
+        )
     
     if len(df) == 0 or 'actual' not in df.columns:
         return {}
@@ -247,12 +572,33 @@ def calculate_accuracy_metrics(df: pd.DataFrame = None) -> Dict:
     return metrics
 
 
-def calculate_accuracy_by_confidence(df: pd.DataFrame = None) -> Dict:
+def calculate_accuracy_by_confidence(df: pd.DataFrame = None, start_date: Optional[str] = None,
+                                     end_date: Optional[str] = None) -> Dict:
     """
     Calculate accuracy broken down by confidence level.
+    
+    Without df the metrics are aggregated in Postgres (get_prediction_accuracy_by_confidence)
+    when Supabase is configured, otherwise computed from the graded predictions.
     """
     if df is None:
-        df = get_predictions_dataframe()
+        rows = _rpc_rows('get_prediction_accuracy_by_confidence', start_date, end_date)
+        if rows is not None:
+            by_confidence = {row['confidence']: row for row in rows}
+            return {
+                confidence: {
+                    'count': int(by_confidence[confidence]['count']),
+                    'mae': _round_metric(by_confidence[confidence]['mae'], 2),
+                    'within_10_pct': _round_metric(by_confidence[confidence]['within_10_pct'], 1),
+                }
+                for confidence in ['high', 'medium', 'low'] if confidence in by_confidence
+            }
+        df = query_predictions(
+            start_date=start_date, end_date=end_date, has_actual=True,
+            columns=['confidence', 'prediction', 'actual']
+        )
+    
+    if len(df) == 0 or 'actual' not in df.columns:
+        return {}
     
     df_with_actuals = df[df['actual'].notna()].copy()
     
@@ -282,24 +628,32 @@ def calculate_accuracy_by_confidence(df: pd.DataFrame = None) -> Dict:
     return results
 
 
-def get_recent_predictions(n: int = 50) -> pd.DataFrame:
+def get_recent_predictions(n: int = 50, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Get most recent predictions.
     """
-    df = get_predictions_dataframe()
-    if len(df) == 0:
+    df = query_predictions(columns=columns, limit=n)
+    if len(df) == 0 or 'timestamp' not in df.columns:
         return df
     
     df['timestamp'] = pd.to_datetime(df['timestamp'])
-    return df.nlargest(n, 'timestamp')
+    return df.sort_values('timestamp', ascending=False, kind='stable')
 
 
-def get_player_prediction_history(player_id: str) -> pd.DataFrame:
+def get_player_prediction_history(
+    player_id: str,
+    stats: Optional[Iterable[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
     """
-    Get prediction history for a specific player.
+    Get prediction history for a specific player, newest first.
     """
-    df = get_predictions_dataframe()
-    return df[df['player_id'] == player_id]
+    return query_predictions(
+        start_date=start_date, end_date=end_date, player_id=player_id,
+        stats=stats, columns=columns
+    )
 
 
 def save_accuracy_summary():
@@ -329,28 +683,25 @@ def get_accuracy_summary() -> Dict:
     return {}
 
 
-def export_for_ml_training() -> pd.DataFrame:
+def export_for_ml_training(start_date: Optional[str] = None, end_date: Optional[str] = None,
+                           stats: Optional[Iterable[str]] = None) -> pd.DataFrame:
     """
     Export prediction data in format suitable for ML training.
     
+    Only graded predictions and the training columns are fetched.
+    
     Returns:
         DataFrame with features and targets
     """
-    df = get_predictions_dataframe()
+    feature_cols = ML_FEATURE_COLUMNS
+    df_ml = query_predictions(
+        start_date=start_date, end_date=end_date, stats=stats, has_actual=True,
+        columns=['stat', 'actual'] + feature_cols
+    )
     
-    if len(df) == 0 or 'actual' not in df.columns:
+    if len(df_ml) == 0 or 'actual' not in df_ml.columns:
         return pd.DataFrame()
     
-    # Filter to records with actual results
-    df_ml = df[df['actual'].notna()].copy()
-    
-    # Feature columns
-    feature_cols = [
-        'season_avg', 'l5_avg', 'l10_avg', 'vs_opponent_avg',
-        'opp_def_rating', 'opp_pace', 'usage_rate',
-        'is_home', 'days_rest'
-    ]
-    
     # Convert boolean to int
     df_ml['is_home'] = df_ml['is_home'].astype(int)
     
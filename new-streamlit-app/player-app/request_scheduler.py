@@ -0,0 +1,336 @@
+"""
+Request Scheduler Module
+Shared scheduler for outbound nba_api, Sportradar, pbpstats and NBA CDN requests.
+
+Calls are submitted to a bounded thread pool and run as soon as their host
+allows: each host has a token-bucket rate limit and a concurrency cap, failed
+calls are retried with jittered exponential backoff (honouring Retry-After on
+HTTP 429), and identical calls already in flight share a single request.
+Bulk refreshes therefore run at the upstream rate limit instead of behind
+fixed sleeps.
+
+Environment variables:
+    NBA_API_RATE: stats.nba.com requests per second (default: 2)
+    NBA_API_CONCURRENCY: Concurrent stats.nba.com requests (default: 3)
+    SPORTRADAR_RATE: Sportradar requests per second (default: 1, the trial limit)
+    SPORTRADAR_CONCURRENCY: Concurrent Sportradar requests (default: 1)
+    REQUEST_MAX_WORKERS: Scheduler thread pool size (default: 8)
+"""
+
+import os
+import time
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+from requests.exceptions import HTTPError
+
+
+NBA_STATS_HOST = 'stats.nba.com'
+NBA_CDN_HOST = 'ak-static.cms.nba.com'
+SPORTRADAR_HOST = 'api.sportradar.com'
+PBPSTATS_HOST = 'api.pbpstats.com'
+DEFAULT_HOST = 'default'
+
+# Per-host limits: requests per second, burst size, max concurrent requests
+HOST_LIMITS = {
+    NBA_STATS_HOST: {
+        'rate': float(os.getenv("NBA_API_RATE", "2")),
+        'burst': 2,
+        'concurrency': int(os.getenv("NBA_API_CONCURRENCY", "3")),
+    },
+    SPORTRADAR_HOST: {
+        'rate': float(os.getenv("SPORTRADAR_RATE", "1")),
+        'burst': 1,
+        'concurrency': int(os.getenv("SPORTRADAR_CONCURRENCY", "1")),
+    },
+    PBPSTATS_HOST: {'rate': 2.0, 'burst': 2, 'concurrency': 2},
+    NBA_CDN_HOST: {'rate': 4.0, 'burst': 4, 'concurrency': 4},
+    DEFAULT_HOST: {'rate': 5.0, 'burst': 5, 'concurrency': 4},
+}
+
+MAX_WORKERS = int(os.getenv("REQUEST_MAX_WORKERS", "8"))
+MAX_RETRIES = 3
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_MAX = 30.0  # seconds
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `burst`."""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = max(rate, 1e-6)
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Block until a token is available and take it.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+    
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for `seconds` (e.g. after the host answered 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header on an HTTP 429 response, if any."""
+    response = getattr(exc, 'response', None)
+    if response is None or getattr(response, 'status_code', None) != 429:
+        return None
+    try:
+        return float(response.headers.get('Retry-After', BACKOFF_BASE))
+    except (TypeError, ValueError):
+        return BACKOFF_BASE
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Client errors (HTTP 4xx other than 429) are final; everything else is retried."""
+    if isinstance(exc, HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return True
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of call arguments, used as the de-duplication key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class RequestScheduler:
+    """
+    Runs submitted calls on a bounded thread pool under per-host rate limits.
+    
+    Use the module-level submit()/call()/call_nba_api() helpers, which share one
+    scheduler per process.
+    """
+    
+    def __init__(self, max_workers: int = MAX_WORKERS, max_retries: int = MAX_RETRIES,
+                 host_limits: Optional[Dict[str, Dict]] = None):
+        self.max_retries = max_retries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='request-scheduler')
+        self._limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'submitted': 0, 'deduplicated': 0, 'retries': 0, 'failed': 0}
+    
+    def configure_host(self, host: str, rate: float, burst: int = 1, concurrency: int = 1) -> None:
+        """Set (or replace) the limits for a host."""
+        with self._lock:
+            self._limits[host] = {'rate': rate, 'burst': burst, 'concurrency': concurrency}
+            self._buckets.pop(host, None)
+            self._semaphores.pop(host, None)
+    
+    def _host_controls(self, host: str):
+        with self._lock:
+            if host not in self._buckets:
+                limits = self._limits.get(host, self._limits.get(DEFAULT_HOST, HOST_LIMITS[DEFAULT_HOST]))
+                self._buckets[host] = TokenBucket(limits['rate'], limits['burst'])
+                self._semaphores[host] = threading.BoundedSemaphore(max(limits['concurrency'], 1))
+            return self._buckets[host], self._semaphores[host]
+    
+    def _run(self, func: Callable, args: tuple, kwargs: dict, host: str, max_retries: int) -> Any:
+        bucket, semaphore = self._host_controls(host)
+        for attempt in range(max_retries):
+            bucket.acquire()
+            try:
+                with semaphore:
+                    return func(*args, **kwargs)
+            except Exception as e:
+                if attempt == max_retries - 1 or not is_retryable(e):
+                    with self._lock:
+                        self.stats['failed'] += 1
+                    raise
+                retry_after = _retry_after(e)
+                if retry_after is not None:
+                    bucket.pause(retry_after)
+                    delay = retry_after
+                else:
+                    # Exponential backoff with jitter in [50%, 100%] of the nominal delay
+                    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+                with self._lock:
+                    self.stats['retries'] += 1
+                time.sleep(delay)
+    
+    def submit(self, func: Callable, *args, host: str = DEFAULT_HOST, key: Optional[Hashable] = None,
+               max_retries: Optional[int] = None, **kwargs) -> Future:
+        """
+        Schedule func(*args, **kwargs) and return a Future for its result.
+        
+        Args:
+            func: Callable performing one request
+            *args: Positional arguments for func
+            host: Host whose rate limit and concurrency cap apply
+            key: De-duplication key; while a call with the same key is in flight
+                 its Future is returned instead of issuing another request.
+                 Defaults to (func, args, kwargs) for named functions; lambdas
+                 and closures are never de-duplicated unless a key is given.
+            max_retries: Attempts before the Future raises (default: MAX_RETRIES)
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            concurrent.futures.Future
+        """
+        if key is None and getattr(func, '__name__', '<lambda>') != '<lambda>' and not getattr(func, '__closure__', None):
+            key = (getattr(func, '__module__', None), getattr(func, '__qualname__', repr(func)),
+                   _freeze(args), _freeze(kwargs))
+        
+        with self._lock:
+            self.stats['submitted'] += 1
+            if key is not None and key in self._in_flight:
+                self.stats['deduplicated'] += 1
+                return self._in_flight[key]
+            
+            future = self._executor.submit(
+                self._run, func, args, kwargs, host, max_retries or self.max_retries
+            )
+            if key is not None:
+                self._in_flight[key] = future
+        
+        if key is not None:
+            future.add_done_callback(lambda _: self._release(key, future))
+        return future
+    
+    def _release(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+    
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Blocking submit(): returns the result or raises the final error."""
+        return self.submit(func, *args, **kwargs).result()
+    
+    def map(self, func: Callable, arg_list: Iterable[tuple], host: str = DEFAULT_HOST,
+            return_exceptions: bool = False) -> List[Any]:
+        """
+        Run func over a list of argument tuples concurrently, preserving order.
+        
+        Args:
+            func: Callable performing one request
+            arg_list: Positional argument tuples, one per call
+            host: Host whose limits apply
+            return_exceptions: Put exceptions in the result list instead of raising
+        
+        Returns:
+            List of results in input order
+        """
+        futures = [self.submit(func, *args, host=host) for args in arg_list]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """Process-wide shared scheduler (created on first use)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler()
+        return _scheduler
+
+
+def submit(func: Callable, *args, **kwargs) -> Future:
+    """Submit a call to the shared scheduler (see RequestScheduler.submit)."""
+    return get_scheduler().submit(func, *args, **kwargs)
+
+
+def call(func: Callable, *args, **kwargs) -> Any:
+    """Run a call through the shared scheduler and wait for its result."""
+    return get_scheduler().call(func, *args, **kwargs)
+
+
+def _get_nba_api_frames(endpoint_cls: Callable, params: Dict[str, Any]) -> list:
+    return endpoint_cls(**params).get_data_frames()
+
+
+def submit_nba_api(endpoint_cls: Callable, max_retries: Optional[int] = None, **params) -> Future:
+    """
+    Schedule an nba_api endpoint request on the stats.nba.com limits.
+    
+    Args:
+        endpoint_cls: nba_api endpoint class (e.g. endpoints.SynergyPlayTypes)
+        max_retries: Attempts before the Future raises (default: MAX_RETRIES)
+        **params: Endpoint parameters
+    
+    Returns:
+        Future resolving to the endpoint's list of DataFrames
+    """
+    key = ('nba_api', endpoint_cls.__name__, _freeze(params))
+    return get_scheduler().submit(
+        _get_nba_api_frames, endpoint_cls, params, host=NBA_STATS_HOST, key=key, max_retries=max_retries
+    )
+
+
+def call_nba_api(endpoint_cls: Callable, max_retries: Optional[int] = None, **params) -> list:
+    """Blocking submit_nba_api(): returns the endpoint's list of DataFrames."""
+    return submit_nba_api(endpoint_cls, max_retries=max_retries, **params).result()
+
+
+def _http_get(url: str, timeout: float, kwargs: dict):
+    import requests
+    response = requests.get(url, timeout=timeout, **kwargs)
+    if response.status_code == 429:
+        response.raise_for_status()  # Retried after Retry-After / backoff
+    return response
+
+
+def http_get(url: str, host: str = DEFAULT_HOST, timeout: float = 30, max_retries: Optional[int] = None, **kwargs):
+    """
+    Blocking requests.get() under a host's rate limit.
+    
+    HTTP 429 responses are retried by the scheduler; any other response
+    (including errors) is returned for the caller to check.
+    
+    Args:
+        url: URL to fetch
+        host: Host whose rate limit and concurrency cap apply (e.g. SPORTRADAR_HOST)
+        timeout: Request timeout in seconds
+        max_retries: Attempts before giving up on 429s (default: MAX_RETRIES)
+        **kwargs: Extra requests.get() arguments (headers, params, ...)
+    
+    Returns:
+        requests.Response
+    """
+    return get_scheduler().submit(
+        _http_get, url, timeout, kwargs, host=host, key=('http_get', url, _freeze(kwargs)), max_retries=max_retries
+    ).result()
@@ -9,7 +9,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import Circle, Rectangle, Arc, Polygon
-import streamlit as st
+import data_cache as dc
+import request_scheduler as rs
 import nba_api.stats.endpoints as endpoints
 from typing import Optional, Tuple, Dict, List
 from datetime import datetime, date
@@ -162,7 +163,7 @@ def draw_court(ax=None, color='black', lw=2, outer_lines=False):
     return ax
 
 
-@st.cache_data(ttl=1800, show_spinner=False)  # Cache for 30 minutes
+@dc.cached(ttl=1800, show_spinner=False)  # Cache for 30 minutes
 def get_player_shot_data(player_id: str, season: str = CURRENT_SEASON, 
                         season_type: str = 'Regular Season',
                         game_id: Optional[str] = None,
@@ -201,7 +202,8 @@ def get_player_shot_data(player_id: str, season: str = CURRENT_SEASON,
                 # Single game shot chart
                 # Use player's team_id if provided, otherwise use 0 (all teams)
                 team_id_to_use = team_id if team_id is not None else 0
-                shot_data = endpoints.ShotChartDetail(
+                shot_frames = rs.call_nba_api(
+                    endpoints.ShotChartDetail,
                     team_id=team_id_to_use,
                     player_id=player_id_int,
                     season_nullable=try_season,
@@ -212,14 +214,15 @@ def get_player_shot_data(player_id: str, season: str = CURRENT_SEASON,
                 # Season shot chart
                 # Use player's team_id if provided, otherwise use 0 (all teams)
                 team_id_to_use = team_id if team_id is not None else 0
-                shot_data = endpoints.ShotChartDetail(
+                shot_frames = rs.call_nba_api(
+                    endpoints.ShotChartDetail,
                     team_id=team_id_to_use,
                     player_id=player_id_int,
                     season_nullable=try_season,
                     season_type_all_star=season_type
                 )
             
-            shot_df = shot_data.get_data_frames()[0]
+            shot_df = shot_frames[0]
             
             # Debug: Collect column names and sample data to understand API response
             if len(shot_df) > 0:
@@ -285,7 +288,7 @@ def get_player_shot_data(player_id: str, season: str = CURRENT_SEASON,
     return pd.DataFrame(), debug_messages
 
 
-@st.cache_data(ttl=1800, show_spinner=False)  # Cache for 30 minutes
+@dc.cached(ttl=1800, show_spinner=False)  # Cache for 30 minutes
 def get_team_shot_data(team_id: int, season: str = CURRENT_SEASON,
                       season_type: str = 'Regular Season',
                       game_id: Optional[str] = None) -> Tuple[pd.DataFrame, List[str]]:
@@ -313,7 +316,8 @@ def get_team_shot_data(team_id: int, season: str = CURRENT_SEASON,
     for try_season in seasons_to_try:
         try:
             if game_id:
-                shot_data = endpoints.ShotChartDetail(
+                shot_frames = rs.call_nba_api(
+                    endpoints.ShotChartDetail,
                     team_id=team_id,
                     player_id=0,  # 0 for all players
                     season_nullable=try_season,
@@ -321,14 +325,15 @@ def get_team_shot_data(team_id: int, season: str = CURRENT_SEASON,
                     game_id_nullable=game_id
                 )
             else:
-                shot_data = endpoints.ShotChartDetail(
+                shot_frames = rs.call_nba_api(
+                    endpoints.ShotChartDetail,
                     team_id=team_id,
                     player_id=0,  # 0 for all players
                     season_nullable=try_season,
                     season_type_all_star=season_type
                 )
             
-            shot_df = shot_data.get_data_frames()[0]
+            shot_df = shot_frames[0]
             
             # Debug: Collect column names and sample data to understand API response
             if len(shot_df) > 0:
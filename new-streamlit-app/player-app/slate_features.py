@@ -0,0 +1,710 @@
+"""
+Slate Features Module
+Columnar feature engine for a whole slate of player-games.
+Computes every game-log-derived prediction feature for all players in one
+groupby/NumPy pass instead of calling get_all_prediction_features() per player.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Union
+import prediction_utils as utils
+import prediction_features as pf
+import player_similarity as ps
+import snapshot_store as snap
+
+
+# Stat lists mirror the per-player functions in prediction_features so the
+# slate engine produces identical feature dicts
+ROLLING_STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M', 'FTM', 'FTA', 'MIN', 'TOV']
+SPLIT_STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'MIN', 'FTM', 'FG3M']
+VS_OPP_STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'MIN', 'FG3M', 'FTM']
+TREND_STATS = ['PTS', 'REB', 'AST', 'FTM', 'FG3M']
+WEIGHTED_STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M', 'FTM', 'TOV']
+FPTS_WEIGHTS = {'PTS': 1.0, 'REB': 1.2, 'AST': 1.5, 'STL': 3.0, 'BLK': 3.0, 'TOV': -1.0}
+
+ROLLING_WINDOWS = [(3, 'L3'), (5, 'L5'), (10, 'L10'), (None, 'Season')]
+TREND_WINDOW = 5
+WEIGHTED_WINDOW = 10
+WEIGHTED_DECAY = 0.85
+FPTS_HISTORY_GAMES = 15
+
+SLATE_COLUMNS = ['player_id', 'team_id', 'opponent_team_id', 'opponent_abbr', 'game_date', 'is_home']
+
+# Materialized per-player feature table (see build_player_feature_table)
+PLAYER_TABLE_KEYS = ['PLAYER_ID', 'AS_OF_DATE']
+PLAYER_TABLE_CHUNK_SIZE = 100
+PLAYER_FEATURE_DATASET = 'player_features'
+
+# In-process copy of the table, refreshed by get_player_feature_table()
+_player_feature_table = None
+_player_feature_table_season = None
+
+
+def build_slate_frame(slate: Union[pd.DataFrame, List[Dict]]) -> pd.DataFrame:
+    """
+    Normalize slate rows into a DataFrame with typed columns.
+    
+    Args:
+        slate: DataFrame or list of dicts with player_id, team_id,
+               opponent_team_id, opponent_abbr, game_date, is_home
+    
+    Returns:
+        DataFrame with a 0..N-1 index (one row per player-game)
+    """
+    slate_df = pd.DataFrame(slate).reset_index(drop=True)
+    
+    missing = [col for col in SLATE_COLUMNS if col not in slate_df.columns]
+    if missing:
+        raise ValueError(f"Slate is missing required columns: {missing}")
+    
+    slate_df['player_id'] = slate_df['player_id'].astype(int)
+    slate_df['team_id'] = slate_df['team_id'].astype(int)
+    slate_df['opponent_team_id'] = slate_df['opponent_team_id'].astype(int)
+    slate_df['game_date'] = pd.to_datetime(slate_df['game_date']).dt.normalize()
+    slate_df['is_home'] = slate_df['is_home'].astype(bool)
+    
+    return slate_df
+
+
+def _prepare_logs(bulk_game_logs: pd.DataFrame) -> pd.DataFrame:
+    """Select the columns the engine needs and derive home/opponent/FPTS columns once."""
+    stat_cols = sorted(set(ROLLING_STATS + SPLIT_STATS + VS_OPP_STATS + ['FGA']))
+    keep = ['PLAYER_ID', 'GAME_DATE', 'MATCHUP'] + [c for c in stat_cols if c in bulk_game_logs.columns]
+    logs = bulk_game_logs[keep].copy()
+    
+    logs['PLAYER_ID'] = logs['PLAYER_ID'].astype(int)
+    logs['GAME_DATE'] = pd.to_datetime(logs['GAME_DATE']).dt.normalize()
+    
+    # MATCHUP format: "TEAM vs. OPP" (home) or "TEAM @ OPP" (away)
+    matchup = logs['MATCHUP'].fillna('').astype(str)
+    logs['LOG_IS_HOME'] = matchup.str.contains('vs.', regex=False)
+    logs['LOG_IS_AWAY'] = matchup.str.contains('@', regex=False)
+    logs['LOG_OPP_ABBR'] = matchup.str.split(' ').str[-1]
+    
+    if all(s in logs.columns for s in FPTS_WEIGHTS):
+        logs['FPTS'] = sum(logs[s].fillna(0) * w for s, w in FPTS_WEIGHTS.items())
+    
+    return logs.drop(columns=['MATCHUP'])
+
+
+def _expand_history(slate_df: pd.DataFrame, logs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join every slate row to the player's games strictly before the slate date.
+    The result is sorted most recent first within each slate row, with GAME_RANK
+    giving the position (0 = most recent prior game).
+    """
+    keys = slate_df[['player_id', 'game_date', 'opponent_abbr']].rename(
+        columns={'player_id': 'PLAYER_ID', 'game_date': 'SLATE_DATE', 'opponent_abbr': 'SLATE_OPP_ABBR'}
+    )
+    keys['ROW_ID'] = slate_df.index.values
+    
+    history = keys.merge(logs, on='PLAYER_ID', how='inner')
+    history = history[history['GAME_DATE'] < history['SLATE_DATE']]
+    history = history.sort_values(['ROW_ID', 'GAME_DATE'], ascending=[True, False], kind='mergesort')
+    history['GAME_RANK'] = history.groupby('ROW_ID').cumcount()
+    
+    return history.reset_index(drop=True)
+
+
+def _empty_history() -> pd.DataFrame:
+    return pd.DataFrame(columns=['ROW_ID', 'GAME_RANK'])
+
+
+def _grouped_mean(history: pd.DataFrame, mask, cols: List[str], index: pd.Index) -> pd.DataFrame:
+    """Mean of cols per slate row over the masked games, aligned to the slate index."""
+    cols = [c for c in cols if c in history.columns]
+    subset = history.loc[mask, ['ROW_ID'] + cols]
+    return subset.groupby('ROW_ID')[cols].mean().reindex(index)
+
+
+def _grouped_sum(history: pd.DataFrame, mask, cols: List[str], index: pd.Index) -> pd.DataFrame:
+    """Sum of cols per slate row over the masked games, aligned to the slate index."""
+    cols = [c for c in cols if c in history.columns]
+    subset = history.loc[mask, ['ROW_ID'] + cols]
+    return subset.groupby('ROW_ID')[cols].sum().reindex(index)
+
+
+def _grouped_count(history: pd.DataFrame, mask, index: pd.Index) -> pd.Series:
+    """Number of masked games per slate row, aligned to the slate index."""
+    return history.loc[mask].groupby('ROW_ID').size().reindex(index, fill_value=0)
+
+
+def _ft_rate(sums: pd.DataFrame) -> pd.Series:
+    """FTA / FGA * 100 from summed columns (0.0 when no FGA)."""
+    if 'FTA' not in sums.columns or 'FGA' not in sums.columns:
+        return pd.Series(np.nan, index=sums.index)
+    fga = sums['FGA'].fillna(0)
+    rate = np.where(fga > 0, sums['FTA'].fillna(0) / fga.where(fga > 0, 1) * 100, 0.0)
+    return pd.Series(np.round(rate, 1), index=sums.index)
+
+
+def _days_rest(slate_df: pd.DataFrame, bulk_team_game_logs: Optional[pd.DataFrame]) -> pd.Series:
+    """
+    Days since each team's previous game, matching calculate_days_rest().
+    Uses an as-of join on team game dates instead of iterating team logs per player.
+    """
+    default = pd.Series(2, index=slate_df.index, dtype=int)
+    if bulk_team_game_logs is None or len(bulk_team_game_logs) == 0:
+        return default
+    
+    team_dates = bulk_team_game_logs[['TEAM_ID', 'GAME_DATE']].copy()
+    team_dates['TEAM_ID'] = team_dates['TEAM_ID'].astype(int)
+    team_dates['LAST_GAME_DATE'] = pd.to_datetime(team_dates['GAME_DATE']).dt.normalize()
+    team_dates = team_dates[['TEAM_ID', 'LAST_GAME_DATE']].drop_duplicates().sort_values('LAST_GAME_DATE')
+    
+    left = slate_df[['team_id', 'game_date']].rename(columns={'team_id': 'TEAM_ID'})
+    left['ROW_ID'] = slate_df.index.values
+    left = left.sort_values('game_date')
+    
+    joined = pd.merge_asof(
+        left, team_dates,
+        left_on='game_date', right_on='LAST_GAME_DATE',
+        by='TEAM_ID', direction='backward', allow_exact_matches=False
+    ).set_index('ROW_ID').reindex(slate_df.index)
+    
+    days = (joined['game_date'] - joined['LAST_GAME_DATE']).dt.days
+    return days.fillna(2).astype(int)
+
+
+def _player_history_columns(history: pd.DataFrame, index: pd.Index) -> Dict[str, pd.Series]:
+    """
+    Opponent-independent features (rolling windows, home/away splits, weighted
+    averages, trends, consistency, FPTS distribution) for each row's history.
+    """
+    columns = {}
+    
+    all_games = pd.Series(True, index=history.index)
+    rank = history['GAME_RANK']
+    columns['GP'] = _grouped_count(history, all_games, index)
+    
+    # Rolling averages (L3/L5/L10/Season)
+    for window, label in ROLLING_WINDOWS:
+        mask = all_games if window is None else rank < window
+        suffix = label.upper()
+        means = _grouped_mean(history, mask, ROLLING_STATS + ['FGA'], index)
+        for stat in ROLLING_STATS:
+            if stat in means.columns:
+                columns[f'{stat}_{suffix}'] = means[stat]
+        if all(s in means.columns for s in ['PTS', 'REB', 'AST']):
+            columns[f'PRA_{suffix}'] = means['PTS'] + means['REB'] + means['AST']
+        columns[f'FT_RATE_{suffix}'] = _ft_rate(_grouped_sum(history, mask, ['FTA', 'FGA'], index))
+    
+    # Home/away splits
+    if len(history) > 0:
+        home_mask, away_mask = history['LOG_IS_HOME'], history['LOG_IS_AWAY']
+    else:
+        home_mask = away_mask = all_games
+    columns['GP_HOME'] = _grouped_count(history, home_mask, index)
+    columns['GP_AWAY'] = _grouped_count(history, away_mask, index)
+    home_means = _grouped_mean(history, home_mask, SPLIT_STATS, index)
+    away_means = _grouped_mean(history, away_mask, SPLIT_STATS, index)
+    for stat in home_means.columns:
+        columns[f'{stat}_HOME'] = home_means[stat]
+        columns[f'{stat}_AWAY'] = away_means[stat]
+    
+    # Exponentially weighted recent average (same as utils.weighted_average over last 10)
+    if len(history) > 0:
+        weighted_mask = rank < WEIGHTED_WINDOW
+        decay_weights = np.power(WEIGHTED_DECAY, rank.to_numpy(dtype=float))
+        weighted = history.loc[weighted_mask, ['ROW_ID']].copy()
+        weighted['_W'] = decay_weights[weighted_mask.to_numpy()]
+        for stat in WEIGHTED_STATS:
+            if stat in history.columns:
+                weighted[stat] = history.loc[weighted_mask, stat] * weighted['_W']
+        weighted_sums = weighted.groupby('ROW_ID').sum().reindex(index)
+        for stat in WEIGHTED_STATS:
+            if stat in weighted_sums.columns:
+                columns[f'{stat}_WAVG'] = weighted_sums[stat] / weighted_sums['_W']
+    
+    # Trends: last 5 vs the 5 before (same as utils.calculate_trend)
+    recent_means = _grouped_mean(history, rank < TREND_WINDOW, TREND_STATS + ['MIN'], index)
+    older_means = _grouped_mean(
+        history, (rank >= TREND_WINDOW) & (rank < TREND_WINDOW * 2), TREND_STATS + ['MIN'], index
+    )
+    has_window = columns['GP'] >= TREND_WINDOW
+    for stat in recent_means.columns:
+        older = older_means[stat]
+        trend = (recent_means[stat] - older) / older.where(older != 0) * 100
+        columns[f'{stat}_TREND'] = trend.where(has_window).fillna(0.0).round(1)
+    if 'MIN' in recent_means.columns:
+        columns['MIN_RECENT'] = recent_means['MIN'].where(has_window)
+    
+    # Consistency: coefficient of variation over all games (same as utils.calculate_consistency)
+    trend_cols = [c for c in TREND_STATS if c in history.columns]
+    if len(history) > 0 and trend_cols:
+        grouped = history.groupby('ROW_ID')[trend_cols]
+        cv = grouped.std(ddof=0) / grouped.mean().where(lambda m: m != 0) * 100
+        cv = cv.reindex(index)
+    else:
+        cv = pd.DataFrame(index=index, columns=trend_cols, dtype=float)
+    for stat in trend_cols:
+        columns[f'{stat}_CV'] = cv[stat].where(has_window).fillna(0.0).round(1)
+    
+    # FPTS distribution over the last 15 games (for ceiling/floor)
+    if 'FPTS' in history.columns:
+        fpts_mask = rank < FPTS_HISTORY_GAMES
+        fpts = history.loc[fpts_mask & history['FPTS'].notna(), ['ROW_ID', 'FPTS']].groupby('ROW_ID')['FPTS']
+        quantiles = fpts.quantile([0.25, 0.5, 0.75]).unstack()
+        columns['FPTS_N'] = fpts.size().reindex(index, fill_value=0)
+        columns['FPTS_P25'] = quantiles[0.25].reindex(index) if 0.25 in quantiles else np.nan
+        columns['FPTS_P50'] = quantiles[0.5].reindex(index) if 0.5 in quantiles else np.nan
+        columns['FPTS_P75'] = quantiles[0.75].reindex(index) if 0.75 in quantiles else np.nan
+        columns['FPTS_MIN'] = fpts.min().reindex(index)
+        columns['FPTS_MAX'] = fpts.max().reindex(index)
+        columns['FPTS_VAR'] = fpts.var(ddof=0).reindex(index)
+    
+    return columns
+
+
+def _vs_opponent_columns(history: pd.DataFrame, index: pd.Index) -> Dict[str, pd.Series]:
+    """Features from each row's prior games against the row's opponent."""
+    columns = {}
+    all_games = pd.Series(True, index=history.index)
+    
+    # Historical vs opponent
+    if len(history) > 0:
+        opp_mask = history['LOG_OPP_ABBR'] == history['SLATE_OPP_ABBR']
+    else:
+        opp_mask = all_games
+    columns['VS_OPP_GP'] = _grouped_count(history, opp_mask, index)
+    opp_means = _grouped_mean(history, opp_mask, VS_OPP_STATS, index)
+    for stat in opp_means.columns:
+        columns[f'{stat}_VS_OPP'] = opp_means[stat]
+    if all(s in opp_means.columns for s in ['PTS', 'REB', 'AST']):
+        columns['PRA_VS_OPP'] = opp_means['PTS'] + opp_means['REB'] + opp_means['AST']
+    columns['FT_RATE_VS_OPP'] = _ft_rate(_grouped_sum(history, opp_mask, ['FTA', 'FGA'], index))
+    
+    return columns
+
+
+def build_slate_feature_matrix(
+    bulk_game_logs: pd.DataFrame,
+    slate: Union[pd.DataFrame, List[Dict]],
+    bulk_team_game_logs: pd.DataFrame = None,
+    bulk_advanced_stats: pd.DataFrame = None,
+    player_feature_table: pd.DataFrame = None
+) -> pd.DataFrame:
+    """
+    Compute every game-log-derived feature for a whole slate in one pass.
+    
+    Only games strictly before each row's game_date are used, so the same
+    function serves today's slate and point-in-time historical rows.
+    
+    Args:
+        bulk_game_logs: DataFrame from get_bulk_player_game_logs()
+        slate: Rows of (player_id, team_id, opponent_team_id, opponent_abbr, game_date, is_home)
+        bulk_team_game_logs: Optional DataFrame from get_bulk_team_game_logs() (for days rest)
+        bulk_advanced_stats: Optional DataFrame from get_bulk_player_advanced_stats() (for usage)
+        player_feature_table: Optional table from build_player_feature_table(); when given,
+                              opponent-independent features are looked up instead of recomputed
+                              and only vs-opponent features are computed from the logs
+    
+    Returns:
+        Feature matrix with one row per slate row. Columns are named
+        {STAT}_{WINDOW}, {STAT}_HOME/_AWAY, {STAT}_VS_OPP, {STAT}_WAVG,
+        {STAT}_TREND, {STAT}_CV plus GP, DAYS_REST, USG_PCT and FPTS_* quantiles.
+    """
+    slate_df = build_slate_frame(slate)
+    index = slate_df.index
+    columns = {}
+    
+    if bulk_game_logs is None or len(bulk_game_logs) == 0:
+        logs = None
+    else:
+        # Only the slate's players are needed; prepare just their rows
+        slate_players = bulk_game_logs['PLAYER_ID'].astype(int).isin(slate_df['player_id'].unique())
+        logs = _prepare_logs(bulk_game_logs[slate_players])
+    
+    if player_feature_table is None:
+        history = _expand_history(slate_df, logs) if logs is not None else _empty_history()
+        columns.update(_player_history_columns(history, index))
+    else:
+        looked_up = lookup_player_features(player_feature_table, slate_df)
+        columns.update({col: looked_up[col] for col in looked_up.columns})
+        # Only games against the slate's opponents are needed for vs-opponent features
+        if logs is not None:
+            logs = logs[logs['LOG_OPP_ABBR'].isin(slate_df['opponent_abbr'].unique())]
+        history = _expand_history(slate_df, logs) if logs is not None else _empty_history()
+    
+    columns.update(_vs_opponent_columns(history, index))
+    
+    # Days rest from the team schedule
+    columns['DAYS_REST'] = _days_rest(slate_df, bulk_team_game_logs)
+    
+    # Usage rate from bulk advanced stats
+    columns['USG_PCT'] = 20.0  # League average default
+    if bulk_advanced_stats is not None and len(bulk_advanced_stats) > 0 and 'USG_PCT' in bulk_advanced_stats.columns:
+        advanced = bulk_advanced_stats.drop_duplicates('PLAYER_ID')
+        usage = pd.Series(advanced['USG_PCT'].values, index=advanced['PLAYER_ID'].astype(int))
+        mapped = slate_df['player_id'].map(usage)
+        columns['USG_PCT'] = (mapped * 100).round(1).fillna(20.0)
+    
+    return pd.concat([slate_df, pd.DataFrame(columns, index=index)], axis=1)
+
+
+
+
+def _build_player_feature_rows(logs: pd.DataFrame, keys: pd.DataFrame) -> pd.DataFrame:
+    """Compute opponent-independent features for (PLAYER_ID, AS_OF_DATE) keys, in player chunks."""
+    keys = keys[PLAYER_TABLE_KEYS].reset_index(drop=True)
+    player_ids = keys['PLAYER_ID'].unique()
+    chunks = []
+    
+    # Chunk by player so the expanded history stays bounded in memory
+    for i in range(0, len(player_ids), PLAYER_TABLE_CHUNK_SIZE):
+        chunk_ids = player_ids[i:i + PLAYER_TABLE_CHUNK_SIZE]
+        chunk_keys = keys[keys['PLAYER_ID'].isin(chunk_ids)].reset_index(drop=True)
+        rows = pd.DataFrame({
+            'player_id': chunk_keys['PLAYER_ID'].values,
+            'game_date': chunk_keys['AS_OF_DATE'].values,
+            'opponent_abbr': ''
+        })
+        history = _expand_history(rows, logs[logs['PLAYER_ID'].isin(chunk_ids)])
+        columns = _player_history_columns(history, rows.index)
+        chunks.append(pd.concat([chunk_keys, pd.DataFrame(columns, index=rows.index)], axis=1))
+    
+    if not chunks:
+        return pd.DataFrame(columns=PLAYER_TABLE_KEYS)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _player_table_keys(logs: pd.DataFrame) -> pd.DataFrame:
+    """One key per player-game: features as of the day after the game (all games up to it)."""
+    keys = pd.DataFrame({
+        'PLAYER_ID': logs['PLAYER_ID'].astype(int).values,
+        'AS_OF_DATE': pd.to_datetime(logs['GAME_DATE']).dt.normalize().astype('datetime64[ns]').values
+    }).drop_duplicates()
+    keys['AS_OF_DATE'] = keys['AS_OF_DATE'] + pd.Timedelta(days=1)
+    return keys
+
+
+def build_player_feature_table(bulk_game_logs: pd.DataFrame, player_ids: Optional[List[int]] = None) -> pd.DataFrame:
+    """
+    Materialize opponent-independent features keyed by (PLAYER_ID, AS_OF_DATE).
+    
+    There is one row per player-game with AS_OF_DATE = GAME_DATE + 1 day, holding
+    features over all of the player's games up to and including that game. The
+    features for any date are those of the latest row with AS_OF_DATE <= date
+    (see lookup_player_features), so historical as-of dates come for free.
+    
+    Args:
+        bulk_game_logs: DataFrame from get_bulk_player_game_logs()
+        player_ids: Optional subset of players
+    
+    Returns:
+        DataFrame keyed by PLAYER_ID, AS_OF_DATE
+    """
+    if bulk_game_logs is None or len(bulk_game_logs) == 0:
+        return pd.DataFrame(columns=PLAYER_TABLE_KEYS)
+    
+    if player_ids is not None:
+        bulk_game_logs = bulk_game_logs[bulk_game_logs['PLAYER_ID'].astype(int).isin([int(p) for p in player_ids])]
+    
+    logs = _prepare_logs(bulk_game_logs)
+    table = _build_player_feature_rows(logs, _player_table_keys(logs))
+    return table.sort_values(PLAYER_TABLE_KEYS).reset_index(drop=True)
+
+
+def update_player_feature_table(player_feature_table: Optional[pd.DataFrame], bulk_game_logs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Append rows for games not yet in the table.
+    
+    Only players with new games are recomputed; everyone else's rows are kept
+    as they are.
+    
+    Args:
+        player_feature_table: Existing table (None or empty to build from scratch)
+        bulk_game_logs: Current DataFrame from get_bulk_player_game_logs()
+    
+    Returns:
+        Updated table
+    """
+    if player_feature_table is None or len(player_feature_table) == 0:
+        return build_player_feature_table(bulk_game_logs)
+    if bulk_game_logs is None or len(bulk_game_logs) == 0:
+        return player_feature_table
+    
+    table = player_feature_table.copy()
+    table['AS_OF_DATE'] = pd.to_datetime(table['AS_OF_DATE']).astype('datetime64[ns]')
+    
+    keys = _player_table_keys(bulk_game_logs)
+    last_as_of = table.groupby('PLAYER_ID')['AS_OF_DATE'].max()
+    known_until = keys['PLAYER_ID'].map(last_as_of)
+    new_keys = keys[known_until.isna() | (keys['AS_OF_DATE'] > known_until)]
+    
+    if len(new_keys) == 0:
+        return player_feature_table
+    
+    # Only the affected players' logs are prepared and expanded
+    affected = bulk_game_logs['PLAYER_ID'].astype(int).isin(new_keys['PLAYER_ID'].unique())
+    new_rows = _build_player_feature_rows(_prepare_logs(bulk_game_logs[affected]), new_keys)
+    
+    table = pd.concat([table, new_rows], ignore_index=True)
+    table = table.drop_duplicates(PLAYER_TABLE_KEYS, keep='last')
+    return table.sort_values(PLAYER_TABLE_KEYS).reset_index(drop=True)
+
+
+def lookup_player_features(player_feature_table: pd.DataFrame, slate: Union[pd.DataFrame, List[Dict]]) -> pd.DataFrame:
+    """
+    Look up each slate row's opponent-independent features as of its game_date.
+    
+    Args:
+        player_feature_table: Table from build_player_feature_table()
+        slate: Slate rows (player_id, game_date, ...)
+    
+    Returns:
+        DataFrame aligned with the slate index, with the same columns and
+        no-history defaults as build_slate_feature_matrix()
+    """
+    slate_df = slate if isinstance(slate, pd.DataFrame) and 'player_id' in slate else build_slate_frame(slate)
+    feature_cols = [c for c in player_feature_table.columns if c not in PLAYER_TABLE_KEYS]
+    
+    left = pd.DataFrame({
+        'PLAYER_ID': slate_df['player_id'].astype(int).values,
+        'SLATE_DATE': pd.to_datetime(slate_df['game_date']).astype('datetime64[ns]').values,
+        'ROW_ID': slate_df.index.values
+    }).sort_values('SLATE_DATE')
+    
+    right = player_feature_table.copy()
+    right['PLAYER_ID'] = right['PLAYER_ID'].astype(int)
+    right['AS_OF_DATE'] = pd.to_datetime(right['AS_OF_DATE']).astype('datetime64[ns]')
+    right = right.sort_values('AS_OF_DATE')
+    
+    joined = pd.merge_asof(
+        left, right,
+        left_on='SLATE_DATE', right_on='AS_OF_DATE',
+        by='PLAYER_ID', direction='backward'
+    ).set_index('ROW_ID').reindex(slate_df.index)
+    
+    looked_up = joined[feature_cols].copy()
+    for col in feature_cols:
+        if col in ('GP', 'GP_HOME', 'GP_AWAY', 'FPTS_N'):
+            looked_up[col] = looked_up[col].fillna(0).astype(int)
+        elif col.endswith('_TREND') or col.endswith('_CV') or col.startswith('FT_RATE_'):
+            looked_up[col] = looked_up[col].fillna(0.0)
+    return looked_up
+
+
+def get_player_feature_table(season: str = pf.CURRENT_SEASON, bulk_game_logs: pd.DataFrame = None, full: bool = False) -> pd.DataFrame:
+    """
+    Load the persisted player feature table, bring it up to date with the
+    current game logs and save it back if anything changed.
+    
+    Args:
+        season: Season string
+        bulk_game_logs: Optional DataFrame from get_bulk_player_game_logs() (fetched if None)
+        full: Rebuild from scratch (e.g. after stat corrections)
+    
+    Returns:
+        DataFrame keyed by PLAYER_ID, AS_OF_DATE
+    """
+    global _player_feature_table, _player_feature_table_season
+    
+    if bulk_game_logs is None:
+        bulk_game_logs = pf.get_bulk_player_game_logs(season)
+    
+    if full:
+        table = None
+    elif _player_feature_table is not None and _player_feature_table_season == season:
+        table = _player_feature_table
+    else:
+        table = snap.load_snapshot(PLAYER_FEATURE_DATASET, season=season)
+    
+    updated = update_player_feature_table(table, bulk_game_logs)
+    if updated is not table and len(updated) > 0:
+        snap.save_snapshot(PLAYER_FEATURE_DATASET, updated, season=season, source='derived')
+    
+    _player_feature_table = updated
+    _player_feature_table_season = season
+    return updated
+
+
+def _round_or_zero(value) -> float:
+    """Round to one decimal, mapping NaN to 0.0 like the per-player helpers."""
+    return 0.0 if pd.isna(value) else round(float(value), 1)
+
+
+def matrix_row_to_features(row: Dict) -> Dict:
+    """
+    Convert one feature matrix row into the dict layout produced by
+    get_all_prediction_features() for the game-log-derived keys.
+    
+    Args:
+        row: A row of build_slate_feature_matrix() as a dict record (or Series)
+    
+    Returns:
+        Dict with rolling_avgs, home_away_splits, vs_opponent, days_rest,
+        usage_rate, minutes_trend, stat_trends, consistency, player_ft_rate,
+        weighted_avgs and fpts_distribution
+    """
+    features = {}
+    n_games = int(row['GP'])
+    
+    # Rolling averages (windows are absent when there are no prior games)
+    rolling_avgs = {}
+    if n_games > 0:
+        for _, label in ROLLING_WINDOWS:
+            suffix = label.upper()
+            window_avgs = {
+                stat: _round_or_zero(row[f'{stat}_{suffix}'])
+                for stat in ROLLING_STATS if f'{stat}_{suffix}' in row
+            }
+            if f'PRA_{suffix}' in row:
+                window_avgs['PRA'] = _round_or_zero(row[f'PRA_{suffix}'])
+            if not pd.isna(row.get(f'FT_RATE_{suffix}')):
+                window_avgs['FT_RATE'] = float(row[f'FT_RATE_{suffix}'])
+            rolling_avgs[label] = window_avgs
+    features['rolling_avgs'] = rolling_avgs
+    features['season_ppg'] = rolling_avgs.get('Season', {}).get('PTS', 0.0)
+    
+    # Home/Away splits
+    splits = {'home': {}, 'away': {}}
+    if n_games > 0:
+        for stat in SPLIT_STATS:
+            if f'{stat}_HOME' in row:
+                splits['home'][stat] = _round_or_zero(row[f'{stat}_HOME']) if row['GP_HOME'] > 0 else 0.0
+                splits['away'][stat] = _round_or_zero(row[f'{stat}_AWAY']) if row['GP_AWAY'] > 0 else 0.0
+    features['home_away_splits'] = splits
+    features['is_home'] = bool(row['is_home'])
+    
+    # Historical vs opponent
+    vs_opp_games = int(row['VS_OPP_GP'])
+    vs_opponent = {'games_played': vs_opp_games}
+    if vs_opp_games > 0:
+        for stat in VS_OPP_STATS:
+            if f'{stat}_VS_OPP' in row:
+                vs_opponent[stat] = _round_or_zero(row[f'{stat}_VS_OPP'])
+        if 'PRA_VS_OPP' in row:
+            vs_opponent['PRA'] = _round_or_zero(row['PRA_VS_OPP'])
+        if not pd.isna(row.get('FT_RATE_VS_OPP')):
+            vs_opponent['FT_RATE'] = float(row['FT_RATE_VS_OPP'])
+    features['vs_opponent'] = vs_opponent
+    
+    # Rest and usage
+    features['days_rest'] = int(row['DAYS_REST'])
+    features['is_back_to_back'] = utils.is_back_to_back(features['days_rest'])
+    features['usage_rate'] = float(row['USG_PCT'])
+    
+    # Minutes trend
+    if n_games >= TREND_WINDOW and 'MIN_RECENT' in row:
+        features['minutes_trend'] = {
+            'avg': _round_or_zero(row['MIN_RECENT']),
+            'trend': float(row.get('MIN_TREND', 0.0))
+        }
+    else:
+        features['minutes_trend'] = {'avg': 0.0, 'trend': 0.0}
+    
+    # Stat trends and consistency
+    features['stat_trends'] = {stat: float(row.get(f'{stat}_TREND', 0.0)) for stat in TREND_STATS}
+    features['consistency'] = {stat: float(row.get(f'{stat}_CV', 0.0)) for stat in TREND_STATS}
+    
+    # Player's season FT Rate (for FTM prediction adjustment)
+    if n_games > 0 and not pd.isna(row.get('FT_RATE_SEASON')):
+        features['player_ft_rate'] = float(row['FT_RATE_SEASON'])
+    else:
+        features['player_ft_rate'] = 25.0  # Default ~25% FT rate
+    
+    # Precomputed values the predictor would otherwise derive from game_logs
+    features['weighted_avgs'] = {
+        stat: round(float(row[f'{stat}_WAVG']), 1)
+        for stat in WEIGHTED_STATS
+        if f'{stat}_WAVG' in row and not pd.isna(row[f'{stat}_WAVG'])
+    }
+    if 'FPTS_N' in row:
+        features['fpts_distribution'] = {
+            'n_games': int(row['FPTS_N']),
+            'p25': row['FPTS_P25'],
+            'p50': row['FPTS_P50'],
+            'p75': row['FPTS_P75'],
+            'min': row['FPTS_MIN'],
+            'max': row['FPTS_MAX'],
+            'variance': row['FPTS_VAR'],
+        }
+    
+    return features
+
+
+def get_slate_prediction_features(
+    slate: Union[pd.DataFrame, List[Dict]],
+    bulk_game_logs: pd.DataFrame,
+    bulk_team_game_logs: pd.DataFrame = None,
+    bulk_advanced_stats: pd.DataFrame = None,
+    bulk_drives_stats: pd.DataFrame = None,
+    bulk_offensive_synergy: Dict[str, pd.DataFrame] = None,
+    feature_matrix: pd.DataFrame = None,
+    player_feature_table: pd.DataFrame = None,
+    use_similar_players: bool = True
+) -> List[Dict]:
+    """
+    Build full prediction feature dicts for every row of a slate.
+    
+    Game-log features come from one build_slate_feature_matrix() call, and
+    opponent features are gathered once per opponent rather than per player.
+    
+    Args:
+        slate: Rows of (player_id, team_id, opponent_team_id, opponent_abbr, game_date, is_home)
+        bulk_game_logs: DataFrame from get_bulk_player_game_logs()
+        bulk_team_game_logs: Optional DataFrame from get_bulk_team_game_logs()
+        bulk_advanced_stats: Optional DataFrame from get_bulk_player_advanced_stats()
+        bulk_drives_stats: Optional DataFrame from get_all_player_drives_stats()
+        bulk_offensive_synergy: Optional dict from get_cached_bulk_offensive_synergy()
+        feature_matrix: Optional precomputed build_slate_feature_matrix() result
+        player_feature_table: Optional table from get_player_feature_table() to look up
+                              opponent-independent features instead of recomputing them
+        use_similar_players: Apply the similar-players-vs-opponent adjustment, with
+                             neighbors for the whole slate from one similarity index query
+    
+    Returns:
+        List of feature dicts in slate row order (compatible with PlayerStatPredictor)
+    """
+    if feature_matrix is None:
+        feature_matrix = build_slate_feature_matrix(
+            bulk_game_logs, slate,
+            bulk_team_game_logs=bulk_team_game_logs,
+            bulk_advanced_stats=bulk_advanced_stats,
+            player_feature_table=player_feature_table
+        )
+    
+    # One bulk team context table serves every opponent on the slate
+    team_context = pf.get_team_context_table()
+    opponent_features = {}
+    for opp_id, opp_abbr in feature_matrix[['opponent_team_id', 'opponent_abbr']].drop_duplicates().itertuples(index=False):
+        opponent_features[(opp_id, opp_abbr)] = pf.get_opponent_features(int(opp_id), opp_abbr, team_context=team_context)
+    
+    # Similar players for every slate player in one index query, and one
+    # (player, opponent) performance cube to gather their games vs each opponent
+    similar_players = {}
+    opponent_cube = None
+    use_similar_players = use_similar_players and bulk_game_logs is not None and len(bulk_game_logs) > 0
+    if use_similar_players:
+        similar_players = ps.get_similar_players_many(
+            feature_matrix['player_id'].astype(int).unique().tolist(),
+            n=ps.SIMILAR_VS_OPPONENT_N,
+            min_similarity=ps.SIMILAR_VS_OPPONENT_MIN_SIMILARITY,
+            exclude_same_team=True
+        )
+        opponent_cube = ps.get_opponent_performance_cube(bulk_game_logs)
+    
+    all_features = []
+    for row in feature_matrix.to_dict('records'):
+        player_features = matrix_row_to_features(row)
+        opp_key = (row['opponent_team_id'], row['opponent_abbr'])
+        for key, value in opponent_features[opp_key].items():
+            player_features[key] = dict(value) if isinstance(value, dict) else value
+        
+        pf.add_context_features(
+            player_features,
+            player_id=str(row['player_id']),
+            opponent_team_id=int(row['opponent_team_id']),
+            opponent_abbr=row['opponent_abbr'],
+            bulk_game_logs=bulk_game_logs,
+            bulk_drives_stats=bulk_drives_stats,
+            bulk_offensive_synergy=bulk_offensive_synergy,
+            use_similar_players=use_similar_players,
+            similar_players=similar_players.get(int(row['player_id'])),
+            opponent_cube=opponent_cube
+        )
+        all_features.append(player_features)
+    
+    return all_features
@@ -0,0 +1,389 @@
+"""
+Slate Simulator Module
+Monte Carlo FPTS distributions for a whole slate of player-games.
+
+Draws N correlated stat lines per player in NumPy and scores them with the
+FPTS formula. Each player's stats are lognormal around the predicted means,
+with dispersion taken from their recent game logs (shrunk toward the league)
+and a league-wide correlation between minutes and each stat. Two slate-level
+effects link players:
+    - game pace: one shared factor per game moves both teams' stats together
+    - shared minutes: teammates' minute shocks are partially centered within
+      the team, so one player's extra minutes come out of the others'
+Lineups are scored against the same draws with one sparse matrix product,
+which gives FPTS quantiles, boom/bust probabilities and lineup win rates
+without per-row loops.
+"""
+
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+from scipy import sparse
+import prediction_features as pf
+import slate_features as sf
+
+
+SIM_STATS = list(sf.FPTS_WEIGHTS)  # PTS, REB, AST, STL, BLK, TOV
+LATENT_STATS = ['MIN'] + SIM_STATS
+HISTORY_GAMES = sf.FPTS_HISTORY_GAMES
+MIN_GAMES = 5
+SHRINKAGE_GAMES = 5  # Weight (in games) of the league CV when shrinking a player's CV
+DEFAULT_CV = 0.5
+
+PACE_LOADING = 0.25  # Share of each stat's latent std driven by the game-level factor
+TEAMMATE_MINUTES_SHARE = 0.5  # Fraction of the team's mean minutes shock removed from each player
+DEFAULT_SIMS = 10000
+SIM_CHUNK_SIZE = 2000
+
+# DraftKings value targets (FPTS per $1,000 of salary)
+BOOM_VALUE = 6.0
+BUST_VALUE = 4.0
+# Relative thresholds when no salary is known (matches the default +/-30% ceiling/floor)
+BOOM_RATIO = 1.3
+BUST_RATIO = 0.7
+
+
+@dataclass
+class SlateSimulation:
+    """Simulated FPTS for a slate: players (row i) x simulations (column j)"""
+    players: pd.DataFrame
+    fpts: np.ndarray
+    seed: Optional[int] = None
+    
+    @property
+    def n_sims(self) -> int:
+        return self.fpts.shape[1]
+
+
+def _recent_logs(bulk_game_logs: pd.DataFrame, player_ids: Optional[Sequence[int]] = None,
+                 history_games: int = HISTORY_GAMES) -> pd.DataFrame:
+    """Last `history_games` games per player (most recent first)."""
+    cols = ['PLAYER_ID', 'GAME_DATE'] + [s for s in LATENT_STATS if s in bulk_game_logs.columns]
+    logs = bulk_game_logs[cols].copy()
+    logs['PLAYER_ID'] = logs['PLAYER_ID'].astype(int)
+    if player_ids is not None:
+        logs = logs[logs['PLAYER_ID'].isin(player_ids)]
+    logs = logs.sort_values(['PLAYER_ID', 'GAME_DATE'], ascending=[True, False], kind='mergesort')
+    logs = logs[logs.groupby('PLAYER_ID').cumcount() < history_games]
+    for stat in LATENT_STATS:
+        logs[stat] = pd.to_numeric(logs[stat], errors='coerce') if stat in logs.columns else np.nan
+    return logs
+
+
+def estimate_stat_correlation(bulk_game_logs: pd.DataFrame, history_games: int = HISTORY_GAMES) -> np.ndarray:
+    """
+    League-wide correlation of within-player game-to-game deviations.
+    
+    Each player's recent games are standardized by their own mean/std, then the
+    standardized values of all players are pooled.
+    
+    Args:
+        bulk_game_logs: DataFrame from get_bulk_player_game_logs()
+        history_games: Recent games per player to use
+    
+    Returns:
+        Correlation matrix over LATENT_STATS (identity if there is not enough data)
+    """
+    identity = np.eye(len(LATENT_STATS))
+    if bulk_game_logs is None or len(bulk_game_logs) == 0:
+        return identity
+    
+    logs = _recent_logs(bulk_game_logs, history_games=history_games)
+    grouped = logs.groupby('PLAYER_ID')[LATENT_STATS]
+    z = (logs[LATENT_STATS] - grouped.transform('mean')) / grouped.transform('std').replace(0, np.nan)
+    z = z[grouped.transform('count')['MIN'] >= MIN_GAMES].dropna()
+    if len(z) < len(LATENT_STATS) * 10:
+        return identity
+    
+    corr = np.corrcoef(z.to_numpy(dtype=float), rowvar=False)
+    return np.nan_to_num(corr, nan=0.0) * (1 - identity) + identity
+
+
+def estimate_player_dispersion(bulk_game_logs: pd.DataFrame, player_ids: Sequence[int],
+                               history_games: int = HISTORY_GAMES) -> pd.DataFrame:
+    """
+    Recent mean and coefficient of variation per player and stat.
+    
+    Player CVs are shrunk toward the league median CV, weighted by games played,
+    so players with few games get league-typical volatility.
+    
+    Args:
+        bulk_game_logs: DataFrame from get_bulk_player_game_logs()
+        player_ids: Players to estimate
+        history_games: Recent games per player to use
+    
+    Returns:
+        DataFrame indexed by PLAYER_ID with N_GAMES, <STAT>_MEAN and <STAT>_CV columns
+    """
+    player_ids = [int(p) for p in player_ids]
+    result = pd.DataFrame(index=pd.Index(player_ids, name='PLAYER_ID'))
+    
+    if bulk_game_logs is not None and len(bulk_game_logs) > 0:
+        league = _recent_logs(bulk_game_logs, history_games=history_games)
+        league_stats = league.groupby('PLAYER_ID')[LATENT_STATS].agg(['mean', 'std', 'count'])
+    else:
+        league_stats = pd.DataFrame()
+    
+    n_games = league_stats[('MIN', 'count')] if len(league_stats) else pd.Series(dtype=float)
+    result['N_GAMES'] = n_games.reindex(result.index).fillna(0).astype(int)
+    
+    for stat in LATENT_STATS:
+        if len(league_stats):
+            means = league_stats[(stat, 'mean')]
+            cvs = (league_stats[(stat, 'std')] / means.where(means > 0)).replace([np.inf, -np.inf], np.nan)
+            qualified = cvs[n_games >= MIN_GAMES].dropna()
+            league_cv = float(qualified.median()) if len(qualified) else DEFAULT_CV
+        else:
+            means = cvs = pd.Series(dtype=float)
+            league_cv = DEFAULT_CV
+        
+        n = result['N_GAMES'].clip(upper=history_games)
+        player_cv = cvs.reindex(result.index).fillna(league_cv)
+        result[f'{stat}_MEAN'] = means.reindex(result.index).fillna(0.0)
+        result[f'{stat}_CV'] = (n * player_cv + SHRINKAGE_GAMES * league_cv) / (n + SHRINKAGE_GAMES)
+    
+    return result
+
+
+def _game_keys(slate_df: pd.DataFrame) -> np.ndarray:
+    """Integer game index per slate row (both teams of a game share it)."""
+    team = slate_df['team_id'].fillna(-1).astype(int).to_numpy()
+    if 'opponent_team_id' in slate_df.columns:
+        opp = slate_df['opponent_team_id'].fillna(-1).astype(int).to_numpy()
+    else:
+        opp = team
+    pairs = pd.Series(list(zip(np.minimum(team, opp), np.maximum(team, opp))))
+    return pd.factorize(pairs)[0]
+
+
+def _cholesky(corr: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        # Nudge toward the identity until positive definite
+        for shrink in (0.05, 0.1, 0.25, 0.5):
+            try:
+                return np.linalg.cholesky((1 - shrink) * corr + shrink * np.eye(len(corr)))
+            except np.linalg.LinAlgError:
+                continue
+        return np.eye(len(corr))
+
+
+def simulate_slate(
+    slate: Union[pd.DataFrame, List[Dict]],
+    bulk_game_logs: pd.DataFrame = None,
+    season: str = pf.CURRENT_SEASON,
+    n_sims: int = DEFAULT_SIMS,
+    seed: Optional[int] = None,
+    pace_loading: float = PACE_LOADING,
+    teammate_minutes_share: float = TEAMMATE_MINUTES_SHARE
+) -> SlateSimulation:
+    """
+    Simulate FPTS for every player on a slate.
+    
+    Args:
+        slate: DataFrame or list of dicts with player_id, team_id and optionally
+               opponent_team_id, Player (name, used to match lineups) and the
+               predicted means PTS, REB, AST, STL, BLK, TOV. Missing means fall
+               back to the player's recent averages.
+        bulk_game_logs: DataFrame from get_bulk_player_game_logs() (fetched if None)
+        season: Season used when fetching game logs
+        n_sims: Number of simulated slates
+        seed: Random seed
+        pace_loading: Weight of the shared game factor in each latent stat
+        teammate_minutes_share: Fraction of the team's mean minutes shock taken
+                                out of each player (0 = independent minutes)
+    
+    Returns:
+        SlateSimulation with an (n_players x n_sims) float32 FPTS matrix
+    """
+    slate_df = pd.DataFrame(slate).reset_index(drop=True)
+    missing = [col for col in ['player_id', 'team_id'] if col not in slate_df.columns]
+    if missing:
+        raise ValueError(f"Slate is missing required columns: {missing}")
+    slate_df['player_id'] = slate_df['player_id'].astype(int)
+    
+    if bulk_game_logs is None:
+        bulk_game_logs = pf.get_bulk_player_game_logs(season)
+    
+    dispersion = estimate_player_dispersion(bulk_game_logs, slate_df['player_id'].unique())
+    dispersion = dispersion.reindex(slate_df['player_id'].to_numpy())
+    corr = estimate_stat_correlation(bulk_game_logs)
+    chol = _cholesky(corr)
+    
+    # Lognormal parameters per player and stat: mean = predicted mean
+    means = np.column_stack([
+        pd.to_numeric(slate_df[stat], errors='coerce').fillna(pd.Series(dispersion[f'{stat}_MEAN'].to_numpy())).to_numpy(dtype=float)
+        if stat in slate_df.columns else dispersion[f'{stat}_MEAN'].to_numpy(dtype=float)
+        for stat in SIM_STATS
+    ]).clip(min=0)
+    cvs = np.column_stack([dispersion[f'{stat}_CV'].to_numpy(dtype=float) for stat in SIM_STATS])
+    sigma = np.sqrt(np.log1p(cvs ** 2))
+    weights = np.array([sf.FPTS_WEIGHTS[stat] for stat in SIM_STATS])
+    
+    n_players = len(slate_df)
+    game_idx = _game_keys(slate_df)
+    n_games = game_idx.max() + 1 if n_players else 0
+    team_idx = pd.factorize(slate_df['team_id'])[0]
+    n_teams = team_idx.max() + 1 if n_players else 0
+    team_sizes = np.bincount(team_idx, minlength=n_teams).astype(float)
+    # How much each stat moves with minutes (regression on the MIN dimension)
+    minutes_beta = corr[1:, 0]
+    # Centering takes share * beta * (team mean minutes shock) out of each stat, leaving a
+    # variance of 1 - beta^2 * (2 * share - share^2) / team_size; rescale back to unit variance
+    removed_share = 2 * teammate_minutes_share - teammate_minutes_share ** 2
+    centered_var = 1.0 - removed_share * np.outer(1.0 / team_sizes[team_idx], minutes_beta ** 2)
+    centered_scale = 1.0 / np.sqrt(np.clip(centered_var, 1e-6, None))
+    idio_scale = np.sqrt(max(1.0 - pace_loading ** 2, 0.0))
+    
+    rng = np.random.default_rng(seed)
+    fpts = np.empty((n_players, n_sims), dtype=np.float32)
+    
+    for start in range(0, n_sims, SIM_CHUNK_SIZE):
+        size = min(SIM_CHUNK_SIZE, n_sims - start)
+        
+        # Correlated (MIN, stats) shocks: players x sims x latent stats
+        latent = rng.standard_normal((n_players, size, len(LATENT_STATS))) @ chol.T
+        
+        # Shared minutes: remove part of the team's mean minutes shock
+        team_minutes = np.zeros((n_teams, size))
+        np.add.at(team_minutes, team_idx, latent[:, :, 0])
+        team_minutes /= team_sizes[:, None]
+        minutes_adjustment = teammate_minutes_share * team_minutes[team_idx]
+        z = latent[:, :, 1:] - minutes_adjustment[:, :, None] * minutes_beta
+        z *= centered_scale[:, None, :]
+        
+        # Game pace factor shared by both teams
+        pace = rng.standard_normal((n_games, size))
+        z = idio_scale * z + pace_loading * pace[game_idx][:, :, None]
+        
+        stats = means[:, None, :] * np.exp(sigma[:, None, :] * z - 0.5 * sigma[:, None, :] ** 2)
+        fpts[:, start:start + size] = stats @ weights
+    
+    return SlateSimulation(players=slate_df, fpts=fpts, seed=seed)
+
+
+def summarize_players(
+    simulation: SlateSimulation,
+    quantiles: Sequence[float] = (0.1, 0.25, 0.5, 0.75, 0.9),
+    salary_col: str = 'salary'
+) -> pd.DataFrame:
+    """
+    Per-player FPTS distribution and boom/bust probabilities.
+    
+    Boom/bust use DraftKings value targets (BOOM_VALUE / BUST_VALUE FPTS per
+    $1,000) when the slate has salaries, otherwise BOOM_RATIO / BUST_RATIO of
+    the simulated mean.
+    
+    Args:
+        simulation: Result of simulate_slate()
+        quantiles: FPTS quantiles to report (as FPTS_P10, FPTS_P25, ...)
+        salary_col: Salary column in the slate
+    
+    Returns:
+        DataFrame with the slate's id/name columns plus FPTS_Mean, FPTS_StdDev,
+        FPTS_P<q> columns, Boom_Probability and Bust_Probability (percent)
+    """
+    players = simulation.players
+    fpts = simulation.fpts
+    id_cols = [c for c in ['player_id', 'Player', 'team_id', 'Team', salary_col] if c in players.columns]
+    summary = players[id_cols].copy()
+    
+    mean = fpts.mean(axis=1, dtype=np.float64)
+    summary['FPTS_Mean'] = mean.round(1)
+    summary['FPTS_StdDev'] = fpts.std(axis=1, dtype=np.float64).round(2)
+    for q, values in zip(quantiles, np.quantile(fpts, quantiles, axis=1)):
+        summary[f'FPTS_P{int(round(q * 100))}'] = values.astype(float).round(1)
+    
+    if salary_col in players.columns:
+        salary = pd.to_numeric(players[salary_col], errors='coerce').to_numpy(dtype=float)
+        boom_line = np.where(np.isnan(salary), mean * BOOM_RATIO, salary / 1000 * BOOM_VALUE)
+        bust_line = np.where(np.isnan(salary), mean * BUST_RATIO, salary / 1000 * BUST_VALUE)
+    else:
+        boom_line = mean * BOOM_RATIO
+        bust_line = mean * BUST_RATIO
+    
+    summary['Boom_Probability'] = ((fpts >= boom_line[:, None]).mean(axis=1) * 100).round(1)
+    summary['Bust_Probability'] = ((fpts < bust_line[:, None]).mean(axis=1) * 100).round(1)
+    return summary
+
+
+def lineup_matrix(simulation: SlateSimulation, lineups: Sequence) -> sparse.csr_matrix:
+    """
+    Sparse (n_lineups x n_players) incidence matrix for a list of lineups.
+    
+    Args:
+        simulation: Result of simulate_slate()
+        lineups: Lineup DataFrames (matched on player_id if present, else Player),
+                 or sequences of slate row indices
+    
+    Returns:
+        scipy.sparse.csr_matrix with 1 where the lineup uses the player
+    """
+    players = simulation.players
+    id_to_row = pd.Series(players.index, index=players['player_id'])
+    name_to_row = pd.Series(players.index, index=players['Player']) if 'Player' in players.columns else None
+    
+    rows, cols = [], []
+    for i, lineup in enumerate(lineups):
+        if isinstance(lineup, pd.DataFrame):
+            if 'player_id' in lineup.columns:
+                idx = id_to_row.reindex(lineup['player_id'].astype(int))
+            elif name_to_row is not None and 'Player' in lineup.columns:
+                idx = name_to_row[~name_to_row.index.duplicated()].reindex(lineup['Player'])
+            else:
+                raise ValueError("Lineup needs a player_id or Player column matching the slate")
+            if idx.isna().any():
+                print(f"Warning: lineup {i} has {int(idx.isna().sum())} players not in the simulation")
+            idx = idx.dropna().astype(int).to_numpy()
+        else:
+            idx = np.asarray(lineup, dtype=int)
+        rows.extend([i] * len(idx))
+        cols.extend(idx)
+    
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(len(lineups), len(players))
+    )
+
+
+def score_lineups(
+    simulation: SlateSimulation,
+    lineups: Sequence,
+    quantiles: Sequence[float] = (0.1, 0.5, 0.9)
+) -> pd.DataFrame:
+    """
+    Score lineups against the simulated slates.
+    
+    Win_Rate is the share of simulations in which the lineup has the highest
+    total among the given lineups (ties split), i.e. an ownership-free
+    estimate of each lineup's equity within the candidate set.
+    
+    Args:
+        simulation: Result of simulate_slate()
+        lineups: See lineup_matrix()
+        quantiles: Total FPTS quantiles to report
+    
+    Returns:
+        DataFrame with one row per lineup: Lineup, FPTS_Mean, FPTS_StdDev,
+        FPTS_P<q> columns and Win_Rate (percent)
+    """
+    q_cols = [f'FPTS_P{int(round(q * 100))}' for q in quantiles]
+    if len(lineups) == 0:
+        return pd.DataFrame(columns=['Lineup', 'FPTS_Mean', 'FPTS_StdDev'] + q_cols + ['Win_Rate'])
+    
+    totals = np.asarray(lineup_matrix(simulation, lineups) @ simulation.fpts, dtype=np.float64)  # lineups x sims
+    
+    best = totals.max(axis=0)
+    is_best = totals >= best
+    win_share = (is_best / is_best.sum(axis=0)).mean(axis=1)
+    
+    result = pd.DataFrame({
+        'Lineup': np.arange(1, len(totals) + 1),
+        'FPTS_Mean': totals.mean(axis=1).round(1),
+        'FPTS_StdDev': totals.std(axis=1).round(2),
+    })
+    for col, values in zip(q_cols, np.quantile(totals, quantiles, axis=1)):
+        result[col] = np.round(values, 1)
+    result['Win_Rate'] = (win_share * 100).round(2)
+    return result
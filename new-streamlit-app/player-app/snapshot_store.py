@@ -0,0 +1,381 @@
+"""
+Snapshot Store Module
+Versioned local Parquet snapshots of bulk NBA datasets with a JSON manifest.
+
+Every successful bulk fetch decorated with @snapshotted is written to
+<snapshot dir>/<dataset>/<season>/<params>/<version>.parquet and recorded in
+manifest.json. In offline mode (NBA_OFFLINE=1) decorated loaders read the latest
+snapshot instead of calling the API, so batch predictions, backtests and the app
+can run entirely from disk. Online, a failed or empty fetch falls back to the
+latest snapshot.
+
+Environment variables:
+    NBA_SNAPSHOT_DIR: Snapshot directory (default: <project root>/.cache/snapshots)
+    NBA_OFFLINE: Set to 1 to read snapshots instead of fetching
+"""
+
+import os
+import re
+import json
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: manifest updates are only serialized within a process
+    fcntl = None
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SNAPSHOT_DIR = Path(os.getenv("NBA_SNAPSHOT_DIR", str(PROJECT_ROOT / '.cache' / 'snapshots')))
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_LOCK_FILE = 'manifest.lock'
+OFFLINE_MODE = os.getenv("NBA_OFFLINE", "0").strip() in ('1', 'true', 'yes')
+
+# Number of versions kept per dataset key (older files are deleted)
+KEEP_VERSIONS = 3
+
+CURRENT_SEASON = "2025-26"
+
+# Bulk datasets covered by the store
+DATASETS = {
+    'player_game_logs': 'PlayerGameLogs for all players',
+    'team_game_logs': 'TeamGameLogs for all teams',
+    'player_advanced_stats': 'LeagueDashPlayerStats (Advanced)',
+    'player_misc_stats': 'LeagueDashPlayerStats (Misc)',
+    'player_drives': 'LeagueDashPtStats drives (players)',
+    'team_drives': 'LeagueDashPtStats drives (teams)',
+    'player_synergy': 'SynergyPlayTypes offensive, one frame per playtype',
+    'team_defensive_synergy': 'SynergyPlayTypes defensive (teams), one frame per playtype',
+    'player_index': 'PlayerIndex',
+    'schedule': 'ScheduleLeagueV2',
+    'standings': 'LeagueStandings',
+    'team_onoff': 'TeamPlayerOnOffSummary, one frame per team',
+    'player_features': 'Per-player rolling feature table keyed by (PLAYER_ID, AS_OF_DATE)',
+    'team_context': 'LeagueDashTeamStats season/L5/L10 team context (pace, ratings, opp FT rate)',
+    'passing_network': 'PlayerDashPtPass passes made as a (passer, receiver, pass type) edge list',
+}
+
+_manifest_lock = threading.Lock()
+
+
+@contextmanager
+def _manifest_locked():
+    """
+    Hold the manifest for a read-modify-write.
+    
+    A thread lock serializes writers within the process and an exclusive flock on
+    manifest.lock serializes processes (e.g. the app and a nightly script), so
+    concurrent saves never drop each other's manifest entries.
+    """
+    with _manifest_lock:
+        if fcntl is None:
+            yield
+            return
+        SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        with open(SNAPSHOT_DIR / MANIFEST_LOCK_FILE, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _slug(value: Any) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]+', '-', str(value))
+
+
+def _dataset_key(dataset: str, season: Optional[str], params: Dict[str, Any]) -> str:
+    """Manifest key / relative directory for a dataset + season + params."""
+    parts = [dataset, _slug(season or 'all')]
+    for name in sorted(params):
+        if params[name] is not None:
+            parts.append(f"{name}={_slug(params[name])}")
+    return '/'.join(parts)
+
+
+def load_manifest() -> Dict[str, Dict]:
+    """
+    Read the snapshot manifest.
+    
+    Returns:
+        Dict of dataset key -> {'dataset', 'season', 'params', 'versions': [...]}
+    """
+    path = SNAPSHOT_DIR / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[SNAPSHOT] Error reading manifest: {e}")
+        return {}
+
+
+def _write_manifest(manifest: Dict[str, Dict]) -> None:
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    path = SNAPSHOT_DIR / MANIFEST_FILE
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """Write a DataFrame to Parquet, stringifying mixed-type object columns Arrow rejects."""
+    try:
+        df.to_parquet(path, index=False)
+    except Exception:
+        df = df.copy()
+        for col in df.select_dtypes(include=['object']).columns:
+            df[col] = df[col].map(lambda v: v if v is None or isinstance(v, str) else str(v))
+        df.to_parquet(path, index=False)
+
+
+def save_snapshot(
+    dataset: str,
+    df: pd.DataFrame,
+    season: Optional[str] = CURRENT_SEASON,
+    source: str = 'nba_api',
+    **params
+) -> Optional[str]:
+    """
+    Persist a DataFrame as a new snapshot version.
+    
+    Args:
+        dataset: Dataset name (see DATASETS)
+        df: Data to store
+        season: Season string (None for season-independent data)
+        source: Where the data came from ('nba_api', 'supabase', ...)
+        **params: Extra key parameters (e.g. playtype='Cut', team_id=1610612738)
+    
+    Returns:
+        Version string, or None if nothing was written
+    """
+    if df is None or not isinstance(df, pd.DataFrame) or len(df) == 0:
+        return None
+    
+    key = _dataset_key(dataset, season, params)
+    version = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+    path = SNAPSHOT_DIR / key / f"{version}.parquet"
+    
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_parquet(df, path)
+    except Exception as e:
+        print(f"[SNAPSHOT] Error writing {key}: {e}")
+        return None
+    
+    with _manifest_locked():
+        manifest = load_manifest()
+        entry = manifest.setdefault(key, {
+            'dataset': dataset,
+            'season': season,
+            'params': {k: v for k, v in params.items() if v is not None},
+            'versions': []
+        })
+        entry['versions'].append({
+            'version': version,
+            'path': str(path.relative_to(SNAPSHOT_DIR)),
+            'rows': int(len(df)),
+            'columns': [str(c) for c in df.columns],
+            'source': source,
+            'created_at': datetime.now(timezone.utc).isoformat()
+        })
+        
+        # Prune old versions
+        stale = entry['versions'][:-KEEP_VERSIONS]
+        entry['versions'] = entry['versions'][-KEEP_VERSIONS:]
+        for old in stale:
+            try:
+                (SNAPSHOT_DIR / old['path']).unlink(missing_ok=True)
+            except Exception as e:
+                print(f"[SNAPSHOT] Error removing {old['path']}: {e}")
+        
+        _write_manifest(manifest)
+    
+    return version
+
+
+def load_snapshot(
+    dataset: str,
+    season: Optional[str] = CURRENT_SEASON,
+    columns: Optional[List[str]] = None,
+    version: Optional[str] = None,
+    max_age_hours: Optional[float] = None,
+    **params
+) -> Optional[pd.DataFrame]:
+    """
+    Load a snapshot (latest version by default).
+    
+    Args:
+        dataset: Dataset name (see DATASETS)
+        season: Season string (None for season-independent data)
+        columns: Only read these columns (column pruning)
+        version: Specific version to read
+        max_age_hours: Ignore the snapshot if it is older than this
+        **params: Extra key parameters used when saving
+    
+    Returns:
+        DataFrame, or None if no matching snapshot exists
+    """
+    entry = load_manifest().get(_dataset_key(dataset, season, params))
+    if not entry or not entry['versions']:
+        return None
+    
+    if version is None:
+        info = entry['versions'][-1]
+    else:
+        info = next((v for v in entry['versions'] if v['version'] == version), None)
+        if info is None:
+            return None
+    
+    if max_age_hours is not None:
+        created_at = datetime.fromisoformat(info['created_at'])
+        if (datetime.now(timezone.utc) - created_at).total_seconds() > max_age_hours * 3600:
+            return None
+    
+    if columns is not None:
+        columns = [c for c in columns if c in info['columns']]
+    
+    try:
+        return pd.read_parquet(SNAPSHOT_DIR / info['path'], columns=columns, memory_map=True)
+    except Exception as e:
+        print(f"[SNAPSHOT] Error reading {info['path']}: {e}")
+        return None
+
+
+def save_snapshot_group(
+    dataset: str,
+    frames: Dict[str, pd.DataFrame],
+    group_param: str,
+    season: Optional[str] = CURRENT_SEASON,
+    source: str = 'nba_api'
+) -> int:
+    """
+    Persist a dict of DataFrames (e.g. synergy by playtype) as one snapshot per key.
+    
+    Returns:
+        Number of frames written
+    """
+    written = 0
+    for group_value, df in frames.items():
+        if save_snapshot(dataset, df, season=season, source=source, **{group_param: group_value}):
+            written += 1
+    return written
+
+
+def load_snapshot_group(
+    dataset: str,
+    group_param: str,
+    season: Optional[str] = CURRENT_SEASON,
+    columns: Optional[List[str]] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Load every frame saved with save_snapshot_group().
+    
+    Returns:
+        Dict of group value -> DataFrame (empty dict if none)
+    """
+    frames = {}
+    for entry in load_manifest().values():
+        if entry['dataset'] != dataset or entry['season'] != season or group_param not in entry['params']:
+            continue
+        group_value = entry['params'][group_param]
+        df = load_snapshot(dataset, season=season, columns=columns, **{group_param: group_value})
+        if df is not None:
+            frames[group_value] = df
+    return frames
+
+
+def list_snapshots() -> pd.DataFrame:
+    """Latest version of every dataset key in the manifest (for display/debugging)."""
+    rows = []
+    for key, entry in load_manifest().items():
+        if not entry['versions']:
+            continue
+        latest = entry['versions'][-1]
+        rows.append({
+            'key': key,
+            'dataset': entry['dataset'],
+            'season': entry['season'],
+            'version': latest['version'],
+            'rows': latest['rows'],
+            'source': latest['source'],
+            'created_at': latest['created_at'],
+            'n_versions': len(entry['versions'])
+        })
+    return pd.DataFrame(rows)
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, pd.DataFrame):
+        return len(value) == 0
+    if isinstance(value, dict):
+        return len(value) == 0 or all(_is_empty(v) for v in value.values())
+    return False
+
+
+def snapshotted(dataset: str, key_params: tuple = (), group_param: Optional[str] = None) -> Callable:
+    """
+    Snapshot a bulk loader's result and serve it from disk offline.
+    
+    The loader's 'season' argument (if any) plus key_params form the snapshot
+    key. Loaders returning a dict of DataFrames (e.g. synergy by playtype) must
+    pass group_param, the name under which dict keys are stored.
+    
+    Args:
+        dataset: Dataset name (see DATASETS)
+        key_params: Other loader arguments that distinguish snapshots (e.g. ('team_id',))
+        group_param: For dict results, the key parameter name for each frame
+    
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {name: bound.arguments[name] for name in key_params}
+            season = bound.arguments.get('season')
+            
+            def load():
+                if group_param is not None:
+                    return load_snapshot_group(dataset, group_param, season=season)
+                return load_snapshot(dataset, season=season, **params)
+            
+            if OFFLINE_MODE:
+                cached = load()
+                if not _is_empty(cached):
+                    return cached
+                print(f"[SNAPSHOT] Offline mode but no snapshot for {dataset}; fetching")
+            
+            result = func(*args, **kwargs)
+            
+            if _is_empty(result):
+                cached = load()
+                if not _is_empty(cached):
+                    print(f"[SNAPSHOT] Fetch for {dataset} returned nothing; using latest snapshot")
+                    return cached
+                return result
+            
+            if group_param is not None and isinstance(result, dict):
+                save_snapshot_group(dataset, result, group_param, season=season)
+            else:
+                save_snapshot(dataset, result, season=season, **params)
+            return result
+        
+        return wrapper
+    
+    return decorator
@@ -106,10 +106,23 @@ def get_player_stats_from_db(season: str = CURRENT_SEASON) -> Optional[pd.DataFr
         return None
 
 
+GAME_LOG_TABLES = {
+    'player': 'sr_player_game_logs',
+    'team': 'sr_team_game_logs',
+}
+
+# PostgREST caps responses at 1000 rows, so row tables are read page by page
+DB_PAGE_SIZE = 1000
+
+
 def get_game_logs_from_db(season: str = CURRENT_SEASON, log_type: str = 'player') -> Optional[pd.DataFrame]:
     """
     Read game logs from Sportradar database.
     
+    Reads the row-oriented sr_player_game_logs / sr_team_game_logs tables,
+    falling back to the legacy sr_game_logs blob if the row tables have not been
+    populated yet.
+    
     Args:
         season: Season string (e.g., '2025-26')
         log_type: 'player' or 'team'
@@ -125,13 +138,30 @@ def get_game_logs_from_db(season: str = CURRENT_SEASON, log_type: str = 'player'
         if not supabase:
             return None
         
+        records = []
+        offset = 0
+        while True:
+            result = supabase.table(GAME_LOG_TABLES[log_type]).select('data').eq('season', season).order(
+                'id'
+            ).range(offset, offset + DB_PAGE_SIZE - 1).execute()
+            page = result.data or []
+            records.extend(row['data'] for row in page)
+            if len(page) < DB_PAGE_SIZE:
+                break
+            offset += DB_PAGE_SIZE
+        
+        if records:
+            df = pd.DataFrame(records)
+            print(f"[SR DB READ] Game logs ({log_type}) from database: {len(df)} records")
+            return df
+        
         result = supabase.table('sr_game_logs').select('data').eq('season', season).eq('log_type', log_type).execute()
         
         if result.data and len(result.data) > 0:
             data = result.data[0]['data']
             if data:
                 df = pd.DataFrame(data)
-                print(f"[SR DB READ] Game logs ({log_type}) from database: {len(df)} records")
+                print(f"[SR DB READ] Game logs ({log_type}) from legacy table: {len(df)} records")
                 return df
         
         return None
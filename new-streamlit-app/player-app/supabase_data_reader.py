@@ -106,13 +106,71 @@ def get_player_stats_from_db(season: str = CURRENT_SEASON) -> Optional[pd.DataFr
         return None
 
 
-def get_game_logs_from_db(season: str = CURRENT_SEASON, log_type: str = 'player') -> Optional[pd.DataFrame]:
+GAME_LOG_TABLES = {
+    'player': 'nba_player_game_logs',
+    'team': 'nba_team_game_logs',
+}
+
+# PostgREST caps responses at 1000 rows, so row tables are read page by page
+DB_PAGE_SIZE = 1000
+
+
+def _filter_game_logs(
+    df: pd.DataFrame,
+    player_ids: Optional[List[int]] = None,
+    team_ids: Optional[List[int]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> pd.DataFrame:
+    """Apply game log filters client-side (used for the legacy per-season blob)."""
+    if player_ids is not None and 'PLAYER_ID' in df.columns:
+        df = df[df['PLAYER_ID'].astype(int).isin([int(p) for p in player_ids])]
+    if team_ids is not None and 'TEAM_ID' in df.columns:
+        df = df[df['TEAM_ID'].astype(int).isin([int(t) for t in team_ids])]
+    if start_date is not None:
+        df = df[df['GAME_DATE'] >= pd.to_datetime(start_date)]
+    if end_date is not None:
+        df = df[df['GAME_DATE'] <= pd.to_datetime(end_date)]
+    return df.reset_index(drop=True)
+
+
+def _get_legacy_game_logs_from_db(supabase, season: str, log_type: str) -> Optional[pd.DataFrame]:
+    """Read the old one-JSONB-array-per-season nba_game_logs layout."""
+    result = supabase.table('nba_game_logs').select('data').eq('season', season).eq('log_type', log_type).execute()
+    
+    if result.data and len(result.data) > 0:
+        data = result.data[0]['data']
+        if data:
+            df = pd.DataFrame(data)
+            if 'GAME_DATE' in df.columns:
+                df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'], errors='coerce')
+            return df
+    
+    return None
+
+
+def get_game_logs_from_db(
+    season: str = CURRENT_SEASON,
+    log_type: str = 'player',
+    player_ids: Optional[List[int]] = None,
+    team_ids: Optional[List[int]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Optional[pd.DataFrame]:
     """
     Read game logs from database.
     
+    Reads the row-oriented nba_player_game_logs / nba_team_game_logs tables with
+    filters applied server-side, falling back to the legacy nba_game_logs blob
+    if the row tables have not been populated yet.
+    
     Args:
         season: Season string (e.g., '2025-26')
         log_type: 'player' or 'team'
+        player_ids: Only these players (player logs only)
+        team_ids: Only these teams
+        start_date: Earliest GAME_DATE to include ('YYYY-MM-DD')
+        end_date: Latest GAME_DATE to include ('YYYY-MM-DD')
     
     Returns:
         DataFrame with game logs, or None if not found
@@ -125,17 +183,43 @@ def get_game_logs_from_db(season: str = CURRENT_SEASON, log_type: str = 'player'
         if not supabase:
             return None
         
-        result = supabase.table('nba_game_logs').select('data').eq('season', season).eq('log_type', log_type).execute()
+        records = []
+        offset = 0
+        while True:
+            query = supabase.table(GAME_LOG_TABLES[log_type]).select('data').eq('season', season)
+            if player_ids is not None and log_type == 'player':
+                query = query.in_('player_id', [int(p) for p in player_ids])
+            if team_ids is not None:
+                query = query.in_('team_id', [int(t) for t in team_ids])
+            if start_date is not None:
+                query = query.gte('game_date', str(start_date)[:10])
+            if end_date is not None:
+                query = query.lte('game_date', str(end_date)[:10])
+            
+            result = query.order('id').range(offset, offset + DB_PAGE_SIZE - 1).execute()
+            page = result.data or []
+            records.extend(row['data'] for row in page)
+            if len(page) < DB_PAGE_SIZE:
+                break
+            offset += DB_PAGE_SIZE
+        
+        if records:
+            df = pd.DataFrame(records)
+            if 'GAME_DATE' in df.columns:
+                df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'], errors='coerce')
+            print(f"[DB READ] {log_type.capitalize()} game logs from database: {len(df)} records")
+            return df
+        
+        # Only fall back to the legacy blob if the row table has nothing for this season
+        populated = supabase.table(GAME_LOG_TABLES[log_type]).select('id').eq('season', season).limit(1).execute()
+        if populated.data:
+            return None
         
-        if result.data and len(result.data) > 0:
-            data = result.data[0]['data']
-            if data:
-                df = pd.DataFrame(data)
-                # Convert GAME_DATE to datetime if present
-                if 'GAME_DATE' in df.columns:
-                    df['GAME_DATE'] = pd.to_datetime(df['GAME_DATE'], errors='coerce')
-                print(f"[DB READ] {log_type.capitalize()} game logs from database: {len(df)} records")
-                return df
+        df = _get_legacy_game_logs_from_db(supabase, season, log_type)
+        if df is not None:
+            df = _filter_game_logs(df, player_ids, team_ids, start_date, end_date)
+            print(f"[DB READ] {log_type.capitalize()} game logs from legacy table: {len(df)} records")
+            return df
         
         return None
     except Exception as e:
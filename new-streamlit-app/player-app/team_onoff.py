@@ -5,12 +5,12 @@ Functions to fetch and process team player on/off court statistics from NBA API.
 
 import pandas as pd
 import numpy as np
-import streamlit as st
+import data_cache as dc
+import snapshot_store as snap
+import request_scheduler as rs
 import nba_api.stats.endpoints as endpoints
-import time
 import json
 from typing import Dict, Optional, Tuple
-from requests.exceptions import ReadTimeout, RequestException
 
 # Supabase imports removed - using Streamlit cache instead
 
@@ -22,7 +22,8 @@ LEAGUE_ID = "00"
 MIN_MINUTES_THRESHOLD = 100
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@dc.cached(ttl=3600, show_spinner=False)
+@snap.snapshotted('team_onoff', key_params=('team_id',))
 def get_team_onoff_summary(team_id: int, season: str = CURRENT_SEASON, 
                            max_retries: int = 3, timeout: int = 60) -> pd.DataFrame:
     """
@@ -38,97 +39,79 @@ def get_team_onoff_summary(team_id: int, season: str = CURRENT_SEASON,
         DataFrame with on/off court data for all players on the team, or empty DataFrame on error
     """
     
-    # Fetch from API
-    for attempt in range(max_retries):
-        try:
-            endpoint = endpoints.TeamPlayerOnOffDetails(
-                team_id=team_id,
-                season=season,
-                season_type_all_star='Regular Season',
-                per_mode_detailed='Totals',
-                measure_type_detailed_defense='Advanced',  # Use Advanced to get rating columns
-                league_id_nullable='00',
-                timeout=timeout
-            )
-            
-            # Get all dataframes from the endpoint
-            data_frames = endpoint.get_data_frames()
-            
-            # Index 0: OverallTeamPlayerOnOffDetails (team-level, not player-level)
-            # Index 1: PlayersOffCourtTeamPlayerOnOffDetails (player stats when OFF court)
-            # Index 2: PlayersOnCourtTeamPlayerOnOffDetails (player stats when ON court)
-            
-            if len(data_frames) < 3:
-                return pd.DataFrame()
-            
-            # The NBA API returns dataframes in a specific order:
-            # Index 1: PlayersOffCourtTeamPlayerOnOffDetails (player stats when OFF court)
-            # Index 2: PlayersOnCourtTeamPlayerOnOffDetails (player stats when ON court)
-            # Based on user feedback that values are flipped, the API index labels don't match the actual data:
-            # Index 1 actually contains ON court data, Index 2 actually contains OFF court data
-            players_on_court_df = data_frames[1].copy()   # Index 1 contains ON court data (despite "OffCourt" label)
-            players_off_court_df = data_frames[2].copy()  # Index 2 contains OFF court data (despite "OnCourt" label)
-            
-            if len(players_off_court_df) == 0 or len(players_on_court_df) == 0:
-                return pd.DataFrame()
-            
-            # Merge on VS_PLAYER_ID (the player ID column)
-            # First, prepare columns for merging - rename columns with suffixes
-            on_cols = {col: f"{col}_ON_COURT" for col in players_on_court_df.columns 
-                      if col not in ['VS_PLAYER_ID', 'VS_PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'COURT_STATUS']}
-            off_cols = {col: f"{col}_OFF_COURT" for col in players_off_court_df.columns 
-                       if col not in ['VS_PLAYER_ID', 'VS_PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'COURT_STATUS']}
-            
-            # Rename columns
-            players_on_court_df = players_on_court_df.rename(columns=on_cols)
-            players_off_court_df = players_off_court_df.rename(columns=off_cols)
-            
-            # Merge on VS_PLAYER_ID
-            merged_df = pd.merge(
-                players_on_court_df,
-                players_off_court_df,
-                on='VS_PLAYER_ID',
-                how='inner',
-                suffixes=('', '_y')
-            )
-            
-            # Clean up duplicate columns from merge
-            if 'VS_PLAYER_NAME_y' in merged_df.columns:
-                merged_df = merged_df.drop(columns=['VS_PLAYER_NAME_y'])
-            if 'TEAM_ID_y' in merged_df.columns:
-                merged_df = merged_df.drop(columns=['TEAM_ID_y'])
-            if 'TEAM_ABBREVIATION_y' in merged_df.columns:
-                merged_df = merged_df.drop(columns=['TEAM_ABBREVIATION_y'])
-            if 'TEAM_NAME_y' in merged_df.columns:
-                merged_df = merged_df.drop(columns=['TEAM_NAME_y'])
-            
-            # Rename VS_PLAYER_ID to PLAYER_ID for consistency
-            if 'VS_PLAYER_ID' in merged_df.columns:
-                merged_df = merged_df.rename(columns={'VS_PLAYER_ID': 'PLAYER_ID'})
-            
-            if len(merged_df) > 0:
-                return merged_df
-            else:
-                return pd.DataFrame()
-                
-        except (ReadTimeout, RequestException) as e:
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 2
-                time.sleep(wait_time)
-                continue
-            else:
-                print(f"Error fetching team on/off data for team {team_id}: {str(e)}")
-                return pd.DataFrame()
-        except Exception as e:
-            if attempt < max_retries - 1:
-                wait_time = (attempt + 1) * 2
-                time.sleep(wait_time)
-                continue
-            else:
-                print(f"Unexpected error fetching team on/off data for team {team_id}: {str(e)}")
-                return pd.DataFrame()
-    
-    return pd.DataFrame()
+    # Fetch from API (rate limited, retried with backoff by the request scheduler)
+    try:
+        data_frames = rs.call_nba_api(
+            endpoints.TeamPlayerOnOffDetails,
+            max_retries=max_retries,
+            team_id=team_id,
+            season=season,
+            season_type_all_star='Regular Season',
+            per_mode_detailed='Totals',
+            measure_type_detailed_defense='Advanced',  # Use Advanced to get rating columns
+            league_id_nullable='00',
+            timeout=timeout
+        )
+    except Exception as e:
+        print(f"Error fetching team on/off data for team {team_id}: {str(e)}")
+        return pd.DataFrame()
+    
+    # Index 0: OverallTeamPlayerOnOffDetails (team-level, not player-level)
+    # Index 1: PlayersOffCourtTeamPlayerOnOffDetails (player stats when OFF court)
+    # Index 2: PlayersOnCourtTeamPlayerOnOffDetails (player stats when ON court)
+    
+    if len(data_frames) < 3:
+        return pd.DataFrame()
+    
+    # The NBA API returns dataframes in a specific order:
+    # Index 1: PlayersOffCourtTeamPlayerOnOffDetails (player stats when OFF court)
+    # Index 2: PlayersOnCourtTeamPlayerOnOffDetails (player stats when ON court)
+    # Based on user feedback that values are flipped, the API index labels don't match the actual data:
+    # Index 1 actually contains ON court data, Index 2 actually contains OFF court data
+    players_on_court_df = data_frames[1].copy()   # Index 1 contains ON court data (despite "OffCourt" label)
+    players_off_court_df = data_frames[2].copy()  # Index 2 contains OFF court data (despite "OnCourt" label)
+    
+    if len(players_off_court_df) == 0 or len(players_on_court_df) == 0:
+        return pd.DataFrame()
+    
+    # Merge on VS_PLAYER_ID (the player ID column)
+    # First, prepare columns for merging - rename columns with suffixes
+    on_cols = {col: f"{col}_ON_COURT" for col in players_on_court_df.columns 
+              if col not in ['VS_PLAYER_ID', 'VS_PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'COURT_STATUS']}
+    off_cols = {col: f"{col}_OFF_COURT" for col in players_off_court_df.columns 
+               if col not in ['VS_PLAYER_ID', 'VS_PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'TEAM_NAME', 'COURT_STATUS']}
+    
+    # Rename columns
+    players_on_court_df = players_on_court_df.rename(columns=on_cols)
+    players_off_court_df = players_off_court_df.rename(columns=off_cols)
+    
+    # Merge on VS_PLAYER_ID
+    merged_df = pd.merge(
+        players_on_court_df,
+        players_off_court_df,
+        on='VS_PLAYER_ID',
+        how='inner',
+        suffixes=('', '_y')
+    )
+    
+    # Clean up duplicate columns from merge
+    if 'VS_PLAYER_NAME_y' in merged_df.columns:
+        merged_df = merged_df.drop(columns=['VS_PLAYER_NAME_y'])
+    if 'TEAM_ID_y' in merged_df.columns:
+        merged_df = merged_df.drop(columns=['TEAM_ID_y'])
+    if 'TEAM_ABBREVIATION_y' in merged_df.columns:
+        merged_df = merged_df.drop(columns=['TEAM_ABBREVIATION_y'])
+    if 'TEAM_NAME_y' in merged_df.columns:
+        merged_df = merged_df.drop(columns=['TEAM_NAME_y'])
+    
+    # Rename VS_PLAYER_ID to PLAYER_ID for consistency
+    if 'VS_PLAYER_ID' in merged_df.columns:
+        merged_df = merged_df.rename(columns={'VS_PLAYER_ID': 'PLAYER_ID'})
+    
+    if len(merged_df) > 0:
+        return merged_df
+    else:
+        return pd.DataFrame()
 
 
 def process_onoff_data(onoff_df: pd.DataFrame, min_minutes: int = MIN_MINUTES_THRESHOLD) -> pd.DataFrame:
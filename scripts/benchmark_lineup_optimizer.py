@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Lineup Optimizer Benchmark
+Times optimize_multiple_lineups() on a synthetic slate and fails when the run exceeds a target.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+import optimize_draftkings_nba_lineup as opt
+
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C', 'PG/SG', 'SG/SF', 'SF/PF', 'PF/C']
+TEAMS = ['ATL', 'BOS', 'CHI', 'DEN', 'LAL', 'MIA', 'NYK', 'PHX']
+
+
+def build_synthetic_slate(num_players: int = 120, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a random slate shaped like a DraftKings main slate.
+    
+    Salaries run $3,000-$10,900 and FPTS track salary (~5 FPTS per $1,000) with noise,
+    so many lineups sit within a few points of the optimum.
+    
+    Args:
+        num_players: Number of players on the slate (default 120)
+        seed: Random seed (default 0)
+    
+    Returns:
+        DataFrame with Player, position, salary, FPTS, Team and position flag columns
+    """
+    rng = np.random.default_rng(seed)
+    salary = rng.integers(30, 110, num_players) * 100
+    df = pd.DataFrame({
+        'Player': [f"Player {i}" for i in range(num_players)],
+        'position': rng.choice(POSITIONS, num_players),
+        'salary': salary,
+        'FPTS': salary / 1000 * 5 + rng.normal(0, 5, num_players),
+        'Team': rng.choice(TEAMS, num_players),
+    })
+    return opt.add_position_flags(df)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark multi-lineup generation on a synthetic slate',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 150 lineups, fail if slower than 90 seconds (default)
+  python benchmark_lineup_optimizer.py
+  
+  # Looser uniqueness and a tighter target
+  python benchmark_lineup_optimizer.py --max-overlap 6 --target-seconds 45
+        """
+    )
+    parser.add_argument('--lineups', type=int, default=150, help='Number of lineups (default: 150)')
+    parser.add_argument('--players', type=int, default=120, help='Players on the slate (default: 120)')
+    parser.add_argument('--max-overlap', type=int, default=3, help='Max shared players between lineups (default: 3)')
+    parser.add_argument('--max-exposure', type=int, default=None, help='Max lineups per player (default: no limit)')
+    parser.add_argument('--time-limit', type=float, default=opt.LINEUP_TIME_LIMIT,
+                        help=f"Solver time limit per lineup in seconds (default: {opt.LINEUP_TIME_LIMIT})")
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the slate (default: 0)')
+    parser.add_argument('--target-seconds', type=float, default=90.0,
+                        help='Fail if the run takes longer than this (default: 90)')
+    
+    args = parser.parse_args()
+    
+    df = build_synthetic_slate(args.players, args.seed)
+    print(f"Solver: {'highspy (incremental)' if opt.highspy is not None else 'scipy milp'}")
+    print(f"Slate: {args.players} players, {args.lineups} lineups, max_overlap={args.max_overlap}, "
+          f"max_exposure={args.max_exposure}, time_limit={args.time_limit}s")
+    
+    start = time.perf_counter()
+    lineups = opt.optimize_multiple_lineups(
+        df,
+        num_lineups=args.lineups,
+        max_overlap=args.max_overlap,
+        max_exposure=args.max_exposure,
+        time_limit=args.time_limit
+    )
+    elapsed = time.perf_counter() - start
+    
+    avg_fpts = np.mean([lineup['FPTS'].sum() for lineup in lineups]) if lineups else 0.0
+    print(f"\nGenerated {len(lineups)}/{args.lineups} lineups in {elapsed:.1f}s "
+          f"({elapsed / max(len(lineups), 1):.2f}s per lineup)")
+    print(f"Average FPTS: {avg_fpts:.2f} (best {lineups[0]['FPTS'].sum():.2f})" if lineups else "Average FPTS: n/a")
+    
+    if len(lineups) < args.lineups:
+        print(f"\n✗ Only {len(lineups)} of {args.lineups} lineups generated")
+        sys.exit(1)
+    if elapsed > args.target_seconds:
+        print(f"\n✗ {elapsed:.1f}s exceeds the {args.target_seconds:.0f}s target")
+        sys.exit(1)
+    print(f"\n✓ Within the {args.target_seconds:.0f}s target")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Build Passing Networks
+Fetches every rostered player's PlayerDashPtPass dashboard and stores the
+league's passing networks as edge lists in the snapshot store.
+
+One request per player and per mode (~1,000 requests per run), throttled by the
+request scheduler. Meant to run as a nightly job so the Passing page and assist
+features read team networks from disk (see passing_network.py).
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / 'new-streamlit-app' / 'player-app'))
+
+import argparse
+from datetime import datetime
+
+import player_functions as pf
+import passing_network as pn
+
+
+def build_passing_networks(season: str = pn.CURRENT_SEASON, per_modes: tuple = pn.PER_MODES) -> bool:
+    """Fetch and store the passing networks of every team."""
+    print(f"[{datetime.now()}] Building passing networks for {season} ({', '.join(per_modes)})")
+    
+    players_df = pf.get_players_dataframe()
+    rosters = pn.get_rosters(players_df)
+    if not rosters:
+        print("  ✗ Could not load rosters from PlayerIndex")
+        return False
+    print(f"  Rosters: {len(rosters)} teams, {sum(len(p) for p in rosters.values())} players")
+    
+    stored = pn.refresh_passing_networks(players_df, season=season, per_modes=per_modes)
+    for per_mode in per_modes:
+        if per_mode in stored:
+            print(f"  ✓ {per_mode}: {stored[per_mode]} edges")
+        else:
+            print(f"  ✗ {per_mode}: not stored")
+    
+    print(f"\n[{datetime.now()}] Completed")
+    return len(stored) == len(per_modes)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build league passing networks (PlayerDashPtPass edge lists)')
+    parser.add_argument('--season', type=str, default=pn.CURRENT_SEASON, help='Season (e.g. 2025-26)')
+    parser.add_argument('--per-mode', type=str, choices=pn.PER_MODES, default=None,
+                        help='Only build one per mode (default: all)')
+    args = parser.parse_args()
+    
+    per_modes = (args.per_mode,) if args.per_mode else pn.PER_MODES
+    success = build_passing_networks(season=args.season, per_modes=per_modes)
+    sys.exit(0 if success else 1)
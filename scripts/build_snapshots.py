@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Build Local Snapshots
+Fetches every bulk NBA dataset once and stores it as a versioned Parquet snapshot
+(see snapshot_store.py). Afterwards batch predictions, backtests and the app can
+run from disk with NBA_OFFLINE=1.
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / 'new-streamlit-app' / 'player-app'))
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from nba_api.stats.static import teams as static_teams
+from datetime import datetime
+
+import snapshot_store as snap
+import request_scheduler as rs
+import prediction_features as pf
+import matchup_stats as ms
+import drives_stats as ds
+import player_synergy as psyn
+import team_onoff as toff
+import slate_features as sf
+
+CURRENT_SEASON = '2025-26'
+
+
+def build_snapshots(season: str = CURRENT_SEASON, include_onoff: bool = True) -> bool:
+    """Fetch all bulk datasets and write snapshots. Returns True if every dataset was stored."""
+    print(f"[{datetime.now()}] Building snapshots for season {season} in {snap.SNAPSHOT_DIR}")
+    
+    # Decorated loaders write their own snapshots on a successful fetch
+    loaders = [
+        ('player_game_logs', lambda: pf.get_bulk_player_game_logs(season)),
+        ('team_game_logs', lambda: pf.get_bulk_team_game_logs(season)),
+        ('player_advanced_stats', lambda: pf.get_bulk_player_advanced_stats(season)),
+        ('player_index', lambda: pf.get_bulk_player_index()),
+        ('player_misc_stats', lambda: ms.get_player_misc_stats(season)),
+        ('player_drives', lambda: ds.get_all_player_drives_stats(season)),
+        ('team_drives', lambda: ds.get_all_team_drives_stats(season)),
+        ('player_synergy', lambda: psyn.get_all_players_offensive_synergy_bulk(season)),
+        ('team_defensive_synergy', lambda: psyn.get_all_teams_defensive_synergy_bulk(season)),
+        ('team_context', lambda: pf.get_team_context_table(season)),
+        ('schedule', lambda: pf.get_league_schedule(season)),
+        ('standings', lambda: pf.get_league_standings(season)),
+        # Derived: incremental update of the per-player rolling feature table
+        ('player_features', lambda: sf.get_player_feature_table(season)),
+    ]
+    
+    success_count = 0
+    error_count = 0
+    
+    for dataset, loader in loaders:
+        try:
+            result = loader()
+            n_rows = sum(len(df) for df in result.values()) if isinstance(result, dict) else len(result)
+            if n_rows > 0:
+                print(f"  ✓ {dataset}: {n_rows} rows")
+                success_count += 1
+            else:
+                print(f"  ✗ {dataset}: no data")
+                error_count += 1
+        except Exception as e:
+            print(f"  ✗ {dataset}: {e}")
+            error_count += 1
+    
+    if include_onoff:
+        # Requests inside get_team_onoff_summary are rate limited by the request scheduler
+        with ThreadPoolExecutor(max_workers=rs.HOST_LIMITS[rs.NBA_STATS_HOST]['concurrency']) as executor:
+            frames = list(executor.map(
+                lambda team: toff.get_team_onoff_summary(team['id'], season), static_teams.get_teams()
+            ))
+        n_teams = sum(1 for df in frames if len(df) > 0)
+        print(f"  {'✓' if n_teams else '✗'} team_onoff: {n_teams} teams")
+        if n_teams:
+            success_count += 1
+        else:
+            error_count += 1
+    
+    print(f"\n[{datetime.now()}] Completed: {success_count} successful, {error_count} errors")
+    return error_count == 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build local Parquet snapshots of bulk NBA data')
+    parser.add_argument('--season', type=str, default=CURRENT_SEASON, help='Season (e.g. 2025-26)')
+    parser.add_argument('--skip-onoff', action='store_true', help='Skip the per-team on/off fetch (30 requests)')
+    parser.add_argument('--list', action='store_true', help='List stored snapshots and exit')
+    args = parser.parse_args()
+    
+    if args.list:
+        with pd.option_context('display.max_rows', None, 'display.width', 200):
+            print(snap.list_snapshots())
+        sys.exit(0)
+    
+    success = build_snapshots(season=args.season, include_onoff=not args.skip_onoff)
+    sys.exit(0 if success else 1)
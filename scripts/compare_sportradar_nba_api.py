@@ -113,18 +113,18 @@ def compare_game_logs():
     
     # Fetch NBA API player game logs
     try:
-        nba_result = supabase.table('nba_game_logs').select('data').eq('season', CURRENT_SEASON).eq('log_type', 'player').execute()
-        nba_data = nba_result.data[0]['data'] if nba_result.data else []
-        print(f"NBA API: {len(nba_data)} player game logs")
+        nba_result = supabase.table('nba_player_game_logs').select('data', count='exact').eq('season', CURRENT_SEASON).limit(1).execute()
+        nba_data = [row['data'] for row in nba_result.data] if nba_result.data else []
+        print(f"NBA API: {nba_result.count or 0} player game logs")
     except Exception as e:
         print(f"Error fetching NBA game logs: {e}")
         nba_data = []
     
     # Fetch Sportradar game logs
     try:
-        sr_result = supabase.table('sr_game_logs').select('data').eq('season', CURRENT_SEASON).eq('log_type', 'player').execute()
-        sr_data = sr_result.data[0]['data'] if sr_result.data else []
-        print(f"Sportradar API: {len(sr_data)} player game logs")
+        sr_result = supabase.table('sr_player_game_logs').select('data', count='exact').eq('season', CURRENT_SEASON).limit(1).execute()
+        sr_data = [row['data'] for row in sr_result.data] if sr_result.data else []
+        print(f"Sportradar API: {sr_result.count or 0} player game logs")
     except Exception as e:
         print(f"Error fetching Sportradar game logs: {e}")
         sr_data = []
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 """
 Fetch NBA Game Logs and Store in Supabase
-Fetches player and team game logs and stores in nba_game_logs table.
+Fetches player and team game logs and stores one row per game in the
+nba_player_game_logs / nba_team_game_logs tables.
+
+Runs incrementally by default: only games on or after the last stored GAME_DATE
+are fetched and upserted (the last date is re-fetched in case it was stored
+mid-slate). Use --full to refetch the whole season.
 """
 
 import sys
@@ -12,18 +17,110 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / 'new-streamlit-app' / 'player-app'))
 
+import math
+import argparse
 import pandas as pd
 import nba_api.stats.endpoints as endpoints
 from supabase_config import get_supabase_service_client
 from datetime import datetime, UTC
+from typing import Dict, List, Optional
 import time
 
 CURRENT_SEASON = '2025-26'
 SEASON_TYPE = 'Regular Season'
+UPSERT_BATCH_SIZE = 500
+
+PLAYER_LOGS_TABLE = 'nba_player_game_logs'
+TEAM_LOGS_TABLE = 'nba_team_game_logs'
+
+
+def get_last_stored_game_date(supabase, table: str, season: str) -> Optional[str]:
+    """
+    Get the most recent game_date stored for a season.
+    
+    Returns:
+        Date string 'YYYY-MM-DD', or None if the table has no rows for the season
+    """
+    try:
+        result = supabase.table(table).select('game_date').eq('season', season).order(
+            'game_date', desc=True
+        ).limit(1).execute()
+        if result.data:
+            return result.data[0]['game_date']
+    except Exception as e:
+        print(f"  Could not read last stored date from {table}: {e}")
+    return None
+
+
+def to_api_date(date_str: str) -> str:
+    """Convert 'YYYY-MM-DD' to the MM/DD/YYYY format expected by the stats API."""
+    return datetime.strptime(date_str[:10], '%Y-%m-%d').strftime('%m/%d/%Y')
+
+
+def clean_records(df: pd.DataFrame) -> List[Dict]:
+    """Convert a DataFrame to JSON-safe records (NaN/Inf -> None)."""
+    records = df.to_dict('records')
+    return [
+        {
+            k: (None if isinstance(v, float) and (math.isnan(v) or math.isinf(v)) else v)
+            for k, v in record.items()
+        }
+        for record in records
+    ]
+
 
-def fetch_and_store_game_logs():
-    """Fetch game logs from NBA API and store in Supabase"""
-    print(f"[{datetime.now()}] Starting game logs fetch for season {CURRENT_SEASON}")
+def build_player_rows(df: pd.DataFrame, season: str) -> List[Dict]:
+    """Build nba_player_game_logs rows from a PlayerGameLogs DataFrame."""
+    now = datetime.now(UTC).isoformat()
+    return [
+        {
+            'season': season,
+            'player_id': int(record['PLAYER_ID']),
+            'game_id': str(record['GAME_ID']),
+            'team_id': int(record['TEAM_ID']) if record.get('TEAM_ID') is not None else None,
+            'game_date': str(record['GAME_DATE'])[:10],
+            'data': record,
+            'updated_at': now
+        }
+        for record in clean_records(df)
+    ]
+
+
+def build_team_rows(df: pd.DataFrame, season: str) -> List[Dict]:
+    """Build nba_team_game_logs rows from a TeamGameLogs DataFrame."""
+    now = datetime.now(UTC).isoformat()
+    return [
+        {
+            'season': season,
+            'team_id': int(record['TEAM_ID']),
+            'game_id': str(record['GAME_ID']),
+            'game_date': str(record['GAME_DATE'])[:10],
+            'data': record,
+            'updated_at': now
+        }
+        for record in clean_records(df)
+    ]
+
+
+def upsert_rows(supabase, table: str, rows: List[Dict], on_conflict: str) -> int:
+    """
+    Upsert rows in batches.
+    
+    Returns:
+        Number of rows upserted
+    """
+    upserted = 0
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[i:i + UPSERT_BATCH_SIZE]
+        supabase.table(table).upsert(batch, on_conflict=on_conflict).execute()
+        upserted += len(batch)
+    return upserted
+
+
+def fetch_and_store_game_logs(season: str = CURRENT_SEASON, full_refresh: bool = False):
+    """Fetch new game logs from NBA API and upsert them into Supabase"""
+    print(f"[{datetime.now()}] Starting game logs fetch for season {season}"
+          f" ({'full refresh' if full_refresh else 'incremental'})")
     
     supabase = get_supabase_service_client()
     if not supabase:
@@ -35,10 +132,12 @@ def fetch_and_store_game_logs():
     
     # Fetch player game logs (all players in one call)
     try:
-        print("Fetching player game logs...")
+        last_date = None if full_refresh else get_last_stored_game_date(supabase, PLAYER_LOGS_TABLE, season)
+        print(f"Fetching player game logs{f' since {last_date}' if last_date else ''}...")
         df = endpoints.PlayerGameLogs(
-            season_nullable=CURRENT_SEASON,
-            league_id_nullable='00'
+            season_nullable=season,
+            league_id_nullable='00',
+            date_from_nullable=to_api_date(last_date) if last_date else ''
         ).get_data_frames()[0]
         
         # Filter out preseason games (keep regular season '2' and playoffs '4')
@@ -46,49 +145,41 @@ def fetch_and_store_game_logs():
             df = df[df['GAME_ID'].astype(str).str[2].isin(['2', '4'])].copy()
         
         if len(df) > 0:
-            data = df.to_dict('records')
-            supabase.table('nba_game_logs').upsert({
-                'season': CURRENT_SEASON,
-                'log_type': 'player',
-                'data': data,
-                'updated_at': datetime.now(UTC).isoformat()
-            }, on_conflict='season,log_type').execute()
-            
-            print(f"  ✓ Stored {len(df)} player game logs")
-            success_count += 1
+            n_rows = upsert_rows(
+                supabase, PLAYER_LOGS_TABLE, build_player_rows(df, season), on_conflict='player_id,game_id'
+            )
+            print(f"  ✓ Stored {n_rows} player game logs")
         else:
-            print("  No player game logs returned")
-            error_count += 1
-            
+            print("  No new player game logs")
+        success_count += 1
+    
     except Exception as e:
         print(f"  ✗ Error fetching player logs: {e}")
         import traceback
         traceback.print_exc()
         error_count += 1
     
+    time.sleep(1)
+    
     # Fetch team game logs (all teams in one call)
     try:
-        print("Fetching team game logs...")
+        last_date = None if full_refresh else get_last_stored_game_date(supabase, TEAM_LOGS_TABLE, season)
+        print(f"Fetching team game logs{f' since {last_date}' if last_date else ''}...")
         df = endpoints.TeamGameLogs(
-            season_nullable=CURRENT_SEASON,
-            season_type_nullable=SEASON_TYPE
+            season_nullable=season,
+            season_type_nullable=SEASON_TYPE,
+            date_from_nullable=to_api_date(last_date) if last_date else ''
         ).get_data_frames()[0]
         
         if len(df) > 0:
-            data = df.to_dict('records')
-            supabase.table('nba_game_logs').upsert({
-                'season': CURRENT_SEASON,
-                'log_type': 'team',
-                'data': data,
-                'updated_at': datetime.now(UTC).isoformat()
-            }, on_conflict='season,log_type').execute()
-            
-            print(f"  ✓ Stored {len(df)} team game logs")
-            success_count += 1
+            n_rows = upsert_rows(
+                supabase, TEAM_LOGS_TABLE, build_team_rows(df, season), on_conflict='team_id,game_id'
+            )
+            print(f"  ✓ Stored {n_rows} team game logs")
         else:
-            print("  No team game logs returned")
-            error_count += 1
-            
+            print("  No new team game logs")
+        success_count += 1
+    
     except Exception as e:
         print(f"  ✗ Error fetching team logs: {e}")
         import traceback
@@ -99,6 +190,10 @@ def fetch_and_store_game_logs():
     return error_count == 0
 
 if __name__ == '__main__':
-    success = fetch_and_store_game_logs()
+    parser = argparse.ArgumentParser(description='Fetch NBA game logs into Supabase')
+    parser.add_argument('--season', type=str, default=CURRENT_SEASON, help='Season (e.g. 2025-26)')
+    parser.add_argument('--full', action='store_true', help='Refetch the whole season instead of only new games')
+    args = parser.parse_args()
+    
+    success = fetch_and_store_game_logs(season=args.season, full_refresh=args.full)
     sys.exit(0 if success else 1)
-
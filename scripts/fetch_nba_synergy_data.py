@@ -16,7 +16,7 @@ import pandas as pd
 import nba_api.stats.endpoints as endpoints
 from supabase_config import get_supabase_service_client
 from datetime import datetime, UTC
-import time
+import request_scheduler as rs
 
 CURRENT_SEASON = '2025-26'
 SEASON_TYPE = 'Regular Season'
@@ -36,87 +36,52 @@ def fetch_and_store_synergy_data():
     success_count = 0
     error_count = 0
     
-    # Fetch team synergy (both offensive and defensive)
-    print("Fetching team synergy data (offensive + defensive)...")
-    for playtype in playtypes:
-        for type_grouping in ['offensive', 'defensive']:
-            try:
-                print(f"Fetching team {playtype} {type_grouping}...")
-                
-                df = endpoints.SynergyPlayTypes(
-                    league_id_nullable='00',
-                    season=CURRENT_SEASON,
-                    season_type_all_star=SEASON_TYPE,
-                    per_mode_simple='Totals',
-                    player_or_team_abbreviation='T',
-                    playtype_nullable=playtype,
-                    type_grouping_nullable=type_grouping
-                ).get_data_frames()[0]
-                
-                if len(df) == 0:
-                    print(f"  No data for team {playtype} {type_grouping}")
-                    continue
-                
-                data = df.to_dict('records')
-                
-                supabase.table('nba_synergy_data').upsert({
-                    'season': CURRENT_SEASON,
-                    'entity_type': 'team',
-                    'playtype': playtype,
-                    'type_grouping': type_grouping,
-                    'data': data,
-                    'updated_at': datetime.now(UTC).isoformat()
-                }, on_conflict='season,entity_type,playtype,type_grouping').execute()
-                
-                print(f"  ✓ Stored team {playtype} {type_grouping} ({len(df)} records)")
-                success_count += 1
-                
-                time.sleep(0.5)  # Rate limiting
-                
-            except Exception as e:
-                print(f"  ✗ Error fetching team {playtype} {type_grouping}: {e}")
-                error_count += 1
-                import traceback
-                traceback.print_exc()
+    # Team synergy (both offensive and defensive) and player synergy (only offensive -
+    # defensive not used in application). All requests are scheduled at once; the
+    # request scheduler enforces the stats.nba.com rate limit and retries with backoff.
+    jobs = [('team', 'T', playtype, type_grouping)
+            for playtype in playtypes for type_grouping in ['offensive', 'defensive']]
+    jobs += [('player', 'P', playtype, 'offensive') for playtype in playtypes]
     
-    # Fetch player synergy (only offensive - defensive not used in application)
-    print("\nFetching player synergy data (offensive only)...")
-    for playtype in playtypes:
+    print(f"Fetching {len(jobs)} synergy datasets...")
+    futures = [
+        rs.submit_nba_api(
+            endpoints.SynergyPlayTypes,
+            league_id_nullable='00',
+            season=CURRENT_SEASON,
+            season_type_all_star=SEASON_TYPE,
+            per_mode_simple='Totals',
+            player_or_team_abbreviation=abbreviation,
+            playtype_nullable=playtype,
+            type_grouping_nullable=type_grouping
+        )
+        for _, abbreviation, playtype, type_grouping in jobs
+    ]
+    
+    for (entity_type, _, playtype, type_grouping), future in zip(jobs, futures):
         try:
-            print(f"Fetching player {playtype} offensive...")
-            
-            df = endpoints.SynergyPlayTypes(
-                league_id_nullable='00',
-                season=CURRENT_SEASON,
-                season_type_all_star=SEASON_TYPE,
-                per_mode_simple='Totals',
-                player_or_team_abbreviation='P',
-                playtype_nullable=playtype,
-                type_grouping_nullable='offensive'
-            ).get_data_frames()[0]
+            df = future.result()[0]
             
             if len(df) == 0:
-                print(f"  No data for player {playtype} offensive")
+                print(f"  No data for {entity_type} {playtype} {type_grouping}")
                 continue
             
             data = df.to_dict('records')
             
             supabase.table('nba_synergy_data').upsert({
                 'season': CURRENT_SEASON,
-                'entity_type': 'player',
+                'entity_type': entity_type,
                 'playtype': playtype,
-                'type_grouping': 'offensive',
+                'type_grouping': type_grouping,
                 'data': data,
                 'updated_at': datetime.now(UTC).isoformat()
             }, on_conflict='season,entity_type,playtype,type_grouping').execute()
             
-            print(f"  ✓ Stored player {playtype} offensive ({len(df)} records)")
+            print(f"  ✓ Stored {entity_type} {playtype} {type_grouping} ({len(df)} records)")
             success_count += 1
-            
-            time.sleep(0.5)  # Rate limiting
-            
+        
         except Exception as e:
-            print(f"  ✗ Error fetching player {playtype} offensive: {e}")
+            print(f"  ✗ Error fetching {entity_type} {playtype} {type_grouping}: {e}")
             error_count += 1
             import traceback
             traceback.print_exc()
@@ -14,27 +14,13 @@ sys.path.insert(0, str(project_root))
 sys.path.insert(0, str(project_root / 'new-streamlit-app' / 'player-app'))
 
 import pandas as pd
-import nba_api.stats.endpoints as endpoints
 from datetime import datetime, date
 import argparse
-import glob
 from typing import Dict, List
 import pytz
 
-# Import prediction functions
-import player_functions as pf
-import prediction_model as pm
 import injury_report as ir
-
-# Import optimizer functions (optional - only if optimizing)
-try:
-    from optimize_draftkings_nba_lineup import (
-        load_draftables, merge_draftables_with_predictions,
-        add_position_flags, optimize_lineup, format_lineup_output
-    )
-    OPTIMIZER_AVAILABLE = True
-except ImportError:
-    OPTIMIZER_AVAILABLE = False
+import prediction_features as pf
 
 
 def get_matchups_for_date(selected_date: date, season: str = '2025-26'):
@@ -49,10 +35,9 @@ def get_matchups_for_date(selected_date: date, season: str = '2025-26'):
         List of matchup dicts with game info
     """
     try:
-        league_schedule = endpoints.ScheduleLeagueV2(
-            league_id='00',
-            season=season
-        ).get_data_frames()[0]
+        league_schedule = pf.get_league_schedule(season)
+        if len(league_schedule) == 0:
+            return []
         
         league_schedule['dateGame'] = pd.to_datetime(league_schedule['gameDate'])
         league_schedule['matchup'] = league_schedule['awayTeam_teamTricode'] + ' @ ' + league_schedule['homeTeam_teamTricode']
@@ -121,331 +106,192 @@ def get_team_roster(team_id: int, players_df: pd.DataFrame) -> List[Dict]:
     return players
 
 
-def generate_predictions_for_date(game_date: date, output_dir: str = None, exclude_injured: bool = True, 
-                                  optimize_lineups: bool = False, draftables_path: str = None, max_salary: int = 50000,
-                                  tipoff_time_filter: str = None):
+def get_out_player_ids(injury_df: pd.DataFrame, away_team_abbr: str, home_team_abbr: str,
+                       players_df: pd.DataFrame) -> List[str]:
     """
-    Generate predictions for all games on a given date.
+    Player IDs listed OUT or DOUBTFUL for a matchup.
     
     Args:
-        game_date: Date to generate predictions for
-        output_dir: Directory to save CSV files (default: ~/Downloads)
-        exclude_injured: Whether to exclude injured players (OUT/DOUBTFUL) (default: True)
-        optimize_lineups: Whether to optimize lineups after generating predictions (default: False)
-        draftables_path: Path to draftables CSV (required if optimize_lineups=True)
-        max_salary: Maximum salary for optimization (default: 50000)
-        
+        injury_df: DataFrame from ir.fetch_injuries_for_date (may be None)
+        away_team_abbr: Away team abbreviation
+        home_team_abbr: Home team abbreviation
+        players_df: DataFrame from PlayerIndex
+    
     Returns:
-        List of output file paths
+        Sorted list of player ID strings
     """
-    if output_dir is None:
-        output_dir = os.path.expanduser("~/Downloads")
-    else:
-        os.makedirs(output_dir, exist_ok=True)
-    
-    print(f"=" * 60)
-    print(f"Generating Predictions for {game_date.strftime('%Y-%m-%d')}")
-    print(f"=" * 60)
-    
-    # Get matchups for the date
-    print(f"\nFetching schedule...")
-    matchups = get_matchups_for_date(game_date)
-    
-    if len(matchups) == 0:
-        print(f"No games found for {game_date.strftime('%Y-%m-%d')}")
+    out_player_ids = set()
+    if injury_df is None or len(injury_df) == 0:
         return []
     
-    print(f"Found {len(matchups)} game(s)")
-    
-    # Get players dataframe (needed for rosters)
-    print(f"\nLoading player data...")
-    players_df = pf.get_players_dataframe()
-    if players_df is None or len(players_df) == 0:
-        raise ValueError("Could not load players dataframe")
-    
-    print(f"Loaded {len(players_df)} players")
-    
-    # Fetch injury report for the date (if excluding injured players)
-    injury_df = None
-    if exclude_injured:
-        print(f"\nFetching injury report...")
-        injury_df, injury_status = ir.fetch_injuries_for_date(game_date, players_df)
-        if injury_df is not None and len(injury_df) > 0:
-            print(f"✓ Loaded injury report ({len(injury_df)} entries)")
-        else:
-            print(f"⚠ No injury report found: {injury_status}")
-    else:
-        print(f"\n⚠ Injury filtering disabled - all players will be included")
+    matchup_injuries = ir.get_injuries_for_matchup(
+        injury_df,
+        away_team_abbr,
+        home_team_abbr,
+        players_df
+    )
     
-    output_files = []
+    # Filter OUT/DOUBTFUL players
+    for injury_item in matchup_injuries.get('away', []) + matchup_injuries.get('home', []):
+        status_lower = injury_item.get('status', '').lower() if injury_item.get('status') else ''
+        if 'out' in status_lower or 'doubtful' in status_lower:
+            player_id = injury_item.get('player_id')
+            if player_id:
+                out_player_ids.add(str(player_id))
     
-    # Check for existing prediction files
-    existing_files = {}
-    if os.path.exists(output_dir):
-        pattern = os.path.join(output_dir, f"predicted_statlines_*_{game_date.strftime('%Y-%m-%d')}.csv")
-        existing_prediction_files = glob.glob(pattern)
-        for file_path in existing_prediction_files:
-            # Extract team abbreviations from filename
-            filename = os.path.basename(file_path)
-            # Format: predicted_statlines_AWAY_vs_HOME_DATE.csv
-            parts = filename.replace('predicted_statlines_', '').replace(f"_{game_date.strftime('%Y-%m-%d')}.csv", '').split('_vs_')
-            if len(parts) == 2:
-                away_team, home_team = parts
-                matchup_key = f"{away_team} @ {home_team}"
-                existing_files[matchup_key] = file_path
+    return sorted(out_player_ids)
+
+
+def predictions_to_statlines(all_predictions: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Convert generate_predictions_for_game() output to the statlines format of the
+    Predictions page export (one row per player).
     
-    if existing_files:
-        print(f"\nFound {len(existing_files)} existing prediction file(s):")
-        for matchup_key, file_path in existing_files.items():
-            print(f"  ✓ {matchup_key}: {os.path.basename(file_path)}")
+    Args:
+        all_predictions: Dict of player_id -> prediction dict
     
-    # Process each game
-    for game_idx, matchup in enumerate(matchups, 1):
-        print(f"\n{'=' * 60}")
-        print(f"Game {game_idx}/{len(matchups)}: {matchup['matchup']}")
-        print(f"{'=' * 60}")
-        
-        away_team_id = matchup['away_team_id']
-        home_team_id = matchup['home_team_id']
-        away_team_abbr = matchup['away_team']
-        home_team_abbr = matchup['home_team']
-        game_date_str = matchup['game_date']
-        
-        # Check if prediction file already exists
-        matchup_key = f"{away_team_abbr} @ {home_team_abbr}"
-        if matchup_key in existing_files:
-            existing_file = existing_files[matchup_key]
-            print(f"✓ Prediction file already exists: {os.path.basename(existing_file)}")
-            print(f"  Skipping prediction generation for this game.")
-            output_files.append(existing_file)
-            continue
-        
-        # Get rosters for both teams
-        print(f"Getting rosters...")
-        away_roster = get_team_roster(away_team_id, players_df)
-        home_roster = get_team_roster(home_team_id, players_df)
+    Returns:
+        DataFrame with Player, Team, MIN, stat and FPTS distribution columns
+        (plus a Player_ID column)
+    """
+    statlines_list = []
+    for player_id, player_data in all_predictions.items():
+        predictions = player_data.get('predictions', {})
+        player_name = player_data.get('player_name', f"Player {player_id}")
+        team_abbr = player_data.get('team_abbr', '')
         
-        if len(away_roster) == 0 or len(home_roster) == 0:
-            print(f"Warning: Could not get rosters for {matchup['matchup']}")
+        # Extract FPTS prediction
+        fpts_pred = predictions.get('FPTS')
+        if fpts_pred is None:
             continue
         
-        print(f"  {away_team_abbr}: {len(away_roster)} players")
-        print(f"  {home_team_abbr}: {len(home_roster)} players")
+        fpts_value = fpts_pred.value if hasattr(fpts_pred, 'value') else fpts_pred
         
-        # Get injuries for this matchup (if excluding injured players)
-        out_player_ids = set()
-        if exclude_injured and injury_df is not None and len(injury_df) > 0:
-            matchup_injuries = ir.get_injuries_for_matchup(
-                injury_df,
-                away_team_abbr,
-                home_team_abbr,
-                players_df
-            )
-            
-            # Filter OUT/DOUBTFUL players
-            for injury_item in matchup_injuries.get('away', []) + matchup_injuries.get('home', []):
-                status_lower = injury_item.get('status', '').lower() if injury_item.get('status') else ''
-                if 'out' in status_lower or 'doubtful' in status_lower:
-                    player_id = injury_item.get('player_id')
-                    if player_id:
-                        out_player_ids.add(str(player_id))
-            
-            if out_player_ids:
-                print(f"\n⚠ Excluding {len(out_player_ids)} injured players (OUT/DOUBTFUL)")
-                for pid in out_player_ids:
-                    player_name = next((p['name'] for p in away_roster + home_roster if p['id'] == pid), f"Player {pid}")
-                    print(f"  - {player_name}")
+        # Extract ceiling/floor if available
+        ceiling_floor = player_data.get('ceiling_floor', {})
+        ceiling_fpts = ceiling_floor.get('ceiling', fpts_value * 1.3) if ceiling_floor else fpts_value * 1.3
+        floor_fpts = ceiling_floor.get('floor', fpts_value * 0.7) if ceiling_floor else fpts_value * 0.7
+        median_fpts = ceiling_floor.get('median', fpts_value) if ceiling_floor else fpts_value
+        variance = ceiling_floor.get('variance', 0.0) if ceiling_floor else 0.0
+        std_dev = ceiling_floor.get('std_dev', 0.0) if ceiling_floor else 0.0
         
-        # Filter out injured players
-        healthy_players = [
-            p for p in away_roster + home_roster
-            if p['id'] not in out_player_ids
-        ]
+        # Extract other stats for completeness
+        stat_values = {}
+        for stat in ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'FG3M', 'FTM']:
+            pred = predictions.get(stat)
+            stat_values[stat] = pred.value if pred and hasattr(pred, 'value') else 0.0
         
-        # Prepare player data for prediction function (only healthy players)
-        all_player_ids = [p['id'] for p in healthy_players]
-        player_names = {p['id']: p['name'] for p in healthy_players}
-        player_team_ids = {p['id']: p['team_id'] for p in healthy_players}
+        # Calculate PRA
+        pra_value = stat_values['PTS'] + stat_values['REB'] + stat_values['AST']
         
-        if len(all_player_ids) == 0:
-            print(f"Warning: No healthy players for {matchup['matchup']}")
-            continue
-        
-        # Generate predictions for all healthy players in the game
-        print(f"\nGenerating predictions for {len(all_player_ids)} healthy players...")
-        try:
-            def progress_callback(current, total, player_name):
-                if current % 5 == 0 or current == total:
-                    print(f"  Progress: {current}/{total} ({player_name})")
-            
-            all_predictions = pm.generate_predictions_for_game(
-                player_ids=all_player_ids,
-                player_names=player_names,
-                player_team_ids=player_team_ids,
-                away_team_id=away_team_id,
-                home_team_id=home_team_id,
-                away_team_abbr=away_team_abbr,
-                home_team_abbr=home_team_abbr,
-                game_date=game_date_str,
-                progress_callback=progress_callback
-            )
-            
-            if len(all_predictions) == 0:
-                print(f"Warning: No predictions generated for {matchup['matchup']}")
-                continue
-            
-            print(f"\n✓ Generated predictions for {len(all_predictions)} players")
-            
-            # Convert to DataFrame format matching Predictions page export
-            statlines_list = []
-            for player_id, player_data in all_predictions.items():
-                predictions = player_data.get('predictions', {})
-                player_name = player_data.get('player_name', f"Player {player_id}")
-                team_abbr = player_data.get('team_abbr', '')
-                
-                # Extract FPTS prediction
-                fpts_pred = predictions.get('FPTS')
-                if fpts_pred is None:
-                    continue
-                
-                fpts_value = fpts_pred.value if hasattr(fpts_pred, 'value') else fpts_pred
-                
-                # Extract ceiling/floor if available
-                ceiling_floor = player_data.get('ceiling_floor', {})
-                ceiling_fpts = ceiling_floor.get('ceiling', fpts_value * 1.3) if ceiling_floor else fpts_value * 1.3
-                floor_fpts = ceiling_floor.get('floor', fpts_value * 0.7) if ceiling_floor else fpts_value * 0.7
-                median_fpts = ceiling_floor.get('median', fpts_value) if ceiling_floor else fpts_value
-                variance = ceiling_floor.get('variance', 0.0) if ceiling_floor else 0.0
-                std_dev = ceiling_floor.get('std_dev', 0.0) if ceiling_floor else 0.0
-                
-                # Extract other stats for completeness
-                pts = predictions.get('PTS')
-                pts_value = pts.value if pts and hasattr(pts, 'value') else 0.0
-                
-                reb = predictions.get('REB')
-                reb_value = reb.value if reb and hasattr(reb, 'value') else 0.0
-                
-                ast = predictions.get('AST')
-                ast_value = ast.value if ast and hasattr(ast, 'value') else 0.0
-                
-                stl = predictions.get('STL')
-                stl_value = stl.value if stl and hasattr(stl, 'value') else 0.0
-                
-                blk = predictions.get('BLK')
-                blk_value = blk.value if blk and hasattr(blk, 'value') else 0.0
-                
-                tov = predictions.get('TOV')
-                tov_value = tov.value if tov and hasattr(tov, 'value') else 0.0
-                
-                fg3m = predictions.get('FG3M')
-                fg3m_value = fg3m.value if fg3m and hasattr(fg3m, 'value') else 0.0
-                
-                ftm = predictions.get('FTM')
-                ftm_value = ftm.value if ftm and hasattr(ftm, 'value') else 0.0
-                
-                # Calculate PRA
-                pra_value = pts_value + reb_value + ast_value
-                
-                statlines_list.append({
-                    'Player': player_name,
-                    'Team': team_abbr,
-                    'MIN': 0.0,  # Minutes not predicted in batch mode
-                    'PTS': round(pts_value, 1),
-                    'REB': round(reb_value, 1),
-                    'AST': round(ast_value, 1),
-                    'STL': round(stl_value, 1),
-                    'BLK': round(blk_value, 1),
-                    'TOV': round(tov_value, 1),
-                    'FG3M': round(fg3m_value, 1),
-                    'FTM': round(ftm_value, 1),
-                    'PRA': round(pra_value, 1),
-                    'FPTS': round(fpts_value, 1),
-                    'FPTS_Ceiling': round(ceiling_fpts, 1),
-                    'FPTS_Floor': round(floor_fpts, 1),
-                    'FPTS_Median': round(median_fpts, 1),
-                    'FPTS_Variance': round(variance, 2),
-                    'FPTS_StdDev': round(std_dev, 2)
-                })
-            
-            # Create DataFrame
-            predictions_df = pd.DataFrame(statlines_list)
-            
-            # Save to CSV
-            output_filename = f"predicted_statlines_{away_team_abbr}_vs_{home_team_abbr}_{game_date_str}.csv"
-            output_path = os.path.join(output_dir, output_filename)
-            predictions_df.to_csv(output_path, index=False)
-            
-            print(f"\n✓ Saved predictions to: {output_path}")
-            print(f"  Total players: {len(predictions_df)}")
-            print(f"  Average FPTS: {predictions_df['FPTS'].mean():.2f}")
-            
-            output_files.append(output_path)
-            
-        except Exception as e:
-            print(f"\n✗ Error generating predictions for {matchup['matchup']}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
+        statlines_list.append({
+            'Player': player_name,
+            'Team': team_abbr,
+            'MIN': 0.0,  # Filled by the slate pipeline's minutes stage
+            **{stat: round(value, 1) for stat, value in stat_values.items()},
+            'PRA': round(pra_value, 1),
+            'FPTS': round(fpts_value, 1),
+            'FPTS_Ceiling': round(ceiling_fpts, 1),
+            'FPTS_Floor': round(floor_fpts, 1),
+            'FPTS_Median': round(median_fpts, 1),
+            'FPTS_Variance': round(variance, 2),
+            'FPTS_StdDev': round(std_dev, 2),
+            'Player_ID': str(player_id)
+        })
     
-    # Count new vs existing files
-    existing_count = sum(1 for f in output_files if f in existing_files.values())
-    new_count = len(output_files) - existing_count
+    return pd.DataFrame(statlines_list)
+
+
+def run_wave_optimizer(game_date: date, draftables_path: str, predictions_dir: str,
+                       output_dir: str, tipoff_time_filter: str = None) -> List[str]:
+    """
+    Run optimize_lineups_by_wave.py over the prediction files in predictions_dir.
+    
+    Returns:
+        List of optimized lineup file paths
+    """
+    if not draftables_path or not os.path.exists(draftables_path):
+        print(f"\n⚠ Warning: Draftables file not found: {draftables_path}")
+        print(f"  Skipping lineup optimization.")
+        return []
     
     print(f"\n{'=' * 60}")
-    print(f"Summary")
+    print(f"Optimizing Lineups by Tip-Off Wave")
     print(f"{'=' * 60}")
-    print(f"Games processed: {len(matchups)}")
-    print(f"Files found (existing): {existing_count}")
-    print(f"Files created (new): {new_count}")
-    print(f"Total files: {len(output_files)}")
-    print(f"\nOutput files:")
-    for f in output_files:
-        file_type = "(existing)" if f in existing_files.values() else "(new)"
-        print(f"  - {f} {file_type}")
     
-    # Optimize lineups if requested
-    if optimize_lineups:
-        if not OPTIMIZER_AVAILABLE:
-            print(f"\n⚠ Warning: Optimizer not available. Skipping lineup optimization.")
-        elif not draftables_path or not os.path.exists(draftables_path):
-            print(f"\n⚠ Warning: Draftables file not found: {draftables_path}")
-            print(f"  Skipping lineup optimization.")
-        else:
-            print(f"\n{'=' * 60}")
-            print(f"Optimizing Lineups by Tip-Off Wave")
-            print(f"{'=' * 60}")
-            
-            try:
-                # Import the wave optimizer
-                optimizer_script_path = Path(__file__).parent / 'optimize_lineups_by_wave.py'
-                if optimizer_script_path.exists():
-                    import importlib.util
-                    spec = importlib.util.spec_from_file_location("optimize_lineups_by_wave", optimizer_script_path)
-                    optimize_module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(optimize_module)
-                    
-                    optimized_files = optimize_module.optimize_lineups_by_wave(
-                        game_date,
-                        draftables_path,
-                        predictions_dir=output_dir,
-                        output_dir=output_dir,
-                        tipoff_time_filter=tipoff_time_filter
-                    )
-                else:
-                    print(f"⚠ Warning: optimize_lineups_by_wave.py not found. Skipping optimization.")
-                    optimized_files = []
-                
-                if optimized_files:
-                    print(f"\n✓ Successfully optimized {len(optimized_files)} lineup(s)")
-                else:
-                    print(f"\n⚠ No optimized lineups generated")
-                    
-            except Exception as e:
-                print(f"\n✗ Error optimizing lineups: {e}")
-                import traceback
-                traceback.print_exc()
+    # Import the wave optimizer
+    optimizer_script_path = Path(__file__).parent / 'optimize_lineups_by_wave.py'
+    if not optimizer_script_path.exists():
+        print(f"⚠ Warning: optimize_lineups_by_wave.py not found. Skipping optimization.")
+        return []
+    
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("optimize_lineups_by_wave", optimizer_script_path)
+    optimize_module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(optimize_module)
+    except ImportError as e:
+        print(f"\n⚠ Warning: Optimizer not available ({e}). Skipping lineup optimization.")
+        return []
+    
+    optimized_files = optimize_module.optimize_lineups_by_wave(
+        game_date,
+        draftables_path,
+        predictions_dir=predictions_dir,
+        output_dir=output_dir,
+        tipoff_time_filter=tipoff_time_filter
+    )
     
-    return output_files
+    if optimized_files:
+        print(f"\n✓ Successfully optimized {len(optimized_files)} lineup(s)")
+    else:
+        print(f"\n⚠ No optimized lineups generated")
+    return optimized_files or []
+
+
+def generate_predictions_for_date(game_date: date, output_dir: str = None, exclude_injured: bool = True, 
+                                  optimize_lineups: bool = False, draftables_path: str = None, max_salary: int = 50000,
+                                  tipoff_time_filter: str = None, season: str = '2025-26',
+                                  max_workers: int = None, refresh=(), log_predictions: bool = False):
+    """
+    Generate predictions for all games on a given date.
+    
+    Runs the staged slate pipeline (see slate_pipeline.py): games are processed in
+    parallel and every stage is checkpointed, so re-running after a crash or a late
+    injury update only recomputes the games and stages whose inputs changed.
+    
+    Args:
+        game_date: Date to generate predictions for
+        output_dir: Directory to save CSV files (default: ~/Downloads)
+        exclude_injured: Whether to exclude injured players (OUT/DOUBTFUL) (default: True)
+        optimize_lineups: Whether to optimize lineups after generating predictions (default: False)
+        draftables_path: Path to draftables CSV (required if optimize_lineups=True)
+        max_salary: Maximum salary for optimization (default: 50000)
+        tipoff_time_filter: Optional tip-off wave to optimize (e.g. "6:00 PM CT")
+        season: NBA season (default '2025-26')
+        max_workers: Parallel game workers (default: slate_pipeline.DEFAULT_WORKERS)
+        refresh: Stage names (or 'all') whose checkpoints are ignored
+        log_predictions: Also log new predictions to the prediction tracker
+    
+    Returns:
+        List of output file paths
+    """
+    import slate_pipeline
+    
+    result = slate_pipeline.run_slate_pipeline(
+        game_date,
+        output_dir=output_dir,
+        exclude_injured=exclude_injured,
+        optimize_lineups=optimize_lineups,
+        draftables_path=draftables_path,
+        max_salary=max_salary,
+        tipoff_time_filter=tipoff_time_filter,
+        season=season,
+        max_workers=max_workers,
+        refresh=refresh,
+        log_predictions=log_predictions
+    )
+    return result['output_files']
 
 
 def main():
@@ -466,6 +312,12 @@ Examples:
   
   # Generate predictions for a specific date with optimization
   python generate_predictions_batch.py --date 2025-01-15 --optimize --draftables draftables.csv
+  
+  # Re-run after a late injury report with 8 parallel games (unchanged games are reused)
+  python generate_predictions_batch.py --workers 8
+  
+  # Ignore feature and prediction checkpoints (e.g. after a model change)
+  python generate_predictions_batch.py --refresh features predictions
         """
     )
     parser.add_argument(
@@ -514,6 +366,24 @@ Examples:
         default=None,
         help='Filter to specific tip-off time when optimizing (e.g., "6:00 PM CT", "7:30 PM CT"). If not specified, optimizes all waves.'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of games processed in parallel (default: 4)'
+    )
+    parser.add_argument(
+        '--refresh',
+        nargs='+',
+        default=[],
+        metavar='STAGE',
+        help='Pipeline stages whose checkpoints are ignored (schedule, rosters, injuries, features, predictions, minutes, output, optimizer, or all)'
+    )
+    parser.add_argument(
+        '--log-predictions',
+        action='store_true',
+        help='Log new predictions to the prediction tracker (Supabase or CSV)'
+    )
     
     args = parser.parse_args()
     
@@ -547,7 +417,11 @@ Examples:
             optimize_lineups=args.optimize,
             draftables_path=args.draftables,
             max_salary=args.max_salary,
-            tipoff_time_filter=args.tipoff_time
+            tipoff_time_filter=args.tipoff_time,
+            season=args.season,
+            max_workers=args.workers,
+            refresh=args.refresh,
+            log_predictions=args.log_predictions
         )
         
         if len(output_files) == 0:
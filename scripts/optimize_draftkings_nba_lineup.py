@@ -6,13 +6,24 @@ Optimizes NBA DraftKings lineups using FPTS predictions and salary constraints.
 
 import pandas as pd
 import numpy as np
-from pulp import LpMaximize, LpProblem, LpVariable, lpSum
+from scipy import sparse
+from scipy.optimize import milp, linear_sum_assignment, LinearConstraint, Bounds
 import os
 import sys
 import json
 import argparse
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'new-streamlit-app' / 'player-app'))
+import player_resolver as pr
+
+# Optional: incremental HiGHS model for multi-lineup generation (falls back to scipy's milp)
+try:
+    import highspy
+except ImportError:
+    highspy = None
 
 # Debug log: write only when path exists and is writable (no-op on Streamlit Cloud)
 def _debug_log(log_entry: dict) -> None:
@@ -25,16 +36,6 @@ def _debug_log(log_entry: dict) -> None:
     except Exception:
         pass
 
-# Try to import fuzzywuzzy, but make it optional
-try:
-    from fuzzywuzzy import fuzz
-    FUZZYWUZZY_AVAILABLE = True
-except ImportError:
-    FUZZYWUZZY_AVAILABLE = False
-    print("Warning: fuzzywuzzy not installed. Fuzzy name matching will be disabled.")
-    print("Install with: pip install fuzzywuzzy python-Levenshtein")
-
-
 def normalize_player_name(name: str) -> str:
     """
     Normalize player name for matching.
@@ -43,21 +44,9 @@ def normalize_player_name(name: str) -> str:
         name: Player name string
         
     Returns:
-        Normalized name (lowercase, stripped, handles suffixes)
+        Normalized name (lowercase ASCII, no punctuation or suffixes, "Last, First" reordered)
     """
-    if pd.isna(name) or name == '':
-        return ''
-    
-    name = str(name).strip()
-    # Convert to lowercase
-    name = name.lower()
-    # Remove common suffixes (Jr., Sr., III, etc.) for better matching
-    suffixes = [' jr.', ' sr.', ' ii', ' iii', ' iv', ' jr', ' sr']
-    for suffix in suffixes:
-        if name.endswith(suffix):
-            name = name[:-len(suffix)].strip()
-    
-    return name
+    return pr.name_key(name)
 
 
 def load_draftables(csv_path: str) -> pd.DataFrame:
@@ -154,6 +143,9 @@ def match_players_fuzzy(draftables_df: pd.DataFrame, predictions_df: pd.DataFram
     """
     Match players using fuzzy matching.
     
+    Prediction names are indexed once (player_resolver), so each draftable is
+    compared only against the predictions sharing the most name trigrams.
+    
     Args:
         draftables_df: DataFrame with draftables (must have displayName_normalized)
         predictions_df: DataFrame with predictions (must have Player_normalized)
@@ -162,32 +154,15 @@ def match_players_fuzzy(draftables_df: pd.DataFrame, predictions_df: pd.DataFram
     Returns:
         Dictionary mapping draftable index to prediction index
     """
-    if not FUZZYWUZZY_AVAILABLE:
-        return {}
+    resolver = pr.PlayerResolver.from_names(predictions_df['Player_normalized'], ids=range(len(predictions_df)))
     
     matches = {}
-    draftables_names = draftables_df['displayName_normalized'].tolist()
-    predictions_names = predictions_df['Player_normalized'].tolist()
-    
-    for draft_idx, draft_name in enumerate(draftables_names):
+    for draft_idx, draft_name in enumerate(draftables_df['displayName_normalized']):
         if not draft_name:
             continue
-        
-        best_match_idx = None
-        best_score = 0
-        
-        for pred_idx, pred_name in enumerate(predictions_names):
-            if not pred_name:
-                continue
-            
-            # Use ratio for overall similarity
-            score = fuzz.ratio(draft_name, pred_name)
-            if score > best_score:
-                best_score = score
-                best_match_idx = pred_idx
-        
-        if best_score >= threshold:
-            matches[draft_idx] = best_match_idx
+        pred_idx = resolver.resolve(draft_name, fuzzy_threshold=threshold / 100)
+        if pred_idx is not None:
+            matches[draft_idx] = pred_idx
     
     return matches
 
@@ -208,17 +183,14 @@ def merge_draftables_with_predictions(draftables_df: pd.DataFrame,
     matched_draft_indices = set()
     matched_pred_indices = set()
     
-    # First pass: exact name matching
+    # First pass: exact name matching (first prediction row per normalized name)
+    exact_index = predictions_df.index.to_series().groupby(predictions_df['Player_normalized'].values).first()
+    
     for draft_idx, draft_row in draftables_df.iterrows():
         draft_name_norm = draft_row['displayName_normalized']
         
-        # Try exact match first
-        exact_matches = predictions_df[
-            predictions_df['Player_normalized'] == draft_name_norm
-        ]
-        
-        if len(exact_matches) > 0:
-            pred_row = exact_matches.iloc[0]
+        if draft_name_norm in exact_index.index:
+            pred_row = predictions_df.loc[exact_index[draft_name_norm]]
             merged_dict = {
                 'Player': draft_row['displayName'],
                 'displayName': draft_row['displayName'],
@@ -240,55 +212,54 @@ def merge_draftables_with_predictions(draftables_df: pd.DataFrame,
             matched_pred_indices.add(pred_row.name)
     
     # Second pass: fuzzy matching for unmatched players
-    if FUZZYWUZZY_AVAILABLE:
-        unmatched_draft = draftables_df[~draftables_df.index.isin(matched_draft_indices)].copy()
-        unmatched_pred = predictions_df[~predictions_df.index.isin(matched_pred_indices)].copy()
+    unmatched_draft = draftables_df[~draftables_df.index.isin(matched_draft_indices)].copy()
+    unmatched_pred = predictions_df[~predictions_df.index.isin(matched_pred_indices)].copy()
+    
+    if len(unmatched_draft) > 0 and len(unmatched_pred) > 0:
+        # Ensure normalized columns exist
+        if 'displayName_normalized' not in unmatched_draft.columns:
+            unmatched_draft['displayName_normalized'] = unmatched_draft['displayName'].apply(normalize_player_name)
+        if 'Player_normalized' not in unmatched_pred.columns:
+            unmatched_pred['Player_normalized'] = unmatched_pred['Player'].apply(normalize_player_name)
         
-        if len(unmatched_draft) > 0 and len(unmatched_pred) > 0:
-            # Ensure normalized columns exist
-            if 'displayName_normalized' not in unmatched_draft.columns:
-                unmatched_draft['displayName_normalized'] = unmatched_draft['displayName'].apply(normalize_player_name)
-            if 'Player_normalized' not in unmatched_pred.columns:
-                unmatched_pred['Player_normalized'] = unmatched_pred['Player'].apply(normalize_player_name)
-            
-            # Reset index to ensure positional indices match enumerate() results
-            unmatched_draft_reset = unmatched_draft.reset_index(drop=True)
-            unmatched_pred_reset = unmatched_pred.reset_index(drop=True)
-            
-            fuzzy_matches = match_players_fuzzy(unmatched_draft_reset, unmatched_pred_reset, threshold=85)
-            
-            # Get actual indices from original filtered dataframes (before reset)
-            draft_actual_indices = unmatched_draft.index.tolist()
-            pred_actual_indices = unmatched_pred.index.tolist()
-            
-            for draft_pos_idx, pred_pos_idx in fuzzy_matches.items():
-                # Map positional indices back to actual dataframe indices
-                if draft_pos_idx < len(draft_actual_indices) and pred_pos_idx < len(pred_actual_indices):
-                    draft_idx = draft_actual_indices[draft_pos_idx]
-                    pred_idx = pred_actual_indices[pred_pos_idx]
-                    
-                    draft_row = draftables_df.loc[draft_idx]
-                    pred_row = predictions_df.loc[pred_idx]
-                    
-                    merged_dict = {
-                        'Player': draft_row['displayName'],
-                        'displayName': draft_row['displayName'],
-                        'salary': draft_row['salary'],
-                        'position': draft_row['position'],
-                        'FPTS': pred_row['FPTS'],
-                        'Team': pred_row.get('Team', ''),
-                        'match_type': 'fuzzy'
-                    }
-                    # Add tip time and opponent if available
-                    if 'Tip_Time' in pred_row:
-                        merged_dict['Tip_Time'] = pred_row['Tip_Time']
-                    if 'Opponent' in pred_row:
-                        merged_dict['Opponent'] = pred_row['Opponent']
-                    elif 'Opponent_Team' in pred_row:
-                        merged_dict['Opponent'] = pred_row['Opponent_Team']
-                    merged_data.append(merged_dict)
-                    matched_draft_indices.add(draft_idx)
-                    matched_pred_indices.add(pred_idx)
+        # Reset index to ensure positional indices match enumerate() results
+        unmatched_draft_reset = unmatched_draft.reset_index(drop=True)
+        unmatched_pred_reset = unmatched_pred.reset_index(drop=True)
+        
+        fuzzy_matches = match_players_fuzzy(unmatched_draft_reset, unmatched_pred_reset, threshold=85)
+        
+        # Get actual indices from original filtered dataframes (before reset)
+        draft_actual_indices = unmatched_draft.index.tolist()
+        pred_actual_indices = unmatched_pred.index.tolist()
+        
+        for draft_pos_idx, pred_pos_idx in fuzzy_matches.items():
+            # Map positional indices back to actual dataframe indices
+            if draft_pos_idx < len(draft_actual_indices) and pred_pos_idx < len(pred_actual_indices):
+                draft_idx = draft_actual_indices[draft_pos_idx]
+                pred_idx = pred_actual_indices[pred_pos_idx]
+                
+                draft_row = draftables_df.loc[draft_idx]
+                pred_row = predictions_df.loc[pred_idx]
+                
+                merged_dict = {
+                    'Player': draft_row['displayName'],
+                    'displayName': draft_row['displayName'],
+                    'salary': draft_row['salary'],
+                    'position': draft_row['position'],
+                    'FPTS': pred_row['FPTS'],
+                    'Team': pred_row.get('Team', ''),
+                    'match_type': 'fuzzy'
+                }
+                # Add tip time and opponent if available
+                if 'Tip_Time' in pred_row:
+                    merged_dict['Tip_Time'] = pred_row['Tip_Time']
+                if 'Opponent' in pred_row:
+                    merged_dict['Opponent'] = pred_row['Opponent']
+                elif 'Opponent_Team' in pred_row:
+                    merged_dict['Opponent'] = pred_row['Opponent_Team']
+                merged_data.append(merged_dict)
+                matched_draft_indices.add(draft_idx)
+                matched_pred_indices.add(pred_idx)
     
     # Third pass: include draftables without predictions (set FPTS to 0)
     unmatched_draft = draftables_df[~draftables_df.index.isin(matched_draft_indices)]
@@ -355,9 +326,273 @@ def add_position_flags(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# DraftKings NBA classic roster: slot -> position flag that makes a player eligible
+DK_SLOTS = ['PG', 'SG', 'SF', 'PF', 'C', 'G', 'F', 'UTIL']
+DK_SLOT_FLAGS = {'PG': 'is_pg', 'SG': 'is_sg', 'SF': 'is_sf', 'PF': 'is_pf',
+                 'C': 'is_c', 'G': 'is_g', 'F': 'is_f', 'UTIL': 'is_util'}
+SLOT_ORDER = {slot: i + 1 for i, slot in enumerate(DK_SLOTS)}
+# Relative optimality gap for each solve (0.5% is ~1.3 FPTS on a 270 FPTS lineup,
+# well inside projection error; proving exact optimality dominates solve time)
+MIP_REL_GAP = 0.005
+# Time limit (seconds) for each solve of a multi-lineup run. Once a slate carries
+# 100+ uniqueness cuts HiGHS finds a near-optimal lineup early and then spends
+# seconds proving the gap; the incumbent at the limit is kept.
+LINEUP_TIME_LIMIT = 0.5
+# HiGHS settings for the incremental model (highspy only). Late solves carry 100+
+# cuts; restarts and presolve redo work the warm-started LP already has, RINS/RENS
+# sub-MIPs take about half of the solve time, and separating cuts at every node or
+# strong branching to build pseudocosts costs more than the nodes it saves. On a
+# 120-player slate these take a 150-lineup run at max_overlap=3 from ~640s to ~190s
+# uncapped with the same lineup quality.
+HIGHS_OPTIONS = {
+    'mip_allow_restart': False,
+    'mip_heuristic_run_rins': False,
+    'mip_heuristic_run_rens': False,
+    'mip_pool_soft_limit': 500,
+    'mip_allow_cut_separation_at_nodes': False,
+    'mip_pscost_minreliable': 0,
+    'presolve': 'off',
+}
+BASE_POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C']
+# Base positions each slot accepts
+SLOT_POSITIONS = {'PG': {'PG'}, 'SG': {'SG'}, 'SF': {'SF'}, 'PF': {'PF'}, 'C': {'C'},
+                  'G': {'PG', 'SG'}, 'F': {'SF', 'PF'}, 'UTIL': set(BASE_POSITIONS)}
+
+
+def _roster_rows(positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exact slot-feasibility constraints for the DraftKings roster (Hall's condition).
+    
+    8 selected players can fill the 8 slots iff, for every set U of base positions,
+    the players eligible at some position in U number at least the non-UTIL slots
+    that only accept positions in U (e.g. U={PG,SG}: 3 for PG, SG and G). UTIL
+    accepts anyone, so together with the roster size row this is exact.
+    
+    Args:
+        positions: Boolean matrix (n_players x 5) of base position eligibility
+    
+    Returns:
+        Tuple of (coefficient matrix with one row per U, required minimum per row)
+    """
+    rows = []
+    mins = []
+    for mask in range(1, 2 ** len(BASE_POSITIONS)):
+        subset = {pos for k, pos in enumerate(BASE_POSITIONS) if mask >> k & 1}
+        cols = [BASE_POSITIONS.index(pos) for pos in subset]
+        rows.append(positions[:, cols].any(axis=1).astype(float))
+        mins.append(sum(1 for slot, accepted in SLOT_POSITIONS.items() if slot != 'UTIL' and accepted <= subset))
+    return np.array(rows), np.array(mins, dtype=float)
+
+
+def _assign_slots(eligibility: np.ndarray) -> List[str]:
+    """Slot for each of 8 selected players (eligibility: 8 x 8 bool, DK_SLOTS order)."""
+    players, slots = linear_sum_assignment(~eligibility)
+    if eligibility[players, slots].sum() != len(DK_SLOTS):
+        raise ValueError("Selected players cannot fill every DraftKings slot.")
+    assigned = [None] * len(players)
+    for player, slot in zip(players, slots):
+        assigned[player] = DK_SLOTS[slot]
+    return assigned
+
+
+class LineupGenerator:
+    """
+    Reusable MILP model for generating many DraftKings lineups from one slate.
+    
+    The constraint matrix is built once from NumPy arrays: roster size, salary
+    cap and the exact slot-feasibility rows from _roster_rows() (no
+    position-count proxies), so every solution can fill all 8 slots; slots are
+    then assigned by bipartite matching. Between solves only the objective,
+    bounds (exposure) and cut limits change, and each uniqueness cut is one
+    appended row.
+    
+    With highspy installed the model is a single incremental HiGHS instance:
+    cuts are added as rows, objectives, limits and exclusions are changed in
+    place, and HIGHS_OPTIONS keep solves with a large cut set fast. Otherwise
+    each solve passes the prebuilt matrix (base rows plus appended cut rows)
+    to scipy.optimize.milp.
+    """
+    
+    def __init__(self, df: pd.DataFrame, max_salary: int = 50000):
+        if df['Player'].duplicated().any():
+            print(f"Warning: Found {df['Player'].duplicated().sum()} duplicate player names. Keeping first occurrence.")
+            df = df.drop_duplicates(subset=['Player'], keep='first')
+        df = df.reset_index(drop=True)
+        if not all(flag in df.columns for flag in DK_SLOT_FLAGS.values()):
+            df = add_position_flags(df)
+        
+        self.df = df
+        self.max_salary = max_salary
+        self.n_players = n = len(df)
+        self.salary = pd.to_numeric(df['salary'], errors='coerce').fillna(0).to_numpy(dtype=float)
+        self.fpts = pd.to_numeric(df['FPTS'], errors='coerce').fillna(0).to_numpy(dtype=float)
+        self.eligibility = np.column_stack([df[DK_SLOT_FLAGS[slot]].fillna(False).to_numpy(dtype=bool) for slot in DK_SLOTS])
+        
+        # Roster size, salary cap and slot feasibility
+        roster_matrix, roster_mins = _roster_rows(self.eligibility[:, :len(BASE_POSITIONS)])
+        self._base_matrix = sparse.csr_matrix(np.vstack([np.ones(n), self.salary, roster_matrix]))
+        self._base_lb = np.concatenate([[len(DK_SLOTS), -np.inf], roster_mins])
+        self._base_ub = np.concatenate([[len(DK_SLOTS), max_salary], np.full(len(roster_mins), np.inf)])
+        
+        # Uniqueness cuts: one row per previous lineup (sum of its players <= limit)
+        self._cut_matrix = sparse.csr_matrix((0, n))
+        self._cut_limits = np.zeros(0)
+        
+        self.upper_bounds = np.ones(n)
+        self.exposure = np.zeros(n, dtype=int)
+        
+        self._highs = self._build_highs() if highspy is not None else None
+    
+    def _build_highs(self):
+        """Incremental HiGHS model with the base rows (maximizing, binary columns)."""
+        n = self.n_players
+        h = highspy.Highs()
+        h.setOptionValue('output_flag', False)
+        for option, value in HIGHS_OPTIONS.items():
+            h.setOptionValue(option, value)
+        h.addVars(n, np.zeros(n), self.upper_bounds)
+        h.changeColsIntegrality(n, np.arange(n, dtype=np.int32), np.full(n, highspy.HighsVarType.kInteger))
+        h.changeObjectiveSense(highspy.ObjSense.kMaximize)
+        self._add_highs_rows(h, self._base_matrix, self._base_lb, self._base_ub)
+        return h
+    
+    @staticmethod
+    def _add_highs_rows(h, matrix: sparse.csr_matrix, lb, ub) -> None:
+        inf = highspy.kHighsInf
+        h.addRows(matrix.shape[0], np.clip(np.asarray(lb, dtype=float), -inf, inf), np.clip(np.asarray(ub, dtype=float), -inf, inf),
+                  matrix.nnz, matrix.indptr[:-1].astype(np.int32), matrix.indices.astype(np.int32), matrix.data.astype(float))
+    
+    def add_cut(self, player_idx: np.ndarray, limit: int) -> None:
+        """Allow at most `limit` of these players together in later lineups."""
+        player_idx = np.asarray(player_idx, dtype=np.int32)
+        row = sparse.csr_matrix((np.ones(len(player_idx)), (np.zeros(len(player_idx), dtype=int), player_idx)), shape=(1, self.n_players))
+        self._cut_matrix = sparse.vstack([self._cut_matrix, row], format='csr')
+        self._cut_limits = np.append(self._cut_limits, float(limit))
+        if self._highs is not None:
+            self._highs.addRow(-highspy.kHighsInf, float(limit), len(player_idx), player_idx, np.ones(len(player_idx)))
+    
+    def set_cut_limits(self, limits) -> None:
+        """Replace the overlap limit of every existing cut (e.g. to relax them for a retry)."""
+        limits = np.asarray(limits, dtype=float)
+        changed = np.nonzero(limits != self._cut_limits)[0]
+        self._cut_limits = limits
+        if self._highs is not None and len(changed):
+            rows = (self._base_matrix.shape[0] + changed).astype(np.int32)
+            self._highs.changeRowsBounds(len(rows), rows, np.full(len(rows), -highspy.kHighsInf), limits[changed])
+    
+    def exclude(self, player_idx: np.ndarray) -> None:
+        """Remove players from later lineups (e.g. once they hit max exposure)."""
+        player_idx = np.asarray(player_idx, dtype=np.int32)
+        self.upper_bounds[player_idx] = 0
+        if self._highs is not None and len(player_idx):
+            self._highs.changeColsBounds(len(player_idx), player_idx, np.zeros(len(player_idx)), np.zeros(len(player_idx)))
+    
+    def count_row(self, mask: np.ndarray, min_count: int, max_count: int) -> Tuple[sparse.csr_matrix, float, float]:
+        """Extra (row, lb, ub) constraint requiring min_count..max_count selected players from a mask."""
+        return sparse.csr_matrix(mask.astype(float).reshape(1, -1)), min_count, max_count
+    
+    def solve(self, objective: np.ndarray, extra_rows: Optional[List[Tuple]] = None,
+              time_limit: float = 10.0, mip_rel_gap: float = MIP_REL_GAP) -> Optional[Tuple[np.ndarray, List[str]]]:
+        """
+        Solve for the best lineup under the current cuts and bounds.
+        
+        Args:
+            objective: Per-player score to maximize (length n_players)
+            extra_rows: Optional (row, lb, ub) constraints for this solve only
+            time_limit: Solver time limit in seconds
+            mip_rel_gap: Relative optimality gap at which the solver stops
+        
+        Returns:
+            Tuple of (selected player indices, slot for each), or None if infeasible
+        """
+        if self._highs is not None:
+            x = self._solve_highs(objective, extra_rows or [], time_limit, mip_rel_gap)
+        else:
+            x = self._solve_scipy(objective, extra_rows or [], time_limit, mip_rel_gap)
+        if x is None:
+            return None
+        
+        player_idx = np.nonzero(np.round(x) == 1)[0]
+        return player_idx, _assign_slots(self.eligibility[player_idx])
+    
+    def _solve_highs(self, objective, extra_rows, time_limit, mip_rel_gap) -> Optional[np.ndarray]:
+        h = self._highs
+        n = self.n_players
+        h.setOptionValue('time_limit', float(time_limit))
+        h.setOptionValue('mip_rel_gap', float(mip_rel_gap))
+        h.changeColsCost(n, np.arange(n, dtype=np.int32), np.asarray(objective, dtype=float))
+        
+        # Rows for this solve only go after the cuts and are deleted afterwards
+        first_extra = h.getNumRow()
+        for row, row_lb, row_ub in extra_rows:
+            self._add_highs_rows(h, sparse.csr_matrix(row), [row_lb], [row_ub])
+        try:
+            h.run()
+            status = h.getModelStatus()
+            has_solution = h.getInfo().primal_solution_status == 2  # 2 = feasible
+            x = np.array(h.getSolution().col_value) if has_solution else None
+        finally:
+            if h.getNumRow() > first_extra:
+                extra = np.arange(first_extra, h.getNumRow(), dtype=np.int32)
+                h.deleteRows(len(extra), extra)
+        
+        if x is None or status not in (highspy.HighsModelStatus.kOptimal, highspy.HighsModelStatus.kTimeLimit):
+            return None
+        return x
+    
+    def _solve_scipy(self, objective, extra_rows, time_limit, mip_rel_gap) -> Optional[np.ndarray]:
+        matrices = [self._base_matrix, self._cut_matrix]
+        lb = [self._base_lb, np.full(len(self._cut_limits), -np.inf)]
+        ub = [self._base_ub, self._cut_limits]
+        for row, row_lb, row_ub in extra_rows:
+            matrices.append(row)
+            lb.append([row_lb])
+            ub.append([row_ub])
+        
+        result = milp(
+            -np.asarray(objective, dtype=float),  # milp minimizes
+            constraints=LinearConstraint(sparse.vstack(matrices, format='csr'), np.concatenate(lb), np.concatenate(ub)),
+            integrality=np.ones(self.n_players),
+            bounds=Bounds(np.zeros(self.n_players), self.upper_bounds),
+            options={'time_limit': time_limit, 'mip_rel_gap': mip_rel_gap}
+        )
+        if result.x is None or result.status not in (0, 1):  # 1 = time limit reached with a feasible solution
+            return None
+        return result.x
+    
+    def lineup_frame(self, player_idx: np.ndarray, slots: List[str]) -> pd.DataFrame:
+        """Build the lineup DataFrame (Player, Position, Salary, FPTS, Team, flags, Slot) in slot order."""
+        rows = []
+        for idx, slot in zip(player_idx, slots):
+            player_info = self.df.iloc[idx]
+            player_dict = {
+                'Player': player_info['Player'],
+                'position': player_info['position'],
+                'Salary': player_info['salary'],
+                'FPTS': player_info['FPTS'],
+                'Team': player_info.get('Team', '')
+            }
+            # Add tip time and opponent if available
+            if 'Tip_Time' in player_info:
+                player_dict['Tip_Time'] = player_info['Tip_Time']
+            if 'Opponent' in player_info:
+                player_dict['Opponent'] = player_info['Opponent']
+            elif 'Opponent_Team' in player_info:
+                player_dict['Opponent'] = player_info['Opponent_Team']
+            player_dict['Slot'] = slot
+            rows.append(player_dict)
+        
+        selected_df = add_position_flags(pd.DataFrame(rows))
+        selected_df = selected_df[[c for c in selected_df.columns if c != 'Slot'] + ['Slot']]
+        selected_df = selected_df.rename(columns={'position': 'Position'})
+        selected_df['slot_order'] = selected_df['Slot'].map(SLOT_ORDER)
+        selected_df = selected_df.sort_values('slot_order', ascending=True).reset_index(drop=True)
+        return selected_df.drop('slot_order', axis=1)
+
+
 def optimize_lineup(df: pd.DataFrame, max_salary: int = 50000) -> pd.DataFrame:
     """
-    Optimize lineup using PuLP.
+    Optimize lineup with an exact DraftKings slot model (see LineupGenerator).
     
     Args:
         df: DataFrame with Player, salary, FPTS, and position flags
@@ -369,602 +604,133 @@ def optimize_lineup(df: pd.DataFrame, max_salary: int = 50000) -> pd.DataFrame:
     # Check for duplicate Player names
     if df['Player'].duplicated().any():
         print(f"Warning: Found {df['Player'].duplicated().sum()} duplicate player names. Keeping first occurrence.")
-        df = df.drop_duplicates(subset=['Player'], keep='first').reset_index(drop=True)
-    
-    # Ensure index is unique
-    df = df.reset_index(drop=True)
-    
-    # Set up the optimization problem
-    prob = LpProblem("Optimize_NBA_Lineup", LpMaximize)
-    
-    # Define binary variables for each player (1 = selected, 0 = not selected)
-    players = df["Player"].tolist()
-    vars = LpVariable.dicts("Select", players, cat="Binary")
-    
-    # Create a lookup dictionary for faster access
-    player_data = df.set_index('Player').to_dict('index')
-    
-    # Objective: maximize total FPTS
-    prob += lpSum([vars[name] * player_data[name]["FPTS"] for name in players])
-    
-    # Constraint: select exactly 8 players
-    prob += lpSum([vars[name] for name in players]) == 8
-    
-    # Constraint: total salary <= max_salary
-    prob += lpSum([vars[name] * player_data[name]["salary"] for name in players]) <= max_salary
     
-    # Position constraints: at least 1 of each required position
-    prob += lpSum([vars[name] for name in players if player_data[name]["is_pg"]]) >= 1  # At least 1 PG
-    prob += lpSum([vars[name] for name in players if player_data[name]["is_sg"]]) >= 1  # At least 1 SG
-    prob += lpSum([vars[name] for name in players if player_data[name]["is_sf"]]) >= 1  # At least 1 SF
-    prob += lpSum([vars[name] for name in players if player_data[name]["is_pf"]]) >= 1  # At least 1 PF
-    prob += lpSum([vars[name] for name in players if player_data[name]["is_c"]]) >= 1   # At least 1 C
-    
-    # Critical: Need at least 3 players who can play G (PG or SG) because we need:
-    # - 1 for PG slot
-    # - 1 for SG slot  
-    # - 1 for G slot
-    prob += lpSum([vars[name] for name in players if player_data[name]["is_g"]]) >= 3  # At least 3 G-eligible (for PG, SG, and G slots)
-    
-    # Critical: Need at least 3 players who can play F (SF or PF) because we need:
-    # - 1 for SF slot
-    # - 1 for PF slot
-    # - 1 for F slot
-    prob += lpSum([vars[name] for name in players if player_data[name]["is_f"]]) >= 3  # At least 3 F-eligible (for SF, PF, and F slots)
-    
-    # UTIL can be any position, so at least 1 is already guaranteed by the 8-player constraint
-    # But we explicitly require at least 1 UTIL-eligible (any position)
-    prob += lpSum([vars[name] for name in players if player_data[name]["is_util"]]) >= 1  # At least 1 UTIL (any)
+    generator = LineupGenerator(df, max_salary=max_salary)
     
     # Solve the problem
     print("\nSolving optimization problem...")
-    prob.solve()
-    
-    # Check solution status
-    if prob.status != 1:  # 1 = Optimal
-        if prob.status == -1:
-            raise ValueError("Optimization failed: No feasible solution found. Check position constraints and salary cap.")
-        elif prob.status == 0:
-            raise ValueError("Optimization failed: Solution not found. Problem may be infeasible.")
-        else:
-            raise ValueError(f"Optimization failed with status: {prob.status}")
-    
-    # Create a list to store selected players
-    selected_players = []
-    
-    # Get the selected players and their data
-    for name in players:
-        if vars[name].value() == 1:
-            player_info = player_data[name]
-            selected_players.append({
-                'Player': name,
-                'Position': player_info['position'],
-                'Salary': player_info['salary'],
-                'FPTS': player_info['FPTS'],
-                'Team': player_info.get('Team', '')
-            })
-    
-    # Create dataframe from selected players
-    selected_df = pd.DataFrame(selected_players)
-    
-    if len(selected_df) == 0:
-        raise ValueError("No players selected. Optimization may have failed.")
-    
-    # Rename 'Position' to 'position' for add_position_flags function
-    selected_df = selected_df.rename(columns={'Position': 'position'})
-    
-    # Add position flags back to selected_df for slot assignment
-    selected_df = add_position_flags(selected_df)
-    
-    # Assign position slots to each player
-    selected_df = assign_position_slots(selected_df)
+    solution = generator.solve(generator.fpts)
+    if solution is None:
+        raise ValueError("Optimization failed: No feasible solution found. Check position constraints and salary cap.")
     
-    # Rename 'position' back to 'Position' for consistency
-    selected_df = selected_df.rename(columns={'position': 'Position'})
-    
-    # Sort by slot order: PG, SG, SF, PF, C, G, F, UTIL
-    slot_order = {'PG': 1, 'SG': 2, 'SF': 3, 'PF': 4, 'C': 5, 'G': 6, 'F': 7, 'UTIL': 8}
-    selected_df['slot_order'] = selected_df['Slot'].map(slot_order)
-    # Sort by slot order first, then by salary (descending) within each slot
-    selected_df = selected_df.sort_values(['slot_order', 'Salary'], ascending=[True, False]).reset_index(drop=True)
-    selected_df = selected_df.drop('slot_order', axis=1)
-    
-    return selected_df
+    return generator.lineup_frame(*solution)
+
+
+# Strategy definitions for multi-lineup generation (cycled when more lineups are requested)
+LINEUP_STRATEGIES = [
+    {'name': 'Max FPTS', 'objective': 'fpts'},
+    {'name': 'Max Value', 'objective': 'value'},
+    {'name': 'Max Ceiling', 'objective': 'ceiling'},
+    {'name': 'Balanced', 'objective': 'balanced'},
+    {'name': 'Punt Strategy', 'objective': 'punt'},
+]
+
+
+def _strategy_objective(generator: LineupGenerator, objective: str, ceiling: np.ndarray) -> np.ndarray:
+    """Per-player objective vector for a strategy."""
+    # FPTS per dollar, scaled by 1000 to make numbers reasonable
+    value = generator.fpts / np.maximum(generator.salary, 1) * 1000
+    if objective == 'value':
+        return value
+    if objective in ('ceiling', 'punt'):
+        return ceiling
+    if objective == 'balanced':
+        # Weighted combination: 60% FPTS, 40% value
+        return 0.6 * generator.fpts + 0.4 * value
+    return generator.fpts
 
 
 def optimize_multiple_lineups(df: pd.DataFrame, max_salary: int = 50000, num_lineups: int = 5, 
-                              max_overlap: int = 3) -> List[pd.DataFrame]:
+                              max_overlap: int = 3, max_exposure: Optional[int] = 3,
+                              time_limit: float = LINEUP_TIME_LIMIT) -> List[pd.DataFrame]:
     """
     Generate multiple unique lineups with different optimization strategies.
     
+    One LineupGenerator is reused for every lineup: each accepted lineup
+    appends a single uniqueness cut row, and players reaching max_exposure are
+    excluded through variable bounds (see LineupGenerator for how the model is
+    kept between solves). Every cut keeps its max_overlap limit; only a solve
+    that is infeasible is retried once with every cut at max_overlap + 2. Each
+    solve stops at time_limit with the best lineup found so far.
+    
     Args:
         df: DataFrame with Player, salary, FPTS, and position flags
         max_salary: Maximum total salary (default 50000)
         num_lineups: Number of lineups to generate (default 5)
         max_overlap: Maximum number of overlapping players between lineups (default 3)
-        
+        max_exposure: Maximum lineups any player may appear in (default 3, the limit
+                      previously hard-coded here; None = no limit)
+        time_limit: Solver time limit in seconds for each lineup (default LINEUP_TIME_LIMIT)
+    
     Returns:
         List of DataFrames, each containing an optimized lineup
     """
     lineups = []
-    selected_players_sets = []  # Track selected players to ensure uniqueness
-    player_exposure_count = {}  # Track how many times each player has been selected across all lineups
     
-    # Check for duplicate Player names
-    if df['Player'].duplicated().any():
-        df = df.drop_duplicates(subset=['Player'], keep='first').reset_index(drop=True)
-    
-    df = df.reset_index(drop=True)
-    
-    # Initialize exposure counts for all players
-    for player_name in df['Player'].tolist():
-        player_exposure_count[player_name] = 0
-    
-    # Check if ceiling/floor columns exist
-    has_ceiling = 'FPTS_Ceiling' in df.columns or 'ceiling_FPTS' in df.columns or 'FPTS_Ceiling' in df.columns
-    ceiling_col = None
-    if 'FPTS_Ceiling' in df.columns:
-        ceiling_col = 'FPTS_Ceiling'
-    elif 'ceiling_FPTS' in df.columns:
-        ceiling_col = 'ceiling_FPTS'
-    
-    # If no ceiling column, create default values based on FPTS
-    if not has_ceiling and 'FPTS' in df.columns:
-        df['FPTS_Ceiling'] = df['FPTS'] * 1.3
-        df['FPTS_Floor'] = df['FPTS'] * 0.7
-        ceiling_col = 'FPTS_Ceiling'
-        has_ceiling = True
-    
-    # #region agent log
-    import json
-    log_entry = {
-        'sessionId': 'debug-session',
-        'runId': 'run1',
-        'hypothesisId': 'H',
-        'location': 'optimize_draftkings_nba_lineup.py:491',
-        'message': 'Starting optimize_multiple_lineups',
-        'data': {
-            'total_players': len(df),
-            'has_ceiling': has_ceiling,
-            'ceiling_col': ceiling_col,
-            'num_lineups_requested': num_lineups,
-            'max_overlap': max_overlap,
-            'columns_in_df': list(df.columns)
-        },
-        'timestamp': int(__import__('time').time() * 1000)
-    }
-    _debug_log(log_entry)
-    # #endregion
-    
-    # Strategy definitions
-    strategies = [
-        {
-            'name': 'Max FPTS',
-            'objective': 'fpts',
-            'weight': 1.0
-        },
-        {
-            'name': 'Max Value',
-            'objective': 'value',
-            'weight': 1.0
-        },
-        {
-            'name': 'Max Ceiling',
-            'objective': 'ceiling',
-            'weight': 1.0,
-            'requires_ceiling': True
-        },
-        {
-            'name': 'Balanced',
-            'objective': 'balanced',
-            'weight': 1.0
-        },
-        {
-            'name': 'Punt Strategy',
-            'objective': 'punt',
-            'weight': 1.0,
-            'requires_ceiling': True
-        }
+    generator = LineupGenerator(df, max_salary=max_salary)
+    gen_df = generator.df
+    
+    # Ceiling column, defaulting to FPTS * 1.3 when predictions have none
+    ceiling_col = next((c for c in ['FPTS_Ceiling', 'ceiling_FPTS'] if c in gen_df.columns), None)
+    if ceiling_col is not None:
+        ceiling = pd.to_numeric(gen_df[ceiling_col], errors='coerce').fillna(gen_df['FPTS']).to_numpy(dtype=float)
+    else:
+        ceiling = generator.fpts * 1.3
+    
+    # Punt strategy: 2-3 stars (>= $8,000), 2-3 role players (<= $6,000), 2-3 mid-tier
+    punt_rows = [
+        generator.count_row(generator.salary >= 8000, 2, 3),
+        generator.count_row(generator.salary <= 6000, 2, 3),
+        generator.count_row((generator.salary > 6000) & (generator.salary < 8000), 2, 3),
     ]
     
-    for strategy_idx, strategy in enumerate(strategies[:num_lineups]):
-        # Skip ceiling-based strategies if ceiling data not available
-        if strategy.get('requires_ceiling') and not has_ceiling:
-            # Fall back to value strategy
-            strategy = {'name': 'Max Value', 'objective': 'value', 'weight': 1.0}
+    for lineup_idx in range(num_lineups):
+        strategy = LINEUP_STRATEGIES[lineup_idx % len(LINEUP_STRATEGIES)]
+        objective = _strategy_objective(generator, strategy['objective'], ceiling)
+        extra_rows = punt_rows if strategy['objective'] == 'punt' else None
         
-        # #region agent log
-        import json
-        log_entry = {
-            'sessionId': 'debug-session',
-            'runId': 'run1',
-            'hypothesisId': 'A',
-            'location': 'optimize_draftkings_nba_lineup.py:537',
-            'message': f'Attempting strategy {strategy_idx + 1}/{num_lineups}: {strategy["name"]}',
-            'data': {
-                'strategy_name': strategy['name'],
-                'strategy_idx': strategy_idx,
-                'num_lineups': num_lineups,
-                'lineups_generated_so_far': len(lineups),
-                'has_ceiling': has_ceiling
-            },
-            'timestamp': int(__import__('time').time() * 1000)
-        }
-        _debug_log(log_entry)
-        # #endregion
+        n_cuts = len(lineups)
         
         try:
-            # Set up optimization problem
-            prob = LpProblem(f"Optimize_NBA_Lineup_{strategy['name']}", LpMaximize)
-            
-            players = df["Player"].tolist()
-            vars = LpVariable.dicts("Select", players, cat="Binary")
-            player_data = df.set_index('Player').to_dict('index')
-            
-            # Objective function based on strategy
-            if strategy['objective'] == 'fpts':
-                # Maximize total FPTS
-                prob += lpSum([vars[name] * player_data[name]["FPTS"] for name in players])
-            elif strategy['objective'] == 'value':
-                # Maximize FPTS per dollar (value)
-                # Scale by 1000 to make numbers reasonable
-                prob += lpSum([vars[name] * (player_data[name]["FPTS"] / max(player_data[name]["salary"], 1) * 1000) 
-                              for name in players])
-            elif strategy['objective'] == 'ceiling' and ceiling_col:
-                # Maximize ceiling FPTS
-                prob += lpSum([vars[name] * player_data[name].get(ceiling_col, player_data[name]["FPTS"]) 
-                              for name in players])
-            elif strategy['objective'] == 'balanced':
-                # Weighted combination: 60% FPTS, 40% value
-                prob += lpSum([vars[name] * (
-                    0.6 * player_data[name]["FPTS"] + 
-                    0.4 * (player_data[name]["FPTS"] / max(player_data[name]["salary"], 1) * 1000)
-                ) for name in players])
-            elif strategy['objective'] == 'punt' and ceiling_col:
-                # Maximize ceiling with constraint on average salary
-                prob += lpSum([vars[name] * player_data[name].get(ceiling_col, player_data[name]["FPTS"]) 
-                              for name in players])
-            else:
-                # Default to FPTS
-                prob += lpSum([vars[name] * player_data[name]["FPTS"] for name in players])
-            
-            # Standard constraints
-            prob += lpSum([vars[name] for name in players]) == 8
-            prob += lpSum([vars[name] * player_data[name]["salary"] for name in players]) <= max_salary
-            
-            # Position constraints
-            # We need at least 1 player for each required position slot
-            # PG slot: needs at least 1 PG-eligible player
-            prob += lpSum([vars[name] for name in players if player_data[name]["is_pg"]]) >= 1
-            # SG slot: needs at least 1 SG-eligible player
-            prob += lpSum([vars[name] for name in players if player_data[name]["is_sg"]]) >= 1
-            # SF slot: needs at least 1 SF-eligible player
-            # IMPORTANT: We need at least 1 SF-eligible player that is NOT also SG-eligible
-            # OR we need at least 2 SF-eligible players total (one can be SG/SF)
-            # To be safe, let's require at least 2 SF-eligible players
-            prob += lpSum([vars[name] for name in players if player_data[name]["is_sf"]]) >= 2
-            # PF slot: needs at least 1 PF-eligible player
-            prob += lpSum([vars[name] for name in players if player_data[name]["is_pf"]]) >= 1
-            # C slot: needs at least 1 C-eligible player
-            prob += lpSum([vars[name] for name in players if player_data[name]["is_c"]]) >= 1
-            # G slot: needs at least 1 G-eligible player (PG or SG)
-            # Since PG and SG slots also require G-eligible players, we need at least 5 total
-            # (1 for PG, 1 for SG, 1 for G slot, plus buffer for flexibility)
-            # G-eligible players might also be F-eligible and get used for F slot, so we need extra buffer
-            prob += lpSum([vars[name] for name in players if player_data[name]["is_g"]]) >= 5
-            # F slot: needs at least 1 F-eligible player (SF or PF)
-            # Since SF and PF slots also require F-eligible players, we need at least 5 total
-            # (1 for SF slot, 1 for PF slot, 1 for F slot, plus buffer for flexibility)
-            # We need extra F-eligible players because SF-eligible players might also be SG-eligible 
-            # and get used for SG slot, and we need flexibility in slot assignment
-            prob += lpSum([vars[name] for name in players if player_data[name]["is_f"]]) >= 5
-            # UTIL slot: can be any player (all players are UTIL-eligible)
-            # We need at least 1 player total, but this is already satisfied by the 8-player constraint
+            solution = generator.solve(objective, extra_rows=extra_rows, time_limit=time_limit)
+            if solution is None and n_cuts > 0:
+                # Retry with relaxed uniqueness constraints (allow more overlap),
+                # then restore the cuts for later lineups
+                generator.set_cut_limits(np.full(n_cuts, max_overlap + 2))
+                solution = generator.solve(objective, extra_rows=extra_rows, time_limit=time_limit)
+                generator.set_cut_limits(np.full(n_cuts, max_overlap))
             
-            # Punt strategy: enforce salary tier structure
-            # 2-3 high salary stars (>= $8,000), 2-3 low salary role players (<= $6,000), 2-3 mid-tier (between $6,000 and $8,000)
-            if strategy['objective'] == 'punt':
-                # High salary players (stars) >= $8,000
-                high_salary_players = [name for name in players if player_data[name]["salary"] >= 8000]
-                prob += lpSum([vars[name] for name in high_salary_players]) >= 2
-                prob += lpSum([vars[name] for name in high_salary_players]) <= 3
-                
-                # Low salary players (role players) <= $6,000
-                low_salary_players = [name for name in players if player_data[name]["salary"] <= 6000]
-                prob += lpSum([vars[name] for name in low_salary_players]) >= 2
-                prob += lpSum([vars[name] for name in low_salary_players]) <= 3
-                
-                # Mid-tier players (between $6,000 and $8,000)
-                mid_salary_players = [name for name in players if 6000 < player_data[name]["salary"] < 8000]
-                prob += lpSum([vars[name] for name in mid_salary_players]) >= 2
-                prob += lpSum([vars[name] for name in mid_salary_players]) <= 3
-            
-            # Uniqueness constraints: ensure this lineup differs from previous ones
-            # Progressively relax constraints - allow more overlap with earlier lineups
-            uniqueness_constraints_added = 0
-            for prev_lineup_idx, prev_selected in enumerate(selected_players_sets):
-                # For recent lineups (last 2), use strict overlap limit
-                # For older lineups, allow more overlap to prevent infeasibility
-                if len(selected_players_sets) - prev_lineup_idx <= 2:
-                    # Recent lineups: strict overlap limit
-                    overlap_limit = max_overlap
-                else:
-                    # Older lineups: allow more overlap (max_overlap + 1)
-                    overlap_limit = max_overlap + 1
-                
-                # Constraint: at most overlap_limit players can overlap
-                prob += lpSum([vars[name] for name in prev_selected]) <= overlap_limit
-                uniqueness_constraints_added += 1
-            
-            # #region agent log
-            log_entry = {
-                'sessionId': 'debug-session',
-                'runId': 'run1',
-                'hypothesisId': 'I',
-                'location': 'optimize_draftkings_nba_lineup.py:629',
-                'message': f'Constraints set for {strategy["name"]}',
-                'data': {
-                    'strategy_name': strategy['name'],
-                    'lineups_generated_so_far': len(lineups),
-                    'uniqueness_constraints_added': uniqueness_constraints_added,
-                    'excluded_by_exposure': len(excluded_by_exposure) if 'excluded_by_exposure' in locals() else 0,
-                    'max_overlap': max_overlap,
-                    'using_progressive_relaxation': True
-                },
-                'timestamp': int(__import__('time').time() * 1000)
-            }
-            _debug_log(log_entry)
-            # #endregion
-            
-            # Player exposure constraint: no player can appear in more than 3 lineups total
-            # BUT: Only apply this constraint if we've already generated at least one lineup
-            # For the first lineup, all players are available
-            excluded_by_exposure = []
-            if len(selected_players_sets) > 0:
-                max_exposure = 3
-                for player_name in players:
-                    current_exposure = player_exposure_count.get(player_name, 0)
-                    if current_exposure >= max_exposure:
-                        # Player has already reached max exposure, exclude from this lineup
-                        prob += vars[player_name] == 0
-                        excluded_by_exposure.append(player_name)
-            
-            # Solve
-            prob.solve()
-            
-            # #region agent log
-            log_entry = {
-                'sessionId': 'debug-session',
-                'runId': 'run1',
-                'hypothesisId': 'B',
-                'location': 'optimize_draftkings_nba_lineup.py:648',
-                'message': f'Initial solve status for {strategy["name"]}',
-                'data': {
-                    'strategy_name': strategy['name'],
-                    'status': prob.status,
-                    'status_name': ['Not Solved', 'Optimal', 'Unbounded', 'Undefined'][prob.status] if prob.status < 4 else 'Unknown',
-                    'lineups_generated_so_far': len(lineups),
-                    'excluded_by_exposure_count': len(excluded_by_exposure)
-                },
-                'timestamp': int(__import__('time').time() * 1000)
-            }
-            _debug_log(log_entry)
-            # #endregion
-            
-            if prob.status != 1:
-                # If infeasible, try with relaxed uniqueness constraints (but keep exposure constraints)
-                if len(selected_players_sets) > 0:
-                    # Retry with relaxed uniqueness constraints (allow more overlap)
-                    prob = LpProblem(f"Optimize_NBA_Lineup_{strategy['name']}_retry", LpMaximize)
-                    vars = LpVariable.dicts("Select", players, cat="Binary")
-                    
-                    if strategy['objective'] == 'fpts':
-                        prob += lpSum([vars[name] * player_data[name]["FPTS"] for name in players])
-                    elif strategy['objective'] == 'value':
-                        prob += lpSum([vars[name] * (player_data[name]["FPTS"] / max(player_data[name]["salary"], 1) * 1000) 
-                                      for name in players])
-                    elif strategy['objective'] == 'ceiling' and ceiling_col:
-                        prob += lpSum([vars[name] * player_data[name].get(ceiling_col, player_data[name]["FPTS"]) 
-                                      for name in players])
-                    elif strategy['objective'] == 'balanced':
-                        prob += lpSum([vars[name] * (
-                            0.6 * player_data[name]["FPTS"] + 
-                            0.4 * (player_data[name]["FPTS"] / max(player_data[name]["salary"], 1) * 1000)
-                        ) for name in players])
-                    elif strategy['objective'] == 'punt' and ceiling_col:
-                        prob += lpSum([vars[name] * player_data[name].get(ceiling_col, player_data[name]["FPTS"]) 
-                                      for name in players])
-                    
-                    prob += lpSum([vars[name] for name in players]) == 8
-                    prob += lpSum([vars[name] * player_data[name]["salary"] for name in players]) <= max_salary
-                    prob += lpSum([vars[name] for name in players if player_data[name]["is_pg"]]) >= 1
-                    prob += lpSum([vars[name] for name in players if player_data[name]["is_sg"]]) >= 1
-                    prob += lpSum([vars[name] for name in players if player_data[name]["is_sf"]]) >= 2
-                    prob += lpSum([vars[name] for name in players if player_data[name]["is_pf"]]) >= 1
-                    prob += lpSum([vars[name] for name in players if player_data[name]["is_c"]]) >= 1
-                    prob += lpSum([vars[name] for name in players if player_data[name]["is_g"]]) >= 5
-                    prob += lpSum([vars[name] for name in players if player_data[name]["is_f"]]) >= 5
-                    prob += lpSum([vars[name] for name in players if player_data[name]["is_util"]]) >= 1
-                    
-                    # Relaxed uniqueness constraints: allow more overlap (max_overlap + 2)
-                    # This helps when strict constraints make it impossible to generate more lineups
-                    relaxed_overlap = max_overlap + 2
-                    for prev_selected in selected_players_sets:
-                        prob += lpSum([vars[name] for name in prev_selected]) <= relaxed_overlap
-                    
-                    # Punt strategy: enforce salary tier structure
-                    if strategy['objective'] == 'punt':
-                        # High salary players (stars) >= $8,000
-                        high_salary_players = [name for name in players if player_data[name]["salary"] >= 8000]
-                        prob += lpSum([vars[name] for name in high_salary_players]) >= 2
-                        prob += lpSum([vars[name] for name in high_salary_players]) <= 3
-                        
-                        # Low salary players (role players) <= $6,000
-                        low_salary_players = [name for name in players if player_data[name]["salary"] <= 6000]
-                        prob += lpSum([vars[name] for name in low_salary_players]) >= 2
-                        prob += lpSum([vars[name] for name in low_salary_players]) <= 3
-                        
-                        # Mid-tier players (between $6,000 and $8,000)
-                        mid_salary_players = [name for name in players if 6000 < player_data[name]["salary"] < 8000]
-                        prob += lpSum([vars[name] for name in mid_salary_players]) >= 2
-                        prob += lpSum([vars[name] for name in mid_salary_players]) <= 3
-                    
-                    # Player exposure constraint: no player can appear in more than 3 lineups total
-                    # BUT: Only apply this constraint if we've already generated at least one lineup
-                    if len(selected_players_sets) > 0:
-                        max_exposure = 3
-                        for player_name in players:
-                            current_exposure = player_exposure_count.get(player_name, 0)
-                            if current_exposure >= max_exposure:
-                                # Player has already reached max exposure, exclude from this lineup
-                                prob += vars[player_name] == 0
-                    
-                    prob.solve()
-                    
-                    # #region agent log
-                    log_entry = {
-                        'sessionId': 'debug-session',
-                        'runId': 'run1',
-                        'hypothesisId': 'C',
-                        'location': 'optimize_draftkings_nba_lineup.py:712',
-                        'message': f'Retry solve status for {strategy["name"]} (with relaxed constraints)',
-                        'data': {
-                            'strategy_name': strategy['name'],
-                            'status': prob.status,
-                            'status_name': ['Not Solved', 'Optimal', 'Unbounded', 'Undefined'][prob.status] if prob.status < 4 else 'Unknown',
-                            'lineups_generated_so_far': len(lineups),
-                            'relaxed_overlap_limit': relaxed_overlap if 'relaxed_overlap' in locals() else None
-                        },
-                        'timestamp': int(__import__('time').time() * 1000)
-                    }
-                    _debug_log(log_entry)
-                    # #endregion
-            
-            if prob.status != 1:
-                print(f"Warning: Strategy '{strategy['name']}' failed to find solution (status: {prob.status})")
-                # #region agent log
-                log_entry = {
-                    'sessionId': 'debug-session',
-                    'runId': 'run1',
-                    'hypothesisId': 'D',
-                    'location': 'optimize_draftkings_nba_lineup.py:714',
-                    'message': f'Strategy {strategy["name"]} FAILED',
-                    'data': {
-                        'strategy_name': strategy['name'],
-                        'status': prob.status,
-                        'status_name': ['Not Solved', 'Optimal', 'Unbounded', 'Undefined'][prob.status] if prob.status < 4 else 'Unknown',
-                        'lineups_generated_so_far': len(lineups),
-                        'total_players': len(players),
-                        'excluded_by_exposure': len(excluded_by_exposure) if 'excluded_by_exposure' in locals() else 0
-                    },
-                    'timestamp': int(__import__('time').time() * 1000)
-                }
-                _debug_log(log_entry)
-                # #endregion
-                continue
-            
-            # Extract selected players
-            selected_players = []
-            selected_player_set = set()
-            for name in players:
-                if vars[name].value() == 1:
-                    player_info = player_data[name]
-                    player_dict = {
-                        'Player': name,
-                        'Position': player_info['position'],
-                        'Salary': player_info['salary'],
-                        'FPTS': player_info['FPTS'],
-                        'Team': player_info.get('Team', '')
-                    }
-                    # Add tip time and opponent if available
-                    if 'Tip_Time' in player_info:
-                        player_dict['Tip_Time'] = player_info['Tip_Time']
-                    if 'Opponent' in player_info:
-                        player_dict['Opponent'] = player_info['Opponent']
-                    elif 'Opponent_Team' in player_info:
-                        player_dict['Opponent'] = player_info['Opponent_Team']
-                    selected_players.append(player_dict)
-                    selected_player_set.add(name)
-            
-            if len(selected_players) == 0:
+            if solution is None:
+                print(f"Warning: Strategy '{strategy['name']}' failed to find solution")
                 continue
             
-            selected_df = pd.DataFrame(selected_players)
-            selected_df = selected_df.rename(columns={'Position': 'position'})
-            selected_df = add_position_flags(selected_df)
-            selected_df = assign_position_slots(selected_df)
-            selected_df = selected_df.rename(columns={'position': 'Position'})
-            
-            # Sort by slot order
-            slot_order = {'PG': 1, 'SG': 2, 'SF': 3, 'PF': 4, 'C': 5, 'G': 6, 'F': 7, 'UTIL': 8}
-            selected_df['slot_order'] = selected_df['Slot'].map(slot_order)
-            selected_df = selected_df.sort_values('slot_order', ascending=True).reset_index(drop=True)
-            selected_df = selected_df.drop('slot_order', axis=1)
-            
-            lineups.append(selected_df)
-            selected_players_sets.append(selected_player_set)
-            
-            # #region agent log
-            log_entry = {
-                'sessionId': 'debug-session',
-                'runId': 'run1',
-                'hypothesisId': 'E',
-                'location': 'optimize_draftkings_nba_lineup.py:756',
-                'message': f'Strategy {strategy["name"]} SUCCESS',
-                'data': {
-                    'strategy_name': strategy['name'],
-                    'players_selected': len(selected_players),
-                    'lineups_generated_so_far': len(lineups),
-                    'total_salary': sum(p['Salary'] for p in selected_players),
-                    'total_fpts': sum(p['FPTS'] for p in selected_players)
-                },
-                'timestamp': int(__import__('time').time() * 1000)
-            }
-            _debug_log(log_entry)
-            # #endregion
-            
-            # Update player exposure counts
-            for player_name in selected_player_set:
-                player_exposure_count[player_name] = player_exposure_count.get(player_name, 0) + 1
+            player_idx, slots = solution
+            lineups.append(generator.lineup_frame(player_idx, slots))
             
+            generator.add_cut(player_idx, max_overlap)
+            generator.exposure[player_idx] += 1
+            if max_exposure is not None:
+                generator.exclude(np.nonzero(generator.exposure >= max_exposure)[0])
+        
         except Exception as e:
             print(f"Error generating lineup with strategy '{strategy['name']}': {e}")
             import traceback
             traceback.print_exc()
-            # #region agent log
-            log_entry = {
-                'sessionId': 'debug-session',
-                'runId': 'run1',
-                'hypothesisId': 'F',
-                'location': 'optimize_draftkings_nba_lineup.py:763',
-                'message': f'Exception in strategy {strategy["name"]}',
-                'data': {
-                    'strategy_name': strategy['name'],
-                    'error': str(e),
-                    'lineups_generated_so_far': len(lineups)
-                },
-                'timestamp': int(__import__('time').time() * 1000)
-            }
-            _debug_log(log_entry)
-            # #endregion
             continue
     
-    # #region agent log
-    log_entry = {
+    _debug_log({
         'sessionId': 'debug-session',
         'runId': 'run1',
         'hypothesisId': 'G',
-        'location': 'optimize_draftkings_nba_lineup.py:769',
+        'location': 'optimize_draftkings_nba_lineup.py:optimize_multiple_lineups',
         'message': 'Finished optimize_multiple_lineups',
         'data': {
             'total_lineups_generated': len(lineups),
             'requested_lineups': num_lineups,
-            'strategies_attempted': len(strategies[:num_lineups])
+            'total_players': generator.n_players
         },
         'timestamp': int(__import__('time').time() * 1000)
-    }
-    _debug_log(log_entry)
-    # #endregion
+    })
     
     return lineups
 
@@ -1063,18 +829,41 @@ def calculate_bust_score(row: pd.Series) -> float:
     return round(bust_score, 2)
 
 
-def calculate_boom_bust_probabilities(df: pd.DataFrame) -> pd.DataFrame:
+def calculate_boom_bust_probabilities(df: pd.DataFrame, simulation_summary: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Calculate boom and bust scores/probabilities for all players.
     
     Args:
         df: DataFrame with player predictions including FPTS, FPTS_Ceiling, FPTS_Floor, salary
-        
+        simulation_summary: Optional slate_simulator.summarize_players() output (with a
+                            Player column). For matched players the simulated FPTS_P75/
+                            FPTS_P25 become FPTS_Ceiling/FPTS_Floor (with FPTS_StdDev) before
+                            scoring, and the simulated Boom_Probability/Bust_Probability
+                            replace the score-based probabilities.
+    
     Returns:
         DataFrame with added Boom_Score and Bust_Score columns
     """
     df = df.copy()
     
+    sim = None
+    if simulation_summary is not None and 'Player' in simulation_summary.columns and len(simulation_summary) > 0:
+        sim = simulation_summary.drop_duplicates(subset=['Player']).set_index('Player')
+        matched = df['Player'].isin(sim.index)
+        
+        # Simulated ceiling/floor (same 75th/25th percentiles as calculate_ceiling_floor);
+        # unmatched players keep their own values or the scores' +/-30% defaults
+        median_fpts = df['FPTS'] if 'FPTS' in df.columns else pd.Series(0.0, index=df.index)
+        sim_ceiling_floor = {
+            'FPTS_Ceiling': ('FPTS_P75', median_fpts * 1.3),
+            'FPTS_Floor': ('FPTS_P25', median_fpts * 0.7),
+            'FPTS_StdDev': ('FPTS_StdDev', 0.0),
+        }
+        for col, (sim_col, default) in sim_ceiling_floor.items():
+            if sim_col in sim.columns:
+                current = df[col] if col in df.columns else default
+                df[col] = df['Player'].map(sim[sim_col]).where(matched, current)
+    
     # Calculate boom scores
     df['Boom_Score'] = df.apply(calculate_boom_score, axis=1)
     
@@ -1094,371 +883,11 @@ def calculate_boom_bust_probabilities(df: pd.DataFrame) -> pd.DataFrame:
     bust_range = max_bust - min_bust if max_bust > min_bust else 1
     df['Bust_Probability'] = ((df['Bust_Score'] - min_bust) / bust_range * 100).round(1)
     
-    return df
-
-
-def assign_position_slots(selected_df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Assign each player to a specific DraftKings position slot.
-    
-    DraftKings NBA lineup requires exactly 8 players:
-    - PG (at least 1)
-    - SG (at least 1)
-    - SF (at least 1)
-    - PF (at least 1)
-    - C (at least 1)
-    - G (at least 1, can be PG or SG)
-    - F (at least 1, can be SF or PF)
-    - UTIL (at least 1, can be any position)
-    
-    Args:
-        selected_df: DataFrame with selected players and position flags
-        
-    Returns:
-        DataFrame with 'Slot' column added (exactly 8 slots filled)
-    """
-    df = selected_df.copy()
-    
-    if len(df) != 8:
-        raise ValueError(f"Expected exactly 8 players, but got {len(df)}")
-    
-    df['Slot'] = None
-    df['assigned'] = False
-    
-    # Identify players who can play multiple positions
-    # For PG/SG: prefer assigning single-position players to PG/SG slots, save multi-position for G
-    df['is_pg_only'] = df['is_pg'] & ~df['is_sg']
-    df['is_sg_only'] = df['is_sg'] & ~df['is_pg']
-    df['is_pg_sg'] = df['is_pg'] & df['is_sg']  # Can play both
-    
-    df['is_sf_only'] = df['is_sf'] & ~df['is_pf']
-    df['is_pf_only'] = df['is_pf'] & ~df['is_sf']
-    df['is_sf_pf'] = df['is_sf'] & df['is_pf']  # Can play both
-    
-    # Strategy: Fill required position slots (PG, SG, SF, PF, C) FIRST before flexible slots (G, F)
-    # This ensures we don't use up SF/PF-eligible players for G/F slots before filling SF/PF slots
-    
-    # Fill PG slot - prefer PG-only players, but can use PG/SG if needed
-    # IMPORTANT: Avoid using PF-eligible players here to save them for PF slot
-    # Use .loc with boolean indexing to avoid issues with == True comparison
-    eligible_pg = df.loc[(df['is_pg']) & (~df['assigned'])]
-    if len(eligible_pg) == 0:
-        raise ValueError("No eligible player found for PG slot. Optimizer may have selected invalid lineup.")
-    # Prefer PG-only players first (avoid PF-eligible players)
-    pg_only = eligible_pg.loc[eligible_pg['is_pg_only']]
-    if len(pg_only) > 0:
-        # Prefer PG-only players who are NOT PF-eligible
-        pg_only_not_pf = pg_only.loc[~pg_only['is_pf']]
-        if len(pg_only_not_pf) > 0:
-            idx = pg_only_not_pf.sort_values('FPTS', ascending=False).index[0]
-        else:
-            idx = pg_only.sort_values('FPTS', ascending=False).index[0]
-    else:
-        # Prefer PG/SG players who are NOT PF-eligible
-        pg_not_pf = eligible_pg.loc[~eligible_pg['is_pf']]
-        if len(pg_not_pf) > 0:
-            idx = pg_not_pf.sort_values('FPTS', ascending=False).index[0]
-        else:
-            # Last resort: use PF-eligible player (should be rare)
-            idx = eligible_pg.sort_values('FPTS', ascending=False).index[0]
-    df.loc[idx, 'Slot'] = 'PG'
-    df.loc[idx, 'assigned'] = True
-    
-    # Fill SG slot - prefer SG-only players, but can use PG/SG if needed
-    # IMPORTANT: Don't use SF-eligible or PF-eligible players here if possible
-    # Use .loc with boolean indexing to avoid issues with == True comparison
-    eligible_sg = df.loc[(df['is_sg']) & (~df['assigned'])]
-    if len(eligible_sg) == 0:
-        raise ValueError("No eligible player found for SG slot. Optimizer may have selected invalid lineup.")
-    # Prefer SG-only players first (avoid SF-eligible and PF-eligible players)
-    sg_only = eligible_sg.loc[eligible_sg['is_sg_only']]
-    if len(sg_only) > 0:
-        # Prefer SG-only players who are NOT SF-eligible and NOT PF-eligible
-        sg_only_not_sf_pf = sg_only.loc[~sg_only['is_sf'] & ~sg_only['is_pf']]
-        if len(sg_only_not_sf_pf) > 0:
-            idx = sg_only_not_sf_pf.sort_values('FPTS', ascending=False).index[0]
-        else:
-            idx = sg_only.sort_values('FPTS', ascending=False).index[0]
-    else:
-        # If no SG-only players, use PG/SG players, but STRICTLY avoid SF-eligible and PF-eligible players
-        # This ensures we save SF-eligible players for SF slot and PF-eligible players for PF slot
-        sg_not_sf_pf = eligible_sg.loc[~eligible_sg['is_sf'] & ~eligible_sg['is_pf']]
-        if len(sg_not_sf_pf) > 0:
-            idx = sg_not_sf_pf.sort_values('FPTS', ascending=False).index[0]
-        else:
-            # Prefer SF-eligible over PF-eligible (SF comes before PF in slot order)
-            sg_not_pf = eligible_sg.loc[~eligible_sg['is_pf']]
-            if len(sg_not_pf) > 0:
-                idx = sg_not_pf.sort_values('FPTS', ascending=False).index[0]
-            else:
-                # Last resort: use PF-eligible player (should be rare)
-                idx = eligible_sg.sort_values('FPTS', ascending=False).index[0]
-    df.loc[idx, 'Slot'] = 'SG'
-    df.loc[idx, 'assigned'] = True
-    
-    # Fill SF slot - prefer SF-only players, but reserve at least one F-eligible player for F slot
-    # IMPORTANT: Fill SF BEFORE G and F slots to ensure we have SF-eligible players available
-    # Use .loc with boolean indexing to avoid issues with == True comparison
-    eligible_sf = df.loc[(df['is_sf']) & (~df['assigned'])]
-    if len(eligible_sf) == 0:
-        raise ValueError("No eligible player found for SF slot. Optimizer may have selected invalid lineup.")
-    
-    # Count how many F-eligible players are still unassigned (needed for F slot after SF and PF are filled)
-    unassigned_f_eligible = df.loc[(df['is_f']) & (~df['assigned'])]
-    unassigned_f_count = len(unassigned_f_eligible)
-    
-    # Strategy: We need to ensure we leave at least 1 F-eligible player for F slot
-    # SF-only and PF-only players ARE F-eligible, so if we use them for SF/PF slots, we've used F-eligible players
-    # Best strategy: Use SF/PF players for SF and PF slots when possible, saving SF-only/PF-only for F slot
-    # But if we don't have SF/PF players, use SF-only/PF-only and ensure we have enough F-eligible players total
-    
-    sf_pf_players = eligible_sf.loc[eligible_sf['is_sf_pf']]  # Players who can play both SF and PF
-    sf_only = eligible_sf.loc[eligible_sf['is_sf_only']]
-    
-    # Strategy: Prefer SF-only players for SF slot to save SF/PF players for PF slot
-    # Only use SF/PF players if we have enough F-eligible players remaining
-    if len(sf_only) > 0:
-        # Use SF-only players first (they're F-eligible but can't play PF, so safe to use here)
-        idx = sf_only.sort_values('FPTS', ascending=False).index[0]
-    elif len(sf_pf_players) > 0 and unassigned_f_count > 2:
-        # We have SF/PF players and enough F-eligible players left - use SF/PF for SF slot
-        # This still leaves SF/PF players available for PF slot
-        idx = sf_pf_players.sort_values('FPTS', ascending=False).index[0]
-    else:
-        # No SF-only players, must use SF/PF (but ensure we have enough F-eligible players)
-        if unassigned_f_count > 1:
-            idx = eligible_sf.sort_values('FPTS', ascending=False).index[0]
-        else:
-            # Not enough F-eligible players - this shouldn't happen with correct optimizer constraints
-            raise ValueError(
-                f"Cannot fill SF slot: Only {unassigned_f_count} F-eligible player(s) remaining, "
-                f"but need at least 1 for PF slot and 1 for F slot. Optimizer may have selected invalid lineup."
-            )
-    df.loc[idx, 'Slot'] = 'SF'
-    df.loc[idx, 'assigned'] = True
-    
-    # Fill PF slot - MUST reserve at least one F-eligible player for F slot
-    # IMPORTANT: Fill PF BEFORE F slot to ensure we have PF-eligible players available
-    # Use .loc with boolean indexing to avoid issues with == True comparison
-    eligible_pf = df.loc[(df['is_pf']) & (~df['assigned'])]
-    
-    # #region agent log
-    import json
-    assigned_so_far = df[df['assigned'] == True]
-    log_entry = {
-        'sessionId': 'debug-session',
-        'runId': 'run1',
-        'hypothesisId': 'J',
-        'location': 'optimize_draftkings_nba_lineup.py:1210',
-        'message': 'PF slot assignment - checking eligibility',
-        'data': {
-            'eligible_pf_count': len(eligible_pf),
-            'assigned_players_count': len(assigned_so_far),
-            'assigned_slots': assigned_so_far['Slot'].tolist() if 'Slot' in assigned_so_far.columns else [],
-            'total_players': len(df),
-            'pf_eligible_players': eligible_pf['Player'].tolist() if len(eligible_pf) > 0 else []
-        },
-        'timestamp': int(__import__('time').time() * 1000)
-    }
-    _debug_log(log_entry)
-    # #endregion
-    
-    if len(eligible_pf) == 0:
-        raise ValueError("No eligible player found for PF slot. Optimizer may have selected invalid lineup.")
-    
-    # Count how many F-eligible players are still unassigned (CRITICAL: need at least 1 for F slot)
-    unassigned_f_eligible = df.loc[(df['is_f']) & (~df['assigned'])]
-    unassigned_f_count = len(unassigned_f_eligible)
-    
-    # #region agent log
-    unassigned_c_eligible = df.loc[(df['is_c']) & (~df['assigned'])]
-    unassigned_c_count = len(unassigned_c_eligible)
-    log_entry = {
-        'sessionId': 'debug-session',
-        'runId': 'run1',
-        'hypothesisId': 'K',
-        'location': 'optimize_draftkings_nba_lineup.py:1216',
-        'message': 'PF slot assignment - F-eligible and C-eligible check',
-        'data': {
-            'unassigned_f_count': unassigned_f_count,
-            'unassigned_f_players': unassigned_f_eligible['Player'].tolist() if len(unassigned_f_eligible) > 0 else [],
-            'unassigned_c_count': unassigned_c_count,
-            'unassigned_c_players': unassigned_c_eligible['Player'].tolist() if len(unassigned_c_eligible) > 0 else [],
-            'pf_only_count': len(eligible_pf.loc[eligible_pf['is_pf_only']]) if len(eligible_pf) > 0 else 0,
-            'pf_only_not_c_count': len(eligible_pf.loc[eligible_pf['is_pf_only'] & ~eligible_pf['is_c']]) if len(eligible_pf) > 0 else 0,
-            'sf_pf_count': len(eligible_pf.loc[eligible_pf['is_sf_pf']]) if len(eligible_pf) > 0 else 0
-        },
-        'timestamp': int(__import__('time').time() * 1000)
-    }
-    _debug_log(log_entry)
-    # #endregion
-    
-    pf_pf_sf_players = eligible_pf.loc[eligible_pf['is_sf_pf']]  # Players who can play both SF and PF
-    pf_only = eligible_pf.loc[eligible_pf['is_pf_only']]
-    
-    # Count C-eligible players remaining (CRITICAL: need at least 1 for C slot)
-    unassigned_c_eligible = df.loc[(df['is_c']) & (~df['assigned'])]
-    unassigned_c_count = len(unassigned_c_eligible)
-    
-    # Strategy: Prefer PF-only players who are NOT C-eligible for PF slot
-    # This preserves C-eligible players for C slot
-    # Only use C-eligible players for PF if absolutely necessary (when unassigned_c_count > 1)
-    pf_only_not_c = pf_only.loc[~pf_only['is_c']] if len(pf_only) > 0 else pd.DataFrame()
-    
-    # Priority order:
-    # 1. PF-only players who are NOT C-eligible (if we have enough F-eligible players)
-    # 2. SF/PF players (if we have enough F-eligible and C-eligible players)
-    # 3. PF-only players who ARE C-eligible (only if we have more than 1 C-eligible player)
-    # 4. Any PF-eligible player (last resort)
-    
-    if len(pf_only_not_c) > 0 and unassigned_f_count > 1:
-        # Best case: PF-only players who are NOT C-eligible
-        idx = pf_only_not_c.sort_values('FPTS', ascending=False).index[0]
-    elif len(pf_pf_sf_players) > 0 and unassigned_f_count > 1 and unassigned_c_count > 0:
-        # Good case: SF/PF players (they're F-eligible, and we have C-eligible players left)
-        idx = pf_pf_sf_players.sort_values('FPTS', ascending=False).index[0]
-    elif len(pf_only) > 0 and unassigned_c_count > 1 and unassigned_f_count > 1:
-        # Acceptable: PF-only players who ARE C-eligible, but we have more than 1 C-eligible player
-        idx = pf_only.sort_values('FPTS', ascending=False).index[0]
-    elif len(eligible_pf) > 0:
-        # Last resort: Any PF-eligible player, but check constraints
-        if unassigned_c_count == 0:
-            raise ValueError(
-                f"Cannot fill PF slot: No C-eligible players remaining for C slot. "
-                f"Optimizer may have selected invalid lineup."
-            )
-        elif unassigned_f_count <= 1:
-            raise ValueError(
-                f"Cannot fill PF slot: Only {unassigned_f_count} F-eligible player(s) remaining, "
-                f"but need at least 1 for F slot. Optimizer may have selected invalid lineup."
-            )
-        else:
-            idx = eligible_pf.sort_values('FPTS', ascending=False).index[0]
-    else:
-        raise ValueError(
-            f"Cannot fill PF slot: No eligible PF players found. "
-            f"Optimizer may have selected invalid lineup."
-        )
-    df.loc[idx, 'Slot'] = 'PF'
-    df.loc[idx, 'assigned'] = True
-    
-    # Fill C slot
-    # Use .loc with boolean indexing to avoid issues with == True comparison
-    eligible_c = df.loc[(df['is_c']) & (~df['assigned'])]
-    
-    # #region agent log
-    assigned_so_far = df[df['assigned'] == True]
-    log_entry = {
-        'sessionId': 'debug-session',
-        'runId': 'run1',
-        'hypothesisId': 'L',
-        'location': 'optimize_draftkings_nba_lineup.py:1360',
-        'message': 'C slot assignment - checking eligibility',
-        'data': {
-            'eligible_c_count': len(eligible_c),
-            'assigned_players_count': len(assigned_so_far),
-            'assigned_slots': assigned_so_far['Slot'].tolist() if 'Slot' in assigned_so_far.columns else [],
-            'total_players': len(df),
-            'c_eligible_players': eligible_c['Player'].tolist() if len(eligible_c) > 0 else []
-        },
-        'timestamp': int(__import__('time').time() * 1000)
-    }
-    _debug_log(log_entry)
-    # #endregion
-    
-    if len(eligible_c) == 0:
-        raise ValueError("No eligible player found for C slot. Optimizer may have selected invalid lineup.")
-    idx = eligible_c.sort_values('FPTS', ascending=False).index[0]
-    df.loc[idx, 'Slot'] = 'C'
-    df.loc[idx, 'assigned'] = True
-    
-    # Fill F slot (must be SF or PF) - CRITICAL: Fill F slot BEFORE G slot to ensure we reserve an F-eligible player
-    # After filling SF and PF slots, we should have at least 1 F-eligible player left for F slot
-    # NOTE: C slot is already filled, so we don't need to check for C-eligible players here
-    # Use .loc with boolean indexing to avoid issues with == True comparison
-    eligible_f = df.loc[(df['is_f']) & (~df['assigned'])]
-    if len(eligible_f) == 0:
-        raise ValueError("No eligible player found for F slot. Optimizer may have selected invalid lineup.")
-    
-    # Simply assign the highest FPTS F-eligible player to F slot
-    # C slot is already filled, so we don't need to preserve C-eligible players
-    idx = eligible_f.sort_values('FPTS', ascending=False).index[0]
-    df.loc[idx, 'Slot'] = 'F'
-    df.loc[idx, 'assigned'] = True
-    
-    # Fill G slot (must be PG or SG) - should have at least one available
-    # IMPORTANT: Fill G AFTER F slot to avoid using F-eligible players for G slot
-    # The optimizer ensures we have at least 4 G-eligible players total (for PG, SG, G, and F slots)
-    # Use .loc with boolean indexing to avoid issues with == True comparison
-    eligible_g = df.loc[(df['is_g']) & (~df['assigned'])]
-    if len(eligible_g) == 0:
-        raise ValueError("No eligible player found for G slot. Optimizer may have selected invalid lineup.")
-    idx = eligible_g.sort_values('FPTS', ascending=False).index[0]
-    df.loc[idx, 'Slot'] = 'G'
-    df.loc[idx, 'assigned'] = True
-    
-    # Fill UTIL slot (any remaining player - should be exactly 1)
-    unassigned = df[df['assigned'] == False]
-    if len(unassigned) == 0:
-        raise ValueError("All players already assigned, but UTIL slot is missing.")
-    elif len(unassigned) == 1:
-        # Perfect case: exactly 1 player for UTIL
-        idx = unassigned.index[0]
-        df.loc[idx, 'Slot'] = 'UTIL'
-        df.loc[idx, 'assigned'] = True
-    else:
-        # More than 1 unassigned player - this indicates a problem
-        # This can happen if the optimizer selected players that don't properly satisfy constraints
-        # OR if there's a bug in the slot assignment logic
-        # The issue is likely that we have players who are eligible for multiple positions
-        # but weren't assigned because we already filled those slots
-        # For example: if we have a PG/SG player assigned to PG, and another PG/SG assigned to SG,
-        # and a third PG/SG assigned to G, but we also have a fourth player who is PG/SG/SF/PF
-        # that wasn't assigned to any specific slot
-        
-        # The safest fix: assign the highest FPTS unassigned player to UTIL
-        # and if there are still unassigned players, that's a critical error
-        idx = unassigned.sort_values('FPTS', ascending=False).index[0]
-        df.loc[idx, 'Slot'] = 'UTIL'
-        df.loc[idx, 'assigned'] = True
-        
-        # Check if there are still unassigned players
-        remaining_unassigned = df[df['assigned'] == False]
-        if len(remaining_unassigned) > 0:
-            # This should never happen - we should have exactly 8 players and 8 slots
-            # But if it does, we need to understand why
-            # The most likely cause: the optimizer selected players that don't satisfy the constraints
-            # OR there's a bug in how we're checking eligibility
-            
-            # Try to assign remaining players to UTIL by creating multiple UTIL slots?
-            # No, DraftKings only allows 1 UTIL slot
-            
-            # The real fix: we need to ensure the optimizer constraints are correct
-            # OR we need to fix the slot assignment to handle edge cases
-            
-            # For now, let's raise a more informative error
-            raise ValueError(
-                f"Slot assignment error: {len(remaining_unassigned)} player(s) remain unassigned after filling all 8 slots. "
-                f"Unassigned players: {remaining_unassigned['Player'].tolist() if 'Player' in remaining_unassigned.columns else 'N/A'}. "
-                f"Assigned slots: {df[df['assigned'] == True]['Slot'].tolist()}. "
-                f"This suggests the optimizer selected players that don't satisfy position constraints correctly, "
-                f"or there's a bug in the slot assignment logic."
-            )
-    
-    # Verify all 8 players are assigned
-    unassigned_count = (df['assigned'] == False).sum()
-    if unassigned_count > 0:
-        raise ValueError(f"{unassigned_count} player(s) not assigned to a slot. Lineup is invalid.")
-    
-    # Verify all 8 slots are filled
-    slots_filled = df['Slot'].value_counts()
-    required_slots = ['PG', 'SG', 'SF', 'PF', 'C', 'G', 'F', 'UTIL']
-    missing_slots = [slot for slot in required_slots if slot not in slots_filled.index]
-    if missing_slots:
-        raise ValueError(f"Missing required slots: {missing_slots}. Lineup is invalid.")
-    
-    # Remove helper columns
-    df = df.drop(['assigned', 'is_pg_only', 'is_sg_only', 'is_pg_sg', 'is_sf_only', 'is_pf_only', 'is_sf_pf'], axis=1, errors='ignore')
+    if sim is not None:
+        sim_cols = [c for c in sim.columns if c.startswith('FPTS_P') or c in ('Boom_Probability', 'Bust_Probability')]
+        for col in sim_cols:
+            simulated = df['Player'].map(sim[col])
+            df[col] = simulated.where(matched, df[col]) if col in df.columns else simulated
     
     return df
 
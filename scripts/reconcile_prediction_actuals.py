@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Reconcile Prediction Actuals
+Fills in actual results for every logged prediction of a date in one pass.
+
+Fetches the night's player game logs with a single PlayerGameLogs call, joins
+them against the open (ungraded) predictions for that date and writes the actuals
+back in batches (see prediction_tracker.reconcile_actual_results). Reports how
+many predictions were matched and how many were left open (orphaned), e.g.
+players who did not play.
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / 'new-streamlit-app' / 'player-app'))
+
+import argparse
+import pandas as pd
+import nba_api.stats.endpoints as endpoints
+from datetime import datetime, date, timedelta
+
+import prediction_tracker as pt
+import request_scheduler as rs
+
+
+def season_for_date(game_date: date) -> str:
+    """NBA season string for a date (seasons start in October, e.g. '2025-26')."""
+    start_year = game_date.year if game_date.month >= 10 else game_date.year - 1
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+
+def fetch_game_logs_for_date(game_date: date, season: str = None) -> pd.DataFrame:
+    """
+    Fetch every player's game log for one date (regular season and playoffs).
+    
+    Returns:
+        PlayerGameLogs DataFrame (empty if no games were played)
+    """
+    api_date = game_date.strftime('%m/%d/%Y')
+    df = rs.call_nba_api(
+        endpoints.PlayerGameLogs,
+        season_nullable=season or season_for_date(game_date),
+        league_id_nullable='00',
+        date_from_nullable=api_date,
+        date_to_nullable=api_date
+    )[0]
+    
+    # Filter out preseason games (keep regular season '2' and playoffs '4')
+    if len(df) > 0:
+        df = df[df['GAME_ID'].astype(str).str[2].isin(['2', '4'])].copy()
+    return df
+
+
+def reconcile_date(game_date: date, season: str = None) -> dict:
+    """Fetch a date's game logs and grade its open predictions."""
+    date_str = game_date.strftime('%Y-%m-%d')
+    print(f"[{datetime.now()}] Reconciling predictions for {date_str}")
+    
+    game_logs = fetch_game_logs_for_date(game_date, season)
+    print(f"  Loaded {len(game_logs)} player game logs")
+    
+    report = pt.reconcile_actual_results(date_str, game_logs)
+    print(f"  Open predictions: {report['open']}")
+    print(f"  ✓ Matched: {report['matched']} (updated {report['updated']})")
+    if report['orphaned']:
+        print(f"  ⚠ Orphaned (no game log): {report['orphaned']} predictions for "
+              f"{len(report['orphaned_players'])} player(s): {', '.join(report['orphaned_players'])}")
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fill in actual results for logged predictions')
+    parser.add_argument('--date', type=str, default=None,
+                        help='Game date (YYYY-MM-DD). Defaults to yesterday.')
+    parser.add_argument('--days', type=int, default=1,
+                        help='Number of consecutive dates to reconcile, ending at --date (default: 1)')
+    parser.add_argument('--season', type=str, default=None,
+                        help='Season (e.g. 2025-26). Defaults to the season of each date.')
+    args = parser.parse_args()
+    
+    try:
+        end_date = datetime.strptime(args.date, '%Y-%m-%d').date() if args.date else date.today() - timedelta(days=1)
+    except ValueError:
+        print(f"Error: Invalid date format '{args.date}'. Use YYYY-MM-DD format.")
+        sys.exit(1)
+    
+    failed = False
+    for offset in range(args.days - 1, -1, -1):
+        try:
+            reconcile_date(end_date - timedelta(days=offset), args.season)
+        except Exception as e:
+            print(f"  ✗ Error reconciling {end_date - timedelta(days=offset)}: {e}")
+            failed = True
+    sys.exit(1 if failed else 0)
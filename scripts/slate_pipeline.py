@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""
+Slate Pipeline
+Staged, resumable prediction run for every game on a date.
+
+Stages:
+    schedule -> rosters -> injuries -> bulk data -> features -> predictions
+    -> injury adjustments and minutes normalization (per team) -> CSV/DB output
+    -> optional optimizer
+
+Slate-level stages (schedule, bulk data, optimizer) run once; the per-game stages
+run for each game in a pool of parallel workers. Every stage writes a checkpoint
+under .cache/slate_pipeline/<date>/<stage>/<key>.pkl holding its value, the hash
+of its inputs and the hash of its output. A stage's inputs are the output hashes
+of the stages it consumes, so re-running after a crash or a late injury update
+reuses every checkpoint whose inputs are unchanged and recomputes only the
+affected games and stages.
+
+Features and base predictions cover the full roster and do not depend on the
+injury report, so an injury update re-runs only the per-team minutes stage of
+the team it affects (see injury_repredict) plus the output and optimizer stages.
+
+Environment variables:
+    SLATE_CHECKPOINT_DIR: Checkpoint directory (default: <project root>/.cache/slate_pipeline)
+"""
+
+import sys
+import os
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / 'new-streamlit-app' / 'player-app'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import json
+import time
+import pickle
+import hashlib
+import threading
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, date
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import pandas as pd
+
+import player_functions as pf
+import prediction_features as features
+import prediction_model as pm
+import prediction_tracker as tracker
+import slate_features as sf
+import drives_stats as ds
+import injury_report as ir
+import injury_adjustments as inj
+import injury_repredict as irp
+import data_cache as dc
+from generate_predictions_batch import (
+    get_matchups_for_date, get_team_roster, get_out_player_ids, run_wave_optimizer
+)
+
+
+CHECKPOINT_DIR = Path(os.getenv("SLATE_CHECKPOINT_DIR", str(project_root / '.cache' / 'slate_pipeline')))
+# Bump to invalidate existing checkpoints after a feature or model change
+PIPELINE_VERSION = 3
+STAGES = ['schedule', 'rosters', 'injuries', 'bulk_data', 'features',
+          'predictions', 'minutes', 'output', 'optimizer']
+DEFAULT_WORKERS = 4
+
+# Minutes normalization: a team's projected minutes sum to 5 players x 48 minutes
+TEAM_MINUTES = 240.0
+
+LOGGED_STATS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'FG3M', 'FTM', 'FPTS']
+
+
+@dataclass
+class StageResult:
+    """Value of a pipeline stage plus the bookkeeping used by downstream stages."""
+    value: Any
+    output_hash: str
+    reused: bool
+
+
+class CheckpointStore:
+    """
+    Per-date checkpoint files for pipeline stages.
+    
+    A checkpoint is reused when its stored input hash matches the current inputs
+    and its stage is not being refreshed.
+    """
+    
+    def __init__(self, slate_date: str, refresh: Iterable[str] = (), root: Path = CHECKPOINT_DIR):
+        """
+        Args:
+            slate_date: Slate date (YYYY-MM-DD)
+            refresh: Stage names (or 'all') whose checkpoints are ignored
+            root: Checkpoint root directory
+        """
+        self.slate_date = slate_date
+        self.directory = Path(root) / slate_date
+        refresh = set(refresh or ())
+        self.refresh = set(STAGES) if 'all' in refresh else refresh
+        self.manifest: Dict[str, Dict[str, Dict]] = {}
+        self._lock = threading.Lock()
+    
+    def path(self, stage: str, key: str) -> Path:
+        safe_key = ''.join(c if c.isalnum() or c in '-_' else '_' for c in key)
+        return self.directory / stage / f"{safe_key}.pkl"
+    
+    def _read(self, path: Path) -> Optional[Dict]:
+        try:
+            if not path.exists():
+                return None
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"[SLATE PIPELINE] Error reading checkpoint {path}: {e}")
+            return None
+    
+    def _write(self, path: Path, entry: Dict) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file then rename so a crash never leaves a partial checkpoint
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[SLATE PIPELINE] Error writing checkpoint {path}: {e}")
+    
+    def _record(self, stage: str, key: str, input_hash: str, output_hash: str, reused: bool) -> None:
+        with self._lock:
+            self.manifest.setdefault(stage, {})[key] = {
+                'input_hash': input_hash,
+                'output_hash': output_hash,
+                'reused': reused
+            }
+    
+    def run(self, stage: str, key: str, inputs: Any, compute: Callable[[], Any],
+            valid: Callable[[Any], bool] = None) -> StageResult:
+        """
+        Return the checkpointed value for (stage, key) or compute and store it.
+        
+        Args:
+            stage: Stage name (one of STAGES)
+            key: Checkpoint key within the stage (e.g. a matchup)
+            inputs: Everything the stage output depends on; hashed with dc.content_hash
+            compute: Zero-argument function producing the stage value. A None result
+                     is returned but not checkpointed (e.g. a failed fetch).
+            valid: Optional check on a checkpointed value (e.g. output files still exist)
+        
+        Returns:
+            StageResult
+        """
+        input_hash = dc.content_hash(PIPELINE_VERSION, stage, inputs)
+        path = self.path(stage, key)
+        
+        if stage not in self.refresh:
+            entry = self._read(path)
+            if entry is not None and entry.get('input_hash') == input_hash:
+                if valid is None or valid(entry['value']):
+                    self._record(stage, key, input_hash, entry['output_hash'], True)
+                    return StageResult(entry['value'], entry['output_hash'], True)
+        
+        value = compute()
+        output_hash = hashlib.sha256(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+        if value is not None:
+            self._write(path, {
+                'input_hash': input_hash,
+                'output_hash': output_hash,
+                'created': datetime.now().isoformat(),
+                'value': value
+            })
+        self._record(stage, key, input_hash, output_hash, False)
+        return StageResult(value, output_hash, False)
+    
+    def write_manifest(self, summary: Dict) -> None:
+        """Write manifest.json describing the last run's stages and results."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.directory / 'manifest.json', 'w') as f:
+                json.dump({
+                    'slate_date': self.slate_date,
+                    'pipeline_version': PIPELINE_VERSION,
+                    'updated': datetime.now().isoformat(),
+                    'summary': summary,
+                    'stages': self.manifest
+                }, f, indent=2, default=str)
+        except Exception as e:
+            print(f"[SLATE PIPELINE] Error writing manifest: {e}")
+
+
+def load_bulk_data(season: str = '2025-26') -> Dict[str, Any]:
+    """
+    Fetch every bulk dataset the feature stage needs (cached by data_cache), plus
+    the player feature table and team context table shared by all games.
+    
+    Returns:
+        Dict of bulk datasets
+    """
+    bulk_game_logs = features.get_bulk_player_game_logs(season)
+    bulk = {
+        'game_logs': bulk_game_logs,
+        'team_game_logs': features.get_bulk_team_game_logs(season),
+        'advanced_stats': features.get_bulk_player_advanced_stats(season),
+        'drives_stats': ds.get_all_player_drives_stats(season),
+        'offensive_synergy': features.get_cached_bulk_offensive_synergy(season),
+    }
+    bulk['player_feature_table'] = sf.get_player_feature_table(season, bulk_game_logs=bulk_game_logs)
+    # Warm the shared team context cache before games fan out to worker threads
+    features.get_team_context_table(season)
+    return bulk
+
+
+def bulk_data_fingerprint(bulk: Dict[str, Any]) -> Dict[str, str]:
+    """Content hash per bulk dataset; feature checkpoints are keyed on these."""
+    return {
+        name: dc.content_hash(value)
+        for name, value in bulk.items()
+        if name != 'player_feature_table'
+    }
+
+
+def season_minutes_map(slate_rows: List[Dict], slate_features: List[Dict]) -> Dict[int, float]:
+    """
+    Season average minutes per player (L5 average when the season one is missing),
+    used for role detection and minutes redistribution in the minutes stage.
+    
+    Args:
+        slate_rows: Slate rows (player_id per feature dict)
+        slate_features: Feature dicts in slate row order
+    
+    Returns:
+        Dict of player_id -> minutes
+    """
+    minutes = {}
+    for row, player_features in zip(slate_rows, slate_features):
+        rolling_avgs = player_features.get('rolling_avgs', {})
+        season_min = rolling_avgs.get('Season', {}).get('MIN', 0.0)
+        minutes[int(row['player_id'])] = float(season_min or rolling_avgs.get('L5', {}).get('MIN', 0.0))
+    return minutes
+
+
+def _log_predictions(all_predictions: Dict[str, Dict], slate_rows: List[Dict],
+                     slate_features: List[Dict], game_date: str, exclude: Iterable[str] = ()) -> int:
+    """Log a game's predictions (except excluded players) to the prediction tracker. Returns the record count."""
+    features_by_player = {str(row['player_id']): f for row, f in zip(slate_rows, slate_features)}
+    exclude = set(exclude)
+    records = []
+    for player_id, player_data in all_predictions.items():
+        if str(player_id) in exclude:
+            continue
+        player_features = features_by_player.get(str(player_id), {})
+        for stat in LOGGED_STATS:
+            prediction = player_data['predictions'].get(stat)
+            if prediction is None:
+                continue
+            records.append(tracker.create_prediction_record_from_dict(
+                player_id=str(player_id),
+                player_name=player_data['player_name'],
+                opponent_abbr=player_data['opponent_abbr'],
+                game_date=game_date,
+                stat=stat,
+                prediction_dict=prediction,
+                features_dict=player_features
+            ))
+    tracker.log_predictions_batch(records)
+    return len(records)
+
+
+def run_game(store: CheckpointStore, matchup: Dict, players_df: pd.DataFrame,
+             injury_df: Optional[pd.DataFrame], bulk: Dict[str, Any], bulk_hash: str,
+             output_dir: str, exclude_injured: bool = True, log_predictions: bool = False) -> Dict:
+    """
+    Run the per-game stages (rosters -> injuries -> features -> predictions ->
+    minutes -> output) for one matchup.
+    
+    Returns:
+        Dict with output_path (None if nothing was written) and the status of each stage
+    """
+    away_team_id = matchup['away_team_id']
+    home_team_id = matchup['home_team_id']
+    away_team_abbr = matchup['away_team']
+    home_team_abbr = matchup['home_team']
+    game_date_str = matchup['game_date']
+    key = f"{away_team_abbr}_vs_{home_team_abbr}"
+    status = {}
+    
+    def stage(name, inputs, compute, valid=None, stage_key=key):
+        result = store.run(name, stage_key, inputs, compute, valid=valid)
+        status[name if stage_key == key else f"{name}:{stage_key}"] = 'reused' if result.reused else 'computed'
+        return result
+    
+    # Rosters
+    team_rows = players_df[players_df['TEAM_ID'].astype(int).isin([away_team_id, home_team_id])]
+    roster_columns = [c for c in ['PERSON_ID', 'PLAYER_FIRST_NAME', 'PLAYER_LAST_NAME', 'TEAM_ID'] if c in team_rows.columns]
+    rosters = stage('rosters', (matchup['matchup'], team_rows[roster_columns].reset_index(drop=True)), lambda: (
+        get_team_roster(away_team_id, players_df) + get_team_roster(home_team_id, players_df)
+    ))
+    roster = rosters.value
+    if not any(p['team_id'] == away_team_id for p in roster) or not any(p['team_id'] == home_team_id for p in roster):
+        print(f"[{matchup['matchup']}] Warning: Could not get rosters")
+        return {'output_path': None, 'stages': status}
+    
+    # Injuries (OUT/DOUBTFUL players for this matchup)
+    if exclude_injured:
+        injuries = stage('injuries', (rosters.output_hash, injury_df), lambda: (
+            get_out_player_ids(injury_df, away_team_abbr, home_team_abbr, players_df)
+        ))
+        out_player_ids = set(injuries.value)
+    else:
+        out_player_ids = set()
+    
+    # Features and base predictions cover the whole roster so that they do not
+    # depend on the injury report; OUT players are handled in the minutes stage
+    player_names = {p['id']: p['name'] for p in roster}
+    slate_rows = pm.build_game_slate_rows(
+        [p['id'] for p in roster],
+        {p['id']: p['team_id'] for p in roster},
+        away_team_id, home_team_id, away_team_abbr, home_team_abbr, game_date_str
+    )
+    
+    # Features
+    feature_result = stage('features', (slate_rows, bulk_hash), lambda: sf.get_slate_prediction_features(
+        slate_rows,
+        bulk_game_logs=bulk['game_logs'],
+        bulk_team_game_logs=bulk['team_game_logs'],
+        bulk_advanced_stats=bulk['advanced_stats'],
+        bulk_drives_stats=bulk['drives_stats'],
+        bulk_offensive_synergy=bulk['offensive_synergy'],
+        player_feature_table=bulk['player_feature_table']
+    ))
+    slate_features = feature_result.value
+    
+    # Predictions
+    predictions = stage('predictions', (feature_result.output_hash, player_names), lambda: pm.predict_slate_rows(
+        slate_rows, [dict(f) for f in slate_features], player_names, away_team_abbr, home_team_abbr
+    ))
+    if not predictions.value:
+        print(f"[{matchup['matchup']}] Warning: No predictions generated")
+        return {'output_path': None, 'stages': status}
+    
+    # Injury adjustments and minutes normalization, one checkpoint per team: a
+    # status change re-runs only its own team (and the opponent only when it
+    # flips the opponent's easier-matchup boost)
+    minutes_map = season_minutes_map(slate_rows, slate_features)
+    positions = inj.get_position_map(team_rows)
+    team_out = {
+        team_id: sorted(p['id'] for p in roster if p['team_id'] == team_id and p['id'] in out_player_ids)
+        for team_id in (away_team_id, home_team_id)
+    }
+    team_statlines = []
+    for team_id, team_abbr, opponent_id in ((away_team_id, away_team_abbr, home_team_id),
+                                            (home_team_id, home_team_abbr, away_team_id)):
+        opponent_boost = inj.key_opponents_out(team_out[opponent_id], minutes_map)
+        team_statlines.append(stage(
+            'minutes',
+            (predictions.output_hash, feature_result.output_hash, bulk_hash, team_out[team_id], opponent_boost),
+            lambda team_abbr=team_abbr, team_id=team_id, opponent_id=opponent_id: irp.repredict_team(
+                predictions.value, team_abbr, team_out[team_id], team_out[opponent_id], minutes_map,
+                players_df=team_rows, positions=positions, bulk_game_logs=bulk['game_logs'],
+                game_date=game_date_str, target_minutes=TEAM_MINUTES
+            ),
+            stage_key=f"{key}_{team_abbr}"
+        ))
+    statlines = pd.concat([result.value for result in team_statlines], ignore_index=True)
+    if len(statlines) == 0:
+        print(f"[{matchup['matchup']}] Warning: No players with projected minutes")
+        return {'output_path': None, 'stages': status}
+    
+    # CSV (and optional prediction tracker) output
+    output_filename = f"predicted_statlines_{away_team_abbr}_vs_{home_team_abbr}_{game_date_str}.csv"
+    output_path = os.path.join(output_dir, output_filename)
+    
+    def write_output():
+        statlines.drop(columns=['Player_ID']).to_csv(output_path, index=False)
+        logged = _log_predictions(predictions.value, slate_rows, slate_features, game_date_str,
+                                  exclude=out_player_ids) if log_predictions else 0
+        return {'path': output_path, 'players': len(statlines), 'logged': logged}
+    
+    output = stage('output', ([result.output_hash for result in team_statlines], output_path, log_predictions),
+                   write_output, valid=lambda value: os.path.exists(value['path']))
+    
+    if output.reused:
+        print(f"[{matchup['matchup']}] ✓ Unchanged, reused {output_filename}")
+    else:
+        print(f"[{matchup['matchup']}] ✓ Saved {len(statlines)} players to {output_filename}"
+              f" (avg FPTS {statlines['FPTS'].mean():.2f})")
+    return {'output_path': output_path, 'output_hash': output.output_hash, 'stages': status}
+
+
+def run_slate_pipeline(game_date: date, output_dir: str = None, exclude_injured: bool = True,
+                       optimize_lineups: bool = False, draftables_path: str = None, max_salary: int = 50000,
+                       tipoff_time_filter: str = None, season: str = '2025-26',
+                       max_workers: int = None, refresh: Iterable[str] = (),
+                       log_predictions: bool = False, injury_df: Optional[pd.DataFrame] = None,
+                       players_df: Optional[pd.DataFrame] = None,
+                       teams: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Run the full slate pipeline for a date.
+    
+    Args:
+        game_date: Date to generate predictions for
+        output_dir: Directory to save CSV files (default: ~/Downloads)
+        exclude_injured: Whether to exclude injured players (OUT/DOUBTFUL) (default: True)
+        optimize_lineups: Whether to optimize lineups after generating predictions (default: False)
+        draftables_path: Path to draftables CSV (required if optimize_lineups=True)
+        max_salary: Maximum salary for optimization (default: 50000)
+        tipoff_time_filter: Optional tip-off wave to optimize (e.g. "6:00 PM CT")
+        season: NBA season (default '2025-26')
+        max_workers: Parallel game workers (default: DEFAULT_WORKERS)
+        refresh: Stage names (or 'all') whose checkpoints are ignored
+        log_predictions: Also log new predictions to the prediction tracker
+        injury_df: Parsed injury report to use instead of fetching one (e.g. from an
+                   InjuryReportPoller)
+        players_df: PlayerIndex DataFrame to use instead of fetching one
+        teams: Only process games involving these team abbreviations (e.g. the
+               teams in an InjuryDelta); other games are left untouched
+    
+    Returns:
+        Dict with output_files, optimized_files and per-game stage status
+    """
+    if output_dir is None:
+        output_dir = os.path.expanduser("~/Downloads")
+    os.makedirs(output_dir, exist_ok=True)
+    
+    date_str = game_date.strftime('%Y-%m-%d')
+    store = CheckpointStore(date_str, refresh=refresh)
+    max_workers = max_workers or DEFAULT_WORKERS
+    result = {'output_files': [], 'optimized_files': [], 'games': {}}
+    start_time = time.time()
+    
+    print("=" * 60)
+    print(f"Generating Predictions for {date_str}")
+    print("=" * 60)
+    
+    # Schedule
+    print("\nFetching schedule...")
+    schedule = store.run('schedule', 'slate', (date_str, season),
+                         lambda: get_matchups_for_date(game_date, season) or None)
+    matchups = schedule.value or []
+    if len(matchups) == 0:
+        print(f"No games found for {date_str}")
+        return result
+    print(f"Found {len(matchups)} game(s){' (checkpoint)' if schedule.reused else ''}")
+    
+    if teams is not None:
+        teams = set(teams)
+        matchups = [m for m in matchups if m['away_team'] in teams or m['home_team'] in teams]
+        print(f"Limiting run to {len(matchups)} game(s) involving {', '.join(sorted(teams))}")
+        if not matchups:
+            return result
+    
+    # Players (rosters and injury name matching)
+    if players_df is None:
+        print("\nLoading player data...")
+        players_df = pf.get_players_dataframe()
+    if players_df is None or len(players_df) == 0:
+        raise ValueError("Could not load players dataframe")
+    print(f"Loaded {len(players_df)} players")
+    
+    # Injury report (re-fetched unless supplied: late updates are what re-runs are for)
+    if not exclude_injured:
+        injury_df = None
+        print("\n⚠ Injury filtering disabled - all players will be included")
+    elif injury_df is not None:
+        print(f"\nUsing supplied injury report ({len(injury_df)} entries)")
+    else:
+        print("\nFetching injury report...")
+        injury_df, injury_status = ir.fetch_injuries_for_date(game_date, players_df)
+        if injury_df is not None and len(injury_df) > 0:
+            print(f"✓ Loaded injury report ({len(injury_df)} entries)")
+        else:
+            print(f"⚠ No injury report found: {injury_status}")
+    
+    # Bulk data (served by data_cache; the checkpoint records its fingerprint)
+    print("\nLoading bulk data...")
+    bulk = load_bulk_data(season)
+    fingerprint = bulk_data_fingerprint(bulk)
+    bulk_stage = store.run('bulk_data', 'slate', fingerprint, lambda: fingerprint)
+    print(f"✓ Bulk data {'unchanged since last run' if bulk_stage.reused else 'loaded'}")
+    
+    # Per-game stages in parallel
+    print(f"\nProcessing {len(matchups)} game(s) with {min(max_workers, len(matchups))} worker(s)...")
+    game_results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                run_game, store, matchup, players_df, injury_df, bulk, bulk_stage.output_hash,
+                output_dir, exclude_injured, log_predictions
+            ): matchup
+            for matchup in matchups
+        }
+        for future in as_completed(futures):
+            matchup = futures[future]
+            try:
+                game_results[matchup['matchup']] = future.result()
+            except Exception as e:
+                print(f"\n✗ Error generating predictions for {matchup['matchup']}: {e}")
+                import traceback
+                traceback.print_exc()
+                game_results[matchup['matchup']] = {'output_path': None, 'stages': {}, 'error': str(e)}
+    
+    # Keep schedule order in the results
+    for matchup in matchups:
+        game_result = game_results.get(matchup['matchup'], {})
+        result['games'][matchup['matchup']] = game_result
+        if game_result.get('output_path'):
+            result['output_files'].append(game_result['output_path'])
+    
+    # Optional optimizer, re-run only when a prediction file or the draftables changed
+    if optimize_lineups and result['output_files']:
+        draftables_hash = None
+        if draftables_path and os.path.exists(draftables_path):
+            with open(draftables_path, 'rb') as f:
+                draftables_hash = hashlib.sha256(f.read()).hexdigest()
+        output_hashes = [game_results[m['matchup']].get('output_hash') for m in matchups]
+        try:
+            optimized = store.run(
+                'optimizer', tipoff_time_filter or 'all_waves',
+                (output_hashes, draftables_hash, tipoff_time_filter, output_dir),
+                lambda: run_wave_optimizer(game_date, draftables_path, output_dir, output_dir, tipoff_time_filter) or None,
+                valid=lambda files: all(os.path.exists(f) for f in files)
+            )
+            result['optimized_files'] = optimized.value or []
+            if optimized.reused:
+                print(f"\n✓ Optimized lineups unchanged ({len(result['optimized_files'])} file(s))")
+        except Exception as e:
+            print(f"\n✗ Error optimizing lineups: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    # Summary
+    computed = {
+        stage: sum(1 for g in result['games'].values() if g.get('stages', {}).get(stage) == 'computed')
+        for stage in ['features', 'predictions', 'output']
+    }
+    computed['minutes'] = sum(
+        1 for g in result['games'].values()
+        for name, state in g.get('stages', {}).items() if name.startswith('minutes:') and state == 'computed'
+    )
+    failed = [m for m, g in result['games'].items() if not g.get('output_path')]
+    summary = {
+        'games': len(matchups),
+        'output_files': len(result['output_files']),
+        'recomputed': computed,
+        'failed': failed,
+        'seconds': round(time.time() - start_time, 1)
+    }
+    store.write_manifest(summary)
+    
+    print(f"\n{'=' * 60}")
+    print("Summary")
+    print(f"{'=' * 60}")
+    print(f"Games processed: {len(matchups)}")
+    print(f"Games recomputed: features {computed['features']}, predictions {computed['predictions']}, files {computed['output']}")
+    print(f"Teams re-adjusted for injuries/minutes: {computed['minutes']}")
+    print(f"Games reused from checkpoints: {len(result['output_files']) - computed['output']}")
+    if failed:
+        print(f"Games without output: {', '.join(failed)}")
+    print(f"Total files: {len(result['output_files'])}")
+    print(f"Elapsed: {summary['seconds']}s")
+    print("\nOutput files:")
+    for f in result['output_files']:
+        print(f"  - {f}")
+    
+    return result
+
+
+def watch_slate(game_date: date, poll_interval: float = None, **pipeline_kwargs) -> None:
+    """
+    Run the slate, then poll the injury report in the background and re-run only
+    the games whose teams had a status change. Within those games, features and
+    base predictions are reused and only the changed team's minutes stage (then
+    the CSV and optimizer) is recomputed. Stops on Ctrl-C.
+    
+    Args:
+        game_date: Slate date
+        poll_interval: Seconds between injury report polls
+        **pipeline_kwargs: Passed to run_slate_pipeline()
+    """
+    import injury_poller
+    
+    players_df = pf.get_players_dataframe()
+    run_lock = threading.Lock()
+    
+    def on_delta(delta):
+        print(f"\n[{datetime.now():%H:%M:%S}] Injury report {ir.format_slot(delta.slot)} ET: "
+              f"{len(delta.changes)} status change(s)")
+        for line in delta.describe():
+            print(f"  {line}")
+        if delta.initial:
+            return
+        with run_lock:
+            run_slate_pipeline(game_date, injury_df=delta.injury_df, players_df=players_df,
+                               teams=delta.affected_teams, **pipeline_kwargs)
+    
+    # Injury report URLs use today's date (the report also lists tomorrow's games)
+    poller = injury_poller.InjuryReportPoller(
+        date.today(), players_df=players_df, on_delta=on_delta,
+        interval=poll_interval or injury_poller.DEFAULT_POLL_INTERVAL
+    )
+    poller.poll()
+    with run_lock:
+        run_slate_pipeline(game_date, injury_df=poller.injury_df if len(poller.injury_df) > 0 else None,
+                           players_df=players_df, **pipeline_kwargs)
+    
+    print(f"\nWatching the injury report every {poller.interval:.0f}s (Ctrl-C to stop)...")
+    poller.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        poller.stop()
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(
+        description='Run the staged, resumable prediction pipeline for an NBA slate',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run today's slate (re-runs reuse every unchanged game and stage)
+  python slate_pipeline.py
+  
+  # Specific date, 8 parallel games, then optimize lineups
+  python slate_pipeline.py --date 2025-01-15 --workers 8 --optimize --draftables draftables.csv
+  
+  # Recompute predictions after a model change
+  python slate_pipeline.py --refresh predictions
+  
+  # Run the slate, then re-predict affected games whenever the injury report changes
+  python slate_pipeline.py --watch --poll-interval 120
+        """
+    )
+    parser.add_argument('--date', type=str, default=None,
+                        help='Slate date (YYYY-MM-DD format). Defaults to today.')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Output directory for CSV files (default: ~/Downloads)')
+    parser.add_argument('--season', type=str, default='2025-26', help='NBA season (default: 2025-26)')
+    parser.add_argument('--include-injured', action='store_true',
+                        help='Include injured players (OUT/DOUBTFUL) in predictions (default: exclude them)')
+    parser.add_argument('--optimize', action='store_true',
+                        help='Optimize lineups after generating predictions (requires --draftables)')
+    parser.add_argument('--draftables', type=str, default=None, help='Path to draftables CSV file')
+    parser.add_argument('--tipoff-time', type=str, default=None,
+                        help='Tip-off wave to optimize (e.g., "6:00 PM CT"). Defaults to all waves.')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Number of games processed in parallel (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--refresh', nargs='+', default=[], metavar='STAGE',
+                        help=f"Stages whose checkpoints are ignored ({', '.join(STAGES)}, or all)")
+    parser.add_argument('--log-predictions', action='store_true',
+                        help='Log new predictions to the prediction tracker (Supabase or CSV)')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep polling the injury report and re-run only games with status changes')
+    parser.add_argument('--poll-interval', type=float, default=None,
+                        help='Seconds between injury report polls in --watch mode (default: 300)')
+    
+    args = parser.parse_args()
+    
+    if args.date is None:
+        game_date = date.today()
+    else:
+        try:
+            game_date = datetime.strptime(args.date, '%Y-%m-%d').date()
+        except ValueError:
+            print(f"Error: Invalid date format '{args.date}'. Use YYYY-MM-DD format.")
+            sys.exit(1)
+    
+    if args.optimize and not args.draftables:
+        print("Error: --draftables is required when using --optimize")
+        sys.exit(1)
+    
+    unknown = set(args.refresh) - set(STAGES) - {'all'}
+    if unknown:
+        print(f"Error: Unknown stage(s): {', '.join(sorted(unknown))}")
+        sys.exit(1)
+    
+    pipeline_kwargs = dict(
+        output_dir=args.output,
+        exclude_injured=not args.include_injured,
+        optimize_lineups=args.optimize,
+        draftables_path=args.draftables,
+        tipoff_time_filter=args.tipoff_time,
+        season=args.season,
+        max_workers=args.workers,
+        refresh=args.refresh,
+        log_predictions=args.log_predictions
+    )
+    
+    if args.watch:
+        if args.include_injured:
+            print("Error: --watch re-predicts on injury changes and cannot be combined with --include-injured")
+            sys.exit(1)
+        watch_slate(game_date, poll_interval=args.poll_interval, **pipeline_kwargs)
+        sys.exit(0)
+    
+    result = run_slate_pipeline(game_date, **pipeline_kwargs)
+    sys.exit(0 if result['output_files'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 """
 Fetch NBA Game Logs from Sportradar API and Store in Supabase
-Fetches player and team game logs using Daily Summaries and stores in sr_game_logs table.
+Fetches box scores of completed games and stores one row per player/team per game
+in the sr_player_game_logs / sr_team_game_logs tables.
+
+Runs incrementally: games recorded in sr_ingested_games with a final (closed) box
+score are skipped, and each game is upserted and recorded as soon as its box score
+arrives, so a failed run picks up where it stopped. Use --full to refetch every
+completed game.
 """
 
 import sys
 import os
 from pathlib import Path
-import json
+import argparse
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -19,33 +27,29 @@ from sportradar_config import (
     get_sportradar_nba_url, SPORTRADAR_NBA_BASE_URL, SPORTRADAR_NBA_VERSION, SPORTRADAR_NBA_API_KEY
 )
 from supabase_config import get_supabase_service_client
-from datetime import datetime, UTC, timedelta
-import time
+from datetime import datetime, UTC
 import requests
+import request_scheduler as rs
 from sportradar_data_reader import get_schedule_from_db
 
 CURRENT_SEASON = '2025-26'
 SEASON_TYPE = 'Regular Season'
+UPSERT_BATCH_SIZE = 500
 
-# Debug logging setup
-DEBUG_LOG_PATH = project_root / '.cursor' / 'debug.log'
+# PostgREST caps responses at 1000 rows, so the ledger is read page by page
+DB_PAGE_SIZE = 1000
 
-def debug_log(session_id, run_id, hypothesis_id, location, message, data):
-    """Write debug log entry"""
-    try:
-        log_entry = {
-            "sessionId": session_id,
-            "runId": run_id,
-            "hypothesisId": hypothesis_id,
-            "location": location,
-            "message": message,
-            "data": data,
-            "timestamp": int(datetime.now(UTC).timestamp() * 1000)
-        }
-        with open(DEBUG_LOG_PATH, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
-    except Exception:
-        pass  # Silently fail if logging fails
+PLAYER_LOGS_TABLE = 'sr_player_game_logs'
+TEAM_LOGS_TABLE = 'sr_team_game_logs'
+INGESTED_GAMES_TABLE = 'sr_ingested_games'
+
+# Schedule statuses of games that have a box score
+COMPLETED_STATUSES = ('closed', 'complete', 'completed', 'final')
+# Box score status once Sportradar has finalized the stats
+FINAL_STATUS = 'closed'
+
+# Box score requests queued at once (the scheduler still caps concurrency and rate)
+MAX_IN_FLIGHT = 8
 
 def extract_player_game_logs_from_boxscore(boxscore_data):
     """
@@ -228,44 +232,166 @@ def extract_team_game_logs_from_boxscore(boxscore_data):
     return team_logs
 
 
-def fetch_and_store_game_logs():
+def get_completed_games(schedule_df: pd.DataFrame, days: Optional[int] = None) -> pd.DataFrame:
+    """
+    Completed games of a Sportradar schedule.
+    
+    Args:
+        schedule_df: Schedule DataFrame (one row per game with id, status, scheduled)
+        days: Only games scheduled in the last N days (default: the whole season)
+    
+    Returns:
+        DataFrame with id, status, scheduled (UTC) and game_date ('YYYY-MM-DD', US/Eastern)
+    """
+    if schedule_df is None or len(schedule_df) == 0 or 'id' not in schedule_df.columns:
+        return pd.DataFrame(columns=['id', 'status', 'scheduled', 'game_date'])
+    
+    games = pd.DataFrame({
+        'id': schedule_df['id'].fillna('').astype(str),
+        'status': schedule_df['status'].astype(str).str.lower(),
+        'scheduled': pd.to_datetime(schedule_df['scheduled'], utc=True, errors='coerce')
+    })
+    mask = games['status'].isin(COMPLETED_STATUSES) & games['scheduled'].notna() & (games['id'] != '')
+    if days is not None:
+        mask &= games['scheduled'] >= pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=days)
+    games = games[mask].drop_duplicates('id').sort_values('scheduled').reset_index(drop=True)
+    # Game dates follow the US/Eastern calendar (late tip-offs are after midnight UTC)
+    games['game_date'] = games['scheduled'].dt.tz_convert('US/Eastern').dt.strftime('%Y-%m-%d')
+    return games
+
+
+def get_ingested_game_ids(supabase, season: str) -> Set[str]:
+    """
+    IDs of the games already ingested with a final (closed) box score.
+    
+    Games ingested before Sportradar closed them are left out, so their box
+    scores are fetched again once the stats are final.
+    """
+    game_ids = set()
+    offset = 0
+    while True:
+        result = supabase.table(INGESTED_GAMES_TABLE).select('game_id').eq('season', season).eq(
+            'status', FINAL_STATUS
+        ).order('id').range(offset, offset + DB_PAGE_SIZE - 1).execute()
+        page = result.data or []
+        game_ids.update(row['game_id'] for row in page)
+        if len(page) < DB_PAGE_SIZE:
+            break
+        offset += DB_PAGE_SIZE
+    return game_ids
+
+
+def build_player_rows(player_logs: List[Dict], season: str, game_date: str) -> List[Dict]:
+    """Build sr_player_game_logs rows from extracted player logs (one row per player)."""
+    now = datetime.now(UTC).isoformat()
+    rows = {}
+    for log in player_logs:
+        if log.get('PLAYER_ID'):
+            rows[log['PLAYER_ID']] = {
+                'season': season,
+                'player_id': log['PLAYER_ID'],
+                'game_id': log['GAME_ID'],
+                'team_id': log.get('TEAM_ID') or None,
+                'game_date': game_date,
+                'data': log,
+                'updated_at': now
+            }
+    return list(rows.values())
+
+
+def build_team_rows(team_logs: List[Dict], season: str, game_date: str) -> List[Dict]:
+    """Build sr_team_game_logs rows from extracted team logs (one row per team)."""
+    now = datetime.now(UTC).isoformat()
+    rows = {}
+    for log in team_logs:
+        if log.get('TEAM_ID'):
+            rows[log['TEAM_ID']] = {
+                'season': season,
+                'team_id': log['TEAM_ID'],
+                'game_id': log['GAME_ID'],
+                'game_date': game_date,
+                'data': log,
+                'updated_at': now
+            }
+    return list(rows.values())
+
+
+def upsert_rows(supabase, table: str, rows: List[Dict], on_conflict: str) -> int:
+    """
+    Upsert rows in batches.
+    
+    Returns:
+        Number of rows upserted
+    """
+    upserted = 0
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[i:i + UPSERT_BATCH_SIZE]
+        supabase.table(table).upsert(batch, on_conflict=on_conflict).execute()
+        upserted += len(batch)
+    return upserted
+
+
+def store_game(supabase, season: str, game: Dict, boxscore_data: Dict) -> Tuple[int, int]:
     """
-    Fetch game logs from Sportradar NBA API by fetching box scores for completed games.
-    Reads schedule from Supabase, filters for completed games in last 3-7 days,
-    fetches box scores, and aggregates into game logs format.
+    Upsert one game's player and team rows, then record the game as ingested.
+    
+    Rows are keyed by (player_id, game_id) / (team_id, game_id), so storing a game
+    again replaces its rows. The ledger row is written last: if a run stops
+    part-way through a game, the game is fetched again on the next run.
+    
+    Returns:
+        Tuple of (player rows, team rows) stored
     """
-    session_id = "debug-session"
-    run_id = "run1"
+    player_rows = build_player_rows(extract_player_game_logs_from_boxscore(boxscore_data), season, game['game_date'])
+    team_rows = build_team_rows(extract_team_game_logs_from_boxscore(boxscore_data), season, game['game_date'])
     
-    print(f"[{datetime.now()}] Starting Sportradar game logs fetch for season {CURRENT_SEASON}")
+    n_player = upsert_rows(supabase, PLAYER_LOGS_TABLE, player_rows, on_conflict='player_id,game_id')
+    n_team = upsert_rows(supabase, TEAM_LOGS_TABLE, team_rows, on_conflict='team_id,game_id')
     
-    # #region agent log
-    debug_log(session_id, run_id, "A", "sportradar_fetch_game_logs.py:fetch_and_store_game_logs",
-              "Function entry", {"season": CURRENT_SEASON})
-    # #endregion
+    supabase.table(INGESTED_GAMES_TABLE).upsert({
+        'season': season,
+        'game_id': game['id'],
+        'game_date': game['game_date'],
+        'status': str(boxscore_data.get('status') or game['status']).lower(),
+        'player_rows': n_player,
+        'team_rows': n_team,
+        'updated_at': datetime.now(UTC).isoformat()
+    }, on_conflict='game_id').execute()
+    
+    return n_player, n_team
+
+
+def fetch_and_store_game_logs(season: str = CURRENT_SEASON, full_refresh: bool = False,
+                              days: Optional[int] = None):
+    """
+    Fetch box scores for completed games not yet ingested and upsert their game logs.
+    
+    Reads the schedule from Supabase, skips games already in sr_ingested_games
+    with a final box score (unless full_refresh) and fetches the rest through the
+    request scheduler, at most MAX_IN_FLIGHT at a time under the Sportradar rate
+    limit. Each game is stored as soon as its box score arrives, so an interrupted
+    run resumes with the games it did not finish.
+    
+    Args:
+        season: Season string (e.g. '2025-26')
+        full_refresh: Refetch every completed game, ignoring the ledger
+        days: Only games scheduled in the last N days (default: the whole season)
+    """
+    print(f"[{datetime.now()}] Starting Sportradar game logs fetch for season {season}"
+          f" ({'full refresh' if full_refresh else 'incremental'})")
     
     if not is_sportradar_configured():
         print("ERROR: Sportradar API keys not configured. Set SPORTRADAR_NBA_API_KEY in .env")
         return False
     
-    # #region agent log
-    debug_log(session_id, run_id, "D", "sportradar_fetch_game_logs.py:fetch_and_store_game_logs",
-              "API configuration check", {"configured": True})
-    # #endregion
-    
     supabase = get_supabase_service_client()
     if not supabase:
         print("ERROR: Could not initialize Supabase service client.")
         return False
     
-    success_count = 0
-    error_count = 0
-    all_player_logs = []
-    all_team_logs = []
-    
     # Read schedule from Supabase
     print("Reading schedule from Supabase...")
-    schedule_df = get_schedule_from_db(CURRENT_SEASON)
+    schedule_df = get_schedule_from_db(season)
     
     if schedule_df is None or len(schedule_df) == 0:
         print("  ✗ No schedule data found. Please run sportradar_fetch_schedule.py first.")
@@ -273,178 +399,68 @@ def fetch_and_store_game_logs():
     
     print(f"  ✓ Found schedule with {len(schedule_df)} games")
     
-    # #region agent log
-    debug_log(session_id, run_id, "SCHEDULE", "sportradar_fetch_game_logs.py:fetch_and_store_game_logs",
-              "Schedule loaded", {"schedule_count": len(schedule_df), "columns": list(schedule_df.columns)})
-    # #endregion
-    
-    # Filter for completed games from last 3-7 days
-    # Schedule is already a DataFrame with games as rows
     try:
-        # Filter for completed games in last 7 days
-        now = datetime.now(UTC)
-        cutoff_date = now - timedelta(days=7)
-        completed_games = []
-        
-        # Iterate over DataFrame rows (each row is a game)
-        for idx, game_row in schedule_df.iterrows():
-            # Get game data - it might be a dict or we need to access columns
-            if isinstance(game_row, pd.Series):
-                game = game_row.to_dict()
-            else:
-                game = game_row
-            
-            # Check game status - completed games typically have status 'closed' or similar
-            game_status = str(game.get('status', '')).lower()
-            game_date_str = game.get('scheduled', '')
-            
-            # Parse game date
-            try:
-                if pd.isna(game_date_str):
-                    continue
-                    
-                if isinstance(game_date_str, str):
-                    # Try parsing ISO format date
-                    game_date = datetime.fromisoformat(game_date_str.replace('Z', '+00:00'))
-                elif isinstance(game_date_str, pd.Timestamp):
-                    game_date = game_date_str.to_pydatetime()
-                    if game_date.tzinfo is None:
-                        game_date = game_date.replace(tzinfo=UTC)
-                else:
-                    continue
-            except Exception as e:
-                continue
-            
-            # Check if game is completed and within date range
-            if game_date < cutoff_date:
-                continue
-            
-            # Check if game is completed (status might be 'closed', 'complete', etc.)
-            if game_status in ['closed', 'complete', 'completed', 'final']:
-                game_id = game.get('id', '')
-                if game_id:
-                    completed_games.append({
-                        'id': game_id,
-                        'date': game_date,
-                        'status': game_status
-                    })
-        
-        print(f"  ✓ Found {len(completed_games)} completed games in last 7 days")
-        
-        if len(completed_games) == 0:
-            print("  No completed games found in date range")
-            return True  # Not an error, just no games
-        
-        # #region agent log
-        debug_log(session_id, run_id, "FILTER", "sportradar_fetch_game_logs.py:fetch_and_store_game_logs",
-                  "Filtered completed games", {"completed_count": len(completed_games)})
-        # #endregion
-        
+        completed_games = get_completed_games(schedule_df, days)
+        ingested = set() if full_refresh else get_ingested_game_ids(supabase, season)
     except Exception as e:
         print(f"  ✗ Error processing schedule: {e}")
         import traceback
         traceback.print_exc()
         return False
     
-    # Fetch box scores for each completed game
-    print(f"Fetching box scores for {len(completed_games)} games...")
+    pending_games = completed_games[~completed_games['id'].isin(ingested)].to_dict('records')
+    print(f"  ✓ {len(completed_games)} completed games, {len(completed_games) - len(pending_games)} already ingested")
     
-    for idx, game_info in enumerate(completed_games):
-        game_id = game_info['id']
-        game_date = game_info['date']
-        
-        try:
-            # Fetch box score using /games/{game_id}/boxscore.json endpoint
-            endpoint = f"games/{game_id}/boxscore.json"
-            
-            # #region agent log
-            debug_log(session_id, run_id, f"BOX{idx}", "sportradar_fetch_game_logs.py:fetch_and_store_game_logs",
-                      "Before box score API call", {"game_id": game_id, "endpoint": endpoint, "game_date": str(game_date)})
-            # #endregion
-            
-            print(f"  [{idx+1}/{len(completed_games)}] Fetching box score for game {game_id}...")
-            
-            # Use header-based authentication
-            boxscore_data = fetch_sportradar_nba(endpoint, use_headers=True)
-            
-            # #region agent log
-            debug_log(session_id, run_id, f"BOX{idx}", "sportradar_fetch_game_logs.py:fetch_and_store_game_logs",
-                      "After box score API call", {"game_id": game_id, "has_game": "game" in boxscore_data})
-            # #endregion
-            
-            # Extract player logs from box score
-            player_logs = extract_player_game_logs_from_boxscore(boxscore_data)
-            all_player_logs.extend(player_logs)
-            
-            # Extract team logs from box score
-            team_logs = extract_team_game_logs_from_boxscore(boxscore_data)
-            all_team_logs.extend(team_logs)
-            
-            print(f"    ✓ Extracted {len(player_logs)} player logs, {len(team_logs)} team logs")
-            
-            # Rate limiting - add delay between requests
-            if idx < len(completed_games) - 1:
-                time.sleep(1)
-                
-        except Exception as e:
-            print(f"    ✗ Error fetching box score for game {game_id}: {e}")
-            error_count += 1
-            continue
+    if len(pending_games) == 0:
+        print("  No new box scores to fetch")
+        return True  # Not an error, just no games
     
-    # Store aggregated logs in Supabase
-    try:
-        if len(all_player_logs) > 0:
-            print(f"\nStoring {len(all_player_logs)} player game logs...")
-            supabase.table('sr_game_logs').upsert({
-                'season': CURRENT_SEASON,
-                'log_type': 'player',
-                'data': all_player_logs,
-                'updated_at': datetime.now(UTC).isoformat()
-            }, on_conflict='season,log_type').execute()
-            
-            print(f"  ✓ Stored {len(all_player_logs)} player game logs")
-            success_count += 1
-        else:
-            print("  No player game logs to store")
-            error_count += 1
-            
-    except Exception as e:
-        print(f"  ✗ Error storing player logs: {e}")
-        import traceback
-        traceback.print_exc()
-        error_count += 1
+    # Fetch box scores through the request scheduler (Sportradar rate limit, retries
+    # with backoff), keeping at most MAX_IN_FLIGHT requests queued. Finished games
+    # are stored while the next box scores download.
+    print(f"Fetching box scores for {len(pending_games)} games...")
     
-    try:
-        if len(all_team_logs) > 0:
-            print(f"\nStoring {len(all_team_logs)} team game logs...")
-            supabase.table('sr_game_logs').upsert({
-                'season': CURRENT_SEASON,
-                'log_type': 'team',
-                'data': all_team_logs,
-                'updated_at': datetime.now(UTC).isoformat()
-            }, on_conflict='season,log_type').execute()
-            
-            print(f"  ✓ Stored {len(all_team_logs)} team game logs")
+    success_count = 0
+    error_count = 0
+    total_player_rows = 0
+    total_team_rows = 0
+    queue = deque(pending_games)
+    in_flight = deque()
+    idx = 0
+    
+    while queue or in_flight:
+        while queue and len(in_flight) < MAX_IN_FLIGHT:
+            game = queue.popleft()
+            in_flight.append((game, rs.submit(fetch_sportradar_nba, f"games/{game['id']}/boxscore.json",
+                                              use_headers=True, host=rs.SPORTRADAR_HOST)))
+        
+        game, future = in_flight.popleft()
+        idx += 1
+        try:
+            boxscore_data = future.result()
+            n_player, n_team = store_game(supabase, season, game, boxscore_data)
+            total_player_rows += n_player
+            total_team_rows += n_team
             success_count += 1
-        else:
-            print("  No team game logs to store")
+            print(f"  [{idx}/{len(pending_games)}] ✓ Game {game['id']} ({game['game_date']}): "
+                  f"{n_player} player logs, {n_team} team logs")
+        except Exception as e:
+            print(f"  [{idx}/{len(pending_games)}] ✗ Error ingesting game {game['id']}: {e}")
             error_count += 1
-            
-    except Exception as e:
-        print(f"  ✗ Error storing team logs: {e}")
-        import traceback
-        traceback.print_exc()
-        error_count += 1
     
-    # #region agent log
-    debug_log(session_id, run_id, "ALL", "sportradar_fetch_game_logs.py:fetch_and_store_game_logs",
-              "Function exit", {"success_count": success_count, "error_count": error_count})
-    # #endregion
+    print(f"\nStored {total_player_rows} player game logs and {total_team_rows} team game logs")
     
-    print(f"\n[{datetime.now()}] Completed: {success_count} successful, {error_count} errors")
+    print(f"\n[{datetime.now()}] Completed: {success_count} games ingested, {error_count} errors")
     return error_count == 0
 
 if __name__ == '__main__':
-    success = fetch_and_store_game_logs()
+    parser = argparse.ArgumentParser(description='Ingest Sportradar box scores into Supabase game log tables')
+    parser.add_argument('--season', type=str, default=CURRENT_SEASON, help='Season (e.g. 2025-26)')
+    parser.add_argument('--full', action='store_true', help='Refetch every completed game, not only new ones')
+    parser.add_argument('--days', type=int, default=None,
+                        help='Only games scheduled in the last N days (default: the whole season)')
+    args = parser.parse_args()
+    
+    success = fetch_and_store_game_logs(season=args.season, full_refresh=args.full, days=args.days)
     sys.exit(0 if success else 1)
 
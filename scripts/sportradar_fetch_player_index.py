@@ -19,9 +19,8 @@ from sportradar_config import (
     get_sportradar_nba_url, SPORTRADAR_NBA_BASE_URL, SPORTRADAR_NBA_VERSION, SPORTRADAR_NBA_API_KEY
 )
 from supabase_config import get_supabase_service_client
+import request_scheduler as rs
 from datetime import datetime, UTC
-import time
-import requests
 
 CURRENT_SEASON = '2025-26'
 
@@ -75,19 +74,13 @@ def fetch_and_store_player_index():
         # Use .us domain with access level (correct format)
         url = get_sportradar_nba_url(endpoint, use_us_domain=True, include_access_level=True)
         print(f"[SPORTRADAR] Fetching URL: {url[:100]}...")
-        response = requests.get(url, timeout=30)
+        response = rs.http_get(url, host=rs.SPORTRADAR_HOST)
         
         # #region agent log
         debug_log(session_id, run_id, "A", "sportradar_fetch_player_index.py:fetch_and_store_player_index",
                   "After API call", {"status_code": response.status_code, "response_length": len(response.text)})
         # #endregion
         
-        if response.status_code == 429:
-            retry_delay = 2
-            print(f"  ✗ Rate limit (429), waiting {retry_delay} seconds...")
-            time.sleep(retry_delay)
-            response = requests.get(url, timeout=30)
-        
         if response.status_code != 200:
             print(f"  ✗ Error response status: {response.status_code}")
             print(f"  ✗ Error response text: {response.text[:500]}")
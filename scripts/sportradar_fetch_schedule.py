@@ -20,9 +20,8 @@ from sportradar_config import (
     get_sportradar_nba_url, SPORTRADAR_NBA_BASE_URL_US, SPORTRADAR_ACCESS_LEVEL, SPORTRADAR_LANGUAGE
 )
 from supabase_config import get_supabase_service_client
+import request_scheduler as rs
 from datetime import datetime, UTC
-import time
-import requests
 
 CURRENT_SEASON = '2025-26'
 
@@ -97,7 +96,7 @@ def fetch_and_store_schedule(date=None):
         # #endregion
         
         # Use header-based authentication with .com domain
-        response_data = fetch_sportradar_nba(endpoint, use_headers=True)
+        response_data = rs.call(fetch_sportradar_nba, endpoint, use_headers=True, host=rs.SPORTRADAR_HOST)
         
         # #region agent log
         debug_log(session_id, run_id, "SUCCESS", "sportradar_fetch_schedule.py:fetch_and_store_schedule",
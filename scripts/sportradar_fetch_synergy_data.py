@@ -19,9 +19,8 @@ from sportradar_config import (
     get_sportradar_synergy_url, SPORTRADAR_SYNERGY_BASE_URL, SPORTRADAR_SYNERGY_VERSION, SPORTRADAR_SYNERGY_API_KEY
 )
 from supabase_config import get_supabase_service_client
+import request_scheduler as rs
 from datetime import datetime, UTC
-import time
-import requests
 
 CURRENT_SEASON = '2025-26'
 SEASON_TYPE = 'Regular Season'
@@ -90,19 +89,13 @@ def fetch_and_store_synergy_data():
                 # Use Synergy API URL builder (may need .us domain check)
                 url = get_sportradar_synergy_url(endpoint)
                 print(f"[SPORTRADAR SYNERGY] Fetching URL: {url[:100]}...")
-                response = requests.get(url, timeout=30)
+                response = rs.http_get(url, host=rs.SPORTRADAR_HOST)
                 
                 # #region agent log
                 debug_log(session_id, run_id, f"{chr(65+attempt_num)}", "sportradar_fetch_synergy_data.py:fetch_and_store_synergy_data",
                           "After API call", {"status_code": response.status_code, "response_length": len(response.text)})
                 # #endregion
                 
-                if response.status_code == 429:
-                    retry_delay = min(2 ** attempt_num, 10)
-                    print(f"  ✗ Rate limit (429), waiting {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    response = requests.get(url, timeout=30)
-                
                 if response.status_code != 200:
                     print(f"  ✗ Error response status: {response.status_code}")
                     print(f"  ✗ Error response text: {response.text[:500]}")
@@ -140,8 +133,6 @@ def fetch_and_store_synergy_data():
                 print(f"  ✓ Stored team {playtype} {type_grouping} ({len(data)} records)")
                 success_count += 1
                 
-                time.sleep(0.5)  # Rate limiting
-                
             except Exception as e:
                 error_msg = str(e)
                 status_code = None
@@ -176,19 +167,13 @@ def fetch_and_store_synergy_data():
             # Use Synergy API URL builder
             url = get_sportradar_synergy_url(endpoint)
             print(f"[SPORTRADAR SYNERGY] Fetching URL: {url[:100]}...")
-            response = requests.get(url, timeout=30)
+            response = rs.http_get(url, host=rs.SPORTRADAR_HOST)
             
             # #region agent log
             debug_log(session_id, run_id, f"P{chr(65+player_attempt_num)}", "sportradar_fetch_synergy_data.py:fetch_and_store_synergy_data",
                       "After API call", {"status_code": response.status_code, "response_length": len(response.text)})
             # #endregion
             
-            if response.status_code == 429:
-                retry_delay = min(2 ** player_attempt_num, 10)
-                print(f"  ✗ Rate limit (429), waiting {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                response = requests.get(url, timeout=30)
-            
             if response.status_code != 200:
                 print(f"  ✗ Error response status: {response.status_code}")
                 print(f"  ✗ Error response text: {response.text[:500]}")
@@ -225,8 +210,6 @@ def fetch_and_store_synergy_data():
             print(f"  ✓ Stored player {playtype} offensive ({len(data)} records)")
             success_count += 1
             
-            time.sleep(0.5)  # Rate limiting
-            
         except Exception as e:
             error_msg = str(e)
             status_code = None
@@ -19,9 +19,8 @@ from sportradar_config import (
     get_sportradar_nba_url, SPORTRADAR_NBA_BASE_URL, SPORTRADAR_NBA_VERSION, SPORTRADAR_NBA_API_KEY
 )
 from supabase_config import get_supabase_service_client
+import request_scheduler as rs
 from datetime import datetime, UTC
-import time
-import requests
 
 CURRENT_SEASON = '2025-26'
 SEASON_TYPE = 'Regular Season'
@@ -114,19 +113,13 @@ def fetch_and_store_team_stats():
                 url = f"{url}&{param_str}"
             
             print(f"[SPORTRADAR] Fetching URL: {url[:100]}...")
-            response = requests.get(url, timeout=30)
+            response = rs.http_get(url, host=rs.SPORTRADAR_HOST)
             
             # #region agent log
             debug_log(session_id, run_id, f"{chr(65+idx)}", "sportradar_fetch_team_stats.py:fetch_and_store_team_stats",
                       "After API call", {"status_code": response.status_code, "response_length": len(response.text)})
             # #endregion
             
-            if response.status_code == 429:
-                retry_delay = min(2 ** idx, 10)
-                print(f"  ✗ Rate limit (429), waiting {retry_delay} seconds...")
-                time.sleep(retry_delay)
-                response = requests.get(url, timeout=30)
-            
             if response.status_code != 200:
                 print(f"  ✗ Error response status: {response.status_code}")
                 print(f"  ✗ Error response text: {response.text[:500]}")
@@ -185,8 +178,6 @@ def fetch_and_store_team_stats():
             print(f"  ✓ Stored {measure_type}, last_n_games={last_n_games}, group={group_quantity} ({len(data)} teams)")
             success_count += 1
             
-            time.sleep(0.5)  # Rate limiting
-            
         except Exception as e:
             error_msg = str(e)
             status_code = None
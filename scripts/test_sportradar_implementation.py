@@ -213,13 +213,14 @@ def test_game_logs_fetch():
             # Verify it's in the database
             supabase = get_supabase_service_client()
             if supabase:
-                result = supabase.table('sr_game_logs').select('*').eq('season', CURRENT_SEASON).execute()
-                if result.data:
-                    print(f"\n✓ Verified: Found {len(result.data)} log entries in database")
-                    for entry in result.data:
-                        log_type = entry.get('log_type', 'unknown')
-                        data = entry.get('data', [])
-                        print(f"  - {log_type}: {len(data)} records")
+                counts = {
+                    log_type: supabase.table(table).select('id', count='exact').eq('season', CURRENT_SEASON).limit(1).execute().count or 0
+                    for log_type, table in [('player', 'sr_player_game_logs'), ('team', 'sr_team_game_logs')]
+                }
+                if any(counts.values()):
+                    print(f"\n✓ Verified: Found {sum(counts.values())} log entries in database")
+                    for log_type, count in counts.items():
+                        print(f"  - {log_type}: {count} records")
                     return True
                 else:
                     print("✗ No game logs found in database")
@@ -6,6 +6,7 @@ import nba_api
 import streamlit as st
 import os
 import sys
+import threading
 
 # Add path to import prediction_features
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'new-streamlit-app', 'player-app'))
@@ -13,6 +14,8 @@ try:
     import prediction_features as pf
 except ImportError:
     pf = None
+import request_scheduler as rs
+import team_metrics as tm
 
 current_season = '2025-26'
 season_type = 'Regular Season'
@@ -160,55 +163,103 @@ def get_cached_team_four_factors_stats(season: str = current_season, last_n_game
         return pd.DataFrame()
 
 
-#ADVANCED DATA LOADING
-##SEASON
-print("[DEBUG] Loading team advanced stats (module level)...")
-data_adv_season = get_cached_team_advanced_stats()
-print(f"[DEBUG] Team advanced stats loaded: {len(data_adv_season)} rows")
-
-# Add missing ranking columns for Core Stats
-data_adv_season['OFF_RATING_RANK'] = data_adv_season['OFF_RATING'].rank(ascending=False, method='first').astype(int)
-data_adv_season['DEF_RATING_RANK'] = data_adv_season['DEF_RATING'].rank(ascending=True, method='first').astype(int)
-data_adv_season['NET_RATING_RANK'] = data_adv_season['NET_RATING'].rank(ascending=False, method='first').astype(int)
-data_adv_season['PACE_RANK'] = data_adv_season['PACE'].rank(ascending=False, method='first').astype(int)
-data_adv_season['AST_PCT_RANK'] = data_adv_season['AST_PCT'].rank(ascending=False, method='first').astype(int)
-data_adv_season['TM_TOV_PCT_RANK'] = data_adv_season['TM_TOV_PCT'].rank(ascending=True, method='first').astype(int)
-data_adv_season['AST_TO_RANK'] = data_adv_season['AST_TO'].rank(ascending=False, method='first').astype(int)
-data_adv_season['DREB_PCT_RANK'] = data_adv_season['DREB_PCT'].rank(ascending=False, method='first').astype(int)
-data_adv_season['OREB_PCT_RANK'] = data_adv_season['OREB_PCT'].rank(ascending=False, method='first').astype(int)
-data_adv_season['REB_PCT_RANK'] = data_adv_season['REB_PCT'].rank(ascending=False, method='first').astype(int)
-##LAST 5 GAMES
-data_adv_L5 = get_cached_team_advanced_stats(last_n_games=5)
-
-#MISC DATA LOADING
-##SEASON
-data_misc_season = get_cached_team_misc_stats()
-##LAST 5 GAMES
-data_misc_L5 = get_cached_team_misc_stats(last_n_games=5)
-
-#LOAD TRADITIONAL DATA
-## SEASON
-data_trad_season = get_cached_team_traditional_stats()
-## LAST 5
-data_trad_L5 = get_cached_team_traditional_stats(last_n_games=5)
-## SEASON - STARTERS
-data_trad_season_starters = get_cached_team_traditional_stats(group_quantity='Starters')
-## LAST 5 - STARTERS
-data_trad_L5_starters = get_cached_team_traditional_stats(last_n_games=5, group_quantity='Starters')
-## SEASON - BENCH
-data_trad_season_bench = get_cached_team_traditional_stats(group_quantity='Bench')
-## LAST 5 - BENCH
-data_trad_L5_bench = get_cached_team_traditional_stats(last_n_games=5, group_quantity='Bench')
-
-#LOAD FOUR FACTORS DATA
-##SEASON
-data_4F_season = get_cached_team_four_factors_stats()
-## LAST 5 GAMES
-data_4F_L5 = get_cached_team_four_factors_stats(last_n_games=5)
+# ============================================================
+# LAZY DATASET REGISTRY
+# ============================================================
+# Team datasets (functions.data_adv_season, functions.standings, ...) used to be
+# fetched when this module was imported. They are now loaded on first access,
+# so importers that only need a helper function pay nothing. Pages that know
+# what they need call load_datasets() (or load_matchup_stats()) up front to
+# fetch everything in parallel through the shared request scheduler.
+
+# name -> (request host, loader)
+DATASETS = {
+    'data_adv_season': (rs.NBA_STATS_HOST, lambda: get_cached_team_advanced_stats()),
+    'data_adv_L5': (rs.NBA_STATS_HOST, lambda: get_cached_team_advanced_stats(last_n_games=5)),
+    'data_misc_season': (rs.NBA_STATS_HOST, lambda: get_cached_team_misc_stats()),
+    'data_misc_L5': (rs.NBA_STATS_HOST, lambda: get_cached_team_misc_stats(last_n_games=5)),
+    'data_trad_season': (rs.NBA_STATS_HOST, lambda: get_cached_team_traditional_stats()),
+    'data_trad_L5': (rs.NBA_STATS_HOST, lambda: get_cached_team_traditional_stats(last_n_games=5)),
+    'data_trad_season_starters': (rs.NBA_STATS_HOST, lambda: get_cached_team_traditional_stats(group_quantity='Starters')),
+    'data_trad_L5_starters': (rs.NBA_STATS_HOST, lambda: get_cached_team_traditional_stats(last_n_games=5, group_quantity='Starters')),
+    'data_trad_season_bench': (rs.NBA_STATS_HOST, lambda: get_cached_team_traditional_stats(group_quantity='Bench')),
+    'data_trad_L5_bench': (rs.NBA_STATS_HOST, lambda: get_cached_team_traditional_stats(last_n_games=5, group_quantity='Bench')),
+    'data_4F_season': (rs.NBA_STATS_HOST, lambda: get_cached_team_four_factors_stats()),
+    'data_4F_L5': (rs.NBA_STATS_HOST, lambda: get_cached_team_four_factors_stats(last_n_games=5)),
+    'standings': (rs.NBA_STATS_HOST, lambda: get_standings_with_clutch(current_season)),
+    'pbp_totals_data': (rs.PBPSTATS_HOST, lambda: get_cached_pbpstats_totals("Team")),
+    'pbp_opp_totals_data': (rs.PBPSTATS_HOST, lambda: get_cached_pbpstats_totals("Opponent")),
+}
+
+# Datasets computed from other datasets: group -> (dependencies, builder, names provided)
+DERIVED_DATASETS = {
+    'todays_matchups': (('data_adv_season',), lambda: {'todays_matchups': get_todays_matchups()}, ('todays_matchups',)),
+    'pbp_team_stats': (('pbp_totals_data', 'pbp_opp_totals_data'), lambda: _build_pbp_team_stats(), (
+        'league_stats_dict', 'opp_league_stats_dict', 'team_stats', 'opp_team_stats',
+        'team_stats_diff', 'opp_team_stats_diff', 'pbp_team_list', 'shooting_diff_results',
+    )),
+}
+_DERIVED_GROUP = {name: group for group, (_, _, names) in DERIVED_DATASETS.items() for name in names}
+
+# Everything the matchup stats (away_team_*, home_team_*, la_*, ...) are computed from
+MATCHUP_STATS_DATASETS = tuple(name for name in DATASETS if not name.startswith('pbp_')) + (
+    'team_stats', 'opp_team_stats', 'team_stats_diff', 'shooting_diff_results',
+)
+
+# Loaded datasets: name -> data (see get_dataset())
+_datasets = {}
+_datasets_lock = threading.RLock()
+
+
+def load_datasets(*names):
+    """
+    Load the named datasets (and what they are derived from) if not loaded yet.
+    
+    Missing fetched datasets are requested in parallel; derived ones are then
+    built in dependency order. Loaded datasets are kept in _datasets (and read
+    as module attributes, e.g. functions.standings, through __getattr__).
+    
+    Args:
+        *names: Keys of DATASETS or names provided by DERIVED_DATASETS
+    
+    Returns:
+        Dict of name -> dataset for the requested names
+    """
+    groups = []
+    for name in names:
+        group = _DERIVED_GROUP.get(name)
+        if group is not None and group not in groups:
+            groups.append(group)
+        elif group is None and name not in DATASETS:
+            raise KeyError(f"Unknown dataset: {name}")
+    fetch = [name for name in names if name in DATASETS]
+    for group in groups:
+        fetch.extend(DERIVED_DATASETS[group][0])
+    
+    with _datasets_lock:
+        # Fetch everything missing concurrently (loaders return empty data on errors)
+        futures = {
+            name: rs.submit(DATASETS[name][1], host=DATASETS[name][0], max_retries=1)
+            for name in dict.fromkeys(fetch) if name not in _datasets
+        }
+        for name, future in futures.items():
+            _datasets[name] = future.result()
+        
+        for group in groups:
+            _, builder, provided = DERIVED_DATASETS[group]
+            if not all(name in _datasets for name in provided):
+                _datasets.update(builder())
+    
+    return {name: _datasets[name] for name in names}
+
+
+def get_dataset(name):
+    """Single dataset by name, loading it on first access."""
+    return load_datasets(name)[name]
+
 
 #Key base variables
-wolves_id = data_adv_season.loc[data_adv_season['TEAM_NAME'] == 'Minnesota Timberwolves', 'TEAM_ID'].values[0]
-# wolves_id = '1610612750'
+wolves_id = 1610612750  # Minnesota Timberwolves
 logo_link = f'https://cdn.nba.com/logos/nba/{wolves_id}/primary/L/logo.svg'
 timberwolves = 'Minnesota Timberwolves'
 nba_logo = 'https://a.espncdn.com/combiner/i?img=/i/teamlogos/leagues/500/nba.png?w=100&h=100&transparent=true'
@@ -229,12 +280,15 @@ def get_standings_with_clutch(season='2025-26'):
     """
     # Fetch from API
     try:
-        # Fetch regular standings
-        standings_df = nba_api.stats.endpoints.LeagueStandings(
-            league_id='00', 
-            season=season, 
-            season_type='Regular Season'
-        ).get_data_frames()[0]
+        # Fetch regular standings (snapshotted by prediction_features when available)
+        if pf is not None:
+            standings_df = pf.get_league_standings(season)
+        else:
+            standings_df = nba_api.stats.endpoints.LeagueStandings(
+                league_id='00', 
+                season=season, 
+                season_type='Regular Season'
+            ).get_data_frames()[0]
         
         # Fetch team clutch stats
         try:
@@ -277,12 +331,10 @@ def get_standings_with_clutch(season='2025-26'):
         # If standings fetch fails, return empty DataFrame
         return pd.DataFrame()
 
-#Load in the current NBA standings
-standings = get_standings_with_clutch(current_season)
-
 # Function to get today's matchups
 def get_todays_matchups():
     """Fetch today's NBA matchups and return as list of dictionaries"""
+    data_adv_season = get_dataset('data_adv_season')
     try:
         from nba_api.live.nba.endpoints import scoreboard
         games = scoreboard.ScoreBoard()
@@ -322,9 +374,6 @@ def get_todays_matchups():
         print(f"Error fetching matchups: {e}")
         return []
 
-# Get today's matchups
-todays_matchups = get_todays_matchups()
-
 # Global variable to store selected matchup (can be set by Streamlit app before stats calculation)
 # Check if streamlit session state exists and has matchup_override
 _selected_matchup_override = None
@@ -344,7 +393,10 @@ def set_matchup_override(matchup):
 def update_selected_matchup(matchup):
     """Update module-level variables based on selected matchup"""
     global game_id, away_id, home_id, away_logo_link, home_logo_link, game_title, home_or_away
+    global selected_matchup, _matchup_selected
     
+    selected_matchup = matchup
+    _matchup_selected = True
     if matchup:
         game_id = matchup['game_id']
         away_id = matchup['away_team_id']
@@ -373,19 +425,32 @@ def update_selected_matchup(matchup):
         away_id = None
         away_logo_link = None
         game_title = "No game today"
-
-# Default to first matchup (which will be Wolves game if available, otherwise first by time)
-# Use override if set, otherwise use first matchup
-selected_matchup = None
-if _selected_matchup_override is not None:
-    selected_matchup = _selected_matchup_override
-elif todays_matchups:
-    selected_matchup = todays_matchups[0]  # Default to first (Wolves game if available)
-
-if selected_matchup:
-    update_selected_matchup(selected_matchup)
-else:
-    update_selected_matchup(None)
+    
+    # Matchup stats are recomputed for the new teams on next access
+    if _matchup_stats_ids is not None and _matchup_stats_ids != (away_id, home_id):
+        _clear_matchup_stats()
+
+# Names set by update_selected_matchup()
+MATCHUP_SELECTION_NAMES = ('selected_matchup', 'game_id', 'away_id', 'home_id', 'away_logo_link',
+                           'home_logo_link', 'game_title', 'home_or_away')
+_matchup_selected = False
+
+def _ensure_selected_matchup():
+    """Select the default matchup on first use unless one was already selected"""
+    if _matchup_selected:
+        return
+    
+    # Default to first matchup (which will be Wolves game if available, otherwise first by time)
+    # Use override if set, otherwise use first matchup
+    matchup = None
+    if _selected_matchup_override is not None:
+        matchup = _selected_matchup_override
+    else:
+        todays_matchups = get_dataset('todays_matchups')
+        if todays_matchups:
+            matchup = todays_matchups[0]  # Default to first (Wolves game if available)
+    
+    update_selected_matchup(matchup)
 
 # Helper function to safely get values from DataFrame
 def safe_get_value(df, team_id, column, default=None, id_column=None):
@@ -423,683 +488,1181 @@ def safe_get_value(df, team_id, column, default=None, id_column=None):
         return filtered.values[0]
     return default
 
-# Only calculate stats if we have valid team IDs
-if away_id is not None and home_id is not None:
-#Record and Seed
-## Away Team
-    away_team_record = safe_get_value(standings, away_id, 'Record', id_column='TeamID')
-    away_team_seed = safe_get_value(standings, away_id, 'PlayoffRank', id_column='TeamID')
-    away_team_division_seed = safe_get_value(standings, away_id, 'DivisionRank', id_column='TeamID')
-    
-## Home Team
-    home_team_record = safe_get_value(standings, home_id, 'Record', id_column='TeamID')
-    home_team_seed = safe_get_value(standings, home_id, 'PlayoffRank', id_column='TeamID')
-    home_team_division_seed = safe_get_value(standings, home_id, 'DivisionRank', id_column='TeamID')
-
-#Offensive Ratings
-## Away Team
-    away_team_ortg = safe_get_value(data_adv_season, away_id, 'OFF_RATING', 0)
-    away_team_ortg_rank = safe_get_value(data_adv_season, away_id, 'OFF_RATING_RANK', 0)
-    l5_away_team_ortg = safe_get_value(data_adv_L5, away_id, 'OFF_RATING', 0)
-    l5_away_team_ortg_rank = safe_get_value(data_adv_L5, away_id, 'OFF_RATING_RANK', 0)
-##League Average
-    la_ortg = round(data_adv_season['OFF_RATING'].mean(), 1)
-    l5_la_ortg = round(data_adv_L5['OFF_RATING'].mean(), 1)
-## Home Team
-    home_team_ortg = safe_get_value(data_adv_season, home_id, 'OFF_RATING', 0)
-    home_team_ortg_rank = safe_get_value(data_adv_season, home_id, 'OFF_RATING_RANK', 0)
-    l5_home_team_ortg = safe_get_value(data_adv_L5, home_id, 'OFF_RATING', 0)
-    l5_home_team_ortg_rank = safe_get_value(data_adv_L5, home_id, 'OFF_RATING_RANK', 0)
-
-#Defensive Ratings
-## Away Team
-    away_team_drtg = safe_get_value(data_adv_season, away_id, 'DEF_RATING', 0)
-    away_team_drtg_rank = safe_get_value(data_adv_season, away_id, 'DEF_RATING_RANK', 0)
-    l5_away_team_drtg = safe_get_value(data_adv_L5, away_id, 'DEF_RATING', 0)
-    l5_away_team_drtg_rank = safe_get_value(data_adv_L5, away_id, 'DEF_RATING_RANK', 0)
-##League Average
-    la_drtg = round(data_adv_season['DEF_RATING'].mean(), 1)
-    l5_la_drtg = round(data_adv_L5['DEF_RATING'].mean(), 1)
-## Home Team
-    home_team_drtg = safe_get_value(data_adv_season, home_id, 'DEF_RATING', 0)
-    home_team_drtg_rank = safe_get_value(data_adv_season, home_id, 'DEF_RATING_RANK', 0)
-    l5_home_team_drtg = safe_get_value(data_adv_L5, home_id, 'DEF_RATING', 0)
-    l5_home_team_drtg_rank = safe_get_value(data_adv_L5, home_id, 'DEF_RATING_RANK', 0)
-
-#Net Ratings
-## Away Team
-    away_team_net = safe_get_value(data_adv_season, away_id, 'NET_RATING', 0)
-    away_team_net_rank = safe_get_value(data_adv_season, away_id, 'NET_RATING_RANK', 0)
-    l5_away_team_net = safe_get_value(data_adv_L5, away_id, 'NET_RATING', 0)
-    l5_away_team_net_rank = safe_get_value(data_adv_L5, away_id, 'NET_RATING_RANK', 0)
-##League Average
-    la_net = 0
-    l5_la_net = 0
-## Home Team
-    home_team_net = safe_get_value(data_adv_season, home_id, 'NET_RATING', 0)
-    home_team_net_rank = safe_get_value(data_adv_season, home_id, 'NET_RATING_RANK', 0)
-    l5_home_team_net = safe_get_value(data_adv_L5, home_id, 'NET_RATING', 0)
-    l5_home_team_net_rank = safe_get_value(data_adv_L5, home_id, 'NET_RATING_RANK', 0)
-
-#REBOUND PERCENTAGES
-
-#DREB%
-## Away Team
-    away_team_dreb = safe_get_value(data_adv_season, away_id, 'DREB_PCT', 0)
-    away_team_dreb_rank = safe_get_value(data_adv_season, away_id, 'DREB_PCT_RANK', 0)
-    l5_away_team_dreb = safe_get_value(data_adv_L5, away_id, 'DREB_PCT', 0)
-    l5_away_team_dreb_rank = safe_get_value(data_adv_L5, away_id, 'DREB_PCT_RANK', 0)
-## League Average
-    la_dreb = round(data_adv_season['DREB_PCT'].mean(), 3)
-    l5_la_dreb = round(data_adv_L5['DREB_PCT'].mean(), 3)
-## Home Team
-    home_team_dreb = safe_get_value(data_adv_season, home_id, 'DREB_PCT', 0)
-    home_team_dreb_rank = safe_get_value(data_adv_season, home_id, 'DREB_PCT_RANK', 0)
-    l5_home_team_dreb = safe_get_value(data_adv_L5, home_id, 'DREB_PCT', 0)
-    l5_home_team_dreb_rank = safe_get_value(data_adv_L5, home_id, 'DREB_PCT_RANK', 0)
-
-#OREB%
-## Away Team
-    away_team_oreb = safe_get_value(data_adv_season, away_id, 'OREB_PCT', 0)
-    away_team_oreb_rank = safe_get_value(data_adv_season, away_id, 'OREB_PCT_RANK', 0)
-    l5_away_team_oreb = safe_get_value(data_adv_L5, away_id, 'OREB_PCT', 0)
-    l5_away_team_oreb_rank = safe_get_value(data_adv_L5, away_id, 'OREB_PCT_RANK', 0)
-## League Average
-    la_oreb = round(data_adv_season['OREB_PCT'].mean(), 3)
-    l5_la_oreb = round(data_adv_L5['OREB_PCT'].mean(), 3)
-## Home Team
-    home_team_oreb = safe_get_value(data_adv_season, home_id, 'OREB_PCT', 0)
-    home_team_oreb_rank = safe_get_value(data_adv_season, home_id, 'OREB_PCT_RANK', 0)
-    l5_home_team_oreb = safe_get_value(data_adv_L5, home_id, 'OREB_PCT', 0)
-    l5_home_team_oreb_rank = safe_get_value(data_adv_L5, home_id, 'OREB_PCT_RANK', 0)
-
-#REB%
-## Away Team
-    away_team_reb = safe_get_value(data_adv_season, away_id, 'REB_PCT', 0)
-    away_team_reb_rank = safe_get_value(data_adv_season, away_id, 'REB_PCT_RANK', 0)
-    l5_away_team_reb = safe_get_value(data_adv_L5, away_id, 'REB_PCT', 0)
-    l5_away_team_reb_rank = safe_get_value(data_adv_L5, away_id, 'REB_PCT_RANK', 0)
-## League Average
-    la_reb = round(data_adv_season['REB_PCT'].mean(), 3)
-    l5_la_reb = round(data_adv_L5['REB_PCT'].mean(), 3)
-## Home Team
-    home_team_reb = safe_get_value(data_adv_season, home_id, 'REB_PCT', 0)
-    home_team_reb_rank = safe_get_value(data_adv_season, home_id, 'REB_PCT_RANK', 0)
-    l5_home_team_reb = safe_get_value(data_adv_L5, home_id, 'REB_PCT', 0)
-    l5_home_team_reb_rank = safe_get_value(data_adv_L5, home_id, 'REB_PCT_RANK', 0)
-else:
-    # Set default values when no game is found
-    away_team_record = None
-    away_team_seed = None
-    away_team_division_seed = None
-    home_team_record = None
-    home_team_seed = None
-    home_team_division_seed = None
-    away_team_ortg = 0
-    away_team_ortg_rank = 0
-    l5_away_team_ortg = 0
-    l5_away_team_ortg_rank = 0
-    la_ortg = 0
-    l5_la_ortg = 0
-    home_team_ortg = 0
-    home_team_ortg_rank = 0
-    l5_home_team_ortg = 0
-    l5_home_team_ortg_rank = 0
+
+# Matchup stats (away_team_*, home_team_*, l5_*, la_*) for the selected matchup
+MATCHUP_STATS_PREFIXES = ('away_team_', 'home_team_', 'l5_', 'la_')
+_matchup_stats_ids = None
+_matchup_stats_names = ()
+
+
+def _build_matchup_stats():
+    """Compute the matchup stats for away_id/home_id from the loaded datasets."""
+    datasets = load_datasets(*MATCHUP_STATS_DATASETS)
+    
+    # Both teams' rows of every dataset, one indexed lookup each
+    cards = get_matchup_card(away_id, home_id)
+    
+    # Only calculate stats if we have valid team IDs
+    if away_id is not None and home_id is not None:
+    #Record and Seed
+    ## Away Team
+        away_team_record = cards['standings']['away'].get('Record')
+        away_team_seed = cards['standings']['away'].get('PlayoffRank')
+        away_team_division_seed = cards['standings']['away'].get('DivisionRank')
+    
+    ## Home Team
+        home_team_record = cards['standings']['home'].get('Record')
+        home_team_seed = cards['standings']['home'].get('PlayoffRank')
+        home_team_division_seed = cards['standings']['home'].get('DivisionRank')
+    
+    #Offensive Ratings
+    ## Away Team
+        away_team_ortg = cards['data_adv_season']['away'].get('OFF_RATING', 0)
+        away_team_ortg_rank = cards['data_adv_season']['away'].get('OFF_RATING_RANK', 0)
+        l5_away_team_ortg = cards['data_adv_L5']['away'].get('OFF_RATING', 0)
+        l5_away_team_ortg_rank = cards['data_adv_L5']['away'].get('OFF_RATING_RANK', 0)
+    ##League Average
+        la_ortg = round(datasets['data_adv_season']['OFF_RATING'].mean(), 1)
+        l5_la_ortg = round(datasets['data_adv_L5']['OFF_RATING'].mean(), 1)
+    ## Home Team
+        home_team_ortg = cards['data_adv_season']['home'].get('OFF_RATING', 0)
+        home_team_ortg_rank = cards['data_adv_season']['home'].get('OFF_RATING_RANK', 0)
+        l5_home_team_ortg = cards['data_adv_L5']['home'].get('OFF_RATING', 0)
+        l5_home_team_ortg_rank = cards['data_adv_L5']['home'].get('OFF_RATING_RANK', 0)
     
     #Defensive Ratings
     ## Away Team
-    away_team_drtg = 0
-    away_team_drtg_rank = 0
-    l5_away_team_drtg = 0
-    l5_away_team_drtg_rank = 0
+        away_team_drtg = cards['data_adv_season']['away'].get('DEF_RATING', 0)
+        away_team_drtg_rank = cards['data_adv_season']['away'].get('DEF_RATING_RANK', 0)
+        l5_away_team_drtg = cards['data_adv_L5']['away'].get('DEF_RATING', 0)
+        l5_away_team_drtg_rank = cards['data_adv_L5']['away'].get('DEF_RATING_RANK', 0)
     ##League Average
-    la_drtg = round(data_adv_season['DEF_RATING'].mean(), 1)
-    l5_la_drtg = round(data_adv_L5['DEF_RATING'].mean(), 1)
+        la_drtg = round(datasets['data_adv_season']['DEF_RATING'].mean(), 1)
+        l5_la_drtg = round(datasets['data_adv_L5']['DEF_RATING'].mean(), 1)
     ## Home Team
-    home_team_drtg = 0
-    home_team_drtg_rank = 0
-    l5_home_team_drtg = 0
-    l5_home_team_drtg_rank = 0
+        home_team_drtg = cards['data_adv_season']['home'].get('DEF_RATING', 0)
+        home_team_drtg_rank = cards['data_adv_season']['home'].get('DEF_RATING_RANK', 0)
+        l5_home_team_drtg = cards['data_adv_L5']['home'].get('DEF_RATING', 0)
+        l5_home_team_drtg_rank = cards['data_adv_L5']['home'].get('DEF_RATING_RANK', 0)
     
     #Net Ratings
     ## Away Team
-    away_team_net = 0
-    away_team_net_rank = 0
-    l5_away_team_net = 0
-    l5_away_team_net_rank = 0
+        away_team_net = cards['data_adv_season']['away'].get('NET_RATING', 0)
+        away_team_net_rank = cards['data_adv_season']['away'].get('NET_RATING_RANK', 0)
+        l5_away_team_net = cards['data_adv_L5']['away'].get('NET_RATING', 0)
+        l5_away_team_net_rank = cards['data_adv_L5']['away'].get('NET_RATING_RANK', 0)
     ##League Average
-    la_net = 0
-    l5_la_net = 0
+        la_net = 0
+        l5_la_net = 0
     ## Home Team
-    home_team_net = 0
-    home_team_net_rank = 0
-    l5_home_team_net = 0
-    l5_home_team_net_rank = 0
+        home_team_net = cards['data_adv_season']['home'].get('NET_RATING', 0)
+        home_team_net_rank = cards['data_adv_season']['home'].get('NET_RATING_RANK', 0)
+        l5_home_team_net = cards['data_adv_L5']['home'].get('NET_RATING', 0)
+        l5_home_team_net_rank = cards['data_adv_L5']['home'].get('NET_RATING_RANK', 0)
     
     #REBOUND PERCENTAGES
-    
+
     #DREB%
     ## Away Team
-    away_team_dreb = 0
-    away_team_dreb_rank = 0
-    l5_away_team_dreb = 0
-    l5_away_team_dreb_rank = 0
+        away_team_dreb = cards['data_adv_season']['away'].get('DREB_PCT', 0)
+        away_team_dreb_rank = cards['data_adv_season']['away'].get('DREB_PCT_RANK', 0)
+        l5_away_team_dreb = cards['data_adv_L5']['away'].get('DREB_PCT', 0)
+        l5_away_team_dreb_rank = cards['data_adv_L5']['away'].get('DREB_PCT_RANK', 0)
     ## League Average
-    la_dreb = round(data_adv_season['DREB_PCT'].mean(), 3)
-    l5_la_dreb = round(data_adv_L5['DREB_PCT'].mean(), 3)
+        la_dreb = round(datasets['data_adv_season']['DREB_PCT'].mean(), 3)
+        l5_la_dreb = round(datasets['data_adv_L5']['DREB_PCT'].mean(), 3)
     ## Home Team
-    home_team_dreb = 0
-    home_team_dreb_rank = 0
-    l5_home_team_dreb = 0
-    l5_home_team_dreb_rank = 0
+        home_team_dreb = cards['data_adv_season']['home'].get('DREB_PCT', 0)
+        home_team_dreb_rank = cards['data_adv_season']['home'].get('DREB_PCT_RANK', 0)
+        l5_home_team_dreb = cards['data_adv_L5']['home'].get('DREB_PCT', 0)
+        l5_home_team_dreb_rank = cards['data_adv_L5']['home'].get('DREB_PCT_RANK', 0)
     
     #OREB%
     ## Away Team
-    away_team_oreb = 0
-    away_team_oreb_rank = 0
-    l5_away_team_oreb = 0
-    l5_away_team_oreb_rank = 0
+        away_team_oreb = cards['data_adv_season']['away'].get('OREB_PCT', 0)
+        away_team_oreb_rank = cards['data_adv_season']['away'].get('OREB_PCT_RANK', 0)
+        l5_away_team_oreb = cards['data_adv_L5']['away'].get('OREB_PCT', 0)
+        l5_away_team_oreb_rank = cards['data_adv_L5']['away'].get('OREB_PCT_RANK', 0)
     ## League Average
-    la_oreb = round(data_adv_season['OREB_PCT'].mean(), 3)
-    l5_la_oreb = round(data_adv_L5['OREB_PCT'].mean(), 3)
+        la_oreb = round(datasets['data_adv_season']['OREB_PCT'].mean(), 3)
+        l5_la_oreb = round(datasets['data_adv_L5']['OREB_PCT'].mean(), 3)
     ## Home Team
-    home_team_oreb = 0
-    home_team_oreb_rank = 0
-    l5_home_team_oreb = 0
-    l5_home_team_oreb_rank = 0
+        home_team_oreb = cards['data_adv_season']['home'].get('OREB_PCT', 0)
+        home_team_oreb_rank = cards['data_adv_season']['home'].get('OREB_PCT_RANK', 0)
+        l5_home_team_oreb = cards['data_adv_L5']['home'].get('OREB_PCT', 0)
+        l5_home_team_oreb_rank = cards['data_adv_L5']['home'].get('OREB_PCT_RANK', 0)
     
     #REB%
     ## Away Team
-    away_team_reb = 0
-    away_team_reb_rank = 0
-    l5_away_team_reb = 0
-    l5_away_team_reb_rank = 0
+        away_team_reb = cards['data_adv_season']['away'].get('REB_PCT', 0)
+        away_team_reb_rank = cards['data_adv_season']['away'].get('REB_PCT_RANK', 0)
+        l5_away_team_reb = cards['data_adv_L5']['away'].get('REB_PCT', 0)
+        l5_away_team_reb_rank = cards['data_adv_L5']['away'].get('REB_PCT_RANK', 0)
     ## League Average
-    la_reb = round(data_adv_season['REB_PCT'].mean(), 3)
-    l5_la_reb = round(data_adv_L5['REB_PCT'].mean(), 3)
+        la_reb = round(datasets['data_adv_season']['REB_PCT'].mean(), 3)
+        l5_la_reb = round(datasets['data_adv_L5']['REB_PCT'].mean(), 3)
     ## Home Team
-    home_team_reb = 0
-    home_team_reb_rank = 0
-    l5_home_team_reb = 0
-    l5_home_team_reb_rank = 0
-    
-    # Initialize all other stats used by the app to defaults
-    away_team_pitp_off = 0
-    away_team_pitp_off_rank = 0
-    l5_away_team_pitp_off = 0
-    l5_away_team_pitp_off_rank = 0
-    home_team_pitp_off = 0
-    home_team_pitp_off_rank = 0
-    l5_home_team_pitp_off = 0
-    l5_home_team_pitp_off_rank = 0
-    away_team_pitp_def = 0
-    away_team_pitp_def_rank = 0
-    l5_away_team_pitp_def = 0
-    l5_away_team_pitp_def_rank = 0
-    home_team_pitp_def = 0
-    home_team_pitp_def_rank = 0
-    l5_home_team_pitp_def = 0
-    l5_home_team_pitp_def_rank = 0
-    away_team_2c_off = 0
-    away_team_2c_off_rank = 0
-    l5_away_team_2c_off = 0
-    l5_away_team_2c_off_rank = 0
-    home_team_2c_off = 0
-    home_team_2c_off_rank = 0
-    l5_home_team_2c_off = 0
-    l5_home_team_2c_off_rank = 0
-    away_team_2c_def = 0
-    away_team_2c_def_rank = 0
-    l5_away_team_2c_def = 0
-    l5_away_team_2c_def_rank = 0
-    home_team_2c_def = 0
-    home_team_2c_def_rank = 0
-    l5_home_team_2c_def = 0
-    l5_home_team_2c_def_rank = 0
-    away_team_fb_off = 0
-    away_team_fb_off_rank = 0
-    l5_away_team_fb_off = 0
-    l5_away_team_fb_off_rank = 0
-    home_team_fb_off = 0
-    home_team_fb_off_rank = 0
-    l5_home_team_fb_off = 0
-    l5_home_team_fb_off_rank = 0
-    away_team_fb_def = 0
-    away_team_fb_def_rank = 0
-    l5_away_team_fb_def = 0
-    l5_away_team_fb_def_rank = 0
-    home_team_fb_def = 0
-    home_team_fb_def_rank = 0
-    l5_home_team_fb_def = 0
-    l5_home_team_fb_def_rank = 0
-    away_team_pace = 0
-    away_team_pace_rank = 0
-    l5_away_team_pace = 0
-    l5_away_team_pace_rank = 0
-    away_team_ast = 0
-    away_team_ast_rank = 0
-    l5_away_team_ast = 0
-    l5_away_team_ast_rank = 0
-    away_team_ast_pct = 0
-    away_team_ast_pct_rank = 0
-    l5_away_team_ast_pct = 0
-    l5_away_team_ast_pct_rank = 0
-    away_team_tov = 0
-    away_team_tov_rank = 0
-    l5_away_team_tov = 0
-    l5_away_team_tov_rank = 0
-    away_team_tov_pct = 0
-    away_team_tov_pct_rank = 0
-    l5_away_team_tov_pct = 0
-    l5_away_team_tov_pct_rank = 0
-    away_team_pts_off_tov = 0
-    away_team_pts_off_tov_rank = 0
-    l5_away_team_pts_off_tov = 0
-    l5_away_team_pts_off_tov_rank = 0
-    home_team_opp_pts_off_tov = 0
-    home_team_opp_pts_off_tov_rank = 0
-    l5_home_team_opp_pts_off_tov = 0
-    l5_home_team_opp_pts_off_tov_rank = 0
-    away_team_ast_tov = 0
-    away_team_ast_tov_rank = 0
-    l5_away_team_ast_tov = 0
-    l5_away_team_ast_tov_rank = 0
-    away_team_starters_scoring = 0
-    away_team_starters_scoring_rank = 0
-    l5_away_team_starters_scoring = 0
-    l5_away_team_starters_scoring_rank = 0
-    away_team_bench_scoring = 0
-    away_team_bench_scoring_rank = 0
-    l5_away_team_bench_scoring = 0
-    l5_away_team_bench_scoring_rank = 0
-    away_team_opp_tov_pct = 0
-    away_team_opp_tov_pct_rank = 0
-    l5_away_team_opp_tov_pct = 0
-    l5_away_team_opp_tov_pct_rank = 0
-
-#POINTS IN THE PAINT
-# Only calculate if we have valid team IDs
-if away_id is not None and home_id is not None:
-#OFFENSE
-## Away Team
-        away_team_pitp_off = safe_get_value(data_misc_season, away_id, 'PTS_PAINT', 0)
-        away_team_pitp_off_rank = safe_get_value(data_misc_season, away_id, 'PTS_PAINT_RANK', 0)
-        l5_away_team_pitp_off = safe_get_value(data_misc_L5, away_id, 'PTS_PAINT', 0)
-        l5_away_team_pitp_off_rank = safe_get_value(data_misc_L5, away_id, 'PTS_PAINT_RANK', 0)
-## League Average
-        la_pitp_off = round(data_misc_season['PTS_PAINT'].mean(), 1)
-        l5_la_pitp_off = round(data_misc_L5['PTS_PAINT'].mean(), 1)
-## Home Team
-        home_team_pitp_off = safe_get_value(data_misc_season, home_id, 'PTS_PAINT', 0)
-        home_team_pitp_off_rank = safe_get_value(data_misc_season, home_id, 'PTS_PAINT_RANK', 0)
-        l5_home_team_pitp_off = safe_get_value(data_misc_L5, home_id, 'PTS_PAINT', 0)
-        l5_home_team_pitp_off_rank = safe_get_value(data_misc_L5, home_id, 'PTS_PAINT_RANK', 0)
-
-#DEFENSE
-## Away Team
-        away_team_pitp_def = safe_get_value(data_misc_season, away_id, 'OPP_PTS_PAINT', 0)
-        away_team_pitp_def_rank = safe_get_value(data_misc_season, away_id, 'OPP_PTS_PAINT_RANK', 0)
-        l5_away_team_pitp_def = safe_get_value(data_misc_L5, away_id, 'OPP_PTS_PAINT', 0)
-        l5_away_team_pitp_def_rank = safe_get_value(data_misc_L5, away_id, 'OPP_PTS_PAINT_RANK', 0)
-## League Average
-        la_pitp_def = round(data_misc_season['OPP_PTS_PAINT'].mean(), 1)
-        l5_la_pitp_def = round(data_misc_L5['OPP_PTS_PAINT'].mean(), 1)
-## Home Team
-        home_team_pitp_def = safe_get_value(data_misc_season, home_id, 'OPP_PTS_PAINT', 0)
-        home_team_pitp_def_rank = safe_get_value(data_misc_season, home_id, 'OPP_PTS_PAINT_RANK', 0)
-        l5_home_team_pitp_def = safe_get_value(data_misc_L5, home_id, 'OPP_PTS_PAINT', 0)
-        l5_home_team_pitp_def_rank = safe_get_value(data_misc_L5, home_id, 'OPP_PTS_PAINT_RANK', 0)
-
-#DIFFERENCE
-## Away Team
-        away_team_pitp_diff = round(safe_get_value(data_misc_season, away_id, 'PTS_PAINT_DIFF', 0), 1)
-        away_team_pitp_diff_rank = int(data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_PAINT_DIFF_RANK'].values[0])
-        l5_away_team_pitp_diff = round(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_PAINT_DIFF'].values[0], 1)
-        l5_away_team_pitp_diff_rank = int(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_PAINT_DIFF_RANK'].values[0])
-## League Average
-        la_pitp_diff = round(data_misc_season['PTS_PAINT_DIFF'].mean(), 1)
-        l5_la_pitp_diff = round(data_misc_L5['PTS_PAINT_DIFF'].mean(), 1)
-## Home Team
-        home_team_pitp_diff = round(data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_PAINT_DIFF'].values[0], 1)
-        home_team_pitp_diff_rank = int(data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_PAINT_DIFF_RANK'].values[0])
-        l5_home_team_pitp_diff = round(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_PAINT_DIFF'].values[0], 1)
-        l5_home_team_pitp_diff_rank = int(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_PAINT_DIFF_RANK'].values[0])
-else:
-    # Set default values when team IDs are not available
-    away_team_pitp_off = 0
-    away_team_pitp_off_rank = 0
-    l5_away_team_pitp_off = 0
-    l5_away_team_pitp_off_rank = 0
-    home_team_pitp_off = 0
-    home_team_pitp_off_rank = 0
-    l5_home_team_pitp_off = 0
-    l5_home_team_pitp_off_rank = 0
-    away_team_pitp_def = 0
-    away_team_pitp_def_rank = 0
-    l5_away_team_pitp_def = 0
-    l5_away_team_pitp_def_rank = 0
-    home_team_pitp_def = 0
-    home_team_pitp_def_rank = 0
-    l5_home_team_pitp_def = 0
-    l5_home_team_pitp_def_rank = 0
-    away_team_pitp_diff = 0
-    away_team_pitp_diff_rank = 0
-    l5_away_team_pitp_diff = 0
-    l5_away_team_pitp_diff_rank = 0
-    home_team_pitp_diff = 0
-    home_team_pitp_diff_rank = 0
-    l5_home_team_pitp_diff = 0
-    l5_home_team_pitp_diff_rank = 0
-    la_pitp_off = 0
-    l5_la_pitp_off = 0
-    la_pitp_def = 0
-    l5_la_pitp_def = 0
-    la_pitp_diff = 0
-    l5_la_pitp_diff = 0
-
-#2ND CHANCE POINTS
-# Only calculate if we have valid team IDs
-if away_id is not None and home_id is not None:
-#OFFENSE
-## Away Team
-    away_team_2c_off = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_2ND_CHANCE'].values[0]
-    away_team_2c_off_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_2ND_CHANCE_RANK'].values[0]
-    l5_away_team_2c_off = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_2ND_CHANCE'].values[0]
-    l5_away_team_2c_off_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_2ND_CHANCE_RANK'].values[0]
-##League Average
-    la_2c_off = round(data_misc_season['PTS_2ND_CHANCE'].mean(), 1)
-    l5_la_2c_off = round(data_misc_L5['PTS_2ND_CHANCE'].mean(), 1)
-## Home Team
-    home_team_2c_off = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_2ND_CHANCE'].values[0]
-    home_team_2c_off_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_2ND_CHANCE_RANK'].values[0]
-    l5_home_team_2c_off = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_2ND_CHANCE'].values[0]
-    l5_home_team_2c_off_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_2ND_CHANCE_RANK'].values[0]
-
-#DEFENSE
-## Away Team
-    away_team_2c_def = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'OPP_PTS_2ND_CHANCE'].values[0]
-    away_team_2c_def_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'OPP_PTS_2ND_CHANCE_RANK'].values[0]
-    l5_away_team_2c_def = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'OPP_PTS_2ND_CHANCE'].values[0]
-    l5_away_team_2c_def_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'OPP_PTS_2ND_CHANCE_RANK'].values[0]
-##League Average
-    la_2c_def = round(data_misc_season['OPP_PTS_2ND_CHANCE'].mean(), 1)
-    l5_la_2c_def = round(data_misc_L5['OPP_PTS_2ND_CHANCE'].mean(), 1)
-## Home Team
-    home_team_2c_def = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'OPP_PTS_2ND_CHANCE'].values[0]
-    home_team_2c_def_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'OPP_PTS_2ND_CHANCE_RANK'].values[0]
-    l5_home_team_2c_def = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'OPP_PTS_2ND_CHANCE'].values[0]
-    l5_home_team_2c_def_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'OPP_PTS_2ND_CHANCE_RANK'].values[0]
-
-#DIFFERENCE
-## Away Team
-    away_team_2c_diff = round(data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_2ND_CHANCE_DIFF'].values[0], 1)
-    away_team_2c_diff_rank = int(data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_2ND_CHANCE_DIFF_RANK'].values[0])
-    l5_away_team_2c_diff = round(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_2ND_CHANCE_DIFF'].values[0], 1)
-    l5_away_team_2c_diff_rank = int(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_2ND_CHANCE_DIFF_RANK'].values[0])
-## League Average
-    la_2c_diff = round(data_misc_season['PTS_2ND_CHANCE_DIFF'].mean(), 1)
-    l5_la_2c_diff = round(data_misc_L5['PTS_2ND_CHANCE_DIFF'].mean(), 1)
-## Home Team
-    home_team_2c_diff = round(data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_2ND_CHANCE_DIFF'].values[0], 1)
-    home_team_2c_diff_rank = int(data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_2ND_CHANCE_DIFF_RANK'].values[0])
-    l5_home_team_2c_diff = round(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_2ND_CHANCE_DIFF'].values[0], 1)
-    l5_home_team_2c_diff_rank = int(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_2ND_CHANCE_DIFF_RANK'].values[0])
-
-    #FAST BREAK POINTS
-
+        home_team_reb = cards['data_adv_season']['home'].get('REB_PCT', 0)
+        home_team_reb_rank = cards['data_adv_season']['home'].get('REB_PCT_RANK', 0)
+        l5_home_team_reb = cards['data_adv_L5']['home'].get('REB_PCT', 0)
+        l5_home_team_reb_rank = cards['data_adv_L5']['home'].get('REB_PCT_RANK', 0)
+    else:
+        # Set default values when no game is found
+        away_team_record = None
+        away_team_seed = None
+        away_team_division_seed = None
+        home_team_record = None
+        home_team_seed = None
+        home_team_division_seed = None
+        away_team_ortg = 0
+        away_team_ortg_rank = 0
+        l5_away_team_ortg = 0
+        l5_away_team_ortg_rank = 0
+        la_ortg = 0
+        l5_la_ortg = 0
+        home_team_ortg = 0
+        home_team_ortg_rank = 0
+        l5_home_team_ortg = 0
+        l5_home_team_ortg_rank = 0
+
+        #Defensive Ratings
+        ## Away Team
+        away_team_drtg = 0
+        away_team_drtg_rank = 0
+        l5_away_team_drtg = 0
+        l5_away_team_drtg_rank = 0
+        ##League Average
+        la_drtg = round(datasets['data_adv_season']['DEF_RATING'].mean(), 1)
+        l5_la_drtg = round(datasets['data_adv_L5']['DEF_RATING'].mean(), 1)
+        ## Home Team
+        home_team_drtg = 0
+        home_team_drtg_rank = 0
+        l5_home_team_drtg = 0
+        l5_home_team_drtg_rank = 0
+
+        #Net Ratings
+        ## Away Team
+        away_team_net = 0
+        away_team_net_rank = 0
+        l5_away_team_net = 0
+        l5_away_team_net_rank = 0
+        ##League Average
+        la_net = 0
+        l5_la_net = 0
+        ## Home Team
+        home_team_net = 0
+        home_team_net_rank = 0
+        l5_home_team_net = 0
+        l5_home_team_net_rank = 0
+
+        #REBOUND PERCENTAGES
+
+        #DREB%
+        ## Away Team
+        away_team_dreb = 0
+        away_team_dreb_rank = 0
+        l5_away_team_dreb = 0
+        l5_away_team_dreb_rank = 0
+        ## League Average
+        la_dreb = round(datasets['data_adv_season']['DREB_PCT'].mean(), 3)
+        l5_la_dreb = round(datasets['data_adv_L5']['DREB_PCT'].mean(), 3)
+        ## Home Team
+        home_team_dreb = 0
+        home_team_dreb_rank = 0
+        l5_home_team_dreb = 0
+        l5_home_team_dreb_rank = 0
+
+        #OREB%
+        ## Away Team
+        away_team_oreb = 0
+        away_team_oreb_rank = 0
+        l5_away_team_oreb = 0
+        l5_away_team_oreb_rank = 0
+        ## League Average
+        la_oreb = round(datasets['data_adv_season']['OREB_PCT'].mean(), 3)
+        l5_la_oreb = round(datasets['data_adv_L5']['OREB_PCT'].mean(), 3)
+        ## Home Team
+        home_team_oreb = 0
+        home_team_oreb_rank = 0
+        l5_home_team_oreb = 0
+        l5_home_team_oreb_rank = 0
+
+        #REB%
+        ## Away Team
+        away_team_reb = 0
+        away_team_reb_rank = 0
+        l5_away_team_reb = 0
+        l5_away_team_reb_rank = 0
+        ## League Average
+        la_reb = round(datasets['data_adv_season']['REB_PCT'].mean(), 3)
+        l5_la_reb = round(datasets['data_adv_L5']['REB_PCT'].mean(), 3)
+        ## Home Team
+        home_team_reb = 0
+        home_team_reb_rank = 0
+        l5_home_team_reb = 0
+        l5_home_team_reb_rank = 0
+
+        # Initialize all other stats used by the app to defaults
+        away_team_pitp_off = 0
+        away_team_pitp_off_rank = 0
+        l5_away_team_pitp_off = 0
+        l5_away_team_pitp_off_rank = 0
+        home_team_pitp_off = 0
+        home_team_pitp_off_rank = 0
+        l5_home_team_pitp_off = 0
+        l5_home_team_pitp_off_rank = 0
+        away_team_pitp_def = 0
+        away_team_pitp_def_rank = 0
+        l5_away_team_pitp_def = 0
+        l5_away_team_pitp_def_rank = 0
+        home_team_pitp_def = 0
+        home_team_pitp_def_rank = 0
+        l5_home_team_pitp_def = 0
+        l5_home_team_pitp_def_rank = 0
+        away_team_2c_off = 0
+        away_team_2c_off_rank = 0
+        l5_away_team_2c_off = 0
+        l5_away_team_2c_off_rank = 0
+        home_team_2c_off = 0
+        home_team_2c_off_rank = 0
+        l5_home_team_2c_off = 0
+        l5_home_team_2c_off_rank = 0
+        away_team_2c_def = 0
+        away_team_2c_def_rank = 0
+        l5_away_team_2c_def = 0
+        l5_away_team_2c_def_rank = 0
+        home_team_2c_def = 0
+        home_team_2c_def_rank = 0
+        l5_home_team_2c_def = 0
+        l5_home_team_2c_def_rank = 0
+        away_team_fb_off = 0
+        away_team_fb_off_rank = 0
+        l5_away_team_fb_off = 0
+        l5_away_team_fb_off_rank = 0
+        home_team_fb_off = 0
+        home_team_fb_off_rank = 0
+        l5_home_team_fb_off = 0
+        l5_home_team_fb_off_rank = 0
+        away_team_fb_def = 0
+        away_team_fb_def_rank = 0
+        l5_away_team_fb_def = 0
+        l5_away_team_fb_def_rank = 0
+        home_team_fb_def = 0
+        home_team_fb_def_rank = 0
+        l5_home_team_fb_def = 0
+        l5_home_team_fb_def_rank = 0
+        away_team_pace = 0
+        away_team_pace_rank = 0
+        l5_away_team_pace = 0
+        l5_away_team_pace_rank = 0
+        away_team_ast = 0
+        away_team_ast_rank = 0
+        l5_away_team_ast = 0
+        l5_away_team_ast_rank = 0
+        away_team_ast_pct = 0
+        away_team_ast_pct_rank = 0
+        l5_away_team_ast_pct = 0
+        l5_away_team_ast_pct_rank = 0
+        away_team_tov = 0
+        away_team_tov_rank = 0
+        l5_away_team_tov = 0
+        l5_away_team_tov_rank = 0
+        away_team_tov_pct = 0
+        away_team_tov_pct_rank = 0
+        l5_away_team_tov_pct = 0
+        l5_away_team_tov_pct_rank = 0
+        away_team_pts_off_tov = 0
+        away_team_pts_off_tov_rank = 0
+        l5_away_team_pts_off_tov = 0
+        l5_away_team_pts_off_tov_rank = 0
+        home_team_opp_pts_off_tov = 0
+        home_team_opp_pts_off_tov_rank = 0
+        l5_home_team_opp_pts_off_tov = 0
+        l5_home_team_opp_pts_off_tov_rank = 0
+        away_team_ast_tov = 0
+        away_team_ast_tov_rank = 0
+        l5_away_team_ast_tov = 0
+        l5_away_team_ast_tov_rank = 0
+        away_team_starters_scoring = 0
+        away_team_starters_scoring_rank = 0
+        l5_away_team_starters_scoring = 0
+        l5_away_team_starters_scoring_rank = 0
+        away_team_bench_scoring = 0
+        away_team_bench_scoring_rank = 0
+        l5_away_team_bench_scoring = 0
+        l5_away_team_bench_scoring_rank = 0
+        away_team_opp_tov_pct = 0
+        away_team_opp_tov_pct_rank = 0
+        l5_away_team_opp_tov_pct = 0
+        l5_away_team_opp_tov_pct_rank = 0
+
+    #POINTS IN THE PAINT
+    # Only calculate if we have valid team IDs
+    if away_id is not None and home_id is not None:
     #OFFENSE
     ## Away Team
-    away_team_fb_off = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_FB'].values[0]
-    away_team_fb_off_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_FB_RANK'].values[0]
-    l5_away_team_fb_off = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_FB'].values[0]
-    l5_away_team_fb_off_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_FB_RANK'].values[0]
-    ##League Average
-    la_fb_off = round(data_misc_season['PTS_FB'].mean(), 1)
-    l5_la_fb_off = round(data_misc_L5['PTS_FB'].mean(), 1)
-    ## Home Team
-    home_team_fb_off = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_FB'].values[0]
-    home_team_fb_off_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_FB_RANK'].values[0]
-    l5_home_team_fb_off = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_FB'].values[0]
-    l5_home_team_fb_off_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_FB_RANK'].values[0]
-
-    #DEFENSE
-    ## Away Team
-    away_team_fb_def = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'OPP_PTS_FB'].values[0]
-    away_team_fb_def_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'OPP_PTS_FB_RANK'].values[0]
-    l5_away_team_fb_def = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'OPP_PTS_FB'].values[0]
-    l5_away_team_fb_def_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'OPP_PTS_FB_RANK'].values[0]
-    ##League Average
-    la_fb_def = round(data_misc_season['OPP_PTS_FB'].mean(), 1)
-    l5_la_fb_def = round(data_misc_L5['OPP_PTS_FB'].mean(), 1)
-    ## Home Team
-    home_team_fb_def = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'OPP_PTS_FB'].values[0]
-    home_team_fb_def_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'OPP_PTS_FB_RANK'].values[0]
-    l5_home_team_fb_def = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'OPP_PTS_FB'].values[0]
-    l5_home_team_fb_def_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'OPP_PTS_FB_RANK'].values[0]
-
-    #DIFFERENCE
-    ## Away Team
-    away_team_fb_diff = round(data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_FB_DIFF'].values[0], 1)
-    away_team_fb_diff_rank = int(data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_FB_DIFF_RANK'].values[0])
-    l5_away_team_fb_diff = round(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_FB_DIFF'].values[0], 1)
-    l5_away_team_fb_diff_rank = int(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_FB_DIFF_RANK'].values[0])
+            away_team_pitp_off = cards['data_misc_season']['away'].get('PTS_PAINT', 0)
+            away_team_pitp_off_rank = cards['data_misc_season']['away'].get('PTS_PAINT_RANK', 0)
+            l5_away_team_pitp_off = cards['data_misc_L5']['away'].get('PTS_PAINT', 0)
+            l5_away_team_pitp_off_rank = cards['data_misc_L5']['away'].get('PTS_PAINT_RANK', 0)
     ## League Average
-    la_fb_diff = round(data_misc_season['PTS_FB_DIFF'].mean(), 1)
-    l5_la_fb_diff = round(data_misc_L5['PTS_FB_DIFF'].mean(), 1)
+            la_pitp_off = round(datasets['data_misc_season']['PTS_PAINT'].mean(), 1)
+            l5_la_pitp_off = round(datasets['data_misc_L5']['PTS_PAINT'].mean(), 1)
     ## Home Team
-    home_team_fb_diff = round(data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_FB_DIFF'].values[0], 1)
-    home_team_fb_diff_rank = int(data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_FB_DIFF_RANK'].values[0])
-    l5_home_team_fb_diff = round(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_FB_DIFF'].values[0], 1)
-    l5_home_team_fb_diff_rank = int(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_FB_DIFF_RANK'].values[0])
-
-    #PLAYMAKING STATS
-
-    #PACE
+            home_team_pitp_off = cards['data_misc_season']['home'].get('PTS_PAINT', 0)
+            home_team_pitp_off_rank = cards['data_misc_season']['home'].get('PTS_PAINT_RANK', 0)
+            l5_home_team_pitp_off = cards['data_misc_L5']['home'].get('PTS_PAINT', 0)
+            l5_home_team_pitp_off_rank = cards['data_misc_L5']['home'].get('PTS_PAINT_RANK', 0)
+    
+    #DEFENSE
     ## Away Team
-    away_team_pace = data_adv_season.loc[data_adv_season['TEAM_ID'] == away_id, 'PACE'].values[0]
-    away_team_pace_rank = data_adv_season.loc[data_adv_season['TEAM_ID'] == away_id, 'PACE_RANK'].values[0]
-    l5_away_team_pace = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == away_id, 'PACE'].values[0]
-    l5_away_team_pace_rank = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == away_id, 'PACE_RANK'].values[0]
-
+            away_team_pitp_def = cards['data_misc_season']['away'].get('OPP_PTS_PAINT', 0)
+            away_team_pitp_def_rank = cards['data_misc_season']['away'].get('OPP_PTS_PAINT_RANK', 0)
+            l5_away_team_pitp_def = cards['data_misc_L5']['away'].get('OPP_PTS_PAINT', 0)
+            l5_away_team_pitp_def_rank = cards['data_misc_L5']['away'].get('OPP_PTS_PAINT_RANK', 0)
     ## League Average
-    la_pace = round(data_adv_season['PACE'].mean(), 1)
-    l5_la_pace = round(data_adv_L5['PACE'].mean(), 1)
-
+            la_pitp_def = round(datasets['data_misc_season']['OPP_PTS_PAINT'].mean(), 1)
+            l5_la_pitp_def = round(datasets['data_misc_L5']['OPP_PTS_PAINT'].mean(), 1)
     ## Home Team
-    home_team_pace = data_adv_season.loc[data_adv_season['TEAM_ID'] == home_id, 'PACE'].values[0]
-    home_team_pace_rank = data_adv_season.loc[data_adv_season['TEAM_ID'] == home_id, 'PACE_RANK'].values[0]
-    l5_home_team_pace = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == home_id, 'PACE'].values[0]
-    l5_home_team_pace_rank = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == home_id, 'PACE_RANK'].values[0]
-
-    #ASSISTS
+            home_team_pitp_def = cards['data_misc_season']['home'].get('OPP_PTS_PAINT', 0)
+            home_team_pitp_def_rank = cards['data_misc_season']['home'].get('OPP_PTS_PAINT_RANK', 0)
+            l5_home_team_pitp_def = cards['data_misc_L5']['home'].get('OPP_PTS_PAINT', 0)
+            l5_home_team_pitp_def_rank = cards['data_misc_L5']['home'].get('OPP_PTS_PAINT_RANK', 0)
+    
+    #DIFFERENCE
     ## Away Team
-    away_team_ast = data_trad_season.loc[data_trad_season['TEAM_ID'] == away_id, 'AST'].values[0]
-    away_team_ast_rank = data_trad_season.loc[data_trad_season['TEAM_ID'] == away_id, 'AST_RANK'].values[0]
-    l5_away_team_ast = data_trad_L5.loc[data_trad_L5['TEAM_ID'] == away_id, 'AST'].values[0]
-    l5_away_team_ast_rank = data_trad_L5.loc[data_trad_L5['TEAM_ID'] == away_id, 'AST_RANK'].values[0]
-
+            away_team_pitp_diff = round(cards['data_misc_season']['away'].get('PTS_PAINT_DIFF', 0), 1)
+            away_team_pitp_diff_rank = int(cards['data_misc_season']['away']['PTS_PAINT_DIFF_RANK'])
+            l5_away_team_pitp_diff = round(cards['data_misc_L5']['away']['PTS_PAINT_DIFF'], 1)
+            l5_away_team_pitp_diff_rank = int(cards['data_misc_L5']['away']['PTS_PAINT_DIFF_RANK'])
     ## League Average
-    la_ast = round(data_trad_season['AST'].mean(), 1)
-    l5_la_ast = round(data_trad_L5['AST'].mean(), 1)
-
+            la_pitp_diff = round(datasets['data_misc_season']['PTS_PAINT_DIFF'].mean(), 1)
+            l5_la_pitp_diff = round(datasets['data_misc_L5']['PTS_PAINT_DIFF'].mean(), 1)
     ## Home Team
-    home_team_ast = data_trad_season.loc[data_trad_season['TEAM_ID'] == home_id, 'AST'].values[0]
-    home_team_ast_rank = data_trad_season.loc[data_trad_season['TEAM_ID'] == home_id, 'AST_RANK'].values[0]
-    l5_home_team_ast = data_trad_L5.loc[data_trad_L5['TEAM_ID'] == home_id, 'AST'].values[0]
-    l5_home_team_ast_rank = data_trad_L5.loc[data_trad_L5['TEAM_ID'] == home_id, 'AST_RANK'].values[0]
-
-    #ASSIST PERCENTAGE
+            home_team_pitp_diff = round(cards['data_misc_season']['home']['PTS_PAINT_DIFF'], 1)
+            home_team_pitp_diff_rank = int(cards['data_misc_season']['home']['PTS_PAINT_DIFF_RANK'])
+            l5_home_team_pitp_diff = round(cards['data_misc_L5']['home']['PTS_PAINT_DIFF'], 1)
+            l5_home_team_pitp_diff_rank = int(cards['data_misc_L5']['home']['PTS_PAINT_DIFF_RANK'])
+    else:
+        # Set default values when team IDs are not available
+        away_team_pitp_off = 0
+        away_team_pitp_off_rank = 0
+        l5_away_team_pitp_off = 0
+        l5_away_team_pitp_off_rank = 0
+        home_team_pitp_off = 0
+        home_team_pitp_off_rank = 0
+        l5_home_team_pitp_off = 0
+        l5_home_team_pitp_off_rank = 0
+        away_team_pitp_def = 0
+        away_team_pitp_def_rank = 0
+        l5_away_team_pitp_def = 0
+        l5_away_team_pitp_def_rank = 0
+        home_team_pitp_def = 0
+        home_team_pitp_def_rank = 0
+        l5_home_team_pitp_def = 0
+        l5_home_team_pitp_def_rank = 0
+        away_team_pitp_diff = 0
+        away_team_pitp_diff_rank = 0
+        l5_away_team_pitp_diff = 0
+        l5_away_team_pitp_diff_rank = 0
+        home_team_pitp_diff = 0
+        home_team_pitp_diff_rank = 0
+        l5_home_team_pitp_diff = 0
+        l5_home_team_pitp_diff_rank = 0
+        la_pitp_off = 0
+        l5_la_pitp_off = 0
+        la_pitp_def = 0
+        l5_la_pitp_def = 0
+        la_pitp_diff = 0
+        l5_la_pitp_diff = 0
+
+    #2ND CHANCE POINTS
+    # Only calculate if we have valid team IDs
+    if away_id is not None and home_id is not None:
+    #OFFENSE
     ## Away Team
-    away_team_ast_pct = data_adv_season.loc[data_adv_season['TEAM_ID'] == away_id, 'AST_PCT'].values[0]
-    away_team_ast_pct_rank = data_adv_season.loc[data_adv_season['TEAM_ID'] == away_id, 'AST_PCT_RANK'].values[0]
-    l5_away_team_ast_pct = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == away_id, 'AST_PCT'].values[0]
-    l5_away_team_ast_pct_rank = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == away_id, 'AST_PCT_RANK'].values[0]
-
-    ## League Average
-    la_ast_pct = round(data_adv_season['AST_PCT'].mean(), 3)
-    l5_la_ast_pct = round(data_adv_L5['AST_PCT'].mean(), 3)
-
+        away_team_2c_off = cards['data_misc_season']['away']['PTS_2ND_CHANCE']
+        away_team_2c_off_rank = cards['data_misc_season']['away']['PTS_2ND_CHANCE_RANK']
+        l5_away_team_2c_off = cards['data_misc_L5']['away']['PTS_2ND_CHANCE']
+        l5_away_team_2c_off_rank = cards['data_misc_L5']['away']['PTS_2ND_CHANCE_RANK']
+    ##League Average
+        la_2c_off = round(datasets['data_misc_season']['PTS_2ND_CHANCE'].mean(), 1)
+        l5_la_2c_off = round(datasets['data_misc_L5']['PTS_2ND_CHANCE'].mean(), 1)
     ## Home Team
-    home_team_ast_pct = data_adv_season.loc[data_adv_season['TEAM_ID'] == home_id, 'AST_PCT'].values[0]
-    home_team_ast_pct_rank = data_adv_season.loc[data_adv_season['TEAM_ID'] == home_id, 'AST_PCT_RANK'].values[0]
-    l5_home_team_ast_pct = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == home_id, 'AST_PCT'].values[0]
-    l5_home_team_ast_pct_rank = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == home_id, 'AST_PCT_RANK'].values[0]
-
-    #TURNOVERS
+        home_team_2c_off = cards['data_misc_season']['home']['PTS_2ND_CHANCE']
+        home_team_2c_off_rank = cards['data_misc_season']['home']['PTS_2ND_CHANCE_RANK']
+        l5_home_team_2c_off = cards['data_misc_L5']['home']['PTS_2ND_CHANCE']
+        l5_home_team_2c_off_rank = cards['data_misc_L5']['home']['PTS_2ND_CHANCE_RANK']
+    
+    #DEFENSE
     ## Away Team
-    away_team_tov = data_trad_season.loc[data_trad_season['TEAM_ID'] == away_id, 'TOV'].values[0]
-    away_team_tov_rank = data_trad_season.loc[data_trad_season['TEAM_ID'] == away_id, 'TOV_RANK'].values[0]
-    l5_away_team_tov = data_trad_L5.loc[data_trad_L5['TEAM_ID'] == away_id, 'TOV'].values[0]
-    l5_away_team_tov_rank = data_trad_L5.loc[data_trad_L5['TEAM_ID'] == away_id, 'TOV_RANK'].values[0]
-
-    ## League Average
-    la_tov = round(data_trad_season['TOV'].mean(), 1)
-    l5_la_tov = round(data_trad_L5['TOV'].mean(), 1)
-
+        away_team_2c_def = cards['data_misc_season']['away']['OPP_PTS_2ND_CHANCE']
+        away_team_2c_def_rank = cards['data_misc_season']['away']['OPP_PTS_2ND_CHANCE_RANK']
+        l5_away_team_2c_def = cards['data_misc_L5']['away']['OPP_PTS_2ND_CHANCE']
+        l5_away_team_2c_def_rank = cards['data_misc_L5']['away']['OPP_PTS_2ND_CHANCE_RANK']
+    ##League Average
+        la_2c_def = round(datasets['data_misc_season']['OPP_PTS_2ND_CHANCE'].mean(), 1)
+        l5_la_2c_def = round(datasets['data_misc_L5']['OPP_PTS_2ND_CHANCE'].mean(), 1)
     ## Home Team
-    home_team_tov = data_trad_season.loc[data_trad_season['TEAM_ID'] == home_id, 'TOV'].values[0]
-    home_team_tov_rank = data_trad_season.loc[data_trad_season['TEAM_ID'] == home_id, 'TOV_RANK'].values[0]
-    l5_home_team_tov = data_trad_L5.loc[data_trad_L5['TEAM_ID'] == home_id, 'TOV'].values[0]
-    l5_home_team_tov_rank = data_trad_L5.loc[data_trad_L5['TEAM_ID'] == home_id, 'TOV_RANK'].values[0]
-
-    #TURNOVER PERCENTAGE
+        home_team_2c_def = cards['data_misc_season']['home']['OPP_PTS_2ND_CHANCE']
+        home_team_2c_def_rank = cards['data_misc_season']['home']['OPP_PTS_2ND_CHANCE_RANK']
+        l5_home_team_2c_def = cards['data_misc_L5']['home']['OPP_PTS_2ND_CHANCE']
+        l5_home_team_2c_def_rank = cards['data_misc_L5']['home']['OPP_PTS_2ND_CHANCE_RANK']
+    
+    #DIFFERENCE
     ## Away Team
-    away_team_tov_pct = data_adv_season.loc[data_adv_season['TEAM_ID'] == away_id, 'TM_TOV_PCT'].values[0]
-    away_team_tov_pct_rank = data_adv_season.loc[data_adv_season['TEAM_ID'] == away_id, 'TM_TOV_PCT_RANK'].values[0]
-    l5_away_team_tov_pct = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == away_id, 'TM_TOV_PCT'].values[0]
-    l5_away_team_tov_pct_rank = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == away_id, 'TM_TOV_PCT_RANK'].values[0]
-
+        away_team_2c_diff = round(cards['data_misc_season']['away']['PTS_2ND_CHANCE_DIFF'], 1)
+        away_team_2c_diff_rank = int(cards['data_misc_season']['away']['PTS_2ND_CHANCE_DIFF_RANK'])
+        l5_away_team_2c_diff = round(cards['data_misc_L5']['away']['PTS_2ND_CHANCE_DIFF'], 1)
+        l5_away_team_2c_diff_rank = int(cards['data_misc_L5']['away']['PTS_2ND_CHANCE_DIFF_RANK'])
     ## League Average
-    la_tov_pct = round(data_adv_season['TM_TOV_PCT'].mean(), 3)
-    # print(la_tov_pct)
-    l5_la_tov_pct = round(data_adv_L5['TM_TOV_PCT'].mean(), 3)
-
+        la_2c_diff = round(datasets['data_misc_season']['PTS_2ND_CHANCE_DIFF'].mean(), 1)
+        l5_la_2c_diff = round(datasets['data_misc_L5']['PTS_2ND_CHANCE_DIFF'].mean(), 1)
     ## Home Team
-    home_team_tov_pct = data_adv_season.loc[data_adv_season['TEAM_ID'] == home_id, 'TM_TOV_PCT'].values[0]
-    home_team_tov_pct_rank = data_adv_season.loc[data_adv_season['TEAM_ID'] == home_id, 'TM_TOV_PCT_RANK'].values[0]
-    l5_home_team_tov_pct = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == home_id, 'TM_TOV_PCT'].values[0]
-    l5_home_team_tov_pct_rank = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == home_id, 'TM_TOV_PCT_RANK'].values[0]
+        home_team_2c_diff = round(cards['data_misc_season']['home']['PTS_2ND_CHANCE_DIFF'], 1)
+        home_team_2c_diff_rank = int(cards['data_misc_season']['home']['PTS_2ND_CHANCE_DIFF_RANK'])
+        l5_home_team_2c_diff = round(cards['data_misc_L5']['home']['PTS_2ND_CHANCE_DIFF'], 1)
+        l5_home_team_2c_diff_rank = int(cards['data_misc_L5']['home']['PTS_2ND_CHANCE_DIFF_RANK'])
+        
+        #FAST BREAK POINTS
+
+        #OFFENSE
+        ## Away Team
+        away_team_fb_off = cards['data_misc_season']['away']['PTS_FB']
+        away_team_fb_off_rank = cards['data_misc_season']['away']['PTS_FB_RANK']
+        l5_away_team_fb_off = cards['data_misc_L5']['away']['PTS_FB']
+        l5_away_team_fb_off_rank = cards['data_misc_L5']['away']['PTS_FB_RANK']
+        ##League Average
+        la_fb_off = round(datasets['data_misc_season']['PTS_FB'].mean(), 1)
+        l5_la_fb_off = round(datasets['data_misc_L5']['PTS_FB'].mean(), 1)
+        ## Home Team
+        home_team_fb_off = cards['data_misc_season']['home']['PTS_FB']
+        home_team_fb_off_rank = cards['data_misc_season']['home']['PTS_FB_RANK']
+        l5_home_team_fb_off = cards['data_misc_L5']['home']['PTS_FB']
+        l5_home_team_fb_off_rank = cards['data_misc_L5']['home']['PTS_FB_RANK']
+        
+        #DEFENSE
+        ## Away Team
+        away_team_fb_def = cards['data_misc_season']['away']['OPP_PTS_FB']
+        away_team_fb_def_rank = cards['data_misc_season']['away']['OPP_PTS_FB_RANK']
+        l5_away_team_fb_def = cards['data_misc_L5']['away']['OPP_PTS_FB']
+        l5_away_team_fb_def_rank = cards['data_misc_L5']['away']['OPP_PTS_FB_RANK']
+        ##League Average
+        la_fb_def = round(datasets['data_misc_season']['OPP_PTS_FB'].mean(), 1)
+        l5_la_fb_def = round(datasets['data_misc_L5']['OPP_PTS_FB'].mean(), 1)
+        ## Home Team
+        home_team_fb_def = cards['data_misc_season']['home']['OPP_PTS_FB']
+        home_team_fb_def_rank = cards['data_misc_season']['home']['OPP_PTS_FB_RANK']
+        l5_home_team_fb_def = cards['data_misc_L5']['home']['OPP_PTS_FB']
+        l5_home_team_fb_def_rank = cards['data_misc_L5']['home']['OPP_PTS_FB_RANK']
+        
+        #DIFFERENCE
+        ## Away Team
+        away_team_fb_diff = round(cards['data_misc_season']['away']['PTS_FB_DIFF'], 1)
+        away_team_fb_diff_rank = int(cards['data_misc_season']['away']['PTS_FB_DIFF_RANK'])
+        l5_away_team_fb_diff = round(cards['data_misc_L5']['away']['PTS_FB_DIFF'], 1)
+        l5_away_team_fb_diff_rank = int(cards['data_misc_L5']['away']['PTS_FB_DIFF_RANK'])
+        ## League Average
+        la_fb_diff = round(datasets['data_misc_season']['PTS_FB_DIFF'].mean(), 1)
+        l5_la_fb_diff = round(datasets['data_misc_L5']['PTS_FB_DIFF'].mean(), 1)
+        ## Home Team
+        home_team_fb_diff = round(cards['data_misc_season']['home']['PTS_FB_DIFF'], 1)
+        home_team_fb_diff_rank = int(cards['data_misc_season']['home']['PTS_FB_DIFF_RANK'])
+        l5_home_team_fb_diff = round(cards['data_misc_L5']['home']['PTS_FB_DIFF'], 1)
+        l5_home_team_fb_diff_rank = int(cards['data_misc_L5']['home']['PTS_FB_DIFF_RANK'])
+        
+        #PLAYMAKING STATS
+
+        #PACE
+        ## Away Team
+        away_team_pace = cards['data_adv_season']['away']['PACE']
+        away_team_pace_rank = cards['data_adv_season']['away']['PACE_RANK']
+        l5_away_team_pace = cards['data_adv_L5']['away']['PACE']
+        l5_away_team_pace_rank = cards['data_adv_L5']['away']['PACE_RANK']
+        
+        ## League Average
+        la_pace = round(datasets['data_adv_season']['PACE'].mean(), 1)
+        l5_la_pace = round(datasets['data_adv_L5']['PACE'].mean(), 1)
+
+        ## Home Team
+        home_team_pace = cards['data_adv_season']['home']['PACE']
+        home_team_pace_rank = cards['data_adv_season']['home']['PACE_RANK']
+        l5_home_team_pace = cards['data_adv_L5']['home']['PACE']
+        l5_home_team_pace_rank = cards['data_adv_L5']['home']['PACE_RANK']
+        
+        #ASSISTS
+        ## Away Team
+        away_team_ast = cards['data_trad_season']['away']['AST']
+        away_team_ast_rank = cards['data_trad_season']['away']['AST_RANK']
+        l5_away_team_ast = cards['data_trad_L5']['away']['AST']
+        l5_away_team_ast_rank = cards['data_trad_L5']['away']['AST_RANK']
+        
+        ## League Average
+        la_ast = round(datasets['data_trad_season']['AST'].mean(), 1)
+        l5_la_ast = round(datasets['data_trad_L5']['AST'].mean(), 1)
+
+        ## Home Team
+        home_team_ast = cards['data_trad_season']['home']['AST']
+        home_team_ast_rank = cards['data_trad_season']['home']['AST_RANK']
+        l5_home_team_ast = cards['data_trad_L5']['home']['AST']
+        l5_home_team_ast_rank = cards['data_trad_L5']['home']['AST_RANK']
+        
+        #ASSIST PERCENTAGE
+        ## Away Team
+        away_team_ast_pct = cards['data_adv_season']['away']['AST_PCT']
+        away_team_ast_pct_rank = cards['data_adv_season']['away']['AST_PCT_RANK']
+        l5_away_team_ast_pct = cards['data_adv_L5']['away']['AST_PCT']
+        l5_away_team_ast_pct_rank = cards['data_adv_L5']['away']['AST_PCT_RANK']
+        
+        ## League Average
+        la_ast_pct = round(datasets['data_adv_season']['AST_PCT'].mean(), 3)
+        l5_la_ast_pct = round(datasets['data_adv_L5']['AST_PCT'].mean(), 3)
+
+        ## Home Team
+        home_team_ast_pct = cards['data_adv_season']['home']['AST_PCT']
+        home_team_ast_pct_rank = cards['data_adv_season']['home']['AST_PCT_RANK']
+        l5_home_team_ast_pct = cards['data_adv_L5']['home']['AST_PCT']
+        l5_home_team_ast_pct_rank = cards['data_adv_L5']['home']['AST_PCT_RANK']
+        
+        #TURNOVERS
+        ## Away Team
+        away_team_tov = cards['data_trad_season']['away']['TOV']
+        away_team_tov_rank = cards['data_trad_season']['away']['TOV_RANK']
+        l5_away_team_tov = cards['data_trad_L5']['away']['TOV']
+        l5_away_team_tov_rank = cards['data_trad_L5']['away']['TOV_RANK']
+        
+        ## League Average
+        la_tov = round(datasets['data_trad_season']['TOV'].mean(), 1)
+        l5_la_tov = round(datasets['data_trad_L5']['TOV'].mean(), 1)
+
+        ## Home Team
+        home_team_tov = cards['data_trad_season']['home']['TOV']
+        home_team_tov_rank = cards['data_trad_season']['home']['TOV_RANK']
+        l5_home_team_tov = cards['data_trad_L5']['home']['TOV']
+        l5_home_team_tov_rank = cards['data_trad_L5']['home']['TOV_RANK']
+        
+        #TURNOVER PERCENTAGE
+        ## Away Team
+        away_team_tov_pct = cards['data_adv_season']['away']['TM_TOV_PCT']
+        away_team_tov_pct_rank = cards['data_adv_season']['away']['TM_TOV_PCT_RANK']
+        l5_away_team_tov_pct = cards['data_adv_L5']['away']['TM_TOV_PCT']
+        l5_away_team_tov_pct_rank = cards['data_adv_L5']['away']['TM_TOV_PCT_RANK']
+        
+        ## League Average
+        la_tov_pct = round(datasets['data_adv_season']['TM_TOV_PCT'].mean(), 3)
+        # print(la_tov_pct)
+        l5_la_tov_pct = round(datasets['data_adv_L5']['TM_TOV_PCT'].mean(), 3)
+
+        ## Home Team
+        home_team_tov_pct = cards['data_adv_season']['home']['TM_TOV_PCT']
+        home_team_tov_pct_rank = cards['data_adv_season']['home']['TM_TOV_PCT_RANK']
+        l5_home_team_tov_pct = cards['data_adv_L5']['home']['TM_TOV_PCT']
+        l5_home_team_tov_pct_rank = cards['data_adv_L5']['home']['TM_TOV_PCT_RANK']
+        
+        #OPP. TURNOVER PERCENTAGE
+        ## Away Team
+        away_team_opp_tov_pct = cards['data_4F_season']['away']['OPP_TOV_PCT']
+        away_team_opp_tov_pct_rank = cards['data_4F_season']['away']['OPP_TOV_PCT_RANK']
+        l5_away_team_opp_tov_pct = cards['data_4F_L5']['away']['OPP_TOV_PCT']
+        l5_away_team_opp_tov_pct_rank = cards['data_4F_L5']['away']['OPP_TOV_PCT_RANK']
+        
+        ## League Average
+        la_opp_tov_pct = round(datasets['data_4F_season']['OPP_TOV_PCT'].mean(), 3)
+        l5_la_opp_tov_pct = round(datasets['data_4F_L5']['OPP_TOV_PCT'].mean(), 3)
+
+        ## Home Team
+        home_team_opp_tov_pct = cards['data_4F_season']['home']['OPP_TOV_PCT']
+        home_team_opp_tov_pct_rank = cards['data_4F_season']['home']['OPP_TOV_PCT_RANK']
+        l5_home_team_opp_tov_pct = cards['data_4F_L5']['home']['OPP_TOV_PCT']
+        l5_home_team_opp_tov_pct_rank = cards['data_4F_L5']['home']['OPP_TOV_PCT_RANK']
+        
+        #AST/TOV RATIO
+        ## Away Team
+        away_team_ast_tov = cards['data_adv_season']['away']['AST_TO']
+        away_team_ast_tov_rank = cards['data_adv_season']['away']['AST_TO_RANK']
+        l5_away_team_ast_tov = cards['data_adv_L5']['away']['AST_TO']
+        l5_away_team_ast_tov_rank = cards['data_adv_L5']['away']['AST_TO_RANK']
+        
+        ## League Average
+        la_ast_tov = round(datasets['data_adv_season']['AST_TO'].mean(), 2)
+        l5_la_ast_tov = round(datasets['data_adv_L5']['AST_TO'].mean(), 2)
+
+        ## Home Team
+        home_team_ast_tov = cards['data_adv_season']['home']['AST_TO']
+        home_team_ast_tov_rank = cards['data_adv_season']['home']['AST_TO_RANK']
+        l5_home_team_ast_tov = cards['data_adv_L5']['home']['AST_TO']
+        l5_home_team_ast_tov_rank = cards['data_adv_L5']['home']['AST_TO_RANK']
+        
+        #POINTS OFF TURNOVERS
+
+        #OFFENSE
+        ## Away Team
+        away_team_pts_off_tov = cards['data_misc_season']['away']['PTS_OFF_TOV']
+        away_team_pts_off_tov_rank = cards['data_misc_season']['away']['PTS_OFF_TOV_RANK']
+        l5_away_team_pts_off_tov = cards['data_misc_L5']['away']['PTS_OFF_TOV']
+        l5_away_team_pts_off_tov_rank = cards['data_misc_L5']['away']['PTS_OFF_TOV_RANK']
+        ##League Average
+        la_pts_off_tov = round(datasets['data_misc_season']['PTS_OFF_TOV'].mean(), 1)
+        l5_la_pts_off_tov = round(datasets['data_misc_L5']['PTS_OFF_TOV'].mean(), 1)
+        ## Home Team
+        home_team_pts_off_tov = cards['data_misc_season']['home']['PTS_OFF_TOV']
+        home_team_pts_off_tov_rank = cards['data_misc_season']['home']['PTS_OFF_TOV_RANK']
+        l5_home_team_pts_off_tov = cards['data_misc_L5']['home']['PTS_OFF_TOV']
+        l5_home_team_pts_off_tov_rank = cards['data_misc_L5']['home']['PTS_OFF_TOV_RANK']
+        
+        #DEFENSE
+        ## Away Team
+        away_team_opp_pts_off_tov = cards['data_misc_season']['away']['OPP_PTS_OFF_TOV']
+        away_team_opp_pts_off_tov_rank = cards['data_misc_season']['away']['OPP_PTS_OFF_TOV_RANK']
+        l5_away_team_opp_pts_off_tov = cards['data_misc_L5']['away']['OPP_PTS_OFF_TOV']
+        l5_away_team_opp_pts_off_tov_rank = cards['data_misc_L5']['away']['OPP_PTS_OFF_TOV_RANK']
+        ##League Average
+        la_opp_pts_off_tov = round(datasets['data_misc_season']['OPP_PTS_OFF_TOV'].mean(), 1)
+        l5_la_opp_pts_off_tov = round(datasets['data_misc_L5']['OPP_PTS_OFF_TOV'].mean(), 1)
+        ## Home Team
+        home_team_opp_pts_off_tov = cards['data_misc_season']['home']['OPP_PTS_OFF_TOV']
+        home_team_opp_pts_off_tov_rank = cards['data_misc_season']['home']['OPP_PTS_OFF_TOV_RANK']
+        l5_home_team_opp_pts_off_tov = cards['data_misc_L5']['home']['OPP_PTS_OFF_TOV']
+        l5_home_team_opp_pts_off_tov_rank = cards['data_misc_L5']['home']['OPP_PTS_OFF_TOV_RANK']
+        
+        #DIFFERENCE
+        ## Away Team
+        away_team_pts_off_tov_diff = round(cards['data_misc_season']['away']['PTS_OFF_TOV_DIFF'], 1)
+        away_team_pts_off_tov_diff_rank = int(cards['data_misc_season']['away']['PTS_OFF_TOV_DIFF_RANK'])
+        l5_away_team_pts_off_tov_diff = round(cards['data_misc_L5']['away']['PTS_OFF_TOV_DIFF'], 1)
+        l5_away_team_pts_off_tov_diff_rank = int(cards['data_misc_L5']['away']['PTS_OFF_TOV_DIFF_RANK'])
+        ## League Average
+        la_pts_off_tov_diff = round(datasets['data_misc_season']['PTS_OFF_TOV_DIFF'].mean(), 1)
+        l5_la_pts_off_tov_diff = round(datasets['data_misc_L5']['PTS_OFF_TOV_DIFF'].mean(), 1)
+        ## Home Team
+        home_team_pts_off_tov_diff = round(cards['data_misc_season']['home']['PTS_OFF_TOV_DIFF'], 1)
+        home_team_pts_off_tov_diff_rank = int(cards['data_misc_season']['home']['PTS_OFF_TOV_DIFF_RANK'])
+        l5_home_team_pts_off_tov_diff = round(cards['data_misc_L5']['home']['PTS_OFF_TOV_DIFF'], 1)
+        l5_home_team_pts_off_tov_diff_rank = int(cards['data_misc_L5']['home']['PTS_OFF_TOV_DIFF_RANK'])
+        
+        #STARTERS AND BENCH SCORING
+
+        ## STARTERS
+        ### Away Team
+        away_team_starters_scoring = cards['data_trad_season_starters']['away']['PTS']
+        away_team_starters_scoring_rank = cards['data_trad_season_starters']['away']['PTS_RANK']
+        l5_away_team_starters_scoring = cards['data_trad_L5_starters']['away']['PTS']
+        l5_away_team_starters_scoring_rank = cards['data_trad_L5_starters']['away']['PTS_RANK']
+        
+        ### League Average
+        la_starters_scoring = round(datasets['data_trad_season_starters']['PTS'].mean(), 1)
+        l5_la_starters_scoring = round(datasets['data_trad_L5_starters']['PTS'].mean(), 1)
+
+        ### Home Team
+        home_team_starters_scoring = cards['data_trad_season_starters']['home']['PTS']
+        home_team_starters_scoring_rank = cards['data_trad_season_starters']['home']['PTS_RANK']
+        l5_home_team_starters_scoring = cards['data_trad_L5_starters']['home']['PTS']
+        l5_home_team_starters_scoring_rank = cards['data_trad_L5_starters']['home']['PTS_RANK']
+        
+        ## BENCH
+        ### Away Team
+        away_team_bench_scoring = cards['data_trad_season_bench']['away']['PTS']
+        away_team_bench_scoring_rank = cards['data_trad_season_bench']['away']['PTS_RANK']
+        l5_away_team_bench_scoring = cards['data_trad_L5_bench']['away']['PTS']
+        l5_away_team_bench_scoring_rank = cards['data_trad_L5_bench']['away']['PTS_RANK']
+        
+        ### League Average
+        la_bench_scoring = round(datasets['data_trad_season_bench']['PTS'].mean(), 1)
+        l5_la_bench_scoring = round(datasets['data_trad_L5_bench']['PTS'].mean(), 1)
+
+        ### Home Team
+        home_team_bench_scoring = cards['data_trad_season_bench']['home']['PTS']
+        home_team_bench_scoring_rank = cards['data_trad_season_bench']['home']['PTS_RANK']
+        l5_home_team_bench_scoring = cards['data_trad_L5_bench']['home']['PTS']
+        l5_home_team_bench_scoring_rank = cards['data_trad_L5_bench']['home']['PTS_RANK']
+    else:
+        # Default values are already set at module level (lines 851-926)
+        # No need to set them again here
+        pass
 
-    #OPP. TURNOVER PERCENTAGE
-    ## Away Team
-    away_team_opp_tov_pct = data_4F_season.loc[data_4F_season['TEAM_ID'] == away_id, 'OPP_TOV_PCT'].values[0]
-    away_team_opp_tov_pct_rank = data_4F_season.loc[data_4F_season['TEAM_ID'] == away_id, 'OPP_TOV_PCT_RANK'].values[0]
-    l5_away_team_opp_tov_pct = data_4F_L5.loc[data_4F_L5['TEAM_ID'] == away_id, 'OPP_TOV_PCT'].values[0]
-    l5_away_team_opp_tov_pct_rank = data_4F_L5.loc[data_4F_L5['TEAM_ID'] == away_id, 'OPP_TOV_PCT_RANK'].values[0]
+    ## SHOOTING STATS (pbpstats)
+    if away_id is not None and home_id is not None:
+        ## HOME TEAM SHOOTING STATS
+
+        # Overall Field Goals
+        # home_team_bench_scoring = cards['data_trad_season_bench']['home']['PTS']
+        ## FGM
+        home_team_fgm = cards['team_stats']['home']['FGM_PG']
+        home_team_fgm_rank = cards['team_stats']['home']['FGM_RANK']
+        home_team_opp_fgm = cards['opp_team_stats']['home']['FGM_PG']
+        home_team_opp_fgm_rank = cards['opp_team_stats']['home']['FGM_RANK']
+        home_team_diff_fgm = round(cards['shooting_diff_results']['home']['FGM_PG'], 1)
+        home_team_diff_fgm_rank = cards['shooting_diff_results']['home']['FGM_RANK']
+        ## FGA
+        home_team_fga = cards['team_stats']['home']['FGA_PG']
+        home_team_fga_rank = cards['team_stats']['home']['FGA_RANK']
+        home_team_opp_fga = cards['opp_team_stats']['home']['FGA_PG']
+        home_team_opp_fga_rank = cards['opp_team_stats']['home']['FGA_RANK']
+        home_team_diff_fga = round(cards['shooting_diff_results']['home']['FGA_PG'], 1)
+        home_team_diff_fga_rank = cards['shooting_diff_results']['home']['FGA_RANK']
+        ## FG%
+        home_team_fg_pct = cards['team_stats']['home']['FG%']
+        home_team_fg_pct_rank = cards['team_stats']['home']['FG%_RANK']
+        home_team_opp_fg_pct = cards['opp_team_stats']['home']['FG%']
+        home_team_opp_fg_pct_rank = cards['opp_team_stats']['home']['FG%_RANK']
+        home_team_diff_fg_pct = cards['shooting_diff_results']['home']['FG%']
+        home_team_diff_fg_pct_rank = cards['shooting_diff_results']['home']['FG%_RANK']
+        # Overall 2-Point Shooting
+        ## 2PT
+        home_team_2pt = cards['team_stats']['home']['FG2M_PG']
+        home_team_2pt_rank = cards['team_stats']['home']['FG2M_RANK']
+        home_team_opp_2pt = cards['opp_team_stats']['home']['FG2M_PG']
+        home_team_opp_2pt_rank = cards['opp_team_stats']['home']['FG2M_RANK']
+        home_team_diff_2pt = round(cards['shooting_diff_results']['home']['FG2M_PG'], 1)
+        home_team_diff_2pt_rank = cards['shooting_diff_results']['home']['FG2M_RANK']
+        ## 2PA
+        home_team_2pa = cards['team_stats']['home']['FG2A_PG']
+        home_team_2pa_rank = cards['team_stats']['home']['FG2A_RANK']
+        home_team_opp_2pa = cards['opp_team_stats']['home']['FG2A_PG']
+        home_team_opp_2pa_rank = cards['opp_team_stats']['home']['FG2A_RANK']
+        home_team_diff_2pa = round(cards['shooting_diff_results']['home']['FG2A_PG'], 1)
+        home_team_diff_2pa_rank = cards['shooting_diff_results']['home']['FG2A_RANK']
+        ## 2PT%
+        home_team_2pt_pct = cards['team_stats']['home']['2PT%']
+        home_team_2pt_pct_rank = cards['team_stats']['home']['2PT%_RANK']
+        home_team_opp_2pt_pct = cards['opp_team_stats']['home']['2PT%']
+        home_team_opp_2pt_pct_rank = cards['opp_team_stats']['home']['2PT%_RANK']
+        home_team_diff_2pt_pct = cards['shooting_diff_results']['home']['2PT%']
+        home_team_diff_2pt_pct_rank = cards['shooting_diff_results']['home']['2PT%_RANK']
+        # Overall 3-Point Shooting
+        ## 3PT
+        home_team_3pt = cards['team_stats']['home']['FG3M_PG']
+        home_team_3pt_rank = cards['team_stats']['home']['FG3M_RANK']
+        home_team_opp_3pt = cards['opp_team_stats']['home']['FG3M_PG']
+        home_team_opp_3pt_rank = cards['opp_team_stats']['home']['FG3M_RANK']
+        home_team_diff_3pt = round(cards['shooting_diff_results']['home']['FG3M_PG'], 1)
+        home_team_diff_3pt_rank = cards['shooting_diff_results']['home']['FG3M_RANK']
+        ## 3PA
+        home_team_3pa = cards['team_stats']['home']['FG3A_PG']
+        home_team_3pa_rank = cards['team_stats']['home']['FG3A_RANK']
+        home_team_opp_3pa = cards['opp_team_stats']['home']['FG3A_PG']
+        home_team_opp_3pa_rank = cards['opp_team_stats']['home']['FG3A_RANK']
+        home_team_diff_3pa = round(cards['shooting_diff_results']['home']['FG3A_PG'], 1)
+        home_team_diff_3pa_rank = cards['shooting_diff_results']['home']['FG3A_RANK']
+        ## 3PT%
+        home_team_3pt_pct = cards['team_stats']['home']['3PT%']
+        home_team_3pt_pct_rank = cards['team_stats']['home']['3PT%_RANK']
+        home_team_opp_3pt_pct = cards['opp_team_stats']['home']['3PT%']
+        home_team_opp_3pt_pct_rank = cards['opp_team_stats']['home']['3PT%_RANK']
+        home_team_diff_3pt_pct = cards['shooting_diff_results']['home']['3PT%']
+        home_team_diff_3pt_pct_rank = cards['shooting_diff_results']['home']['3PT%_RANK']
+        # Overall Free Throw Shooting
+        ## FTM
+        home_team_ftm = cards['team_stats']['home']['FTM_PG']
+        home_team_ftm_rank = cards['team_stats']['home']['FTM_RANK']
+        home_team_opp_ftm = cards['opp_team_stats']['home']['FTM_PG']
+        home_team_opp_ftm_rank = cards['opp_team_stats']['home']['FTM_RANK']
+        home_team_diff_ftm = round(cards['shooting_diff_results']['home']['FTM_PG'], 1)
+        home_team_diff_ftm_rank = cards['shooting_diff_results']['home']['FTM_RANK']
+        ## FTA
+        home_team_fta = cards['team_stats']['home']['FTA_PG']
+        home_team_fta_rank = cards['team_stats']['home']['FTA_RANK']
+        home_team_opp_fta = cards['opp_team_stats']['home']['FTA_PG']
+        home_team_opp_fta_rank = cards['opp_team_stats']['home']['FTA_RANK']
+        home_team_diff_fta = round(cards['shooting_diff_results']['home']['FTA_PG'], 1)
+        home_team_diff_fta_rank = cards['shooting_diff_results']['home']['FTA_RANK']
+        ## FT%
+        home_team_ft_pct = cards['team_stats']['home']['FT%']
+        home_team_ft_pct_rank = cards['team_stats']['home']['FT%_RANK']
+        home_team_opp_ft_pct = cards['opp_team_stats']['home']['FT%']
+        home_team_opp_ft_pct_rank = cards['opp_team_stats']['home']['FT%_RANK']
+        home_team_diff_ft_pct = cards['shooting_diff_results']['home']['FT%']
+        home_team_diff_ft_pct_rank = cards['shooting_diff_results']['home']['FT%_RANK']
+        # RIM
+        ## Rim Frequency
+        home_team_rim_freq = cards['team_stats']['home']['AtRimFrequency']
+        home_team_rim_freq_rank = cards['team_stats']['home']['RIM_FREQ_RANK']
+        home_team_opp_rim_freq = cards['opp_team_stats']['home']['AtRimFrequency']
+        home_team_opp_rim_freq_rank = cards['opp_team_stats']['home']['RIM_FREQ_RANK']
+        home_team_diff_rim_freq = cards['shooting_diff_results']['home']['AtRimFrequency']
+        home_team_diff_rim_freq_rank = cards['shooting_diff_results']['home']['RIM_FREQ_RANK']
+        ## Rim Accuracy
+        home_team_rim_acc = cards['team_stats']['home']['AtRimAccuracy']
+        home_team_rim_acc_rank = cards['team_stats']['home']['RIM_FG%_RANK']
+        home_team_opp_rim_acc = cards['opp_team_stats']['home']['AtRimAccuracy']
+        home_team_opp_rim_acc_rank = cards['opp_team_stats']['home']['RIM_FG%_RANK']
+        home_team_diff_rim_acc = cards['shooting_diff_results']['home']['AtRimAccuracy']
+        home_team_diff_rim_acc_rank = cards['shooting_diff_results']['home']['RIM_FG%_RANK']
+        
+        # Short Mid-Range Shooting
+        ## SMR Frequency
+        home_team_smr_freq = cards['team_stats']['home']['ShortMidRangeFrequency']
+        home_team_smr_freq_rank = cards['team_stats']['home']['SMR_FREQ_RANK']
+        home_team_opp_smr_freq = cards['opp_team_stats']['home']['ShortMidRangeFrequency']
+        home_team_opp_smr_freq_rank = cards['opp_team_stats']['home']['SMR_FREQ_RANK']
+        home_team_diff_smr_freq = cards['shooting_diff_results']['home']['ShortMidRangeFrequency']
+        home_team_diff_smr_freq_rank = cards['shooting_diff_results']['home']['SMR_FREQ_RANK']
+        ## SMR Accuracy
+        home_team_smr_acc = cards['team_stats']['home']['ShortMidRangeAccuracy']
+        home_team_smr_acc_rank = cards['team_stats']['home']['SMR_FG%_RANK']
+        home_team_opp_smr_acc = cards['opp_team_stats']['home']['ShortMidRangeAccuracy']
+        home_team_opp_smr_acc_rank = cards['opp_team_stats']['home']['SMR_FG%_RANK']
+        home_team_diff_smr_acc = cards['shooting_diff_results']['home']['ShortMidRangeAccuracy']
+        home_team_diff_smr_acc_rank = cards['shooting_diff_results']['home']['SMR_FG%_RANK']
+        
+        # Long Mid-Range Shooting
+        ## LMR Frequency
+        home_team_lmr_freq = cards['team_stats']['home']['LongMidRangeFrequency']
+        home_team_lmr_freq_rank = cards['team_stats']['home']['LMR_FREQ_RANK']
+        home_team_opp_lmr_freq = cards['opp_team_stats']['home']['LongMidRangeFrequency']
+        home_team_opp_lmr_freq_rank = cards['opp_team_stats']['home']['LMR_FREQ_RANK']
+        home_team_diff_lmr_freq = cards['shooting_diff_results']['home']['LongMidRangeFrequency']
+        home_team_diff_lmr_freq_rank = cards['shooting_diff_results']['home']['LMR_FREQ_RANK']
+        ## LMR Accuracy
+        home_team_lmr_acc = cards['team_stats']['home']['LongMidRangeAccuracy']
+        home_team_lmr_acc_rank = cards['team_stats']['home']['LMR_FG%_RANK']
+        home_team_opp_lmr_acc = cards['opp_team_stats']['home']['LongMidRangeAccuracy']
+        home_team_opp_lmr_acc_rank = cards['opp_team_stats']['home']['LMR_FG%_RANK']
+        home_team_diff_lmr_acc = cards['shooting_diff_results']['home']['LongMidRangeAccuracy']
+        home_team_diff_lmr_acc_rank = cards['shooting_diff_results']['home']['LMR_FG%_RANK']
+        # Corner 3-Point Shooting
+        ## C3 Frequency
+        home_team_c3_freq = cards['team_stats']['home']['Corner3Frequency']
+        home_team_c3_freq_rank = cards['team_stats']['home']['C3_FREQ_RANK']
+        home_team_opp_c3_freq = cards['opp_team_stats']['home']['Corner3Frequency']
+        home_team_opp_c3_freq_rank = cards['opp_team_stats']['home']['C3_FREQ_RANK']
+        home_team_diff_c3_freq = cards['shooting_diff_results']['home']['Corner3Frequency']
+        home_team_diff_c3_freq_rank = cards['shooting_diff_results']['home']['C3_FREQ_RANK']
+        ## C3 Accuracy
+        home_team_c3_acc = cards['team_stats']['home']['Corner3Accuracy']
+        home_team_c3_acc_rank = cards['team_stats']['home']['C3_FG%_RANK']
+        home_team_opp_c3_acc = cards['opp_team_stats']['home']['Corner3Accuracy']
+        home_team_opp_c3_acc_rank = cards['opp_team_stats']['home']['C3_FG%_RANK']
+        home_team_diff_c3_acc = cards['shooting_diff_results']['home']['Corner3Accuracy']
+        home_team_diff_c3_acc_rank = cards['shooting_diff_results']['home']['C3_FG%_RANK']
+        # Above the Break 3-Point Shooting
+        ## ATB3 Frequency
+        home_team_atb3_freq = cards['team_stats']['home']['Arc3Frequency']
+        home_team_atb3_freq_rank = cards['team_stats']['home']['ATB3_FREQ_RANK']
+        home_team_opp_atb3_freq = cards['opp_team_stats']['home']['Arc3Frequency']
+        home_team_opp_atb3_freq_rank = cards['opp_team_stats']['home']['ATB3_FREQ_RANK']
+        home_team_diff_atb3_freq = cards['shooting_diff_results']['home']['Arc3Frequency']
+        home_team_diff_atb3_freq_rank = cards['shooting_diff_results']['home']['ATB3_FREQ_RANK']
+        ## ATB3 Accuracy
+        home_team_atb3_acc = cards['team_stats']['home']['Arc3Accuracy']
+        home_team_atb3_acc_rank = cards['team_stats']['home']['ATB3_FG%_RANK']
+        home_team_opp_atb3_acc = cards['opp_team_stats']['home']['Arc3Accuracy']
+        home_team_opp_atb3_acc_rank = cards['opp_team_stats']['home']['ATB3_FG%_RANK']
+        home_team_diff_atb3_acc = cards['shooting_diff_results']['home']['Arc3Accuracy']
+        home_team_diff_atb3_acc_rank = cards['shooting_diff_results']['home']['ATB3_FG%_RANK']
+        
+        ## AWAY TEAM SHOOTING STATS
+
+        # Overall Field Goals
+        # away_team_bench_scoring = cards['data_trad_season_bench']['away']['PTS']
+        ## FGM
+        away_team_fgm = cards['team_stats']['away']['FGM_PG']
+        away_team_fgm_rank = cards['team_stats']['away']['FGM_RANK']
+        away_team_opp_fgm = cards['opp_team_stats']['away']['FGM_PG']
+        away_team_opp_fgm_rank = cards['opp_team_stats']['away']['FGM_RANK']
+        away_team_diff_fgm = round(cards['shooting_diff_results']['away']['FGM_PG'], 1)
+        away_team_diff_fgm_rank = cards['shooting_diff_results']['away']['FGM_RANK']
+        ## FGA
+        away_team_fga = cards['team_stats']['away']['FGA_PG']
+        away_team_fga_rank = cards['team_stats']['away']['FGA_RANK']
+        away_team_opp_fga = cards['opp_team_stats']['away']['FGA_PG']
+        away_team_opp_fga_rank = cards['opp_team_stats']['away']['FGA_RANK']
+        away_team_diff_fga = round(cards['shooting_diff_results']['away']['FGA_PG'], 1)
+        away_team_diff_fga_rank = cards['shooting_diff_results']['away']['FGA_RANK']
+        ## FG%
+        away_team_fg_pct = cards['team_stats']['away']['FG%']
+        away_team_fg_pct_rank = cards['team_stats']['away']['FG%_RANK']
+        away_team_opp_fg_pct = cards['opp_team_stats']['away']['FG%']
+        away_team_opp_fg_pct_rank = cards['opp_team_stats']['away']['FG%_RANK']
+        away_team_diff_fg_pct = cards['shooting_diff_results']['away']['FG%']
+        away_team_diff_fg_pct_rank = cards['shooting_diff_results']['away']['FG%_RANK']
+        # Overall 2-Point Shooting
+        ## 2PT
+        away_team_2pt = cards['team_stats']['away']['FG2M_PG']
+        away_team_2pt_rank = cards['team_stats']['away']['FG2M_RANK']
+        away_team_opp_2pt = cards['opp_team_stats']['away']['FG2M_PG']
+        away_team_opp_2pt_rank = cards['opp_team_stats']['away']['FG2M_RANK']
+        away_team_diff_2pt = round(cards['shooting_diff_results']['away']['FG2M_PG'], 1)
+        away_team_diff_2pt_rank = cards['shooting_diff_results']['away']['FG2M_RANK']
+        ## 2PA
+        away_team_2pa = cards['team_stats']['away']['FG2A_PG']
+        away_team_2pa_rank = cards['team_stats']['away']['FG2A_RANK']
+        away_team_opp_2pa = cards['opp_team_stats']['away']['FG2A_PG']
+        away_team_opp_2pa_rank = cards['opp_team_stats']['away']['FG2A_RANK']
+        away_team_diff_2pa = round(cards['shooting_diff_results']['away']['FG2A_PG'], 1)
+        away_team_diff_2pa_rank = cards['shooting_diff_results']['away']['FG2A_RANK']
+        ## 2PT%
+        away_team_2pt_pct = cards['team_stats']['away']['2PT%']
+        away_team_2pt_pct_rank = cards['team_stats']['away']['2PT%_RANK']
+        away_team_opp_2pt_pct = cards['opp_team_stats']['away']['2PT%']
+        away_team_opp_2pt_pct_rank = cards['opp_team_stats']['away']['2PT%_RANK']
+        away_team_diff_2pt_pct = cards['shooting_diff_results']['away']['2PT%']
+        away_team_diff_2pt_pct_rank = cards['shooting_diff_results']['away']['2PT%_RANK']
+        # Overall 3-Point Shooting
+        ## 3PT
+        away_team_3pt = cards['team_stats']['away']['FG3M_PG']
+        away_team_3pt_rank = cards['team_stats']['away']['FG3M_RANK']
+        away_team_opp_3pt = cards['opp_team_stats']['away']['FG3M_PG']
+        away_team_opp_3pt_rank = cards['opp_team_stats']['away']['FG3M_RANK']
+        away_team_diff_3pt = round(cards['shooting_diff_results']['away']['FG3M_PG'], 1)
+        away_team_diff_3pt_rank = cards['shooting_diff_results']['away']['FG3M_RANK']
+        ## 3PA
+        away_team_3pa = cards['team_stats']['away']['FG3A_PG']
+        away_team_3pa_rank = cards['team_stats']['away']['FG3A_RANK']
+        away_team_opp_3pa = cards['opp_team_stats']['away']['FG3A_PG']
+        away_team_opp_3pa_rank = cards['opp_team_stats']['away']['FG3A_RANK']
+        away_team_diff_3pa = round(cards['shooting_diff_results']['away']['FG3A_PG'], 1)
+        away_team_diff_3pa_rank = cards['shooting_diff_results']['away']['FG3A_RANK']
+        ## 3PT%
+        away_team_3pt_pct = cards['team_stats']['away']['3PT%']
+        away_team_3pt_pct_rank = cards['team_stats']['away']['3PT%_RANK']
+        away_team_opp_3pt_pct = cards['opp_team_stats']['away']['3PT%']
+        away_team_opp_3pt_pct_rank = cards['opp_team_stats']['away']['3PT%_RANK']
+        away_team_diff_3pt_pct = cards['shooting_diff_results']['away']['3PT%']
+        away_team_diff_3pt_pct_rank = cards['shooting_diff_results']['away']['3PT%_RANK']
+        # Overall Free Throw Shooting
+        ## FTM
+        away_team_ftm = cards['team_stats']['away']['FTM_PG']
+        away_team_ftm_rank = cards['team_stats']['away']['FTM_RANK']
+        away_team_opp_ftm = cards['opp_team_stats']['away']['FTM_PG']
+        away_team_opp_ftm_rank = cards['opp_team_stats']['away']['FTM_RANK']
+        away_team_diff_ftm = round(cards['shooting_diff_results']['away']['FTM_PG'], 1)
+        away_team_diff_ftm_rank = cards['shooting_diff_results']['away']['FTM_RANK']
+        ## FTA
+        away_team_fta = cards['team_stats']['away']['FTA_PG']
+        away_team_fta_rank = cards['team_stats']['away']['FTA_RANK']
+        away_team_opp_fta = cards['opp_team_stats']['away']['FTA_PG']
+        away_team_opp_fta_rank = cards['opp_team_stats']['away']['FTA_RANK']
+        away_team_diff_fta = round(cards['shooting_diff_results']['away']['FTA_PG'], 1)
+        away_team_diff_fta_rank = cards['shooting_diff_results']['away']['FTA_RANK']
+        ## FT%
+        away_team_ft_pct = cards['team_stats']['away']['FT%']
+        away_team_ft_pct_rank = cards['team_stats']['away']['FT%_RANK']
+        away_team_opp_ft_pct = cards['opp_team_stats']['away']['FT%']
+        away_team_opp_ft_pct_rank = cards['opp_team_stats']['away']['FT%_RANK']
+        away_team_diff_ft_pct = cards['shooting_diff_results']['away']['FT%']
+        away_team_diff_ft_pct_rank = cards['shooting_diff_results']['away']['FT%_RANK']
+        # RIM
+        ## Rim Frequency
+        away_team_rim_freq = cards['team_stats']['away']['AtRimFrequency']
+        away_team_rim_freq_rank = cards['team_stats']['away']['RIM_FREQ_RANK']
+        away_team_opp_rim_freq = cards['opp_team_stats']['away']['AtRimFrequency']
+        away_team_opp_rim_freq_rank = cards['opp_team_stats']['away']['RIM_FREQ_RANK']
+        away_team_diff_rim_freq = cards['shooting_diff_results']['away']['AtRimFrequency']
+        away_team_diff_rim_freq_rank = cards['shooting_diff_results']['away']['RIM_FREQ_RANK']
+        ## Rim Accuracy
+        away_team_rim_acc = cards['team_stats']['away']['AtRimAccuracy']
+        away_team_rim_acc_rank = cards['team_stats']['away']['RIM_FG%_RANK']
+        away_team_opp_rim_acc = cards['opp_team_stats']['away']['AtRimAccuracy']
+        away_team_opp_rim_acc_rank = cards['opp_team_stats']['away']['RIM_FG%_RANK']
+        away_team_diff_rim_acc = cards['shooting_diff_results']['away']['AtRimAccuracy']
+        away_team_diff_rim_acc_rank = cards['shooting_diff_results']['away']['RIM_FG%_RANK']
+        
+        # Short Mid-Range Shooting
+        ## SMR Frequency
+        away_team_smr_freq = cards['team_stats']['away']['ShortMidRangeFrequency']
+        away_team_smr_freq_rank = cards['team_stats']['away']['SMR_FREQ_RANK']
+        away_team_opp_smr_freq = cards['opp_team_stats']['away']['ShortMidRangeFrequency']
+        away_team_opp_smr_freq_rank = cards['opp_team_stats']['away']['SMR_FREQ_RANK']
+        away_team_diff_smr_freq = cards['shooting_diff_results']['away']['ShortMidRangeFrequency']
+        away_team_diff_smr_freq_rank = cards['shooting_diff_results']['away']['SMR_FREQ_RANK']
+        ## SMR Accuracy
+        away_team_smr_acc = cards['team_stats']['away']['ShortMidRangeAccuracy']
+        away_team_smr_acc_rank = cards['team_stats']['away']['SMR_FG%_RANK']
+        away_team_opp_smr_acc = cards['opp_team_stats']['away']['ShortMidRangeAccuracy']
+        away_team_opp_smr_acc_rank = cards['opp_team_stats']['away']['SMR_FG%_RANK']
+        away_team_diff_smr_acc = cards['shooting_diff_results']['away']['ShortMidRangeAccuracy']
+        away_team_diff_smr_acc_rank = cards['shooting_diff_results']['away']['SMR_FG%_RANK']
+        
+        # Long Mid-Range Shooting
+        ## LMR Frequency
+        away_team_lmr_freq = cards['team_stats']['away']['LongMidRangeFrequency']
+        away_team_lmr_freq_rank = cards['team_stats']['away']['LMR_FREQ_RANK']
+        away_team_opp_lmr_freq = cards['opp_team_stats']['away']['LongMidRangeFrequency']
+        away_team_opp_lmr_freq_rank = cards['opp_team_stats']['away']['LMR_FREQ_RANK']
+        away_team_diff_lmr_freq = cards['shooting_diff_results']['away']['LongMidRangeFrequency']
+        away_team_diff_lmr_freq_rank = cards['shooting_diff_results']['away']['LMR_FREQ_RANK']
+        ## LMR Accuracy
+        away_team_lmr_acc = cards['team_stats']['away']['LongMidRangeAccuracy']
+        away_team_lmr_acc_rank = cards['team_stats']['away']['LMR_FG%_RANK']
+        away_team_opp_lmr_acc = cards['opp_team_stats']['away']['LongMidRangeAccuracy']
+        away_team_opp_lmr_acc_rank = cards['opp_team_stats']['away']['LMR_FG%_RANK']
+        away_team_diff_lmr_acc = cards['shooting_diff_results']['away']['LongMidRangeAccuracy']
+        away_team_diff_lmr_acc_rank = cards['shooting_diff_results']['away']['LMR_FG%_RANK']
+        # Corner 3-Point Shooting
+        ## C3 Frequency
+        away_team_c3_freq = cards['team_stats']['away']['Corner3Frequency']
+        away_team_c3_freq_rank = cards['team_stats']['away']['C3_FREQ_RANK']
+        away_team_opp_c3_freq = cards['opp_team_stats']['away']['Corner3Frequency']
+        away_team_opp_c3_freq_rank = cards['opp_team_stats']['away']['C3_FREQ_RANK']
+        away_team_diff_c3_freq = cards['shooting_diff_results']['away']['Corner3Frequency']
+        away_team_diff_c3_freq_rank = cards['shooting_diff_results']['away']['C3_FREQ_RANK']
+        ## C3 Accuracy
+        away_team_c3_acc = cards['team_stats']['away']['Corner3Accuracy']
+        away_team_c3_acc_rank = cards['team_stats']['away']['C3_FG%_RANK']
+        away_team_opp_c3_acc = cards['opp_team_stats']['away']['Corner3Accuracy']
+        away_team_opp_c3_acc_rank = cards['opp_team_stats']['away']['C3_FG%_RANK']
+        away_team_diff_c3_acc = cards['shooting_diff_results']['away']['Corner3Accuracy']
+        away_team_diff_c3_acc_rank = cards['shooting_diff_results']['away']['C3_FG%_RANK']
+        # Above the Break 3-Point Shooting
+        ## ATB3 Frequency
+        away_team_atb3_freq = cards['team_stats']['away']['Arc3Frequency']
+        away_team_atb3_freq_rank = cards['team_stats']['away']['ATB3_FREQ_RANK']
+        away_team_opp_atb3_freq = cards['opp_team_stats']['away']['Arc3Frequency']
+        away_team_opp_atb3_freq_rank = cards['opp_team_stats']['away']['ATB3_FREQ_RANK']
+        away_team_diff_atb3_freq = cards['shooting_diff_results']['away']['Arc3Frequency']
+        away_team_diff_atb3_freq_rank = cards['shooting_diff_results']['away']['ATB3_FREQ_RANK']
+        ## ATB3 Accuracy
+        away_team_atb3_acc = cards['team_stats']['away']['Arc3Accuracy']
+        away_team_atb3_acc_rank = cards['team_stats']['away']['ATB3_FG%_RANK']
+        away_team_opp_atb3_acc = cards['opp_team_stats']['away']['Arc3Accuracy']
+        away_team_opp_atb3_acc_rank = cards['opp_team_stats']['away']['ATB3_FG%_RANK']
+        away_team_diff_atb3_acc = cards['shooting_diff_results']['away']['Arc3Accuracy']
+        away_team_diff_atb3_acc_rank = cards['shooting_diff_results']['away']['ATB3_FG%_RANK']
+        
+        ## LEAGUE AVERAGE SHOOTING STATS
+
+        la_fgm = round(datasets['team_stats_diff']['FGM_PG'].mean(), 1)
+        la_fga = round(datasets['team_stats_diff']['FGA_PG'].mean(), 1)
+        la_fg_pct = round(datasets['team_stats_diff']['FG%'].mean(), 3)
+
+        la_2pt = round(datasets['team_stats_diff']['FG2M_PG'].mean(), 1)
+        la_2pa = round(datasets['team_stats_diff']['FG2A_PG'].mean(), 1)
+        la_2pt_pct = round(datasets['team_stats_diff']['2PT%'].mean(), 3)
+
+        la_3pt = round(datasets['team_stats_diff']['FG3M_PG'].mean(), 1)
+        la_3pa = round(datasets['team_stats_diff']['FG3A_PG'].mean(), 1)
+        la_3pt_pct = round(datasets['team_stats_diff']['3PT%'].mean(), 3)
+
+        la_ftm = round(datasets['team_stats_diff']['FTM_PG'].mean(), 1)
+        la_fta = round(datasets['team_stats_diff']['FTA_PG'].mean(), 1)
+        la_ft_pct = round(datasets['team_stats_diff']['FT%'].mean(), 3)
+
+        la_rim_freq = round(datasets['team_stats_diff']['AtRimFrequency'].mean(), 3)
+        la_rim_acc = round(datasets['team_stats_diff']['AtRimAccuracy'].mean(), 3)
+
+        la_smr_freq = round(datasets['team_stats_diff']['ShortMidRangeFrequency'].mean(), 3)
+        la_smr_acc = round(datasets['team_stats_diff']['ShortMidRangeAccuracy'].mean(), 3)
+
+        la_lmr_freq = round(datasets['team_stats_diff']['LongMidRangeFrequency'].mean(), 3)
+        la_lmr_acc = round(datasets['team_stats_diff']['LongMidRangeAccuracy'].mean(), 3)
+
+        la_atb3_freq = round(datasets['team_stats_diff']['Arc3Frequency'].mean(), 3)
+        la_atb3_acc = round(datasets['team_stats_diff']['Arc3Accuracy'].mean(), 3)
+
+        la_c3_freq = round(datasets['team_stats_diff']['Corner3Frequency'].mean(), 3)
+        la_c3_acc = round(datasets['team_stats_diff']['Corner3Accuracy'].mean(), 3)
+    
+    return {name: value for name, value in locals().items() if name.startswith(MATCHUP_STATS_PREFIXES)}
+
+
+# Team-indexed datasets and matchup cards (see team_metrics.py)
+MATCHUP_CARD_DATASETS = tuple(name for name in MATCHUP_STATS_DATASETS if name != 'team_stats_diff')
+_team_metrics = {}
+_matchup_cards = {}
+_matchup_cards_metrics = ()
+
+
+def get_team_metrics(name):
+    """
+    TeamMetrics for a dataset, indexed by team ID.
+    
+    Built once per loaded dataset and rebuilt only if the dataset is reloaded.
+    """
+    df = get_dataset(name)
+    cached = _team_metrics.get(name)
+    if cached is None or cached[0] is not df:
+        cached = (df, tm.TeamMetrics(df))
+        _team_metrics[name] = cached
+    return cached[1]
 
-    ## League Average
-    la_opp_tov_pct = round(data_4F_season['OPP_TOV_PCT'].mean(), 3)
-    l5_la_opp_tov_pct = round(data_4F_L5['OPP_TOV_PCT'].mean(), 3)
 
-    ## Home Team
-    home_team_opp_tov_pct = data_4F_season.loc[data_4F_season['TEAM_ID'] == home_id, 'OPP_TOV_PCT'].values[0]
-    home_team_opp_tov_pct_rank = data_4F_season.loc[data_4F_season['TEAM_ID'] == home_id, 'OPP_TOV_PCT_RANK'].values[0]
-    l5_home_team_opp_tov_pct = data_4F_L5.loc[data_4F_L5['TEAM_ID'] == home_id, 'OPP_TOV_PCT'].values[0]
-    l5_home_team_opp_tov_pct_rank = data_4F_L5.loc[data_4F_L5['TEAM_ID'] == home_id, 'OPP_TOV_PCT_RANK'].values[0]
+def precompute_matchup_cards(matchups):
+    """
+    Build the matchup cards of every game on a slate in one pass.
+    
+    Args:
+        matchups: Matchup dicts with away_team_id/home_team_id
+    
+    Returns:
+        Dict of (away_id, home_id) -> dataset name -> {'away': row, 'home': row}
+    """
+    global _matchup_cards, _matchup_cards_metrics
+    
+    load_datasets(*MATCHUP_CARD_DATASETS)
+    metrics = {name: get_team_metrics(name) for name in MATCHUP_CARD_DATASETS}
+    cards = tm.build_matchup_cards(metrics, [(m['away_team_id'], m['home_team_id']) for m in matchups])
+    with _datasets_lock:
+        # Cards built from datasets that have since been reloaded are dropped
+        if not _matchup_cards_current(metrics.values()):
+            _matchup_cards = {}
+            _matchup_cards_metrics = tuple(metrics.values())
+        _matchup_cards.update(cards)
+    return cards
 
-    #AST/TOV RATIO
-    ## Away Team
-    away_team_ast_tov = data_adv_season.loc[data_adv_season['TEAM_ID'] == away_id, 'AST_TO'].values[0]
-    away_team_ast_tov_rank = data_adv_season.loc[data_adv_season['TEAM_ID'] == away_id, 'AST_TO_RANK'].values[0]
-    l5_away_team_ast_tov = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == away_id, 'AST_TO'].values[0]
-    l5_away_team_ast_tov_rank = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == away_id, 'AST_TO_RANK'].values[0]
 
-    ## League Average
-    la_ast_tov = round(data_adv_season['AST_TO'].mean(), 2)
-    l5_la_ast_tov = round(data_adv_L5['AST_TO'].mean(), 2)
+def _matchup_cards_current(metrics):
+    """Whether the stored matchup cards were built from these TeamMetrics."""
+    metrics = tuple(metrics)
+    return len(metrics) == len(_matchup_cards_metrics) and all(a is b for a, b in zip(metrics, _matchup_cards_metrics))
 
-    ## Home Team
-    home_team_ast_tov = data_adv_season.loc[data_adv_season['TEAM_ID'] == home_id, 'AST_TO'].values[0]
-    home_team_ast_tov_rank = data_adv_season.loc[data_adv_season['TEAM_ID'] == home_id, 'AST_TO_RANK'].values[0]
-    l5_home_team_ast_tov = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == home_id, 'AST_TO'].values[0]
-    l5_home_team_ast_tov_rank = data_adv_L5.loc[data_adv_L5['TEAM_ID'] == home_id, 'AST_TO_RANK'].values[0]
 
-    #POINTS OFF TURNOVERS
+def get_matchup_card(away_id, home_id):
+    """Dataset name -> {'away': row, 'home': row} for one game (precomputed if available)."""
+    load_datasets(*MATCHUP_CARD_DATASETS)
+    card = _matchup_cards.get((away_id, home_id))
+    if card is not None and _matchup_cards_current(get_team_metrics(name) for name in MATCHUP_CARD_DATASETS):
+        return card
+    return precompute_matchup_cards([{'away_team_id': away_id, 'home_team_id': home_id}])[(away_id, home_id)]
 
-    #OFFENSE
-    ## Away Team
-    away_team_pts_off_tov = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_OFF_TOV'].values[0]
-    away_team_pts_off_tov_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_OFF_TOV_RANK'].values[0]
-    l5_away_team_pts_off_tov = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_OFF_TOV'].values[0]
-    l5_away_team_pts_off_tov_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_OFF_TOV_RANK'].values[0]
-    ##League Average
-    la_pts_off_tov = round(data_misc_season['PTS_OFF_TOV'].mean(), 1)
-    l5_la_pts_off_tov = round(data_misc_L5['PTS_OFF_TOV'].mean(), 1)
-    ## Home Team
-    home_team_pts_off_tov = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_OFF_TOV'].values[0]
-    home_team_pts_off_tov_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_OFF_TOV_RANK'].values[0]
-    l5_home_team_pts_off_tov = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_OFF_TOV'].values[0]
-    l5_home_team_pts_off_tov_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_OFF_TOV_RANK'].values[0]
 
-    #DEFENSE
-    ## Away Team
-    away_team_opp_pts_off_tov = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'OPP_PTS_OFF_TOV'].values[0]
-    away_team_opp_pts_off_tov_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'OPP_PTS_OFF_TOV_RANK'].values[0]
-    l5_away_team_opp_pts_off_tov = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'OPP_PTS_OFF_TOV'].values[0]
-    l5_away_team_opp_pts_off_tov_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'OPP_PTS_OFF_TOV_RANK'].values[0]
-    ##League Average
-    la_opp_pts_off_tov = round(data_misc_season['OPP_PTS_OFF_TOV'].mean(), 1)
-    l5_la_opp_pts_off_tov = round(data_misc_L5['OPP_PTS_OFF_TOV'].mean(), 1)
-    ## Home Team
-    home_team_opp_pts_off_tov = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'OPP_PTS_OFF_TOV'].values[0]
-    home_team_opp_pts_off_tov_rank = data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'OPP_PTS_OFF_TOV_RANK'].values[0]
-    l5_home_team_opp_pts_off_tov = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'OPP_PTS_OFF_TOV'].values[0]
-    l5_home_team_opp_pts_off_tov_rank = data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'OPP_PTS_OFF_TOV_RANK'].values[0]
+def load_matchup_stats():
+    """
+    Compute the matchup stats for the selected matchup if not computed yet.
+    
+    Fetches every dataset they need in parallel first; the stats become module
+    attributes (e.g. functions.away_team_ortg) until the matchup changes.
+    """
+    global _matchup_stats_ids, _matchup_stats_names
+    
+    _ensure_selected_matchup()
+    load_datasets(*MATCHUP_STATS_DATASETS)
+    with _datasets_lock:
+        if _matchup_stats_ids == (away_id, home_id):
+            return
+        _clear_matchup_stats()
+        stats = _build_matchup_stats()
+        globals().update(stats)
+        _matchup_stats_names = tuple(stats)
+        _matchup_stats_ids = (away_id, home_id)
+
+
+def _clear_matchup_stats():
+    """Drop the matchup stats of the previously selected matchup."""
+    global _matchup_stats_ids, _matchup_stats_names
+    
+    module_globals = globals()
+    for name in _matchup_stats_names:
+        module_globals.pop(name, None)
+    _matchup_stats_names = ()
+    _matchup_stats_ids = None
+
+
+def __getattr__(name):
+    """Load datasets, the selected matchup and matchup stats on first access."""
+    if name in DATASETS or name in _DERIVED_GROUP:
+        return get_dataset(name)
+    if name.startswith('_'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name in MATCHUP_SELECTION_NAMES:
+        _ensure_selected_matchup()
+        return globals()[name]
+    if name.startswith(MATCHUP_STATS_PREFIXES) and _matchup_stats_ids is None:
+        load_matchup_stats()
+        if name in globals():
+            return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    #DIFFERENCE
-    ## Away Team
-    away_team_pts_off_tov_diff = round(data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_OFF_TOV_DIFF'].values[0], 1)
-    away_team_pts_off_tov_diff_rank = int(data_misc_season.loc[data_misc_season['TEAM_ID'] == away_id, 'PTS_OFF_TOV_DIFF_RANK'].values[0])
-    l5_away_team_pts_off_tov_diff = round(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_OFF_TOV_DIFF'].values[0], 1)
-    l5_away_team_pts_off_tov_diff_rank = int(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == away_id, 'PTS_OFF_TOV_DIFF_RANK'].values[0])
-    ## League Average
-    la_pts_off_tov_diff = round(data_misc_season['PTS_OFF_TOV_DIFF'].mean(), 1)
-    l5_la_pts_off_tov_diff = round(data_misc_L5['PTS_OFF_TOV_DIFF'].mean(), 1)
-    ## Home Team
-    home_team_pts_off_tov_diff = round(data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_OFF_TOV_DIFF'].values[0], 1)
-    home_team_pts_off_tov_diff_rank = int(data_misc_season.loc[data_misc_season['TEAM_ID'] == home_id, 'PTS_OFF_TOV_DIFF_RANK'].values[0])
-    l5_home_team_pts_off_tov_diff = round(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_OFF_TOV_DIFF'].values[0], 1)
-    l5_home_team_pts_off_tov_diff_rank = int(data_misc_L5.loc[data_misc_L5['TEAM_ID'] == home_id, 'PTS_OFF_TOV_DIFF_RANK'].values[0])
-
-    #STARTERS AND BENCH SCORING
-
-    ## STARTERS
-    ### Away Team
-    away_team_starters_scoring = data_trad_season_starters.loc[data_trad_season_starters['TEAM_ID'] == away_id, 'PTS'].values[0]
-    away_team_starters_scoring_rank = data_trad_season_starters.loc[data_trad_season_starters['TEAM_ID'] == away_id, 'PTS_RANK'].values[0]
-    l5_away_team_starters_scoring = data_trad_L5_starters.loc[data_trad_L5_starters['TEAM_ID'] == away_id, 'PTS'].values[0]
-    l5_away_team_starters_scoring_rank = data_trad_L5_starters.loc[data_trad_L5_starters['TEAM_ID'] == away_id, 'PTS_RANK'].values[0]
-
-    ### League Average
-    la_starters_scoring = round(data_trad_season_starters['PTS'].mean(), 1)
-    l5_la_starters_scoring = round(data_trad_L5_starters['PTS'].mean(), 1)
-
-    ### Home Team
-    home_team_starters_scoring = data_trad_season_starters.loc[data_trad_season_starters['TEAM_ID'] == home_id, 'PTS'].values[0]
-    home_team_starters_scoring_rank = data_trad_season_starters.loc[data_trad_season_starters['TEAM_ID'] == home_id, 'PTS_RANK'].values[0]
-    l5_home_team_starters_scoring = data_trad_L5_starters.loc[data_trad_L5_starters['TEAM_ID'] == home_id, 'PTS'].values[0]
-    l5_home_team_starters_scoring_rank = data_trad_L5_starters.loc[data_trad_L5_starters['TEAM_ID'] == home_id, 'PTS_RANK'].values[0]
-
-    ## BENCH
-    ### Away Team
-    away_team_bench_scoring = data_trad_season_bench.loc[data_trad_season_bench['TEAM_ID'] == away_id, 'PTS'].values[0]
-    away_team_bench_scoring_rank = data_trad_season_bench.loc[data_trad_season_bench['TEAM_ID'] == away_id, 'PTS_RANK'].values[0]
-    l5_away_team_bench_scoring = data_trad_L5_bench.loc[data_trad_L5_bench['TEAM_ID'] == away_id, 'PTS'].values[0]
-    l5_away_team_bench_scoring_rank = data_trad_L5_bench.loc[data_trad_L5_bench['TEAM_ID'] == away_id, 'PTS_RANK'].values[0]
-
-    ### League Average
-    la_bench_scoring = round(data_trad_season_bench['PTS'].mean(), 1)
-    l5_la_bench_scoring = round(data_trad_L5_bench['PTS'].mean(), 1)
-
-    ### Home Team
-    home_team_bench_scoring = data_trad_season_bench.loc[data_trad_season_bench['TEAM_ID'] == home_id, 'PTS'].values[0]
-    home_team_bench_scoring_rank = data_trad_season_bench.loc[data_trad_season_bench['TEAM_ID'] == home_id, 'PTS_RANK'].values[0]
-    l5_home_team_bench_scoring = data_trad_L5_bench.loc[data_trad_L5_bench['TEAM_ID'] == home_id, 'PTS'].values[0]
-    l5_home_team_bench_scoring_rank = data_trad_L5_bench.loc[data_trad_L5_bench['TEAM_ID'] == home_id, 'PTS_RANK'].values[0]
-else:
-    # Default values are already set at module level (lines 851-926)
-    # No need to set them again here
-    pass
 
 @st.cache_data(ttl=21600, show_spinner=False)
 def get_cached_pbpstats_totals(data_type: str = "Team", season: str = current_season):
@@ -1127,607 +1690,249 @@ def get_cached_pbpstats_totals(data_type: str = "Team", season: str = current_se
         print(f"Error fetching pbpstats data: {e}")
         return {"league_stats": {}, "team_stats": pd.DataFrame()}
 
-# Load pbpstats data using cached functions
-pbp_totals_data = get_cached_pbpstats_totals("Team")
-league_stats_dict = pbp_totals_data.get("league_stats", {})
-team_stats_dict = pbp_totals_data.get("team_stats", pd.DataFrame())
-
-pbp_opp_totals_data = get_cached_pbpstats_totals("Opponent")
-opp_league_stats_dict = pbp_opp_totals_data.get("league_stats", {})
-opp_team_stats_dict = pbp_opp_totals_data.get("team_stats", pd.DataFrame())
-
-team_stats = pd.DataFrame(team_stats_dict) if isinstance(team_stats_dict, pd.DataFrame) else pd.DataFrame()
-opp_team_stats = pd.DataFrame(opp_team_stats_dict)
-
-
-# PRE-WORK FOR SHOOTING STATS -- TEAM
-## MAKE TEAM ID A NUMBER
-## ALL RANKS SHOULD BE ASCENDING=FALSE
-team_stats['TeamId'] = team_stats['TeamId'].astype(int)
-## FG%
-team_stats['FGM'] = team_stats['FG2M'] + team_stats['FG3M']
-team_stats['FGA'] = team_stats['FG2A'] + team_stats['FG3A']
-team_stats['FGM_PG'] = round((team_stats['FG2M'] + team_stats['FG3M'])/team_stats['GamesPlayed'], 1)
-team_stats['FGM_RANK'] = team_stats['FGM_PG'].rank(ascending=False, method='first').astype(int)
-team_stats['FGA_PG'] = round((team_stats['FG2A'] + team_stats['FG3A'])/team_stats['GamesPlayed'], 1)
-team_stats['FGA_RANK'] = team_stats['FGA_PG'].rank(ascending=False, method='first').astype(int)
-team_stats['FG%'] = round(team_stats['FGM']/team_stats['FGA'], 3)
-team_stats['FG%_RANK'] = team_stats['FG%'].rank(ascending=False, method='first').astype(int)
-
-## 2PT%
-team_stats['FG2M_PG'] = round(team_stats['FG2M']/team_stats['GamesPlayed'], 1)
-team_stats['FG2M_RANK'] = team_stats['FG2M_PG'].rank(ascending=False, method='first').astype(int)
-team_stats['FG2A_PG'] = round(team_stats['FG2A']/team_stats['GamesPlayed'], 1)
-team_stats['FG2A_RANK'] = team_stats['FG2A_PG'].rank(ascending=False, method='first').astype(int)
-team_stats['2PT%'] = round(team_stats['FG2M']/team_stats['FG2A'], 3)
-team_stats['2PT%_RANK'] = team_stats['Fg2Pct'].rank(ascending=False, method='first').astype(int)
-team_stats['2PT_RATE'] = round(team_stats['FG2A']/team_stats['FGA'], 3)
-team_stats['2PT_RATE_RANK'] = team_stats['2PT_RATE'].rank(ascending=False, method='first').astype(int)
-
-## 3PT%
-team_stats['FG3M_PG'] = round(team_stats['FG3M']/team_stats['GamesPlayed'], 1)
-team_stats['FG3M_RANK'] = team_stats['FG3M_PG'].rank(ascending=False, method='first').astype(int)
-team_stats['FG3A_PG'] = round(team_stats['FG3A']/team_stats['GamesPlayed'], 1)
-team_stats['FG3A_RANK'] = team_stats['FG3A_PG'].rank(ascending=False, method='first').astype(int)
-team_stats['3PT%'] = round(team_stats['FG3M']/team_stats['FG3A'], 3)
-team_stats['3PT%_RANK'] = team_stats['Fg3Pct'].rank(ascending=False, method='first').astype(int)
-team_stats['3PT_RATE'] = round(team_stats['FG3A']/team_stats['FGA'], 3)
-team_stats['3PT_RATE_RANK'] = team_stats['3PT_RATE'].rank(ascending=False, method='first').astype(int)
-
-## FT%
-team_stats['FTM'] = team_stats['FtPoints']
-team_stats['FTM_PG'] = round(team_stats['FTM']/team_stats['GamesPlayed'], 1)
-team_stats['FTM_RANK'] = team_stats['FTM_PG'].rank(ascending=False, method='first').astype(int)
-team_stats['FTA_PG'] = round(team_stats['FTA']/team_stats['GamesPlayed'], 1)
-team_stats['FTA_RANK'] = team_stats['FTA_PG'].rank(ascending=False, method='first').astype(int)
-team_stats['FT%'] = round(team_stats['FTM']/team_stats['FTA'], 3)
-team_stats['FT%_RANK'] = team_stats['FT%'].rank(ascending=False, method='first').astype(int)
-team_stats['FT_RATE'] = round(team_stats['FTA']/team_stats['FGA'], 3)
-team_stats['FT_RATE_RANK'] = team_stats['FT_RATE'].rank(ascending=False, method='first').astype(int)
-
-## RIM
-team_stats['RIM_FREQ_RANK'] = team_stats['AtRimFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-team_stats['RIM_FG%_RANK'] = team_stats['AtRimAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-
-## SMR
-team_stats['SMR_FREQ_RANK'] = team_stats['ShortMidRangeFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-team_stats['SMR_FG%_RANK'] = team_stats['ShortMidRangeAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-
-## LMR
-team_stats['LMR_FREQ_RANK'] = team_stats['LongMidRangeFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-team_stats['LMR_FG%_RANK'] = team_stats['LongMidRangeAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-
-## C3
-team_stats['C3_FREQ_RANK'] = team_stats['Corner3Frequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-team_stats['C3_FG%_RANK'] = team_stats['Corner3Accuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-
-## ATB3
-team_stats['ATB3_FREQ_RANK'] = team_stats['Arc3Frequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-team_stats['ATB3_FG%_RANK'] = team_stats['Arc3Accuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-
-
-# PRE-WORK FOR SHOOTING STATS -- OPPONENT
-## MAKE TEAM ID A NUMBER
-## ALL RANKS SHOULD BE ASCENDING=TRUE
-opp_team_stats['TeamId'] = opp_team_stats['TeamId'].astype(int)
-## FG%
-opp_team_stats['FGM'] = opp_team_stats['FG2M'] + opp_team_stats['FG3M']
-opp_team_stats['FGA'] = opp_team_stats['FG2A'] + opp_team_stats['FG3A']
-opp_team_stats['FGM_PG'] = round((opp_team_stats['FG2M'] + opp_team_stats['FG3M'])/opp_team_stats['GamesPlayed'], 1)
-opp_team_stats['FGM_RANK'] = opp_team_stats['FGM_PG'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['FGA_PG'] = round((opp_team_stats['FG2A'] + opp_team_stats['FG3A'])/opp_team_stats['GamesPlayed'], 1)
-opp_team_stats['FGA_RANK'] = opp_team_stats['FGA_PG'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['FG%'] = round(opp_team_stats['FGM']/opp_team_stats['FGA'], 3)
-opp_team_stats['FG%_RANK'] = opp_team_stats['FG%'].rank(ascending=True, method='first').astype(int)
-
-## 2PT%
-opp_team_stats['FG2M_PG'] = round(opp_team_stats['FG2M']/opp_team_stats['GamesPlayed'], 1)
-opp_team_stats['FG2M_RANK'] = opp_team_stats['FG2M_PG'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['FG2A_PG'] = round(opp_team_stats['FG2A']/opp_team_stats['GamesPlayed'], 1)
-opp_team_stats['FG2A_RANK'] = opp_team_stats['FG2A_PG'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['2PT%'] = round(opp_team_stats['FG2M']/opp_team_stats['FG2A'], 3)
-opp_team_stats['2PT%_RANK'] = opp_team_stats['Fg2Pct'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['2PT_RATE'] = round(opp_team_stats['FG2A']/opp_team_stats['FGA'], 3)
-opp_team_stats['2PT_RATE_RANK'] = opp_team_stats['2PT_RATE'].rank(ascending=True, method='first').astype(int)
-
-## 3PT%
-opp_team_stats['FG3M_PG'] = round(opp_team_stats['FG3M']/opp_team_stats['GamesPlayed'], 1)
-opp_team_stats['FG3M_RANK'] = opp_team_stats['FG3M_PG'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['FG3A_PG'] = round(opp_team_stats['FG3A']/opp_team_stats['GamesPlayed'], 1)
-opp_team_stats['FG3A_RANK'] = opp_team_stats['FG3A_PG'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['3PT%'] = round(opp_team_stats['FG3M']/opp_team_stats['FG3A'], 3)
-opp_team_stats['3PT%_RANK'] = opp_team_stats['Fg3Pct'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['3PT_RATE'] = round(opp_team_stats['FG3A']/opp_team_stats['FGA'], 3)
-opp_team_stats['3PT_RATE_RANK'] = opp_team_stats['3PT_RATE'].rank(ascending=True, method='first').astype(int)
-
-## FT%
-opp_team_stats['FTM'] = opp_team_stats['FtPoints']
-opp_team_stats['FTM_PG'] = round(opp_team_stats['FTM']/opp_team_stats['GamesPlayed'], 1)
-opp_team_stats['FTM_RANK'] = opp_team_stats['FTM_PG'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['FTA_PG'] = round(opp_team_stats['FTA']/opp_team_stats['GamesPlayed'], 1)
-opp_team_stats['FTA_RANK'] = opp_team_stats['FTA_PG'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['FT%'] = round(opp_team_stats['FTM']/opp_team_stats['FTA'], 3)
-opp_team_stats['FT%_RANK'] = opp_team_stats['FT%'].rank(ascending=True, method='first').astype(int)
-opp_team_stats['FT_RATE'] = round(opp_team_stats['FTA']/opp_team_stats['FGA'], 3)
-opp_team_stats['FT_RATE_RANK'] = opp_team_stats['FT_RATE'].rank(ascending=True, method='first').astype(int)
-
-## RIM
-opp_team_stats['RIM_FREQ_RANK'] = opp_team_stats['AtRimFrequency'].fillna(0).rank(ascending=True, method='first').astype(int)
-opp_team_stats['RIM_FG%_RANK'] = opp_team_stats['AtRimAccuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
-
-## SMR
-opp_team_stats['SMR_FREQ_RANK'] = opp_team_stats['ShortMidRangeFrequency'].fillna(0).rank(ascending=True, method='first').astype(int)
-opp_team_stats['SMR_FG%_RANK'] = opp_team_stats['ShortMidRangeAccuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
-
-## LMR
-opp_team_stats['LMR_FREQ_RANK'] = opp_team_stats['LongMidRangeFrequency'].fillna(0).rank(ascending=True, method='first').astype(int)
-opp_team_stats['LMR_FG%_RANK'] = opp_team_stats['LongMidRangeAccuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
-
-## C3
-opp_team_stats['C3_FREQ_RANK'] = opp_team_stats['Corner3Frequency'].fillna(0).rank(ascending=True, method='first').astype(int)
-opp_team_stats['C3_FG%_RANK'] = opp_team_stats['Corner3Accuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
-
-## ATB3
-opp_team_stats['ATB3_FREQ_RANK'] = opp_team_stats['Arc3Frequency'].fillna(0).rank(ascending=True, method='first').astype(int)
-opp_team_stats['ATB3_FG%_RANK'] = opp_team_stats['Arc3Accuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
-
-# PRE-WORK FOR SHOOTING STATS -- DIFFERENTIAL
-## MAKE TEAM ID A NUMBER
-## ALL RANKS SHOULD BE ASCENDING=TRUE
-
-#Get a list of all team abbreviations
-pbp_team_list = team_stats.sort_values('Name', ascending=True)['Name'].tolist()
-
-shooting_columns_to_extract = ['TeamId', 'Name',
-                               'FGM_PG', 'FGA_PG', 'FG%',
-                               'FG2M_PG', 'FG2A_PG', '2PT%',
-                               'FG3M_PG', 'FG3A_PG', '3PT%',
-                               'FTM_PG', 'FTA_PG', 'FT%',
-                               'AtRimFrequency', 'AtRimAccuracy',
-                               'ShortMidRangeFrequency', 'ShortMidRangeAccuracy',
-                               'LongMidRangeFrequency', 'LongMidRangeAccuracy',
-                               'Corner3Frequency', 'Corner3Accuracy',
-                               'Arc3Frequency', 'Arc3Accuracy'
-                               ]
-
-# Ensure data is reset and aligned
-team_stats_diff = team_stats[shooting_columns_to_extract].reset_index(drop=True)
-opp_team_stats_diff = opp_team_stats[shooting_columns_to_extract].reset_index(drop=True)
-
-team_stats_col_num = team_stats_diff.shape[1]
-shooting_team_stats_diff = pd.DataFrame()
-
-def create_shooting_diff(team):
-    func_df = pd.DataFrame()  # Initialize once per function call
-
-    if team not in team_stats_diff['Name'].values:  # Prevent KeyError
-        print(f"Warning: {team} not found in team_stats_diff")
-        return pd.DataFrame()  # Return empty DF if team is missing
-
-    for col_counter in range(team_stats_col_num):
-        column_name = shooting_columns_to_extract[col_counter]
-
-        # Ensure the column exists
-        if column_name not in team_stats_diff.columns or column_name not in opp_team_stats_diff.columns:
-            print(f"Warning: {column_name} not found in columns")
-            continue  # Skip missing columns
-
-        # Get team and opponent stats safely
-        team_stat_values = team_stats_diff.loc[team_stats_diff['Name'] == team, column_name].values
-        opp_stat_values = opp_team_stats_diff.loc[opp_team_stats_diff['Name'] == team, column_name].values
-
-        if len(team_stat_values) == 0 or len(opp_stat_values) == 0:
-            print(f"Warning: Missing data for team {team} in column {column_name}")
-            continue  # Skip if data is missing
-
-        team_stat = team_stat_values[0]
-        opp_stat = opp_stat_values[0]
-
-        # Compute final stat difference
-        if col_counter > 1:
-            final_stat = team_stat - opp_stat
-            func_df[column_name] = [final_stat]  # Store as list for DataFrame consistency
-        else:
-            func_df[column_name] = [team_stat]  # Store team_stat as list
-
-    return func_df  # Return full row, not an empty DataFrame
-
-# Apply function across teams
-shooting_diff_results = pd.concat([create_shooting_diff(team) for team in pbp_team_list], ignore_index=True)
-
-#SHOOTING DIFFERENTIAL RANKS
-shooting_diff_results['FGM_RANK'] = shooting_diff_results['FGA_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['FGA_RANK'] = shooting_diff_results['FGA_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['FG%_RANK'] = shooting_diff_results['FG%'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['FG2M_RANK'] = shooting_diff_results['FG2M_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['FG2A_RANK'] = shooting_diff_results['FG2A_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['2PT%_RANK'] = shooting_diff_results['2PT%'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['FG3M_RANK'] = shooting_diff_results['FG3M_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['FG3A_RANK'] = shooting_diff_results['FG3A_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['3PT%_RANK'] = shooting_diff_results['3PT%'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['FTM_RANK'] = shooting_diff_results['FTM_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['FTA_RANK'] = shooting_diff_results['FTA_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['FT%_RANK'] = shooting_diff_results['FT%'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['RIM_FREQ_RANK'] = shooting_diff_results['AtRimFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['RIM_FG%_RANK'] = shooting_diff_results['AtRimAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['SMR_FREQ_RANK'] = shooting_diff_results['ShortMidRangeFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['SMR_FG%_RANK'] = shooting_diff_results['ShortMidRangeAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['LMR_FREQ_RANK'] = shooting_diff_results['LongMidRangeFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['LMR_FG%_RANK'] = shooting_diff_results['LongMidRangeAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['C3_FREQ_RANK'] = shooting_diff_results['Corner3Frequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['C3_FG%_RANK'] = shooting_diff_results['Corner3Accuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['ATB3_FREQ_RANK'] = shooting_diff_results['Arc3Frequency'].fillna(0).rank(ascending=False, method='first').astype(int)
-shooting_diff_results['ATB3_FG%_RANK'] = shooting_diff_results['Arc3Accuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
-## HOME TEAM SHOOTING STATS
-
-# Overall Field Goals
-# home_team_bench_scoring = data_trad_season_bench.loc[data_trad_season_bench['TEAM_ID'] == home_id, 'PTS'].values[0]
-## FGM
-home_team_fgm = team_stats.loc[team_stats['TeamId'] == home_id, 'FGM_PG'].values[0]
-home_team_fgm_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FGM_RANK'].values[0]
-home_team_opp_fgm = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FGM_PG'].values[0]
-home_team_opp_fgm_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FGM_RANK'].values[0]
-home_team_diff_fgm = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FGM_PG'].values[0], 1)
-home_team_diff_fgm_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FGM_RANK'].values[0]
-## FGA
-home_team_fga = team_stats.loc[team_stats['TeamId'] == home_id, 'FGA_PG'].values[0]
-home_team_fga_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FGA_RANK'].values[0]
-home_team_opp_fga = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FGA_PG'].values[0]
-home_team_opp_fga_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FGA_RANK'].values[0]
-home_team_diff_fga = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FGA_PG'].values[0], 1)
-home_team_diff_fga_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FGA_RANK'].values[0]
-## FG%
-home_team_fg_pct = team_stats.loc[team_stats['TeamId'] == home_id, 'FG%'].values[0]
-home_team_fg_pct_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FG%_RANK'].values[0]
-home_team_opp_fg_pct = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG%'].values[0]
-home_team_opp_fg_pct_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG%_RANK'].values[0]
-home_team_diff_fg_pct = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG%'].values[0]
-home_team_diff_fg_pct_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG%_RANK'].values[0]
-# Overall 2-Point Shooting
-## 2PT
-home_team_2pt = team_stats.loc[team_stats['TeamId'] == home_id, 'FG2M_PG'].values[0]
-home_team_2pt_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FG2M_RANK'].values[0]
-home_team_opp_2pt = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG2M_PG'].values[0]
-home_team_opp_2pt_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG2M_RANK'].values[0]
-home_team_diff_2pt = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG2M_PG'].values[0], 1)
-home_team_diff_2pt_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG2M_RANK'].values[0]
-## 2PA
-home_team_2pa = team_stats.loc[team_stats['TeamId'] == home_id, 'FG2A_PG'].values[0]
-home_team_2pa_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FG2A_RANK'].values[0]
-home_team_opp_2pa = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG2A_PG'].values[0]
-home_team_opp_2pa_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG2A_RANK'].values[0]
-home_team_diff_2pa = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG2A_PG'].values[0], 1)
-home_team_diff_2pa_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG2A_RANK'].values[0]
-## 2PT%
-home_team_2pt_pct = team_stats.loc[team_stats['TeamId'] == home_id, '2PT%'].values[0]
-home_team_2pt_pct_rank = team_stats.loc[team_stats['TeamId'] == home_id, '2PT%_RANK'].values[0]
-home_team_opp_2pt_pct = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, '2PT%'].values[0]
-home_team_opp_2pt_pct_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, '2PT%_RANK'].values[0]
-home_team_diff_2pt_pct = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, '2PT%'].values[0]
-home_team_diff_2pt_pct_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, '2PT%_RANK'].values[0]
-# Overall 3-Point Shooting
-## 3PT
-home_team_3pt = team_stats.loc[team_stats['TeamId'] == home_id, 'FG3M_PG'].values[0]
-home_team_3pt_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FG3M_RANK'].values[0]
-home_team_opp_3pt = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG3M_PG'].values[0]
-home_team_opp_3pt_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG3M_RANK'].values[0]
-home_team_diff_3pt = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG3M_PG'].values[0], 1)
-home_team_diff_3pt_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG3M_RANK'].values[0]
-## 3PA
-home_team_3pa = team_stats.loc[team_stats['TeamId'] == home_id, 'FG3A_PG'].values[0]
-home_team_3pa_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FG3A_RANK'].values[0]
-home_team_opp_3pa = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG3A_PG'].values[0]
-home_team_opp_3pa_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FG3A_RANK'].values[0]
-home_team_diff_3pa = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG3A_PG'].values[0], 1)
-home_team_diff_3pa_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FG3A_RANK'].values[0]
-## 3PT%
-home_team_3pt_pct = team_stats.loc[team_stats['TeamId'] == home_id, '3PT%'].values[0]
-home_team_3pt_pct_rank = team_stats.loc[team_stats['TeamId'] == home_id, '3PT%_RANK'].values[0]
-home_team_opp_3pt_pct = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, '3PT%'].values[0]
-home_team_opp_3pt_pct_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, '3PT%_RANK'].values[0]
-home_team_diff_3pt_pct = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, '3PT%'].values[0]
-home_team_diff_3pt_pct_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, '3PT%_RANK'].values[0]
-# Overall Free Throw Shooting
-## FTM
-home_team_ftm = team_stats.loc[team_stats['TeamId'] == home_id, 'FTM_PG'].values[0]
-home_team_ftm_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FTM_RANK'].values[0]
-home_team_opp_ftm = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FTM_PG'].values[0]
-home_team_opp_ftm_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FTM_RANK'].values[0]
-home_team_diff_ftm = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FTM_PG'].values[0], 1)
-home_team_diff_ftm_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FTM_RANK'].values[0]
-## FTA
-home_team_fta = team_stats.loc[team_stats['TeamId'] == home_id, 'FTA_PG'].values[0]
-home_team_fta_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FTA_RANK'].values[0]
-home_team_opp_fta = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FTA_PG'].values[0]
-home_team_opp_fta_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FTA_RANK'].values[0]
-home_team_diff_fta = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FTA_PG'].values[0], 1)
-home_team_diff_fta_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FTA_RANK'].values[0]
-## FT%
-home_team_ft_pct = team_stats.loc[team_stats['TeamId'] == home_id, 'FT%'].values[0]
-home_team_ft_pct_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'FT%_RANK'].values[0]
-home_team_opp_ft_pct = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FT%'].values[0]
-home_team_opp_ft_pct_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'FT%_RANK'].values[0]
-home_team_diff_ft_pct = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FT%'].values[0]
-home_team_diff_ft_pct_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'FT%_RANK'].values[0]
-# RIM
-## Rim Frequency
-home_team_rim_freq = team_stats.loc[team_stats['TeamId'] == home_id, 'AtRimFrequency'].values[0]
-home_team_rim_freq_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'RIM_FREQ_RANK'].values[0]
-home_team_opp_rim_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'AtRimFrequency'].values[0]
-home_team_opp_rim_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'RIM_FREQ_RANK'].values[0]
-home_team_diff_rim_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'AtRimFrequency'].values[0]
-home_team_diff_rim_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'RIM_FREQ_RANK'].values[0]
-## Rim Accuracy
-home_team_rim_acc = team_stats.loc[team_stats['TeamId'] == home_id, 'AtRimAccuracy'].values[0]
-home_team_rim_acc_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'RIM_FG%_RANK'].values[0]
-home_team_opp_rim_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'AtRimAccuracy'].values[0]
-home_team_opp_rim_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'RIM_FG%_RANK'].values[0]
-home_team_diff_rim_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'AtRimAccuracy'].values[0]
-home_team_diff_rim_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'RIM_FG%_RANK'].values[0]
-
-# Short Mid-Range Shooting
-## SMR Frequency
-home_team_smr_freq = team_stats.loc[team_stats['TeamId'] == home_id, 'ShortMidRangeFrequency'].values[0]
-home_team_smr_freq_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'SMR_FREQ_RANK'].values[0]
-home_team_opp_smr_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'ShortMidRangeFrequency'].values[0]
-home_team_opp_smr_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'SMR_FREQ_RANK'].values[0]
-home_team_diff_smr_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'ShortMidRangeFrequency'].values[0]
-home_team_diff_smr_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'SMR_FREQ_RANK'].values[0]
-## SMR Accuracy
-home_team_smr_acc = team_stats.loc[team_stats['TeamId'] == home_id, 'ShortMidRangeAccuracy'].values[0]
-home_team_smr_acc_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'SMR_FG%_RANK'].values[0]
-home_team_opp_smr_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'ShortMidRangeAccuracy'].values[0]
-home_team_opp_smr_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'SMR_FG%_RANK'].values[0]
-home_team_diff_smr_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'ShortMidRangeAccuracy'].values[0]
-home_team_diff_smr_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'SMR_FG%_RANK'].values[0]
-
-# Long Mid-Range Shooting
-## LMR Frequency
-home_team_lmr_freq = team_stats.loc[team_stats['TeamId'] == home_id, 'LongMidRangeFrequency'].values[0]
-home_team_lmr_freq_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'LMR_FREQ_RANK'].values[0]
-home_team_opp_lmr_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'LongMidRangeFrequency'].values[0]
-home_team_opp_lmr_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'LMR_FREQ_RANK'].values[0]
-home_team_diff_lmr_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'LongMidRangeFrequency'].values[0]
-home_team_diff_lmr_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'LMR_FREQ_RANK'].values[0]
-## LMR Accuracy
-home_team_lmr_acc = team_stats.loc[team_stats['TeamId'] == home_id, 'LongMidRangeAccuracy'].values[0]
-home_team_lmr_acc_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'LMR_FG%_RANK'].values[0]
-home_team_opp_lmr_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'LongMidRangeAccuracy'].values[0]
-home_team_opp_lmr_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'LMR_FG%_RANK'].values[0]
-home_team_diff_lmr_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'LongMidRangeAccuracy'].values[0]
-home_team_diff_lmr_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'LMR_FG%_RANK'].values[0]
-# Corner 3-Point Shooting
-## C3 Frequency
-home_team_c3_freq = team_stats.loc[team_stats['TeamId'] == home_id, 'Corner3Frequency'].values[0]
-home_team_c3_freq_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'C3_FREQ_RANK'].values[0]
-home_team_opp_c3_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'Corner3Frequency'].values[0]
-home_team_opp_c3_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'C3_FREQ_RANK'].values[0]
-home_team_diff_c3_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'Corner3Frequency'].values[0]
-home_team_diff_c3_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'C3_FREQ_RANK'].values[0]
-## C3 Accuracy
-home_team_c3_acc = team_stats.loc[team_stats['TeamId'] == home_id, 'Corner3Accuracy'].values[0]
-home_team_c3_acc_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'C3_FG%_RANK'].values[0]
-home_team_opp_c3_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'Corner3Accuracy'].values[0]
-home_team_opp_c3_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'C3_FG%_RANK'].values[0]
-home_team_diff_c3_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'Corner3Accuracy'].values[0]
-home_team_diff_c3_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'C3_FG%_RANK'].values[0]
-# Above the Break 3-Point Shooting
-## ATB3 Frequency
-home_team_atb3_freq = team_stats.loc[team_stats['TeamId'] == home_id, 'Arc3Frequency'].values[0]
-home_team_atb3_freq_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'ATB3_FREQ_RANK'].values[0]
-home_team_opp_atb3_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'Arc3Frequency'].values[0]
-home_team_opp_atb3_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'ATB3_FREQ_RANK'].values[0]
-home_team_diff_atb3_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'Arc3Frequency'].values[0]
-home_team_diff_atb3_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'ATB3_FREQ_RANK'].values[0]
-## ATB3 Accuracy
-home_team_atb3_acc = team_stats.loc[team_stats['TeamId'] == home_id, 'Arc3Accuracy'].values[0]
-home_team_atb3_acc_rank = team_stats.loc[team_stats['TeamId'] == home_id, 'ATB3_FG%_RANK'].values[0]
-home_team_opp_atb3_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'Arc3Accuracy'].values[0]
-home_team_opp_atb3_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == home_id, 'ATB3_FG%_RANK'].values[0]
-home_team_diff_atb3_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'Arc3Accuracy'].values[0]
-home_team_diff_atb3_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == home_id, 'ATB3_FG%_RANK'].values[0]
-
-## AWAY TEAM SHOOTING STATS
-
-# Overall Field Goals
-# away_team_bench_scoring = data_trad_season_bench.loc[data_trad_season_bench['TEAM_ID'] == away_id, 'PTS'].values[0]
-## FGM
-away_team_fgm = team_stats.loc[team_stats['TeamId'] == away_id, 'FGM_PG'].values[0]
-away_team_fgm_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FGM_RANK'].values[0]
-away_team_opp_fgm = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FGM_PG'].values[0]
-away_team_opp_fgm_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FGM_RANK'].values[0]
-away_team_diff_fgm = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FGM_PG'].values[0], 1)
-away_team_diff_fgm_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FGM_RANK'].values[0]
-## FGA
-away_team_fga = team_stats.loc[team_stats['TeamId'] == away_id, 'FGA_PG'].values[0]
-away_team_fga_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FGA_RANK'].values[0]
-away_team_opp_fga = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FGA_PG'].values[0]
-away_team_opp_fga_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FGA_RANK'].values[0]
-away_team_diff_fga = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FGA_PG'].values[0], 1)
-away_team_diff_fga_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FGA_RANK'].values[0]
-## FG%
-away_team_fg_pct = team_stats.loc[team_stats['TeamId'] == away_id, 'FG%'].values[0]
-away_team_fg_pct_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FG%_RANK'].values[0]
-away_team_opp_fg_pct = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG%'].values[0]
-away_team_opp_fg_pct_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG%_RANK'].values[0]
-away_team_diff_fg_pct = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG%'].values[0]
-away_team_diff_fg_pct_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG%_RANK'].values[0]
-# Overall 2-Point Shooting
-## 2PT
-away_team_2pt = team_stats.loc[team_stats['TeamId'] == away_id, 'FG2M_PG'].values[0]
-away_team_2pt_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FG2M_RANK'].values[0]
-away_team_opp_2pt = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG2M_PG'].values[0]
-away_team_opp_2pt_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG2M_RANK'].values[0]
-away_team_diff_2pt = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG2M_PG'].values[0], 1)
-away_team_diff_2pt_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG2M_RANK'].values[0]
-## 2PA
-away_team_2pa = team_stats.loc[team_stats['TeamId'] == away_id, 'FG2A_PG'].values[0]
-away_team_2pa_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FG2A_RANK'].values[0]
-away_team_opp_2pa = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG2A_PG'].values[0]
-away_team_opp_2pa_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG2A_RANK'].values[0]
-away_team_diff_2pa = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG2A_PG'].values[0], 1)
-away_team_diff_2pa_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG2A_RANK'].values[0]
-## 2PT%
-away_team_2pt_pct = team_stats.loc[team_stats['TeamId'] == away_id, '2PT%'].values[0]
-away_team_2pt_pct_rank = team_stats.loc[team_stats['TeamId'] == away_id, '2PT%_RANK'].values[0]
-away_team_opp_2pt_pct = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, '2PT%'].values[0]
-away_team_opp_2pt_pct_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, '2PT%_RANK'].values[0]
-away_team_diff_2pt_pct = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, '2PT%'].values[0]
-away_team_diff_2pt_pct_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, '2PT%_RANK'].values[0]
-# Overall 3-Point Shooting
-## 3PT
-away_team_3pt = team_stats.loc[team_stats['TeamId'] == away_id, 'FG3M_PG'].values[0]
-away_team_3pt_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FG3M_RANK'].values[0]
-away_team_opp_3pt = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG3M_PG'].values[0]
-away_team_opp_3pt_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG3M_RANK'].values[0]
-away_team_diff_3pt = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG3M_PG'].values[0], 1)
-away_team_diff_3pt_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG3M_RANK'].values[0]
-## 3PA
-away_team_3pa = team_stats.loc[team_stats['TeamId'] == away_id, 'FG3A_PG'].values[0]
-away_team_3pa_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FG3A_RANK'].values[0]
-away_team_opp_3pa = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG3A_PG'].values[0]
-away_team_opp_3pa_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FG3A_RANK'].values[0]
-away_team_diff_3pa = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG3A_PG'].values[0], 1)
-away_team_diff_3pa_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FG3A_RANK'].values[0]
-## 3PT%
-away_team_3pt_pct = team_stats.loc[team_stats['TeamId'] == away_id, '3PT%'].values[0]
-away_team_3pt_pct_rank = team_stats.loc[team_stats['TeamId'] == away_id, '3PT%_RANK'].values[0]
-away_team_opp_3pt_pct = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, '3PT%'].values[0]
-away_team_opp_3pt_pct_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, '3PT%_RANK'].values[0]
-away_team_diff_3pt_pct = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, '3PT%'].values[0]
-away_team_diff_3pt_pct_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, '3PT%_RANK'].values[0]
-# Overall Free Throw Shooting
-## FTM
-away_team_ftm = team_stats.loc[team_stats['TeamId'] == away_id, 'FTM_PG'].values[0]
-away_team_ftm_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FTM_RANK'].values[0]
-away_team_opp_ftm = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FTM_PG'].values[0]
-away_team_opp_ftm_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FTM_RANK'].values[0]
-away_team_diff_ftm = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FTM_PG'].values[0], 1)
-away_team_diff_ftm_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FTM_RANK'].values[0]
-## FTA
-away_team_fta = team_stats.loc[team_stats['TeamId'] == away_id, 'FTA_PG'].values[0]
-away_team_fta_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FTA_RANK'].values[0]
-away_team_opp_fta = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FTA_PG'].values[0]
-away_team_opp_fta_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FTA_RANK'].values[0]
-away_team_diff_fta = round(shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FTA_PG'].values[0], 1)
-away_team_diff_fta_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FTA_RANK'].values[0]
-## FT%
-away_team_ft_pct = team_stats.loc[team_stats['TeamId'] == away_id, 'FT%'].values[0]
-away_team_ft_pct_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'FT%_RANK'].values[0]
-away_team_opp_ft_pct = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FT%'].values[0]
-away_team_opp_ft_pct_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'FT%_RANK'].values[0]
-away_team_diff_ft_pct = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FT%'].values[0]
-away_team_diff_ft_pct_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'FT%_RANK'].values[0]
-# RIM
-## Rim Frequency
-away_team_rim_freq = team_stats.loc[team_stats['TeamId'] == away_id, 'AtRimFrequency'].values[0]
-away_team_rim_freq_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'RIM_FREQ_RANK'].values[0]
-away_team_opp_rim_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'AtRimFrequency'].values[0]
-away_team_opp_rim_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'RIM_FREQ_RANK'].values[0]
-away_team_diff_rim_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'AtRimFrequency'].values[0]
-away_team_diff_rim_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'RIM_FREQ_RANK'].values[0]
-## Rim Accuracy
-away_team_rim_acc = team_stats.loc[team_stats['TeamId'] == away_id, 'AtRimAccuracy'].values[0]
-away_team_rim_acc_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'RIM_FG%_RANK'].values[0]
-away_team_opp_rim_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'AtRimAccuracy'].values[0]
-away_team_opp_rim_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'RIM_FG%_RANK'].values[0]
-away_team_diff_rim_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'AtRimAccuracy'].values[0]
-away_team_diff_rim_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'RIM_FG%_RANK'].values[0]
-
-# Short Mid-Range Shooting
-## SMR Frequency
-away_team_smr_freq = team_stats.loc[team_stats['TeamId'] == away_id, 'ShortMidRangeFrequency'].values[0]
-away_team_smr_freq_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'SMR_FREQ_RANK'].values[0]
-away_team_opp_smr_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'ShortMidRangeFrequency'].values[0]
-away_team_opp_smr_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'SMR_FREQ_RANK'].values[0]
-away_team_diff_smr_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'ShortMidRangeFrequency'].values[0]
-away_team_diff_smr_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'SMR_FREQ_RANK'].values[0]
-## SMR Accuracy
-away_team_smr_acc = team_stats.loc[team_stats['TeamId'] == away_id, 'ShortMidRangeAccuracy'].values[0]
-away_team_smr_acc_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'SMR_FG%_RANK'].values[0]
-away_team_opp_smr_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'ShortMidRangeAccuracy'].values[0]
-away_team_opp_smr_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'SMR_FG%_RANK'].values[0]
-away_team_diff_smr_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'ShortMidRangeAccuracy'].values[0]
-away_team_diff_smr_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'SMR_FG%_RANK'].values[0]
-
-# Long Mid-Range Shooting
-## LMR Frequency
-away_team_lmr_freq = team_stats.loc[team_stats['TeamId'] == away_id, 'LongMidRangeFrequency'].values[0]
-away_team_lmr_freq_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'LMR_FREQ_RANK'].values[0]
-away_team_opp_lmr_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'LongMidRangeFrequency'].values[0]
-away_team_opp_lmr_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'LMR_FREQ_RANK'].values[0]
-away_team_diff_lmr_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'LongMidRangeFrequency'].values[0]
-away_team_diff_lmr_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'LMR_FREQ_RANK'].values[0]
-## LMR Accuracy
-away_team_lmr_acc = team_stats.loc[team_stats['TeamId'] == away_id, 'LongMidRangeAccuracy'].values[0]
-away_team_lmr_acc_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'LMR_FG%_RANK'].values[0]
-away_team_opp_lmr_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'LongMidRangeAccuracy'].values[0]
-away_team_opp_lmr_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'LMR_FG%_RANK'].values[0]
-away_team_diff_lmr_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'LongMidRangeAccuracy'].values[0]
-away_team_diff_lmr_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'LMR_FG%_RANK'].values[0]
-# Corner 3-Point Shooting
-## C3 Frequency
-away_team_c3_freq = team_stats.loc[team_stats['TeamId'] == away_id, 'Corner3Frequency'].values[0]
-away_team_c3_freq_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'C3_FREQ_RANK'].values[0]
-away_team_opp_c3_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'Corner3Frequency'].values[0]
-away_team_opp_c3_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'C3_FREQ_RANK'].values[0]
-away_team_diff_c3_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'Corner3Frequency'].values[0]
-away_team_diff_c3_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'C3_FREQ_RANK'].values[0]
-## C3 Accuracy
-away_team_c3_acc = team_stats.loc[team_stats['TeamId'] == away_id, 'Corner3Accuracy'].values[0]
-away_team_c3_acc_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'C3_FG%_RANK'].values[0]
-away_team_opp_c3_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'Corner3Accuracy'].values[0]
-away_team_opp_c3_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'C3_FG%_RANK'].values[0]
-away_team_diff_c3_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'Corner3Accuracy'].values[0]
-away_team_diff_c3_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'C3_FG%_RANK'].values[0]
-# Above the Break 3-Point Shooting
-## ATB3 Frequency
-away_team_atb3_freq = team_stats.loc[team_stats['TeamId'] == away_id, 'Arc3Frequency'].values[0]
-away_team_atb3_freq_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'ATB3_FREQ_RANK'].values[0]
-away_team_opp_atb3_freq = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'Arc3Frequency'].values[0]
-away_team_opp_atb3_freq_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'ATB3_FREQ_RANK'].values[0]
-away_team_diff_atb3_freq = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'Arc3Frequency'].values[0]
-away_team_diff_atb3_freq_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'ATB3_FREQ_RANK'].values[0]
-## ATB3 Accuracy
-away_team_atb3_acc = team_stats.loc[team_stats['TeamId'] == away_id, 'Arc3Accuracy'].values[0]
-away_team_atb3_acc_rank = team_stats.loc[team_stats['TeamId'] == away_id, 'ATB3_FG%_RANK'].values[0]
-away_team_opp_atb3_acc = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'Arc3Accuracy'].values[0]
-away_team_opp_atb3_acc_rank = opp_team_stats.loc[opp_team_stats['TeamId'] == away_id, 'ATB3_FG%_RANK'].values[0]
-away_team_diff_atb3_acc = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'Arc3Accuracy'].values[0]
-away_team_diff_atb3_acc_rank = shooting_diff_results.loc[shooting_diff_results['TeamId'] == away_id, 'ATB3_FG%_RANK'].values[0]
-
-## LEAGUE AVERAGE SHOOTING STATS
-
-la_fgm = round(team_stats_diff['FGM_PG'].mean(), 1)
-la_fga = round(team_stats_diff['FGA_PG'].mean(), 1)
-la_fg_pct = round(team_stats_diff['FG%'].mean(), 3)
-
-la_2pt = round(team_stats_diff['FG2M_PG'].mean(), 1)
-la_2pa = round(team_stats_diff['FG2A_PG'].mean(), 1)
-la_2pt_pct = round(team_stats_diff['2PT%'].mean(), 3)
-
-la_3pt = round(team_stats_diff['FG3M_PG'].mean(), 1)
-la_3pa = round(team_stats_diff['FG3A_PG'].mean(), 1)
-la_3pt_pct = round(team_stats_diff['3PT%'].mean(), 3)
-
-la_ftm = round(team_stats_diff['FTM_PG'].mean(), 1)
-la_fta = round(team_stats_diff['FTA_PG'].mean(), 1)
-la_ft_pct = round(team_stats_diff['FT%'].mean(), 3)
-
-la_rim_freq = round(team_stats_diff['AtRimFrequency'].mean(), 3)
-la_rim_acc = round(team_stats_diff['AtRimAccuracy'].mean(), 3)
-
-la_smr_freq = round(team_stats_diff['ShortMidRangeFrequency'].mean(), 3)
-la_smr_acc = round(team_stats_diff['ShortMidRangeAccuracy'].mean(), 3)
-
-la_lmr_freq = round(team_stats_diff['LongMidRangeFrequency'].mean(), 3)
-la_lmr_acc = round(team_stats_diff['LongMidRangeAccuracy'].mean(), 3)
-
-la_atb3_freq = round(team_stats_diff['Arc3Frequency'].mean(), 3)
-la_atb3_acc = round(team_stats_diff['Arc3Accuracy'].mean(), 3)
-
-la_c3_freq = round(team_stats_diff['Corner3Frequency'].mean(), 3)
-la_c3_acc = round(team_stats_diff['Corner3Accuracy'].mean(), 3)
+
+def _build_pbp_team_stats():
+    """Team and opponent pbpstats totals with per-game stats, ranks and shooting differentials."""
+    league_stats_dict = get_dataset('pbp_totals_data').get("league_stats", {})
+    team_stats_dict = get_dataset('pbp_totals_data').get("team_stats", pd.DataFrame())
+
+    opp_league_stats_dict = get_dataset('pbp_opp_totals_data').get("league_stats", {})
+    opp_team_stats_dict = get_dataset('pbp_opp_totals_data').get("team_stats", pd.DataFrame())
+
+    team_stats = pd.DataFrame(team_stats_dict) if isinstance(team_stats_dict, pd.DataFrame) else pd.DataFrame()
+    opp_team_stats = pd.DataFrame(opp_team_stats_dict)
+
+
+    # PRE-WORK FOR SHOOTING STATS -- TEAM
+    ## MAKE TEAM ID A NUMBER
+    ## ALL RANKS SHOULD BE ASCENDING=FALSE
+    team_stats['TeamId'] = team_stats['TeamId'].astype(int)
+    ## FG%
+    team_stats['FGM'] = team_stats['FG2M'] + team_stats['FG3M']
+    team_stats['FGA'] = team_stats['FG2A'] + team_stats['FG3A']
+    team_stats['FGM_PG'] = round((team_stats['FG2M'] + team_stats['FG3M'])/team_stats['GamesPlayed'], 1)
+    team_stats['FGM_RANK'] = team_stats['FGM_PG'].rank(ascending=False, method='first').astype(int)
+    team_stats['FGA_PG'] = round((team_stats['FG2A'] + team_stats['FG3A'])/team_stats['GamesPlayed'], 1)
+    team_stats['FGA_RANK'] = team_stats['FGA_PG'].rank(ascending=False, method='first').astype(int)
+    team_stats['FG%'] = round(team_stats['FGM']/team_stats['FGA'], 3)
+    team_stats['FG%_RANK'] = team_stats['FG%'].rank(ascending=False, method='first').astype(int)
+
+    ## 2PT%
+    team_stats['FG2M_PG'] = round(team_stats['FG2M']/team_stats['GamesPlayed'], 1)
+    team_stats['FG2M_RANK'] = team_stats['FG2M_PG'].rank(ascending=False, method='first').astype(int)
+    team_stats['FG2A_PG'] = round(team_stats['FG2A']/team_stats['GamesPlayed'], 1)
+    team_stats['FG2A_RANK'] = team_stats['FG2A_PG'].rank(ascending=False, method='first').astype(int)
+    team_stats['2PT%'] = round(team_stats['FG2M']/team_stats['FG2A'], 3)
+    team_stats['2PT%_RANK'] = team_stats['Fg2Pct'].rank(ascending=False, method='first').astype(int)
+    team_stats['2PT_RATE'] = round(team_stats['FG2A']/team_stats['FGA'], 3)
+    team_stats['2PT_RATE_RANK'] = team_stats['2PT_RATE'].rank(ascending=False, method='first').astype(int)
+
+    ## 3PT%
+    team_stats['FG3M_PG'] = round(team_stats['FG3M']/team_stats['GamesPlayed'], 1)
+    team_stats['FG3M_RANK'] = team_stats['FG3M_PG'].rank(ascending=False, method='first').astype(int)
+    team_stats['FG3A_PG'] = round(team_stats['FG3A']/team_stats['GamesPlayed'], 1)
+    team_stats['FG3A_RANK'] = team_stats['FG3A_PG'].rank(ascending=False, method='first').astype(int)
+    team_stats['3PT%'] = round(team_stats['FG3M']/team_stats['FG3A'], 3)
+    team_stats['3PT%_RANK'] = team_stats['Fg3Pct'].rank(ascending=False, method='first').astype(int)
+    team_stats['3PT_RATE'] = round(team_stats['FG3A']/team_stats['FGA'], 3)
+    team_stats['3PT_RATE_RANK'] = team_stats['3PT_RATE'].rank(ascending=False, method='first').astype(int)
+
+    ## FT%
+    team_stats['FTM'] = team_stats['FtPoints']
+    team_stats['FTM_PG'] = round(team_stats['FTM']/team_stats['GamesPlayed'], 1)
+    team_stats['FTM_RANK'] = team_stats['FTM_PG'].rank(ascending=False, method='first').astype(int)
+    team_stats['FTA_PG'] = round(team_stats['FTA']/team_stats['GamesPlayed'], 1)
+    team_stats['FTA_RANK'] = team_stats['FTA_PG'].rank(ascending=False, method='first').astype(int)
+    team_stats['FT%'] = round(team_stats['FTM']/team_stats['FTA'], 3)
+    team_stats['FT%_RANK'] = team_stats['FT%'].rank(ascending=False, method='first').astype(int)
+    team_stats['FT_RATE'] = round(team_stats['FTA']/team_stats['FGA'], 3)
+    team_stats['FT_RATE_RANK'] = team_stats['FT_RATE'].rank(ascending=False, method='first').astype(int)
+
+    ## RIM
+    team_stats['RIM_FREQ_RANK'] = team_stats['AtRimFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    team_stats['RIM_FG%_RANK'] = team_stats['AtRimAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+
+    ## SMR
+    team_stats['SMR_FREQ_RANK'] = team_stats['ShortMidRangeFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    team_stats['SMR_FG%_RANK'] = team_stats['ShortMidRangeAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+
+    ## LMR
+    team_stats['LMR_FREQ_RANK'] = team_stats['LongMidRangeFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    team_stats['LMR_FG%_RANK'] = team_stats['LongMidRangeAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+
+    ## C3
+    team_stats['C3_FREQ_RANK'] = team_stats['Corner3Frequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    team_stats['C3_FG%_RANK'] = team_stats['Corner3Accuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+
+    ## ATB3
+    team_stats['ATB3_FREQ_RANK'] = team_stats['Arc3Frequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    team_stats['ATB3_FG%_RANK'] = team_stats['Arc3Accuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+
+
+    # PRE-WORK FOR SHOOTING STATS -- OPPONENT
+    ## MAKE TEAM ID A NUMBER
+    ## ALL RANKS SHOULD BE ASCENDING=TRUE
+    opp_team_stats['TeamId'] = opp_team_stats['TeamId'].astype(int)
+    ## FG%
+    opp_team_stats['FGM'] = opp_team_stats['FG2M'] + opp_team_stats['FG3M']
+    opp_team_stats['FGA'] = opp_team_stats['FG2A'] + opp_team_stats['FG3A']
+    opp_team_stats['FGM_PG'] = round((opp_team_stats['FG2M'] + opp_team_stats['FG3M'])/opp_team_stats['GamesPlayed'], 1)
+    opp_team_stats['FGM_RANK'] = opp_team_stats['FGM_PG'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['FGA_PG'] = round((opp_team_stats['FG2A'] + opp_team_stats['FG3A'])/opp_team_stats['GamesPlayed'], 1)
+    opp_team_stats['FGA_RANK'] = opp_team_stats['FGA_PG'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['FG%'] = round(opp_team_stats['FGM']/opp_team_stats['FGA'], 3)
+    opp_team_stats['FG%_RANK'] = opp_team_stats['FG%'].rank(ascending=True, method='first').astype(int)
+
+    ## 2PT%
+    opp_team_stats['FG2M_PG'] = round(opp_team_stats['FG2M']/opp_team_stats['GamesPlayed'], 1)
+    opp_team_stats['FG2M_RANK'] = opp_team_stats['FG2M_PG'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['FG2A_PG'] = round(opp_team_stats['FG2A']/opp_team_stats['GamesPlayed'], 1)
+    opp_team_stats['FG2A_RANK'] = opp_team_stats['FG2A_PG'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['2PT%'] = round(opp_team_stats['FG2M']/opp_team_stats['FG2A'], 3)
+    opp_team_stats['2PT%_RANK'] = opp_team_stats['Fg2Pct'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['2PT_RATE'] = round(opp_team_stats['FG2A']/opp_team_stats['FGA'], 3)
+    opp_team_stats['2PT_RATE_RANK'] = opp_team_stats['2PT_RATE'].rank(ascending=True, method='first').astype(int)
+
+    ## 3PT%
+    opp_team_stats['FG3M_PG'] = round(opp_team_stats['FG3M']/opp_team_stats['GamesPlayed'], 1)
+    opp_team_stats['FG3M_RANK'] = opp_team_stats['FG3M_PG'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['FG3A_PG'] = round(opp_team_stats['FG3A']/opp_team_stats['GamesPlayed'], 1)
+    opp_team_stats['FG3A_RANK'] = opp_team_stats['FG3A_PG'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['3PT%'] = round(opp_team_stats['FG3M']/opp_team_stats['FG3A'], 3)
+    opp_team_stats['3PT%_RANK'] = opp_team_stats['Fg3Pct'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['3PT_RATE'] = round(opp_team_stats['FG3A']/opp_team_stats['FGA'], 3)
+    opp_team_stats['3PT_RATE_RANK'] = opp_team_stats['3PT_RATE'].rank(ascending=True, method='first').astype(int)
+
+    ## FT%
+    opp_team_stats['FTM'] = opp_team_stats['FtPoints']
+    opp_team_stats['FTM_PG'] = round(opp_team_stats['FTM']/opp_team_stats['GamesPlayed'], 1)
+    opp_team_stats['FTM_RANK'] = opp_team_stats['FTM_PG'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['FTA_PG'] = round(opp_team_stats['FTA']/opp_team_stats['GamesPlayed'], 1)
+    opp_team_stats['FTA_RANK'] = opp_team_stats['FTA_PG'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['FT%'] = round(opp_team_stats['FTM']/opp_team_stats['FTA'], 3)
+    opp_team_stats['FT%_RANK'] = opp_team_stats['FT%'].rank(ascending=True, method='first').astype(int)
+    opp_team_stats['FT_RATE'] = round(opp_team_stats['FTA']/opp_team_stats['FGA'], 3)
+    opp_team_stats['FT_RATE_RANK'] = opp_team_stats['FT_RATE'].rank(ascending=True, method='first').astype(int)
+
+    ## RIM
+    opp_team_stats['RIM_FREQ_RANK'] = opp_team_stats['AtRimFrequency'].fillna(0).rank(ascending=True, method='first').astype(int)
+    opp_team_stats['RIM_FG%_RANK'] = opp_team_stats['AtRimAccuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
+
+    ## SMR
+    opp_team_stats['SMR_FREQ_RANK'] = opp_team_stats['ShortMidRangeFrequency'].fillna(0).rank(ascending=True, method='first').astype(int)
+    opp_team_stats['SMR_FG%_RANK'] = opp_team_stats['ShortMidRangeAccuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
+
+    ## LMR
+    opp_team_stats['LMR_FREQ_RANK'] = opp_team_stats['LongMidRangeFrequency'].fillna(0).rank(ascending=True, method='first').astype(int)
+    opp_team_stats['LMR_FG%_RANK'] = opp_team_stats['LongMidRangeAccuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
+
+    ## C3
+    opp_team_stats['C3_FREQ_RANK'] = opp_team_stats['Corner3Frequency'].fillna(0).rank(ascending=True, method='first').astype(int)
+    opp_team_stats['C3_FG%_RANK'] = opp_team_stats['Corner3Accuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
+
+    ## ATB3
+    opp_team_stats['ATB3_FREQ_RANK'] = opp_team_stats['Arc3Frequency'].fillna(0).rank(ascending=True, method='first').astype(int)
+    opp_team_stats['ATB3_FG%_RANK'] = opp_team_stats['Arc3Accuracy'].fillna(0).rank(ascending=True, method='first').astype(int)
+
+    # PRE-WORK FOR SHOOTING STATS -- DIFFERENTIAL
+    ## MAKE TEAM ID A NUMBER
+    ## ALL RANKS SHOULD BE ASCENDING=TRUE
+
+    #Get a list of all team abbreviations
+    pbp_team_list = team_stats.sort_values('Name', ascending=True)['Name'].tolist()
+
+    shooting_columns_to_extract = ['TeamId', 'Name',
+                                   'FGM_PG', 'FGA_PG', 'FG%',
+                                   'FG2M_PG', 'FG2A_PG', '2PT%',
+                                   'FG3M_PG', 'FG3A_PG', '3PT%',
+                                   'FTM_PG', 'FTA_PG', 'FT%',
+                                   'AtRimFrequency', 'AtRimAccuracy',
+                                   'ShortMidRangeFrequency', 'ShortMidRangeAccuracy',
+                                   'LongMidRangeFrequency', 'LongMidRangeAccuracy',
+                                   'Corner3Frequency', 'Corner3Accuracy',
+                                   'Arc3Frequency', 'Arc3Accuracy'
+                                   ]
+
+    # Ensure data is reset and aligned
+    team_stats_diff = team_stats[shooting_columns_to_extract].reset_index(drop=True)
+    opp_team_stats_diff = opp_team_stats[shooting_columns_to_extract].reset_index(drop=True)
+
+    team_stats_col_num = team_stats_diff.shape[1]
+    shooting_team_stats_diff = pd.DataFrame()
+
+    def create_shooting_diff(team):
+        func_df = pd.DataFrame()  # Initialize once per function call
+
+        if team not in team_stats_diff['Name'].values:  # Prevent KeyError
+            print(f"Warning: {team} not found in team_stats_diff")
+            return pd.DataFrame()  # Return empty DF if team is missing
+
+        for col_counter in range(team_stats_col_num):
+            column_name = shooting_columns_to_extract[col_counter]
+
+            # Ensure the column exists
+            if column_name not in team_stats_diff.columns or column_name not in opp_team_stats_diff.columns:
+                print(f"Warning: {column_name} not found in columns")
+                continue  # Skip missing columns
+
+            # Get team and opponent stats safely
+            team_stat_values = team_stats_diff.loc[team_stats_diff['Name'] == team, column_name].values
+            opp_stat_values = opp_team_stats_diff.loc[opp_team_stats_diff['Name'] == team, column_name].values
+
+            if len(team_stat_values) == 0 or len(opp_stat_values) == 0:
+                print(f"Warning: Missing data for team {team} in column {column_name}")
+                continue  # Skip if data is missing
+
+            team_stat = team_stat_values[0]
+            opp_stat = opp_stat_values[0]
+
+            # Compute final stat difference
+            if col_counter > 1:
+                final_stat = team_stat - opp_stat
+                func_df[column_name] = [final_stat]  # Store as list for DataFrame consistency
+            else:
+                func_df[column_name] = [team_stat]  # Store team_stat as list
+
+        return func_df  # Return full row, not an empty DataFrame
+
+    # Apply function across teams
+    shooting_diff_results = pd.concat([create_shooting_diff(team) for team in pbp_team_list], ignore_index=True)
+
+    #SHOOTING DIFFERENTIAL RANKS
+    shooting_diff_results['FGM_RANK'] = shooting_diff_results['FGA_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['FGA_RANK'] = shooting_diff_results['FGA_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['FG%_RANK'] = shooting_diff_results['FG%'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['FG2M_RANK'] = shooting_diff_results['FG2M_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['FG2A_RANK'] = shooting_diff_results['FG2A_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['2PT%_RANK'] = shooting_diff_results['2PT%'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['FG3M_RANK'] = shooting_diff_results['FG3M_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['FG3A_RANK'] = shooting_diff_results['FG3A_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['3PT%_RANK'] = shooting_diff_results['3PT%'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['FTM_RANK'] = shooting_diff_results['FTM_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['FTA_RANK'] = shooting_diff_results['FTA_PG'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['FT%_RANK'] = shooting_diff_results['FT%'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['RIM_FREQ_RANK'] = shooting_diff_results['AtRimFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['RIM_FG%_RANK'] = shooting_diff_results['AtRimAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['SMR_FREQ_RANK'] = shooting_diff_results['ShortMidRangeFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['SMR_FG%_RANK'] = shooting_diff_results['ShortMidRangeAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['LMR_FREQ_RANK'] = shooting_diff_results['LongMidRangeFrequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['LMR_FG%_RANK'] = shooting_diff_results['LongMidRangeAccuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['C3_FREQ_RANK'] = shooting_diff_results['Corner3Frequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['C3_FG%_RANK'] = shooting_diff_results['Corner3Accuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['ATB3_FREQ_RANK'] = shooting_diff_results['Arc3Frequency'].fillna(0).rank(ascending=False, method='first').astype(int)
+    shooting_diff_results['ATB3_FG%_RANK'] = shooting_diff_results['Arc3Accuracy'].fillna(0).rank(ascending=False, method='first').astype(int)
+
+    return {
+        'league_stats_dict': league_stats_dict,
+        'opp_league_stats_dict': opp_league_stats_dict,
+        'team_stats': team_stats,
+        'opp_team_stats': opp_team_stats,
+        'team_stats_diff': team_stats_diff,
+        'opp_team_stats_diff': opp_team_stats_diff,
+        'pbp_team_list': pbp_team_list,
+        'shooting_diff_results': shooting_diff_results,
+    }
+
 
 # ============================================================
 # PLAYER ROSTER FUNCTIONS FOR TEAMS PAGE
@@ -1796,198 +2001,227 @@ def get_all_player_game_logs():
         return pd.DataFrame()
 
 
-def get_team_roster_stats(team_id: int, players_df: pd.DataFrame, game_logs_df: pd.DataFrame, num_games: int = None, per_mode: str = 'PerGame'):
+# League-wide roster stats: every (team, player, window, per mode) computed at once
+ROSTER_STATS_WINDOWS = (0, 10, 5, 3)  # Team's last N games (0 = season), as offered on the Teams page
+ROSTER_STATS_PER_MODES = ('PerGame', 'Totals')
+ROSTER_STATS_LOG_COLUMNS = ['MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA']
+ROSTER_STATS_COLUMNS = ['headshot', 'Player', 'Pos', 'GP', 'MIN', 'PTS', 'REB', 'AST', 'PRA', 'STL', 'BLK', 'TOV',
+                        'FGM', 'FPTS', 'FGA', 'FG%', '3PM', '3PA', '3P%', 'FTM', 'FTA', 'FT%', '_player_id']
+ROSTER_TREND_STATS = ['PTS', 'REB', 'AST', 'MIN']
+_roster_stats_groups = None
+_roster_trends_groups = None
+_roster_stats_sources = (None, None)
+
+
+def _get_team_games(roster: pd.DataFrame, game_logs_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Get rolling averages or totals for all players on a team.
+    Every team's games numbered from the most recent (GAME_RECENCY 0).
     
-    Args:
-        team_id: NBA team ID
-        players_df: DataFrame from PlayerIndex
-        game_logs_df: DataFrame from PlayerGameLogs
-        num_games: Number of recent TEAM games to average (None = all games / season)
-        per_mode: 'PerGame' for averages or 'Totals' for totals
+    Uses the bulk team game logs; teams missing from them fall back to the games
+    played by players on their current roster.
     
     Returns:
-        DataFrame with player stats
+        DataFrame with TEAM_ID, GAME_ID, GAME_RECENCY
     """
-    # Filter players by team
-    team_players = players_df[players_df['TEAM_ID'].astype(int) == team_id].copy()
-    
-    if len(team_players) == 0:
-        return pd.DataFrame()
-    
-    # Get team's game logs to identify team's last N games
-    # Player game logs don't have TEAM_ID - need to get team game logs separately
-    # Try to get team game logs first (has TEAM_ID column)
-    team_logs = None
+    team_games = pd.DataFrame(columns=['TEAM_ID', 'GAME_ID', 'GAME_DATE'])
     try:
         if pf is not None:
             team_game_logs_df = pf.get_bulk_team_game_logs(season=current_season)
             if team_game_logs_df is not None and len(team_game_logs_df) > 0 and 'TEAM_ID' in team_game_logs_df.columns:
-                # Filter team game logs for this team
-                team_logs = team_game_logs_df[team_game_logs_df['TEAM_ID'].astype(int) == team_id].copy()
+                team_games = team_game_logs_df[['TEAM_ID', 'GAME_ID', 'GAME_DATE']].copy()
+                team_games['TEAM_ID'] = team_games['TEAM_ID'].astype(int)
     except Exception as e:
         pass
     
-    # Fallback: extract game IDs from player game logs for players on this team
-    if team_logs is None or len(team_logs) == 0:
-        team_player_ids = team_players['PERSON_ID'].tolist()
-        team_player_logs = game_logs_df[game_logs_df['PLAYER_ID'].isin(team_player_ids)].copy()
-        if len(team_player_logs) > 0:
-            # Get unique game IDs and dates from team players' game logs
-            team_logs = team_player_logs[['GAME_ID', 'GAME_DATE']].drop_duplicates().copy()
-        else:
-            team_logs = pd.DataFrame()
+    player_games = game_logs_df[['PLAYER_ID', 'GAME_ID', 'GAME_DATE']].merge(
+        roster[['PERSON_ID', 'TEAM_ID']], left_on='PLAYER_ID', right_on='PERSON_ID'
+    )[['TEAM_ID', 'GAME_ID', 'GAME_DATE']]
+    team_games = pd.concat([team_games, player_games[~player_games['TEAM_ID'].isin(team_games['TEAM_ID'])]], ignore_index=True)
+    
+    team_games['GAME_DATE'] = pd.to_datetime(team_games['GAME_DATE'])
+    team_games = team_games.sort_values(['TEAM_ID', 'GAME_DATE'], ascending=[True, False], kind='mergesort')
+    team_games = team_games.drop_duplicates(['TEAM_ID', 'GAME_ID'])
+    team_games['GAME_RECENCY'] = team_games.groupby('TEAM_ID').cumcount()
+    return team_games[['TEAM_ID', 'GAME_ID', 'GAME_RECENCY']]
+
+
+def _roster_stats_frame(values: pd.DataFrame, totals: pd.DataFrame, games_played: pd.Series) -> pd.DataFrame:
+    """Roster stat columns from per-player values (means or sums) and sums."""
+    stats = values.round(1)
+    
+    def pct(made, attempted):
+        return (totals[made] / totals[attempted] * 100).round(1).where(totals[attempted] > 0, 0.0)
+    
+    return pd.DataFrame({
+        'GP': games_played,
+        'MIN': stats['MIN'],
+        'PTS': stats['PTS'],
+        'REB': stats['REB'],
+        'AST': stats['AST'],
+        'PRA': (stats['PTS'] + stats['REB'] + stats['AST']).round(1),
+        'STL': stats['STL'],
+        'BLK': stats['BLK'],
+        'TOV': stats['TOV'],
+        'FGM': stats['FGM'],
+        'FPTS': (stats['PTS'] + stats['REB'] * 1.2 + stats['AST'] * 1.5 + stats['STL'] * 3 + stats['BLK'] * 3 - stats['TOV']).round(1),
+        'FGA': stats['FGA'],
+        'FG%': pct('FGM', 'FGA'),
+        '3PM': stats['FG3M'],
+        '3PA': stats['FG3A'],
+        '3P%': pct('FG3M', 'FG3A'),
+        'FTM': stats['FTM'],
+        'FTA': stats['FTA'],
+        'FT%': pct('FTM', 'FTA'),
+    })
+
+
+def build_league_roster_stats(players_df: pd.DataFrame, game_logs_df: pd.DataFrame,
+                              windows: tuple = ROSTER_STATS_WINDOWS) -> pd.DataFrame:
+    """
+    Roster stats for every team, window and per mode in one pass.
+    
+    A window of N keeps each player's games among his current team's last N
+    games (0 = all games), exactly like get_team_roster_stats.
     
-    if len(team_logs) == 0:
+    Args:
+        players_df: DataFrame from PlayerIndex
+        game_logs_df: DataFrame from PlayerGameLogs
+        windows: Team game windows to compute
+    
+    Returns:
+        DataFrame with TEAM_ID, NUM_GAMES, PER_MODE and the get_team_roster_stats
+        columns, players sorted by minutes within each team/window/mode
+    """
+    if players_df is None or game_logs_df is None or len(players_df) == 0 or len(game_logs_df) == 0:
         return pd.DataFrame()
     
-    # Get unique team games, sorted by date descending (most recent first)
-    team_logs['GAME_DATE'] = pd.to_datetime(team_logs['GAME_DATE'])
-    team_logs = team_logs.sort_values(by='GAME_DATE', ascending=False)
+    roster = players_df.copy()
+    roster['TEAM_ID'] = roster['TEAM_ID'].astype(int)
+    roster['_roster_order'] = range(len(roster))
+    roster = roster.drop_duplicates(['PERSON_ID', 'TEAM_ID'])
+    
+    team_games = _get_team_games(roster, game_logs_df)
+    logs = game_logs_df[['PLAYER_ID', 'GAME_ID'] + ROSTER_STATS_LOG_COLUMNS].merge(
+        roster[['PERSON_ID', 'TEAM_ID']], left_on='PLAYER_ID', right_on='PERSON_ID'
+    ).merge(team_games, on=['TEAM_ID', 'GAME_ID'])
+    
+    tables = []
+    for num_games in windows:
+        window_logs = logs[logs['GAME_RECENCY'] < num_games] if num_games and num_games > 0 else logs
+        grouped = window_logs.groupby(['TEAM_ID', 'PLAYER_ID'])[ROSTER_STATS_LOG_COLUMNS]
+        totals = grouped.sum()
+        games_played = grouped.size()
+        for per_mode in ROSTER_STATS_PER_MODES:
+            table = _roster_stats_frame(totals if per_mode == 'Totals' else grouped.mean(), totals, games_played)
+            table['NUM_GAMES'] = num_games or 0
+            table['PER_MODE'] = per_mode
+            tables.append(table.reset_index())
+    
+    if not tables or sum(len(table) for table in tables) == 0:
+        return pd.DataFrame()
     
-    # Get unique game IDs for the team's last N games
-    if num_games is not None and num_games > 0:
-        # Get unique game IDs from the most recent N games
-        team_game_ids = team_logs['GAME_ID'].unique()[:num_games]
-    else:
-        # All team games
-        team_game_ids = team_logs['GAME_ID'].unique()
+    player_info = roster[['PERSON_ID', 'TEAM_ID', '_roster_order']].rename(columns={'PERSON_ID': 'PLAYER_ID'})
+    player_info['Player'] = roster['PLAYER_FIRST_NAME'].astype(str) + ' ' + roster['PLAYER_LAST_NAME'].astype(str)
+    player_info['Pos'] = roster['POSITION'] if 'POSITION' in roster.columns else ''
+    table = pd.concat(tables, ignore_index=True).merge(player_info, on=['TEAM_ID', 'PLAYER_ID'])
+    table['headshot'] = 'https://cdn.nba.com/headshots/nba/latest/1040x760/' + table['PLAYER_ID'].astype(str) + '.png'
+    table['_player_id'] = table['PLAYER_ID']
     
-    roster_stats = []
+    # Sort by minutes (descending) within each team, window and mode; ties stay in roster order
+    table = table.sort_values(['TEAM_ID', 'NUM_GAMES', 'PER_MODE', 'MIN', '_roster_order'],
+                              ascending=[True, True, True, False, True], kind='mergesort')
+    return table[['TEAM_ID', 'NUM_GAMES', 'PER_MODE', '_roster_order'] + ROSTER_STATS_COLUMNS].reset_index(drop=True)
+
+
+def build_roster_trends(roster_stats: pd.DataFrame) -> pd.DataFrame:
+    """
+    Each player's L5 per-game stats next to his season stats, for every team.
     
-    for _, player in team_players.iterrows():
-        player_id = player['PERSON_ID']
-        player_name = f"{player['PLAYER_FIRST_NAME']} {player['PLAYER_LAST_NAME']}"
-        position = player.get('POSITION', '')
-        
-        # Get player's game logs
-        player_logs = game_logs_df[game_logs_df['PLAYER_ID'] == player_id].copy()
-        
-        if len(player_logs) == 0:
-            continue
-        
-        # Filter to only include games from the team's last N games
-        player_logs = player_logs[player_logs['GAME_ID'].isin(team_game_ids)].copy()
-        
-        if len(player_logs) == 0:
-            continue
-        
-        # Sort by date descending (most recent first) for consistency
-        player_logs['GAME_DATE'] = pd.to_datetime(player_logs['GAME_DATE'])
-        player_logs = player_logs.sort_values(by='GAME_DATE', ascending=False)
-        
-        if len(player_logs) == 0:
-            continue
-        
-        # Calculate averages or totals based on per_mode
-        games_played = len(player_logs)
-        
-        if per_mode == 'Totals':
-            # Calculate totals
-            min_val = round(player_logs['MIN'].sum(), 1)
-            pts_val = round(player_logs['PTS'].sum(), 1)
-            reb_val = round(player_logs['REB'].sum(), 1)
-            ast_val = round(player_logs['AST'].sum(), 1)
-            pra_val = round(pts_val + reb_val + ast_val, 1)
-            stl_val = round(player_logs['STL'].sum(), 1)
-            blk_val = round(player_logs['BLK'].sum(), 1)
-            tov_val = round(player_logs['TOV'].sum(), 1)
-            
-            # Field Goal stats
-            fgm_val = round(player_logs['FGM'].sum(), 1)
-            fga_val = round(player_logs['FGA'].sum(), 1)
-            total_fgm = player_logs['FGM'].sum()
-            total_fga = player_logs['FGA'].sum()
-            fg_pct = round((total_fgm / total_fga * 100), 1) if total_fga > 0 else 0.0
-            
-            # 3-Point stats
-            fg3m_val = round(player_logs['FG3M'].sum(), 1)
-            fg3a_val = round(player_logs['FG3A'].sum(), 1)
-            total_fg3m = player_logs['FG3M'].sum()
-            total_fg3a = player_logs['FG3A'].sum()
-            fg3_pct = round((total_fg3m / total_fg3a * 100), 1) if total_fg3a > 0 else 0.0
-            
-            # Free Throw stats
-            ftm_val = round(player_logs['FTM'].sum(), 1)
-            fta_val = round(player_logs['FTA'].sum(), 1)
-            total_ftm = player_logs['FTM'].sum()
-            total_fta = player_logs['FTA'].sum()
-            ft_pct = round((total_ftm / total_fta * 100), 1) if total_fta > 0 else 0.0
-            
-            # Calculate FPTS (fantasy points) - totals
-            fpts_val = round(pts_val + reb_val * 1.2 + ast_val * 1.5 + stl_val * 3 + blk_val * 3 - tov_val, 1)
-        else:
-            # Calculate averages (PerGame)
-            min_val = round(player_logs['MIN'].mean(), 1)
-            pts_val = round(player_logs['PTS'].mean(), 1)
-            reb_val = round(player_logs['REB'].mean(), 1)
-            ast_val = round(player_logs['AST'].mean(), 1)
-            pra_val = round(pts_val + reb_val + ast_val, 1)
-            stl_val = round(player_logs['STL'].mean(), 1)
-            blk_val = round(player_logs['BLK'].mean(), 1)
-            tov_val = round(player_logs['TOV'].mean(), 1)
-            
-            # Field Goal stats
-            fgm_val = round(player_logs['FGM'].mean(), 1)
-            fga_val = round(player_logs['FGA'].mean(), 1)
-            total_fgm = player_logs['FGM'].sum()
-            total_fga = player_logs['FGA'].sum()
-            fg_pct = round((total_fgm / total_fga * 100), 1) if total_fga > 0 else 0.0
-            
-            # 3-Point stats
-            fg3m_val = round(player_logs['FG3M'].mean(), 1)
-            fg3a_val = round(player_logs['FG3A'].mean(), 1)
-            total_fg3m = player_logs['FG3M'].sum()
-            total_fg3a = player_logs['FG3A'].sum()
-            fg3_pct = round((total_fg3m / total_fg3a * 100), 1) if total_fg3a > 0 else 0.0
-            
-            # Free Throw stats
-            ftm_val = round(player_logs['FTM'].mean(), 1)
-            fta_val = round(player_logs['FTA'].mean(), 1)
-            total_ftm = player_logs['FTM'].sum()
-            total_fta = player_logs['FTA'].sum()
-            ft_pct = round((total_ftm / total_fta * 100), 1) if total_fta > 0 else 0.0
-            
-            # Calculate FPTS (fantasy points) - averages
-            fpts_val = round(pts_val + reb_val * 1.2 + ast_val * 1.5 + stl_val * 3 + blk_val * 3 - tov_val, 1)
-        
-        # Headshot URL
-        headshot_url = f'https://cdn.nba.com/headshots/nba/latest/1040x760/{player_id}.png'
-        
-        roster_stats.append({
-            'headshot': headshot_url,
-            'Player': player_name,
-            'Pos': position,
-            'GP': games_played,
-            'MIN': min_val,
-            'PTS': pts_val,
-            'REB': reb_val,
-            'AST': ast_val,
-            'PRA': pra_val,
-            'STL': stl_val,
-            'BLK': blk_val,
-            'TOV': tov_val,
-            'FGM': fgm_val,
-            'FPTS': fpts_val,
-            'FGA': fga_val,
-            'FG%': fg_pct,
-            '3PM': fg3m_val,
-            '3PA': fg3a_val,
-            '3P%': fg3_pct,
-            'FTM': ftm_val,
-            'FTA': fta_val,
-            'FT%': ft_pct,
-            '_player_id': player_id,  # Hidden column for sorting
-        })
+    Args:
+        roster_stats: Table from build_league_roster_stats
     
-    if not roster_stats:
+    Returns:
+        L5 rows (in L5 order) with <stat>_SEASON and <stat>_CHANGE (% change from
+        season to L5, NaN where the season value is not positive) for
+        ROSTER_TREND_STATS; players without a season row are dropped
+    """
+    if len(roster_stats) == 0:
         return pd.DataFrame()
     
-    # Create DataFrame and sort by minutes (descending)
-    df = pd.DataFrame(roster_stats)
-    df = df.sort_values(by='MIN', ascending=False)
+    per_game = roster_stats[roster_stats['PER_MODE'] == 'PerGame']
+    l5_stats = per_game[per_game['NUM_GAMES'] == 5]
+    # First season row per player name, as in a lookup by name
+    season_stats = per_game[per_game['NUM_GAMES'] == 0].drop_duplicates(['TEAM_ID', 'Player'])
+    trends = l5_stats.merge(season_stats[['TEAM_ID', 'Player'] + ROSTER_TREND_STATS], on=['TEAM_ID', 'Player'],
+                            how='inner', suffixes=('', '_SEASON'))
+    for stat in ROSTER_TREND_STATS:
+        season_val = trends[f'{stat}_SEASON']
+        trends[f'{stat}_CHANGE'] = ((trends[stat] - season_val) / season_val).where(season_val > 0)
+    return trends
+
+
+def _load_league_roster_stats(players_df: pd.DataFrame, game_logs_df: pd.DataFrame) -> None:
+    """Build the league roster stats and trends unless built from these DataFrames already."""
+    global _roster_stats_groups, _roster_trends_groups, _roster_stats_sources
     
+    sources = _roster_stats_sources
+    if _roster_stats_groups is not None and sources[0] is players_df and sources[1] is game_logs_df:
+        return
+    
+    table = build_league_roster_stats(players_df, game_logs_df)
+    trends = build_roster_trends(table)
+    _roster_stats_groups = {} if len(table) == 0 else dict(tuple(table.groupby(['TEAM_ID', 'NUM_GAMES', 'PER_MODE'], sort=False)))
+    _roster_trends_groups = {} if len(trends) == 0 else dict(tuple(trends.groupby('TEAM_ID', sort=False)))
+    _roster_stats_sources = (players_df, game_logs_df)
+
+
+def get_league_roster_stats(players_df: pd.DataFrame, game_logs_df: pd.DataFrame) -> dict:
+    """
+    League roster stats grouped by (TEAM_ID, NUM_GAMES, PER_MODE).
+    
+    Built once per pair of players/game logs DataFrames and reused until they
+    change (e.g. on the next data refresh).
+    """
+    _load_league_roster_stats(players_df, game_logs_df)
+    return _roster_stats_groups
+
+
+def get_team_roster_trends(team_id: int, players_df: pd.DataFrame, game_logs_df: pd.DataFrame) -> pd.DataFrame:
+    """A team's rows of build_roster_trends (empty if none), from the shared league table."""
+    _load_league_roster_stats(players_df, game_logs_df)
+    return _roster_trends_groups.get(team_id, pd.DataFrame())
+
+
+def get_team_roster_stats(team_id: int, players_df: pd.DataFrame, game_logs_df: pd.DataFrame, num_games: int = None, per_mode: str = 'PerGame'):
+    """
+    Get rolling averages or totals for all players on a team.
+    
+    Args:
+        team_id: NBA team ID
+        players_df: DataFrame from PlayerIndex
+        game_logs_df: DataFrame from PlayerGameLogs
+        num_games: Number of recent TEAM games to average (None = all games / season)
+        per_mode: 'PerGame' for averages or 'Totals' for totals
+    
+    Returns:
+        DataFrame with player stats
+    """
+    num_games = num_games if num_games is not None and num_games > 0 else 0
+    per_mode = 'Totals' if per_mode == 'Totals' else 'PerGame'
+    
+    if num_games in ROSTER_STATS_WINDOWS:
+        team_df = get_league_roster_stats(players_df, game_logs_df).get((team_id, num_games, per_mode))
+    else:
+        # Uncommon window: compute just this one
+        table = build_league_roster_stats(players_df, game_logs_df, windows=(num_games,))
+        team_df = table[(table['TEAM_ID'] == team_id) & (table['PER_MODE'] == per_mode)] if len(table) > 0 else None
+    
+    if team_df is None or len(team_df) == 0:
+        return pd.DataFrame()
+    
+    # Index rows by their roster position, as when the rows were built team by team
+    df = team_df[ROSTER_STATS_COLUMNS].copy()
+    df.index = team_df['_roster_order'].rank(method='first').astype(int).values - 1
     return df
 
 
@@ -2288,58 +2522,29 @@ def find_hot_players(team_id: int, players_df: pd.DataFrame, game_logs_df: pd.Da
     """
     hot_players = []
     
-    # Get season stats for comparison
-    season_stats = get_team_roster_stats(team_id, players_df, game_logs_df, num_games=None)
-    l5_stats = get_team_roster_stats(team_id, players_df, game_logs_df, num_games=5)
-    
-    if len(season_stats) == 0 or len(l5_stats) == 0:
+    trends = get_team_roster_trends(team_id, players_df, game_logs_df)
+    if len(trends) == 0:
         return hot_players
     
-    # Join season and L5 stats
-    for _, l5_row in l5_stats.iterrows():
-        player_name = l5_row['Player']
-        
-        # Must have at least min_l5_games in L5
-        if l5_row['GP'] < min_l5_games:
-            continue
-        
-        # Find season row
-        season_row = season_stats[season_stats['Player'] == player_name]
-        if len(season_row) == 0:
-            continue
-        season_row = season_row.iloc[0]
-        
-        # Skip if season avg is too low (avoid division issues)
-        if season_row['PTS'] < 3:
-            continue
-        
-        # Calculate % increase for key stats
-        hot_stats = []
-        
-        for stat in ['PTS', 'REB', 'AST']:
-            season_val = season_row[stat]
-            l5_val = l5_row[stat]
-            
-            if season_val > 0:
-                pct_change = (l5_val - season_val) / season_val
-                if pct_change >= threshold_pct:
-                    hot_stats.append({
-                        'stat': stat,
-                        'season': season_val,
-                        'l5': l5_val,
-                        'pct_change': pct_change
-                    })
-        
-        if hot_stats:
-            # Sort by biggest improvement
-            hot_stats.sort(key=lambda x: x['pct_change'], reverse=True)
-            hot_players.append({
-                'player_name': player_name,
-                'player_id': l5_row.get('_player_id'),
-                'headshot': l5_row.get('headshot'),
-                'hot_stats': hot_stats,
-                'best_pct_change': hot_stats[0]['pct_change']
-            })
+    # Must have at least min_l5_games in L5; skip if season avg is too low (avoid division issues)
+    trends = trends[(trends['GP'] >= min_l5_games) & (trends['PTS_SEASON'] >= 3)]
+    stats = ['PTS', 'REB', 'AST']
+    qualifies = trends[[f'{stat}_CHANGE' for stat in stats]].to_numpy() >= threshold_pct
+    
+    for l5_row, row_qualifies in zip(trends[qualifies.any(axis=1)].to_dict('records'), qualifies[qualifies.any(axis=1)]):
+        hot_stats = [
+            {'stat': stat, 'season': l5_row[f'{stat}_SEASON'], 'l5': l5_row[stat], 'pct_change': l5_row[f'{stat}_CHANGE']}
+            for stat, stat_qualifies in zip(stats, row_qualifies) if stat_qualifies
+        ]
+        # Sort by biggest improvement
+        hot_stats.sort(key=lambda x: x['pct_change'], reverse=True)
+        hot_players.append({
+            'player_name': l5_row['Player'],
+            'player_id': l5_row.get('_player_id'),
+            'headshot': l5_row.get('headshot'),
+            'hot_stats': hot_stats,
+            'best_pct_change': hot_stats[0]['pct_change']
+        })
     
     # Sort by biggest improvement
     hot_players.sort(key=lambda x: x['best_pct_change'], reverse=True)
@@ -2364,58 +2569,31 @@ def find_cold_players(team_id: int, players_df: pd.DataFrame, game_logs_df: pd.D
     """
     cold_players = []
     
-    # Get season stats for comparison
-    season_stats = get_team_roster_stats(team_id, players_df, game_logs_df, num_games=None)
-    l5_stats = get_team_roster_stats(team_id, players_df, game_logs_df, num_games=5)
-    
-    if len(season_stats) == 0 or len(l5_stats) == 0:
+    trends = get_team_roster_trends(team_id, players_df, game_logs_df)
+    if len(trends) == 0:
         return cold_players
     
-    for _, l5_row in l5_stats.iterrows():
-        player_name = l5_row['Player']
-        
-        # Must have at least min_l5_games in L5
-        if l5_row['GP'] < min_l5_games:
-            continue
-        
-        # Find season row
-        season_row = season_stats[season_stats['Player'] == player_name]
-        if len(season_row) == 0:
-            continue
-        season_row = season_row.iloc[0]
-        
-        # Skip if season avg is too low (avoid division issues and focus on meaningful players)
-        if season_row['PTS'] < 8:
-            continue
-        
-        # Calculate % decrease for key stats
-        cold_stats = []
-        
-        for stat in ['PTS', 'REB', 'AST']:
-            season_val = season_row[stat]
-            l5_val = l5_row[stat]
-            
-            if season_val > 0:
-                pct_change = (l5_val - season_val) / season_val
-                # Looking for negative change (below average)
-                if pct_change <= -threshold_pct:
-                    cold_stats.append({
-                        'stat': stat,
-                        'season': season_val,
-                        'l5': l5_val,
-                        'pct_change': pct_change
-                    })
-        
-        if cold_stats:
-            # Sort by biggest decline (most negative first)
-            cold_stats.sort(key=lambda x: x['pct_change'])
-            cold_players.append({
-                'player_name': player_name,
-                'player_id': l5_row.get('_player_id'),
-                'headshot': l5_row.get('headshot'),
-                'cold_stats': cold_stats,
-                'worst_pct_change': cold_stats[0]['pct_change']
-            })
+    # Must have at least min_l5_games in L5; skip if season avg is too low
+    # (avoid division issues and focus on meaningful players)
+    trends = trends[(trends['GP'] >= min_l5_games) & (trends['PTS_SEASON'] >= 8)]
+    stats = ['PTS', 'REB', 'AST']
+    # Looking for negative change (below average)
+    qualifies = trends[[f'{stat}_CHANGE' for stat in stats]].to_numpy() <= -threshold_pct
+    
+    for l5_row, row_qualifies in zip(trends[qualifies.any(axis=1)].to_dict('records'), qualifies[qualifies.any(axis=1)]):
+        cold_stats = [
+            {'stat': stat, 'season': l5_row[f'{stat}_SEASON'], 'l5': l5_row[stat], 'pct_change': l5_row[f'{stat}_CHANGE']}
+            for stat, stat_qualifies in zip(stats, row_qualifies) if stat_qualifies
+        ]
+        # Sort by biggest decline (most negative first)
+        cold_stats.sort(key=lambda x: x['pct_change'])
+        cold_players.append({
+            'player_name': l5_row['Player'],
+            'player_id': l5_row.get('_player_id'),
+            'headshot': l5_row.get('headshot'),
+            'cold_stats': cold_stats,
+            'worst_pct_change': cold_stats[0]['pct_change']
+        })
     
     # Sort by biggest decline (most negative first)
     cold_players.sort(key=lambda x: x['worst_pct_change'])
@@ -2440,47 +2618,27 @@ def find_new_players(team_id: int, players_df: pd.DataFrame, game_logs_df: pd.Da
     """
     new_players = []
     
-    # Get season and L5 stats
-    season_stats = get_team_roster_stats(team_id, players_df, game_logs_df, num_games=None)
-    l5_stats = get_team_roster_stats(team_id, players_df, game_logs_df, num_games=5)
-    
-    if len(season_stats) == 0 or len(l5_stats) == 0:
+    trends = get_team_roster_trends(team_id, players_df, game_logs_df)
+    if len(trends) == 0:
         return new_players
     
-    for _, l5_row in l5_stats.iterrows():
-        player_name = l5_row['Player']
-        
-        # Find season row
-        season_row = season_stats[season_stats['Player'] == player_name]
-        if len(season_row) == 0:
-            continue
-        season_row = season_row.iloc[0]
-        
-        season_min = season_row['MIN']
-        l5_min = l5_row['MIN']
-        
-        # Must meet minimum season minutes threshold
-        if season_min < min_season_minutes:
-            continue
-        
-        # Calculate % increase
-        if season_min > 0:
-            pct_increase = (l5_min - season_min) / season_min
-            
-            if pct_increase >= min_increase_pct:
-                new_players.append({
-                    'player_name': player_name,
-                    'player_id': l5_row.get('_player_id'),
-                    'headshot': l5_row.get('headshot'),
-                    'season_min': season_min,
-                    'l5_min': l5_min,
-                    'min_increase': l5_min - season_min,
-                    'pct_increase': pct_increase,
-                    # Include their L5 production
-                    'l5_pts': l5_row['PTS'],
-                    'l5_reb': l5_row['REB'],
-                    'l5_ast': l5_row['AST']
-                })
+    # Must meet minimum season minutes threshold
+    trends = trends[(trends['MIN_SEASON'] >= min_season_minutes) & (trends['MIN_CHANGE'] >= min_increase_pct)]
+    
+    for l5_row in trends.to_dict('records'):
+        new_players.append({
+            'player_name': l5_row['Player'],
+            'player_id': l5_row.get('_player_id'),
+            'headshot': l5_row.get('headshot'),
+            'season_min': l5_row['MIN_SEASON'],
+            'l5_min': l5_row['MIN'],
+            'min_increase': l5_row['MIN'] - l5_row['MIN_SEASON'],
+            'pct_increase': l5_row['MIN_CHANGE'],
+            # Include their L5 production
+            'l5_pts': l5_row['PTS'],
+            'l5_reb': l5_row['REB'],
+            'l5_ast': l5_row['AST']
+        })
     
     # Sort by biggest % increase
     new_players.sort(key=lambda x: x['pct_increase'], reverse=True)
@@ -2503,106 +2661,105 @@ def calculate_stat_mismatches(away_id: int, home_id: int, away_abbr: str = 'Away
     Returns:
         List of dicts with mismatch details, sorted by magnitude
     """
+    # Team-indexed datasets: every value and rank below is an indexed lookup
+    metrics = {
+        name: get_team_metrics(name)
+        for name in load_datasets('data_adv_season', 'data_4F_season', 'data_misc_season', 'team_stats', 'opp_team_stats')
+    }
     mismatches = []
     
-    # Define stat matchups: (name, off_stat, off_rank_col, def_stat, def_rank_col, off_df, def_df, off_higher_is_better, def_lower_is_better)
-    # For single DataFrame stats, pass the same df for both off_df and def_df
+    # Define stat matchups: (name, off_stat, off_rank_col, def_stat, def_rank_col, off_metrics, def_metrics, off_higher_is_better, def_lower_is_better)
+    # For single-dataset stats, pass the same dataset for both off_metrics and def_metrics
     stat_matchups = [
         # Core ratings
         ('Offensive Rating', 'OFF_RATING', 'OFF_RATING_RANK', 'DEF_RATING', 'DEF_RATING_RANK', 
-         data_adv_season, data_adv_season, True, True),
+         metrics['data_adv_season'], metrics['data_adv_season'], True, True),
         
         # Shooting percentages - from Four Factors
-        ('Effective FG%', 'EFG_PCT', None, 'OPP_EFG_PCT', None, data_4F_season, data_4F_season, True, True),
+        ('Effective FG%', 'EFG_PCT', None, 'OPP_EFG_PCT', None, metrics['data_4F_season'], metrics['data_4F_season'], True, True),
         
         # Rebounding
         ('Offensive Reb %', 'OREB_PCT', 'OREB_PCT_RANK', 'DREB_PCT', 'DREB_PCT_RANK', 
-         data_adv_season, data_adv_season, True, True),
+         metrics['data_adv_season'], metrics['data_adv_season'], True, True),
         
         # Playmaking
         ('Assist %', 'AST_PCT', 'AST_PCT_RANK', 'AST_PCT', 'AST_PCT_RANK', 
-         data_adv_season, data_adv_season, True, True),
+         metrics['data_adv_season'], metrics['data_adv_season'], True, True),
         
         # Turnovers
         ('Turnover %', 'TM_TOV_PCT', 'TM_TOV_PCT_RANK', 'OPP_TOV_PCT', 'OPP_TOV_PCT_RANK', 
-         data_4F_season, data_4F_season, False, False),
+         metrics['data_4F_season'], metrics['data_4F_season'], False, False),
         
         # Pace
-        ('Pace', 'PACE', 'PACE_RANK', 'PACE', 'PACE_RANK', data_adv_season, data_adv_season, True, True),
+        ('Pace', 'PACE', 'PACE_RANK', 'PACE', 'PACE_RANK', metrics['data_adv_season'], metrics['data_adv_season'], True, True),
         
         # Paint scoring
         ('Points in Paint', 'PTS_PAINT', 'PTS_PAINT_RANK', 'OPP_PTS_PAINT', 'OPP_PTS_PAINT_RANK',
-         data_misc_season, data_misc_season, True, True),
+         metrics['data_misc_season'], metrics['data_misc_season'], True, True),
         
         # Second chance
         ('2nd Chance Points', 'PTS_2ND_CHANCE', 'PTS_2ND_CHANCE_RANK', 'OPP_PTS_2ND_CHANCE', 'OPP_PTS_2ND_CHANCE_RANK',
-         data_misc_season, data_misc_season, True, True),
+         metrics['data_misc_season'], metrics['data_misc_season'], True, True),
         
         # Fast break
         ('Fast Break Points', 'PTS_FB', 'PTS_FB_RANK', 'OPP_PTS_FB', 'OPP_PTS_FB_RANK',
-         data_misc_season, data_misc_season, True, True),
+         metrics['data_misc_season'], metrics['data_misc_season'], True, True),
         
         # Points off turnovers
         ('Points Off Turnovers', 'PTS_OFF_TOV', 'PTS_OFF_TOV_RANK', 'OPP_PTS_OFF_TOV', 'OPP_PTS_OFF_TOV_RANK',
-         data_misc_season, data_misc_season, True, True),
+         metrics['data_misc_season'], metrics['data_misc_season'], True, True),
         
         # Free throw rate
-        ('Free Throw Rate', 'FTA_RATE', None, 'OPP_FTA_RATE', None, data_4F_season, data_4F_season, True, True),
+        ('Free Throw Rate', 'FTA_RATE', None, 'OPP_FTA_RATE', None, metrics['data_4F_season'], metrics['data_4F_season'], True, True),
         
-        # Shooting stats - using team_stats for offense and opp_team_stats for defense
+        # Shooting stats - using metrics['team_stats'] for offense and metrics['opp_team_stats'] for defense
         ('Field Goals Made', 'FGM_PG', 'FGM_RANK', 'FGM_PG', 'FGM_RANK',
-         team_stats, opp_team_stats, True, True),
+         metrics['team_stats'], metrics['opp_team_stats'], True, True),
         ('Field Goals Attempted', 'FGA_PG', 'FGA_RANK', 'FGA_PG', 'FGA_RANK',
-         team_stats, opp_team_stats, True, True),
+         metrics['team_stats'], metrics['opp_team_stats'], True, True),
         ('Field Goal %', 'FG%', 'FG%_RANK', 'FG%', 'FG%_RANK',
-         team_stats, opp_team_stats, True, True),
+         metrics['team_stats'], metrics['opp_team_stats'], True, True),
         ('3-Pointers Made', 'FG3M_PG', 'FG3M_RANK', 'FG3M_PG', 'FG3M_RANK',
-         team_stats, opp_team_stats, True, True),
+         metrics['team_stats'], metrics['opp_team_stats'], True, True),
         ('3-Pointers Attempted', 'FG3A_PG', 'FG3A_RANK', 'FG3A_PG', 'FG3A_RANK',
-         team_stats, opp_team_stats, True, True),
+         metrics['team_stats'], metrics['opp_team_stats'], True, True),
         ('3-Point %', '3PT%', '3PT%_RANK', '3PT%', '3PT%_RANK',
-         team_stats, opp_team_stats, True, True),
+         metrics['team_stats'], metrics['opp_team_stats'], True, True),
         ('Free Throws Made', 'FTM_PG', 'FTM_RANK', 'FTM_PG', 'FTM_RANK',
-         team_stats, opp_team_stats, True, True),
+         metrics['team_stats'], metrics['opp_team_stats'], True, True),
         ('Free Throws Attempted', 'FTA_PG', 'FTA_RANK', 'FTA_PG', 'FTA_RANK',
-         team_stats, opp_team_stats, True, True),
+         metrics['team_stats'], metrics['opp_team_stats'], True, True),
         ('Free Throw %', 'FT%', 'FT%_RANK', 'FT%', 'FT%_RANK',
-         team_stats, opp_team_stats, True, True),
+         metrics['team_stats'], metrics['opp_team_stats'], True, True),
     ]
     
-    def get_rank_and_value(df, team_id, stat_col, rank_col, use_team_id_col=False):
+    def get_rank_and_value(team_metrics, team_id, stat_col, rank_col):
         """Helper to get stat value and rank
         
         Args:
-            df: DataFrame to search
+            team_metrics: TeamMetrics of the dataset to search
             team_id: Team ID to look up
             stat_col: Column name for the stat value
             rank_col: Column name for the rank (or None to calculate)
-            use_team_id_col: If True, use 'TeamId' column instead of 'TEAM_ID'
         """
-        id_col = 'TeamId' if use_team_id_col else 'TEAM_ID'
-        team_row = df[df[id_col] == team_id]
-        if len(team_row) == 0:
+        if team_id not in team_metrics:
             return None, None
         
-        value = team_row[stat_col].values[0] if stat_col in team_row.columns else None
+        value = team_metrics.get(team_id, stat_col)
         
-        if rank_col and rank_col in team_row.columns:
-            rank = int(team_row[rank_col].values[0])
+        if rank_col and rank_col in team_metrics.frame.columns:
+            rank = int(team_metrics.get(team_id, rank_col))
         elif value is not None:
-            rank = int(df[stat_col].rank(ascending=False, method='first')[team_row.index[0]])
+            rank = int(team_metrics.rank(team_id, stat_col))
         else:
             rank = None
             
         return value, rank
     
     # Process Away Offense vs Home Defense
-    for name, off_stat, off_rank, def_stat, def_rank, off_df, def_df, off_higher_better, def_lower_better in stat_matchups:
-        # Determine if we're using TeamId column (for shooting stats) or TEAM_ID (for other stats)
-        use_team_id_col = (off_df is team_stats) or (def_df is opp_team_stats)
-        
-        away_off_val, away_off_rank = get_rank_and_value(off_df, away_id, off_stat, off_rank, use_team_id_col=use_team_id_col)
-        home_def_val, home_def_rank = get_rank_and_value(def_df, home_id, def_stat, def_rank, use_team_id_col=use_team_id_col)
+    for name, off_stat, off_rank, def_stat, def_rank, off_metrics, def_metrics, off_higher_better, def_lower_better in stat_matchups:
+        away_off_val, away_off_rank = get_rank_and_value(off_metrics, away_id, off_stat, off_rank)
+        home_def_val, home_def_rank = get_rank_and_value(def_metrics, home_id, def_stat, def_rank)
         
         if away_off_rank is not None and home_def_rank is not None:
             if def_lower_better:
@@ -2625,12 +2782,9 @@ def calculate_stat_mismatches(away_id: int, home_id: int, away_abbr: str = 'Away
             })
     
     # Process Home Offense vs Away Defense  
-    for name, off_stat, off_rank, def_stat, def_rank, off_df, def_df, off_higher_better, def_lower_better in stat_matchups:
-        # Determine if we're using TeamId column (for shooting stats) or TEAM_ID (for other stats)
-        use_team_id_col = (off_df is team_stats) or (def_df is opp_team_stats)
-        
-        home_off_val, home_off_rank = get_rank_and_value(off_df, home_id, off_stat, off_rank, use_team_id_col=use_team_id_col)
-        away_def_val, away_def_rank = get_rank_and_value(def_df, away_id, def_stat, def_rank, use_team_id_col=use_team_id_col)
+    for name, off_stat, off_rank, def_stat, def_rank, off_metrics, def_metrics, off_higher_better, def_lower_better in stat_matchups:
+        home_off_val, home_off_rank = get_rank_and_value(off_metrics, home_id, off_stat, off_rank)
+        away_def_val, away_def_rank = get_rank_and_value(def_metrics, away_id, def_stat, def_rank)
         
         if home_off_rank is not None and away_def_rank is not None:
             if def_lower_better:
@@ -43,14 +43,14 @@ if todays_matchups:
         # Store override in session state
         st.session_state['matchup_override'] = selected_matchup
     
-    # Update matchup variables without reloading (all team stats are already calculated)
-    # This avoids unnecessary API calls and timeout errors
+    # Update matchup variables without reloading the page
     if 'matchup_override' in st.session_state:
         # Set override and update matchup variables
         functions.set_matchup_override(st.session_state['matchup_override'])
         # Update matchup (this updates away_id, home_id, logos, etc.)
-        # All team stats are already calculated, so we just need to change which teams we're displaying
         functions.update_selected_matchup(st.session_state['matchup_override'])
+        # Fetch everything the matchup stats need in parallel before the tabs read them
+        functions.load_matchup_stats()
 else:
     st.info("ℹ️ No games scheduled for today.")
     # Use default matchup from functions module
@@ -0,0 +1,137 @@
+"""
+Team Metrics Module
+Team-indexed access to the team stats DataFrames behind the matchup pages.
+
+Matchup stats used to be read one value at a time with a boolean scan of the
+whole frame (df.loc[df['TeamId'] == team_id, col].values[0]), several hundred
+scans per matchup. TeamMetrics indexes a dataset by team ID once. Reading a
+value is then a hash lookup. A matchup card (every column for both teams) is
+one indexed .loc, and the cards for a whole slate take one .loc per dataset.
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+import pandas as pd
+
+
+# Team ID column names used by the NBA stats, standings and pbpstats frames
+ID_COLUMNS = ('TEAM_ID', 'TeamID', 'TeamId')
+
+
+def detect_id_column(df: pd.DataFrame) -> Optional[str]:
+    """Name of the team ID column of a team stats DataFrame (None if it has none)."""
+    for column in ID_COLUMNS:
+        if column in df.columns:
+            return column
+    return None
+
+
+class TeamMetrics:
+    """
+    One team stats dataset indexed by team ID.
+    
+    Rows are kept in the dataset's order; if a team appears more than once, the
+    first row wins (like .values[0] on a boolean scan). Rank columns that the
+    dataset does not provide are computed once per column on first use.
+    """
+    
+    def __init__(self, df: Optional[pd.DataFrame], id_column: Optional[str] = None):
+        """
+        Args:
+            df: Team stats DataFrame (may be empty or None)
+            id_column: Team ID column (auto-detects TEAM_ID / TeamID / TeamId if None)
+        """
+        df = df if df is not None else pd.DataFrame()
+        self.id_column = id_column or detect_id_column(df)
+        if self.id_column is None or self.id_column not in df.columns:
+            self.frame = pd.DataFrame()
+        else:
+            frame = df.set_index(self.id_column, drop=False)
+            self.frame = frame[~frame.index.duplicated(keep='first')]
+        self._ranks = {}
+    
+    def __contains__(self, team_id) -> bool:
+        return team_id is not None and team_id in self.frame.index
+    
+    def __len__(self) -> int:
+        return len(self.frame)
+    
+    def get(self, team_id, column: str, default=None):
+        """Single value for a team, or default if the team or column is missing."""
+        if team_id not in self or column not in self.frame.columns:
+            return default
+        return self.frame.at[team_id, column]
+    
+    def rank(self, team_id, column: str, ascending: bool = False):
+        """
+        Rank of a team in a column (1 = highest unless ascending).
+        
+        Uses method='first' like the rank columns built in the app; the ranking
+        of each column is computed once and reused.
+        
+        Returns:
+            Rank, or None if the team or column is missing
+        """
+        if team_id not in self or column not in self.frame.columns:
+            return None
+        key = (column, ascending)
+        if key not in self._ranks:
+            self._ranks[key] = self.frame[column].rank(ascending=ascending, method='first')
+        return self._ranks[key].at[team_id]
+    
+    def rows(self, team_ids: Iterable, columns: Optional[List[str]] = None) -> Dict[Hashable, dict]:
+        """
+        Rows for several teams with one indexed .loc.
+        
+        Args:
+            team_ids: Team IDs (missing teams are left out)
+            columns: Columns to return (defaults to all; missing ones are skipped)
+        
+        Returns:
+            Dict of team ID -> {column: value}
+        """
+        present = [team_id for team_id in dict.fromkeys(team_ids) if team_id in self]
+        if not present:
+            return {}
+        if columns is None:
+            selected = self.frame.loc[present]
+        else:
+            selected = self.frame.loc[present, [c for c in columns if c in self.frame.columns]]
+        # Per-row dicts keep each column's dtype (integer ranks stay integers)
+        return dict(zip(present, selected.to_dict('records')))
+    
+    def matchup_card(self, away_id, home_id, columns: Optional[List[str]] = None) -> Dict[str, dict]:
+        """
+        Every metric for both teams of a game.
+        
+        Returns:
+            {'away': {column: value}, 'home': {column: value}} (empty dict for a
+            team missing from the dataset)
+        """
+        rows = self.rows([away_id, home_id], columns)
+        return {'away': rows.get(away_id, {}), 'home': rows.get(home_id, {})}
+
+
+def build_matchup_cards(
+    metrics: Dict[str, TeamMetrics],
+    matchups: Iterable[Tuple[Hashable, Hashable]]
+) -> Dict[Tuple[Hashable, Hashable], Dict[str, Dict[str, dict]]]:
+    """
+    Matchup cards for many games, with one indexed .loc per dataset.
+    
+    Args:
+        metrics: Dataset name -> TeamMetrics
+        matchups: (away team ID, home team ID) pairs
+    
+    Returns:
+        Dict of (away_id, home_id) -> dataset name -> {'away': row, 'home': row}
+    """
+    matchups = list(dict.fromkeys(matchups))
+    team_ids = [team_id for pair in matchups for team_id in pair]
+    rows = {name: team_metrics.rows(team_ids) for name, team_metrics in metrics.items()}
+    return {
+        (away_id, home_id): {
+            name: {'away': dataset_rows.get(away_id, {}), 'home': dataset_rows.get(home_id, {})}
+            for name, dataset_rows in rows.items()
+        }
+        for away_id, home_id in matchups
+    }
@@ -0,0 +1,48 @@
+-- NBA Game Log Rows Schema
+-- Row-oriented storage for player and team game logs (one row per player/team per game)
+-- Replaces the one-JSONB-array-per-season layout of nba_game_logs so readers can
+-- filter by player, team or date range on the server and fetches can be incremental.
+-- Key columns are extracted for filtering; the full API record is kept in data.
+
+-- Table 1: nba_player_game_logs
+CREATE TABLE IF NOT EXISTS nba_player_game_logs (
+    id BIGSERIAL PRIMARY KEY,
+    season VARCHAR(10) NOT NULL,
+    player_id BIGINT NOT NULL,
+    game_id VARCHAR(20) NOT NULL,
+    team_id BIGINT,
+    game_date DATE NOT NULL,
+    data JSONB NOT NULL, -- Single PlayerGameLogs record
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE(player_id, game_id)
+);
+
+-- Indexes for nba_player_game_logs
+CREATE INDEX IF NOT EXISTS idx_nba_player_game_logs_season_date ON nba_player_game_logs(season, game_date DESC);
+CREATE INDEX IF NOT EXISTS idx_nba_player_game_logs_player ON nba_player_game_logs(player_id, game_date DESC);
+CREATE INDEX IF NOT EXISTS idx_nba_player_game_logs_team ON nba_player_game_logs(team_id, game_date DESC);
+
+-- Table 2: nba_team_game_logs
+CREATE TABLE IF NOT EXISTS nba_team_game_logs (
+    id BIGSERIAL PRIMARY KEY,
+    season VARCHAR(10) NOT NULL,
+    team_id BIGINT NOT NULL,
+    game_id VARCHAR(20) NOT NULL,
+    game_date DATE NOT NULL,
+    data JSONB NOT NULL, -- Single TeamGameLogs record
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE(team_id, game_id)
+);
+
+-- Indexes for nba_team_game_logs
+CREATE INDEX IF NOT EXISTS idx_nba_team_game_logs_season_date ON nba_team_game_logs(season, game_date DESC);
+CREATE INDEX IF NOT EXISTS idx_nba_team_game_logs_team ON nba_team_game_logs(team_id, game_date DESC);
+
+-- Triggers to automatically update updated_at
+CREATE TRIGGER update_nba_player_game_logs_updated_at BEFORE UPDATE ON nba_player_game_logs
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE TRIGGER update_nba_team_game_logs_updated_at BEFORE UPDATE ON nba_team_game_logs
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,89 @@
+-- Prediction Query Support
+-- Indexes for the filtered, keyset-paginated reads in prediction_tracker.py and
+-- server-side accuracy aggregates, so dashboards no longer download the whole
+-- predictions table to compute a handful of numbers.
+
+-- Indexes for predictions table
+-- Keyset pagination walks id; date range and stat filters use these
+CREATE INDEX IF NOT EXISTS idx_predictions_game_date ON predictions(game_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_predictions_stat_date ON predictions(stat, game_date DESC, id DESC);
+
+-- Graded predictions only, with the columns the accuracy functions read (index-only scans)
+CREATE INDEX IF NOT EXISTS idx_predictions_graded ON predictions(stat, confidence, game_date)
+    INCLUDE (prediction, actual, vegas_line)
+    WHERE actual IS NOT NULL;
+
+-- Function: accuracy metrics by stat
+-- Mirrors calculate_accuracy_metrics(): MAE, RMSE, bias, hit rate vs the Vegas
+-- line (rows with a line only) and share of predictions within 10% / 20%
+CREATE OR REPLACE FUNCTION get_prediction_accuracy_by_stat(
+    p_start_date DATE DEFAULT NULL,
+    p_end_date DATE DEFAULT NULL
+)
+RETURNS TABLE (
+    stat VARCHAR,
+    count BIGINT,
+    mae DOUBLE PRECISION,
+    rmse DOUBLE PRECISION,
+    bias DOUBLE PRECISION,
+    vs_line_accuracy DOUBLE PRECISION,
+    within_10_pct DOUBLE PRECISION,
+    within_20_pct DOUBLE PRECISION
+) AS $$
+    SELECT
+        p.stat,
+        COUNT(*) AS count,
+        AVG(ABS(p.prediction - p.actual))::DOUBLE PRECISION AS mae,
+        SQRT(AVG((p.prediction - p.actual) ^ 2))::DOUBLE PRECISION AS rmse,
+        AVG(p.prediction - p.actual)::DOUBLE PRECISION AS bias,
+        (100.0 * COUNT(*) FILTER (
+            WHERE (p.actual > p.vegas_line AND p.prediction > p.vegas_line)
+               OR (p.actual < p.vegas_line AND p.prediction < p.vegas_line)
+        ) / NULLIF(COUNT(p.vegas_line), 0))::DOUBLE PRECISION AS vs_line_accuracy,
+        (100.0 * COUNT(*) FILTER (
+            WHERE p.actual <> 0 AND ABS(p.prediction - p.actual) / p.actual * 100 <= 10
+        ) / COUNT(*))::DOUBLE PRECISION AS within_10_pct,
+        (100.0 * COUNT(*) FILTER (
+            WHERE p.actual <> 0 AND ABS(p.prediction - p.actual) / p.actual * 100 <= 20
+        ) / COUNT(*))::DOUBLE PRECISION AS within_20_pct
+    FROM predictions p
+    WHERE p.actual IS NOT NULL
+      AND (p_start_date IS NULL OR p.game_date >= p_start_date)
+      AND (p_end_date IS NULL OR p.game_date <= p_end_date)
+    GROUP BY p.stat
+    ORDER BY p.stat;
+$$ LANGUAGE sql STABLE;
+
+-- Function: accuracy metrics by confidence level
+-- Mirrors calculate_accuracy_by_confidence()
+CREATE OR REPLACE FUNCTION get_prediction_accuracy_by_confidence(
+    p_start_date DATE DEFAULT NULL,
+    p_end_date DATE DEFAULT NULL
+)
+RETURNS TABLE (
+    confidence VARCHAR,
+    count BIGINT,
+    mae DOUBLE PRECISION,
+    within_10_pct DOUBLE PRECISION
+) AS $$
+    SELECT
+        p.confidence,
+        COUNT(*) AS count,
+        AVG(ABS(p.prediction - p.actual))::DOUBLE PRECISION AS mae,
+        (100.0 * COUNT(*) FILTER (
+            WHERE p.actual <> 0 AND ABS(p.prediction - p.actual) / p.actual * 100 <= 10
+        ) / COUNT(*))::DOUBLE PRECISION AS within_10_pct
+    FROM predictions p
+    WHERE p.actual IS NOT NULL
+      AND p.confidence IN ('high', 'medium', 'low')
+      AND (p_start_date IS NULL OR p.game_date >= p_start_date)
+      AND (p_end_date IS NULL OR p.game_date <= p_end_date)
+    GROUP BY p.confidence;
+$$ LANGUAGE sql STABLE;
+
+-- Views: all-time accuracy, readable like a table (e.g. from the dashboard)
+CREATE OR REPLACE VIEW prediction_accuracy_by_stat AS
+    SELECT * FROM get_prediction_accuracy_by_stat(NULL, NULL);
+
+CREATE OR REPLACE VIEW prediction_accuracy_by_confidence AS
+    SELECT * FROM get_prediction_accuracy_by_confidence(NULL, NULL);
@@ -0,0 +1,26 @@
+-- Prediction Actuals Reconciliation
+-- Batched write-back of actual results for reconcile_actual_results() in
+-- prediction_tracker.py: one call updates every matched prediction of a night
+-- instead of one SELECT and one UPDATE per (player, date, stat).
+
+-- Index for open (ungraded) predictions of a date
+CREATE INDEX IF NOT EXISTS idx_predictions_open_date ON predictions(game_date, player_id, stat)
+    WHERE actual IS NULL;
+
+-- Function: set actual results by prediction id
+-- p_updates is a JSON array of {"id": <prediction id>, "actual": <value>}
+-- Returns the number of predictions updated
+CREATE OR REPLACE FUNCTION apply_prediction_actuals(p_updates JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    UPDATE predictions p
+    SET actual = u.actual
+    FROM jsonb_to_recordset(p_updates) AS u(id BIGINT, actual DECIMAL(10, 2))
+    WHERE p.id = u.id;
+    
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
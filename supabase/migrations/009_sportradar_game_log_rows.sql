@@ -0,0 +1,70 @@
+-- Sportradar Game Log Rows Schema
+-- Row-oriented storage for Sportradar box score game logs (one row per player/team
+-- per game) plus a ledger of ingested games, replacing the one-JSONB-array-per-season
+-- sr_game_logs layout. Box scores are upserted per game, so nightly runs only fetch
+-- games missing from the ledger and a failed run resumes where it stopped.
+-- Sportradar IDs are UUIDs, so ID columns are text.
+
+-- Table 1: sr_player_game_logs
+CREATE TABLE IF NOT EXISTS sr_player_game_logs (
+    id BIGSERIAL PRIMARY KEY,
+    season VARCHAR(10) NOT NULL,
+    player_id VARCHAR(50) NOT NULL,
+    game_id VARCHAR(50) NOT NULL,
+    team_id VARCHAR(50),
+    game_date DATE NOT NULL,
+    data JSONB NOT NULL, -- Single player box score record
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE(player_id, game_id)
+);
+
+-- Indexes for sr_player_game_logs
+CREATE INDEX IF NOT EXISTS idx_sr_player_game_logs_season_date ON sr_player_game_logs(season, game_date DESC);
+CREATE INDEX IF NOT EXISTS idx_sr_player_game_logs_player ON sr_player_game_logs(player_id, game_date DESC);
+CREATE INDEX IF NOT EXISTS idx_sr_player_game_logs_team ON sr_player_game_logs(team_id, game_date DESC);
+
+-- Table 2: sr_team_game_logs
+CREATE TABLE IF NOT EXISTS sr_team_game_logs (
+    id BIGSERIAL PRIMARY KEY,
+    season VARCHAR(10) NOT NULL,
+    team_id VARCHAR(50) NOT NULL,
+    game_id VARCHAR(50) NOT NULL,
+    game_date DATE NOT NULL,
+    data JSONB NOT NULL, -- Single team box score record
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    UNIQUE(team_id, game_id)
+);
+
+-- Indexes for sr_team_game_logs
+CREATE INDEX IF NOT EXISTS idx_sr_team_game_logs_season_date ON sr_team_game_logs(season, game_date DESC);
+CREATE INDEX IF NOT EXISTS idx_sr_team_game_logs_team ON sr_team_game_logs(team_id, game_date DESC);
+
+-- Table 3: sr_ingested_games
+-- One row per game whose box score rows have been stored; written after the rows,
+-- so a game is only skipped once all of its rows are in place
+CREATE TABLE IF NOT EXISTS sr_ingested_games (
+    id BIGSERIAL PRIMARY KEY,
+    season VARCHAR(10) NOT NULL,
+    game_id VARCHAR(50) NOT NULL UNIQUE,
+    game_date DATE NOT NULL,
+    status VARCHAR(20) NOT NULL, -- Box score status when ingested ('closed' = final)
+    player_rows INTEGER NOT NULL DEFAULT 0,
+    team_rows INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Indexes for sr_ingested_games
+CREATE INDEX IF NOT EXISTS idx_sr_ingested_games_season ON sr_ingested_games(season, status);
+
+-- Triggers to automatically update updated_at
+CREATE TRIGGER update_sr_player_game_logs_updated_at BEFORE UPDATE ON sr_player_game_logs
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE TRIGGER update_sr_team_game_logs_updated_at BEFORE UPDATE ON sr_team_game_logs
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE TRIGGER update_sr_ingested_games_updated_at BEFORE UPDATE ON sr_ingested_games
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
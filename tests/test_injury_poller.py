@@ -0,0 +1,75 @@
+"""
+Injury Poller Tests
+diff_injury_reports() on players added to and removed from the report.
+"""
+
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'new-streamlit-app' / 'player-app'))
+
+import pandas as pd
+import injury_poller as ip
+
+
+def _report(rows):
+    return pd.DataFrame(rows, columns=['team', 'player_name', 'game_date', 'matchup', 'status', 'reason'])
+
+
+def test_added_and_removed_players_have_none_status():
+    old_df = _report([
+        ['Boston Celtics', 'Jayson Tatum', '2025-01-10', 'BOS@NYK', 'Questionable', 'Ankle'],
+        ['Boston Celtics', 'Jaylen Brown', '2025-01-10', 'BOS@NYK', 'Out', 'Knee'],
+    ])
+    new_df = _report([
+        ['Boston Celtics', 'Jayson Tatum', '2025-01-10', 'BOS@NYK', 'Questionable', 'Ankle'],
+        ['New York Knicks', 'Jalen Brunson', '2025-01-10', 'BOS@NYK', 'Out', None],
+    ])
+    
+    changes = ip.diff_injury_reports(old_df, new_df).set_index('player_name')
+    
+    assert sorted(changes.index) == ['Jalen Brunson', 'Jaylen Brown']
+    assert changes.loc['Jalen Brunson', 'old_status'] is None
+    assert changes.loc['Jalen Brunson', 'new_status'] == 'Out'
+    assert changes.loc['Jalen Brunson', 'reason'] is None
+    assert changes.loc['Jaylen Brown', 'old_status'] == 'Out'
+    assert changes.loc['Jaylen Brown', 'new_status'] is None
+
+
+def test_describe_uses_not_listed_for_missing_status():
+    old_df = _report([['Boston Celtics', 'Jaylen Brown', '2025-01-10', 'BOS@NYK', 'Out', 'Knee']])
+    new_df = _report([['New York Knicks', 'Jalen Brunson', '2025-01-10', 'BOS@NYK', 'Doubtful', 'Calf']])
+    
+    delta = ip.InjuryDelta(
+        report_date=date(2025, 1, 10),
+        slot=datetime(2025, 1, 10, 17, 30),
+        url='',
+        changes=ip.diff_injury_reports(old_df, new_df),
+        injury_df=new_df
+    )
+    lines = delta.describe()
+    
+    assert 'BOS Jaylen Brown: Out -> not listed' in lines
+    assert 'NYK Jalen Brunson: not listed -> Doubtful' in lines
+    assert not any('nan' in line for line in lines)
+
+
+def test_unparseable_report_is_remembered(monkeypatch, tmp_path):
+    slot = datetime(2025, 1, 10, 17, 30)
+    parsed = []
+    monkeypatch.setattr(ip, 'STATE_DIR', tmp_path)
+    monkeypatch.setattr(ip.ir, 'report_slots', lambda report_date, after=None: [slot])
+    monkeypatch.setattr(ip.ir, 'find_latest_report', lambda slots, report_date: (slot, 'report.pdf', b'pdf'))
+    monkeypatch.setattr(ip.ir, 'parse_injury_report_cached', lambda content: parsed.append(content) or _report([]))
+    
+    poller = ip.InjuryReportPoller(report_date=date(2025, 1, 10))
+    
+    assert poller.poll() is None
+    assert poller.state.slot == slot
+    assert poller.state.url == 'report.pdf'
+    assert poller.state.pdf_hash == ip.ir.report_hash(b'pdf')
+    assert ip.InjuryReportPoller(report_date=date(2025, 1, 10)).state.pdf_hash == poller.state.pdf_hash
+    
+    assert poller.poll() is None
+    assert len(parsed) == 1
@@ -0,0 +1,59 @@
+"""
+Injury Repredict Tests
+repredict_team() on a game where one player is ruled out.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'new-streamlit-app' / 'player-app'))
+
+import injury_repredict as irp
+
+
+def _base_predictions():
+    predictions = {}
+    for team_abbr, first_id in (('BOS', 100), ('NYK', 200)):
+        for i in range(10):
+            player_id = str(first_id + i)
+            predictions[player_id] = {
+                'player_name': f"{team_abbr} Player {i}",
+                'team_abbr': team_abbr,
+                'is_home': team_abbr == 'NYK',
+                'predictions': {
+                    'PTS': 20.0 - i, 'REB': 6.0, 'AST': 4.0, 'STL': 1.0,
+                    'BLK': 0.5, 'TOV': 2.0, 'FG3M': 2.0, 'FTM': 3.0,
+                    'FPTS': 40.0 - i
+                }
+            }
+    return predictions
+
+
+def _minutes_map():
+    return {first_id + i: 34.0 - i * 2 for first_id in (100, 200) for i in range(10)}
+
+
+def test_out_player_minutes_go_to_teammates():
+    base_predictions = _base_predictions()
+    minutes_map = _minutes_map()
+    
+    healthy = irp.repredict_team(base_predictions, 'BOS', [], [], minutes_map).set_index('Player_ID')
+    adjusted = irp.repredict_team(base_predictions, 'BOS', ['100'], [], minutes_map).set_index('Player_ID')
+    
+    assert set(adjusted['Team']) == {'BOS'}
+    assert '100' in healthy.index
+    assert '100' not in adjusted.index
+    assert abs(adjusted['MIN'].sum() - 240.0) < 1.0
+    assert adjusted.loc['101', 'MIN'] > healthy.loc['101', 'MIN']
+    assert adjusted.loc['101', 'FPTS'] > healthy.loc['101', 'FPTS']
+
+
+def test_only_the_requested_team_is_returned():
+    base_predictions = _base_predictions()
+    minutes_map = _minutes_map()
+    
+    home = irp.repredict_team(base_predictions, 'NYK', [], ['100'], minutes_map)
+    
+    assert set(home['Team']) == {'NYK'}
+    assert len(home) > 0
+    assert list(home.columns) == irp.STATLINE_COLUMNS